@@ -5,6 +5,8 @@ from fastapi import FastAPI
 from fastapi.openapi.docs import get_swagger_ui_html
 
 from .db import init_db_pool, shutdown_db_pool
+from .http_clients import close_model_http_clients
+from .job_executor import shutdown_job_executors
 from .routes.core import router as core_router
 from .routes.culp_artefacts import router as culp_artefacts_router
 from .routes.debug import router as debug_router
@@ -34,6 +36,8 @@ from .routes.tool_requests import router as tool_requests_router
 from .routes.trace import router as trace_router
 from .routes.workflow import router as workflow_router
 from .routes.visuals import router as visuals_router
+from .services import scenarios as scenarios_service
+from .tool_runs import shutdown_tool_run_recorder
 
 
 def create_app() -> FastAPI:
@@ -43,10 +47,27 @@ def create_app() -> FastAPI:
     def _startup_db_pool() -> None:
         init_db_pool()
 
+    @app.on_event("startup")
+    def _recover_tab_refreshes() -> None:
+        scenarios_service.recover_tab_refreshes()
+
+    @app.on_event("shutdown")
+    def _shutdown_job_executors() -> None:
+        shutdown_job_executors()
+
+    # Registered before the pool shutdown so queued ToolRun records are flushed while it is open.
+    @app.on_event("shutdown")
+    def _shutdown_tool_run_recorder() -> None:
+        shutdown_tool_run_recorder()
+
     @app.on_event("shutdown")
     def _shutdown_db_pool() -> None:
         shutdown_db_pool()
 
+    @app.on_event("shutdown")
+    def _shutdown_model_http_clients() -> None:
+        close_model_http_clients()
+
     app.include_router(core_router)
     
     if os.environ.get("TPA_DEBUG_ENABLED", "false").lower() == "true":
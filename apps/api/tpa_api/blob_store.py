@@ -4,6 +4,7 @@ import base64
 import io
 import mimetypes
 import os
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any
 from urllib.parse import urlparse
@@ -103,3 +104,135 @@ def write_blob_bytes(blob_path: str, data: bytes, content_type: str | None = Non
         return blob_path, None
     except Exception as exc:  # noqa: BLE001
         return None, f"minio_put_object_failed: {exc}"
+
+
+# Ranged reads, so large derived rasters (e.g. georef Cloud-Optimized GeoTIFFs) are read a tile at a
+# time instead of whole-file: COG readers fetch the header, then only the byte ranges of the tiles
+# (and overview level) they need.
+
+
+def blob_size(blob_path: str) -> tuple[int | None, str | None]:
+    """Size in bytes of a local file or MinIO object. Returns (size, error_text)."""
+    if not blob_path:
+        return None, "empty_blob_path"
+    local = Path(blob_path)
+    if local.exists() and local.is_file():
+        return local.stat().st_size, None
+    client = minio_client_or_none()
+    bucket = os.environ.get("TPA_S3_BUCKET")
+    if not client or not bucket:
+        return None, "minio_unconfigured"
+    try:
+        return int(client.stat_object(bucket, blob_path).size), None
+    except Exception as exc:  # noqa: BLE001
+        return None, f"minio_stat_object_failed: {exc}"
+
+
+def read_blob_range(blob_path: str, offset: int, length: int) -> tuple[bytes | None, str | None]:
+    """
+    Read `length` bytes starting at `offset` (fewer at end of blob) from a local file or MinIO
+    object. Returns (bytes, error_text).
+    """
+    if not blob_path:
+        return None, "empty_blob_path"
+    if offset < 0 or length < 0:
+        return None, "invalid_range"
+    if length == 0:
+        return b"", None
+    local = Path(blob_path)
+    if local.exists() and local.is_file():
+        try:
+            with local.open("rb") as handle:
+                handle.seek(offset)
+                return handle.read(length), None
+        except Exception as exc:  # noqa: BLE001
+            return None, f"read_local_failed: {exc}"
+    client = minio_client_or_none()
+    bucket = os.environ.get("TPA_S3_BUCKET")
+    if not client or not bucket:
+        return None, "minio_unconfigured"
+    try:
+        resp = client.get_object(bucket, blob_path, offset=offset, length=length)
+        try:
+            return resp.read(), None
+        finally:
+            resp.close()
+            resp.release_conn()
+    except Exception as exc:  # noqa: BLE001
+        return None, f"minio_get_object_failed: {exc}"
+
+
+class BlobRangeReader(io.RawIOBase):
+    """
+    Seekable read-only file object over a blob, fetched lazily in aligned blocks.
+
+    Hand it to a reader that seeks (rasterio `opener=`, tifffile, PIL) to pull only the parts of a
+    large blob it touches. Recently used blocks are kept (`max_blocks`), so the repeated small reads
+    of TIFF tag parsing cost one request per block rather than one per read.
+    """
+
+    def __init__(self, blob_path: str, *, block_size: int = 256 * 1024, max_blocks: int = 32) -> None:
+        super().__init__()
+        size, err = blob_size(blob_path)
+        if size is None:
+            raise OSError(f"blob_unavailable:{err}")
+        self.blob_path = blob_path
+        self.size = size
+        self.block_size = max(4096, block_size)
+        self.max_blocks = max(1, max_blocks)
+        self._pos = 0
+        self._blocks: OrderedDict[int, bytes] = OrderedDict()
+        self.requests = 0
+        self.bytes_fetched = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = self.size + offset
+        else:
+            raise ValueError(f"invalid whence: {whence}")
+        if pos < 0:
+            raise ValueError("negative seek position")
+        self._pos = pos
+        return pos
+
+    def _block(self, index: int) -> bytes:
+        block = self._blocks.get(index)
+        if block is not None:
+            self._blocks.move_to_end(index)
+            return block
+        data, err = read_blob_range(self.blob_path, index * self.block_size, self.block_size)
+        if data is None:
+            raise OSError(f"blob_range_read_failed:{err}")
+        self.requests += 1
+        self.bytes_fetched += len(data)
+        self._blocks[index] = data
+        if len(self._blocks) > self.max_blocks:
+            self._blocks.popitem(last=False)
+        return data
+
+    def readinto(self, buffer: Any) -> int:
+        view = memoryview(buffer).cast("B")
+        want = min(len(view), max(0, self.size - self._pos))
+        done = 0
+        while done < want:
+            index, start = divmod(self._pos + done, self.block_size)
+            chunk = self._block(index)[start : start + want - done]
+            if not chunk:
+                break
+            view[done : done + len(chunk)] = chunk
+            done += len(chunk)
+        self._pos += done
+        return done
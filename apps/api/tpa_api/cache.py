@@ -88,3 +88,54 @@ def cache_delete(key: str) -> None:
 def cache_key(prefix: str, *parts: Any) -> str:
     safe_parts = [str(p) for p in parts if p is not None]
     return ":".join([prefix, *safe_parts])
+
+
+def cache_shared_available() -> bool:
+    """True when a shared (Redis) backend is configured; False means the per-process fallback."""
+    return _get_redis_client() is not None
+
+
+def cache_get_many_json(keys: list[str]) -> list[Any]:
+    """
+    Fetch several keys in one round trip (Redis MGET); missing or undecodable entries are None.
+    """
+    if not keys:
+        return []
+    client = _get_redis_client()
+    if client:
+        try:
+            raws = client.mget(keys)
+        except Exception:  # noqa: BLE001
+            raws = [None] * len(keys)
+        out: list[Any] = []
+        for raw in raws:
+            value = None
+            if raw:
+                try:
+                    value = json.loads(raw)
+                except Exception:  # noqa: BLE001
+                    value = None
+            out.append(value)
+        return out
+    return [cache_get_json(key) for key in keys]
+
+
+def cache_set_many_json(items: dict[str, Any], ttl_seconds: int | None = None) -> None:
+    if not items:
+        return
+    client = _get_redis_client()
+    if client:
+        try:
+            pipe = client.pipeline(transaction=False)
+            for key, value in items.items():
+                payload = json.dumps(value, ensure_ascii=False)
+                if ttl_seconds:
+                    pipe.setex(key, ttl_seconds, payload)
+                else:
+                    pipe.set(key, payload)
+            pipe.execute()
+            return
+        except Exception:  # noqa: BLE001
+            pass
+    for key, value in items.items():
+        cache_set_json(key, value, ttl_seconds=ttl_seconds)
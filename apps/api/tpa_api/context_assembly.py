@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Callable
 from uuid import uuid4
 
-from .spatial_fingerprint import compute_site_fingerprint_sync, extract_site_ids_from_state_vector
+from .spatial_fingerprint import compute_site_fingerprints_batch_sync, extract_site_ids_from_state_vector
 from .spec_io import _read_yaml, _spec_root
 from .text_utils import _estimate_tokens
 
@@ -24,6 +26,9 @@ class ContextAssemblyDeps:
     retrieve_policy_clauses_hybrid_sync: Callable[..., dict[str, Any]]
     utc_now_iso: Callable[[], str]
     utc_now: Callable[[], Any]
+    # Optional multi-query variants (one embedding call + one SQL round trip per batch).
+    retrieve_chunks_hybrid_batch_sync: Callable[..., list[dict[str, Any]]] | None = None
+    retrieve_policy_clauses_hybrid_batch_sync: Callable[..., list[dict[str, Any]]] | None = None
 
 
 def _clamp_int(value: int, *, lo: int, hi: int) -> int:
@@ -531,6 +536,79 @@ def build_or_refine_retrieval_frame_sync(
     return frame_out
 
 
+def _frame_retrieval_concurrency() -> int:
+    try:
+        return max(1, int(os.environ.get("TPA_FRAME_RETRIEVAL_CONCURRENCY", "4")))
+    except ValueError:
+        return 4
+
+
+def _frame_query_batch_size() -> int:
+    try:
+        return max(1, int(os.environ.get("TPA_FRAME_QUERY_BATCH_SIZE", "8")))
+    except ValueError:
+        return 8
+
+
+def _execute_frame_text_queries_sync(
+    *,
+    deps: ContextAssemblyDeps,
+    jobs: list[dict[str, Any]],
+    authority_id: str,
+    plan_cycle_id: str | None,
+) -> dict[int, tuple[dict[str, Any], dict[str, Any]]]:
+    """
+    Run clause + chunk hybrid retrieval for every text query of a frame.
+
+    Queries sharing (kind, limit, rerank_top_n) are grouped into batches (one embedding call and
+    one SQL round trip each, when the deps provide batch retrievers) and batches run on a bounded
+    pool. Each query gets exactly the arguments the serial path used, so candidate sets match.
+    Returns {job index: (clause result, chunk result)}.
+    """
+    groups: dict[tuple[str, int, int], list[tuple[int, str]]] = {}
+    for job in jobs:
+        groups.setdefault(("clause", job["clause_limit"], job["clause_rerank_top_n"]), []).append(
+            (job["index"], job["query"])
+        )
+        groups.setdefault(("chunk", job["limit"], job["rerank_top_n"]), []).append((job["index"], job["query"]))
+
+    single = {"clause": deps.retrieve_policy_clauses_hybrid_sync, "chunk": deps.retrieve_chunks_hybrid_sync}
+    batched = {
+        "clause": deps.retrieve_policy_clauses_hybrid_batch_sync,
+        "chunk": deps.retrieve_chunks_hybrid_batch_sync,
+    }
+    batch_size = _frame_query_batch_size()
+    tasks: list[tuple[str, int, int, list[tuple[int, str]]]] = []
+    for (kind, limit, rerank_top_n), items in groups.items():
+        step = batch_size if batched[kind] is not None else 1
+        for start in range(0, len(items), step):
+            tasks.append((kind, limit, rerank_top_n, items[start : start + step]))
+
+    def run(task: tuple[str, int, int, list[tuple[int, str]]]) -> list[tuple[str, int, dict[str, Any]]]:
+        kind, limit, rerank_top_n, items = task
+        common = {
+            "authority_id": authority_id,
+            "plan_cycle_id": plan_cycle_id,
+            "limit": limit,
+            "rerank": True,
+            "rerank_top_n": rerank_top_n,
+        }
+        batch_fn = batched[kind]
+        if batch_fn is not None:
+            outs = batch_fn(queries=[query for _, query in items], **common)
+        else:
+            outs = [single[kind](query=query, **common) for _, query in items]
+        return [(kind, index, out) for (index, _), out in zip(items, outs, strict=True)]
+
+    results: dict[str, dict[int, dict[str, Any]]] = {"clause": {}, "chunk": {}}
+    if tasks:
+        with ThreadPoolExecutor(max_workers=min(_frame_retrieval_concurrency(), len(tasks))) as pool:
+            for outs in pool.map(run, tasks):
+                for kind, index, out in outs:
+                    results[kind][index] = out
+    return {job["index"]: (results["clause"][job["index"]], results["chunk"][job["index"]]) for job in jobs}
+
+
 def assemble_curated_evidence_set_sync(
     *,
     deps: ContextAssemblyDeps,
@@ -671,15 +749,52 @@ def assemble_curated_evidence_set_sync(
                 },
             )
 
+    frame_queries = retrieval_frame.get("queries") if isinstance(retrieval_frame.get("queries"), list) else []
+
+    def query_limit(q: dict[str, Any]) -> int:
+        top_k = q.get("top_k")
+        limit = int(top_k) if isinstance(top_k, int) else max_candidates_per_query
+        return _clamp_int(limit, lo=5, hi=max_candidates_per_query)
+
+    def clause_limit_for(limit: int) -> int:
+        return max(6, min(max_candidates_per_query, max(6, limit // 2)))
+
+    # Text retrieval for the whole frame runs up front (batched, bounded concurrency); results are
+    # consumed below in frame order so candidates and tool runs are recorded as before.
+    text_jobs: list[dict[str, Any]] = []
+    for index, q in enumerate(frame_queries):
+        if not isinstance(q, dict):
+            continue
+        modality = q.get("modality") if isinstance(q.get("modality"), str) else "text"
+        query_text = q.get("query").strip() if isinstance(q.get("query"), str) else ""
+        if modality != "text" or not query_text:
+            continue
+        limit = query_limit(q)
+        clause_limit = clause_limit_for(limit)
+        text_jobs.append(
+            {
+                "index": index,
+                "query": query_text,
+                "limit": limit,
+                "rerank_top_n": max(10, min(max_candidates_per_query, limit)),
+                "clause_limit": clause_limit,
+                "clause_rerank_top_n": max(10, min(max_candidates_per_query, clause_limit)),
+            }
+        )
+    text_results = _execute_frame_text_queries_sync(
+        deps=deps,
+        jobs=text_jobs,
+        authority_id=authority_id,
+        plan_cycle_id=plan_cycle_id,
+    )
+
     # Run queries from the frame. If issue_id is missing, attach to all issues.
-    for q in retrieval_frame.get("queries") if isinstance(retrieval_frame.get("queries"), list) else []:
+    for index, q in enumerate(frame_queries):
         if not isinstance(q, dict):
             continue
         modality = q.get("modality") if isinstance(q.get("modality"), str) else "text"
         purpose = q.get("purpose") if isinstance(q.get("purpose"), str) else "primary"
-        top_k = q.get("top_k")
-        limit = int(top_k) if isinstance(top_k, int) else max_candidates_per_query
-        limit = _clamp_int(limit, lo=5, hi=max_candidates_per_query)
+        limit = query_limit(q)
         target_issue_ids: list[str]
         issue_id = q.get("issue_id")
         if isinstance(issue_id, str) and issue_id:
@@ -692,23 +807,24 @@ def assemble_curated_evidence_set_sync(
 
         if modality == "spatial":
             site_ids = extract_site_ids_from_state_vector(scenario.get("state_vector") if isinstance(scenario, dict) else {})
+            pending_site_ids = [sid for sid in site_ids[:10] if sid not in computed_site_tool_run_by_site_id]
+            if pending_site_ids:
+                batch = compute_site_fingerprints_batch_sync(
+                    db_fetch_one=deps.db_fetch_one,
+                    db_fetch_all=deps.db_fetch_all,
+                    db_execute=deps.db_execute,
+                    utc_now=deps.utc_now,
+                    site_ids=pending_site_ids,
+                    authority_id=authority_id,
+                    plan_cycle_id=plan_cycle_id,
+                    token_budget=token_budget,
+                )
+                for sid, (fingerprint, tool_run_id, _errs) in batch.items():
+                    computed_site_tool_run_by_site_id[sid] = tool_run_id
+                    computed_site_fingerprint_by_site_id[sid] = fingerprint or {}
             for site_id in site_ids[:10]:
-                if site_id in computed_site_tool_run_by_site_id:
-                    tool_run_id = computed_site_tool_run_by_site_id[site_id]
-                    fingerprint = computed_site_fingerprint_by_site_id.get(site_id) or {}
-                else:
-                    fingerprint, tool_run_id, _errs = compute_site_fingerprint_sync(
-                        db_fetch_one=deps.db_fetch_one,
-                        db_fetch_all=deps.db_fetch_all,
-                        db_execute=deps.db_execute,
-                        utc_now=deps.utc_now,
-                        site_id=site_id,
-                        authority_id=authority_id,
-                        plan_cycle_id=plan_cycle_id,
-                        token_budget=token_budget,
-                    )
-                    computed_site_tool_run_by_site_id[site_id] = tool_run_id
-                    computed_site_fingerprint_by_site_id[site_id] = fingerprint or {}
+                tool_run_id = computed_site_tool_run_by_site_id[site_id]
+                fingerprint = computed_site_fingerprint_by_site_id.get(site_id) or {}
 
                 tool_run_ids.append(tool_run_id)
                 evidence_ref = f"tool_run::{tool_run_id}::site_fingerprint"
@@ -845,27 +961,12 @@ def assemble_curated_evidence_set_sync(
         if not query_text:
             continue
 
-        clause_limit = max(6, min(max_candidates_per_query, max(6, limit // 2)))
-        clause = deps.retrieve_policy_clauses_hybrid_sync(
-            query=query_text,
-            authority_id=authority_id,
-            plan_cycle_id=plan_cycle_id,
-            limit=clause_limit,
-            rerank=True,
-            rerank_top_n=max(10, min(max_candidates_per_query, clause_limit)),
-        )
+        clause_limit = clause_limit_for(limit)
+        clause, chunk = text_results[index]
         for tid in [clause.get("tool_run_id"), clause.get("rerank_tool_run_id")]:
             if isinstance(tid, str):
                 tool_run_ids.append(tid)
 
-        chunk = deps.retrieve_chunks_hybrid_sync(
-            query=query_text,
-            authority_id=authority_id,
-            plan_cycle_id=plan_cycle_id,
-            limit=limit,
-            rerank=True,
-            rerank_top_n=max(10, min(max_candidates_per_query, limit)),
-        )
         for tid in [chunk.get("tool_run_id"), chunk.get("rerank_tool_run_id")]:
             if isinstance(tid, str):
                 tool_run_ids.append(tid)
@@ -958,7 +1059,7 @@ def assemble_curated_evidence_set_sync(
         "  - include at least 1 countervailing item where plausible (not tokenistic)\n"
         "- If evidence is missing (e.g. spatial constraints, transport instruments, plan maps), emit ToolRequests.\n"
         "- If instrument_hints are provided, treat them as available evidence instruments and propose ToolRequests where they would close gaps.\n"
-        "- If you select visual_asset evidence_refs and interpretation would benefit from a VLM instrument run, request instrument_id=\"townscape_vlm_assessment\" with inputs {\"visual_asset_refs\": [...], \"viewpoint_context\": {...}}.\n"
+        "- If you select visual_asset evidence_refs and interpretation would benefit from a VLM instrument run, request instrument_id=\"townscape_vlm_assessment\" with inputs {\"visual_asset_refs\": [...], \"viewpoint_context\": {...}}; whole document pages can be included as doc::<document_id>::page-<n> refs.\n"
         "- Record deliberate omissions (e.g. duplicates, out-of-scope plan cycles, low provenance) explicitly.\n"
         "- Do not invent citations.\n"
     )
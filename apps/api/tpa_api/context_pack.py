@@ -1,6 +1,12 @@
 from __future__ import annotations
 
+import copy
 import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Callable
@@ -94,6 +100,94 @@ def _estimate_payload_tokens(payload: dict[str, Any]) -> int:
         return 0
 
 
+# JSON keys/punctuation of a candidate payload, in tokens (~4 chars each).
+_PAYLOAD_OVERHEAD_TOKENS = 60
+
+
+def _precomputed_payload_tokens(stored_estimate: Any, *small_fields: Any) -> int | None:
+    """
+    Token estimate from the row's stored `token_estimate` (its large text/JSON, sized at ingest)
+    plus the short scalar fields, without serialising the payload. None when there is no stored
+    estimate; callers then fall back to `_estimate_payload_tokens`.
+    """
+    if not isinstance(stored_estimate, int):
+        return None
+    small = sum(len(str(v)) for v in small_fields if v is not None)
+    return stored_estimate + small // 4 + _PAYLOAD_OVERHEAD_TOKENS
+
+
+def _max_candidates_per_slice() -> int:
+    try:
+        return max(1, int(os.environ.get("TPA_CONTEXT_PACK_MAX_CANDIDATES_PER_SLICE", "400")))
+    except ValueError:
+        return 400
+
+
+def _candidate_total(rows: list[dict[str, Any]]) -> int:
+    """Rows matching a capped loader before its LIMIT (`COUNT(*) OVER ()` is evaluated first)."""
+    if not rows:
+        return 0
+    total = rows[0].get("candidate_total")
+    return int(total) if isinstance(total, int) else len(rows)
+
+
+def _candidate_cap_omissions(totals: dict[str, tuple[int, int]]) -> list[dict[str, Any]]:
+    """
+    One omission per slice whose loader hit `TPA_CONTEXT_PACK_MAX_CANDIDATES_PER_SLICE`, so
+    candidates the selector never saw are recorded next to the ones it chose to leave out.
+    `totals` maps slice_type to (loaded, total).
+    """
+    omissions: list[dict[str, Any]] = []
+    for slice_type, (loaded, total) in totals.items():
+        if total > loaded:
+            omissions.append(
+                {
+                    "slice_type": slice_type,
+                    "reason": "candidate_cap",
+                    "loaded": loaded,
+                    "total": total,
+                    "omitted_count": total - loaded,
+                }
+            )
+    return omissions
+
+
+def _candidate_cache_seconds() -> float:
+    try:
+        return max(0.0, float(os.environ.get("TPA_CONTEXT_PACK_CANDIDATE_CACHE_SECONDS", "600")))
+    except ValueError:
+        return 600.0
+
+
+_CANDIDATE_CACHE_MAX_ENTRIES = 64
+_candidate_cache: OrderedDict[tuple[Any, ...], tuple[float, Any]] = OrderedDict()
+_candidate_cache_lock = threading.Lock()
+
+
+def _cached_for_run(key: tuple[Any, ...], load: Callable[[], Any]) -> Any:
+    """
+    Memoise authority/plan-cycle scoped loads (gates, policy clauses, visuals, spatial features,
+    advice cards) for the moves of one run; the key always includes the run_id. Run-scoped slices
+    (evidence atoms, assumptions, limitations) change between moves and are not cached.
+    """
+    ttl = _candidate_cache_seconds()
+    if ttl <= 0:
+        return load()
+    now = time.monotonic()
+    with _candidate_cache_lock:
+        hit = _candidate_cache.get(key)
+        if hit is not None and now - hit[0] <= ttl:
+            _candidate_cache.move_to_end(key)
+            return copy.deepcopy(hit[1])
+    value = load()
+    with _candidate_cache_lock:
+        _candidate_cache[key] = (now, copy.deepcopy(value))
+        _candidate_cache.move_to_end(key)
+        while len(_candidate_cache) > _CANDIDATE_CACHE_MAX_ENTRIES:
+            _candidate_cache.popitem(last=False)
+    return value
+
+
 def _gate_slice_availability(
     *,
     deps: ContextPackAssemblyDeps,
@@ -101,6 +195,73 @@ def _gate_slice_availability(
     plan_cycle_id: str | None,
     plan_project_id: str | None,
     application_id: str | None,
+) -> dict[str, bool]:
+    """All slice gates in one round trip; falls back to per-gate queries (each failing closed)."""
+    try:
+        row = deps.db_fetch_one(
+            """
+            SELECT
+              EXISTS (
+                SELECT 1
+                FROM visual_assets va
+                JOIN documents d ON d.id = va.document_id
+                WHERE d.is_active = true
+                  AND (%s IS NULL OR d.authority_id = %s)
+                  AND (%s::uuid IS NULL OR d.plan_cycle_id = %s::uuid)
+              ) AS visual_assets_present,
+              EXISTS (
+                SELECT 1
+                FROM spatial_features sf
+                WHERE sf.is_active = true
+                  AND (%s IS NULL OR sf.authority_id = %s)
+              ) AS spatial_layers_present,
+              EXISTS (
+                SELECT 1
+                FROM consultations c
+                WHERE (%s::uuid IS NULL OR c.plan_project_id = %s::uuid)
+              ) AS consultations_present,
+              EXISTS (
+                SELECT 1
+                FROM decisions d
+                WHERE (%s::uuid IS NULL OR d.application_id = %s::uuid)
+              ) AS decisions_present
+            """,
+            (
+                authority_id,
+                authority_id,
+                plan_cycle_id,
+                plan_cycle_id,
+                authority_id,
+                authority_id,
+                plan_project_id,
+                plan_project_id,
+                application_id,
+                application_id,
+            ),
+        )
+    except Exception:  # noqa: BLE001
+        row = None
+    if row is None:
+        return _gate_slice_availability_per_gate(
+            deps=deps,
+            authority_id=authority_id,
+            plan_cycle_id=plan_cycle_id,
+            plan_project_id=plan_project_id,
+            application_id=application_id,
+        )
+    return {
+        key: bool(row.get(key))
+        for key in ("visual_assets_present", "spatial_layers_present", "consultations_present", "decisions_present")
+    }
+
+
+def _gate_slice_availability_per_gate(
+    *,
+    deps: ContextPackAssemblyDeps,
+    authority_id: str | None,
+    plan_cycle_id: str | None,
+    plan_project_id: str | None,
+    application_id: str | None,
 ) -> dict[str, bool]:
     status = {
         "visual_assets_present": False,
@@ -195,7 +356,7 @@ def _policy_clause_candidates(
     deps: ContextPackAssemblyDeps,
     authority_id: str | None,
     plan_cycle_id: str | None,
-) -> list[dict[str, Any]]:
+) -> tuple[list[dict[str, Any]], int]:
     rows = deps.db_fetch_all(
         """
         SELECT
@@ -211,7 +372,9 @@ def _policy_clause_candidates(
           d.weight_hint,
           er.source_type,
           er.source_id,
-          er.fragment_id
+          er.fragment_id,
+          pc.token_estimate,
+          COUNT(*) OVER () AS candidate_total
         FROM policy_clauses pc
         JOIN policy_sections ps ON ps.id = pc.policy_section_id
         JOIN documents d ON d.id = ps.document_id
@@ -219,9 +382,10 @@ def _policy_clause_candidates(
         WHERE d.is_active = true
           AND (%s IS NULL OR d.authority_id = %s)
           AND (%s::uuid IS NULL OR d.plan_cycle_id = %s::uuid)
-        ORDER BY d.metadata->>'title' ASC NULLS LAST, ps.section_path ASC NULLS LAST, pc.clause_ref ASC NULLS LAST
+        ORDER BY d.metadata->>'title' ASC NULLS LAST, ps.section_path ASC NULLS LAST, pc.clause_ref ASC NULLS LAST, pc.id
+        LIMIT %s
         """,
-        (authority_id, authority_id, plan_cycle_id, plan_cycle_id),
+        (authority_id, authority_id, plan_cycle_id, plan_cycle_id, _max_candidates_per_slice()),
     )
     out: list[dict[str, Any]] = []
     for row in rows:
@@ -256,18 +420,30 @@ def _policy_clause_candidates(
             "limitations_text": None,
             "metadata": row.get("clause_metadata") if isinstance(row.get("clause_metadata"), dict) else {},
         }
+        approx_tokens = _precomputed_payload_tokens(
+            row.get("token_estimate"),
+            clause_id,
+            payload["policy_section_id"],
+            payload["policy_ref"],
+            payload["clause_ref"],
+            payload["section_path"],
+            payload["document_title"],
+            payload["document_status"],
+            payload["weight_hint"],
+            evidence_ref,
+        )
         out.append(
             {
                 "candidate_id": f"policy_clause::{clause_id}",
                 "slice_type": "policy_clauses",
                 "evidence_ref": evidence_ref,
-                "approx_tokens": _estimate_payload_tokens(payload),
+                "approx_tokens": approx_tokens if approx_tokens is not None else _estimate_payload_tokens(payload),
                 "summary": summary,
                 "title": title,
                 "payload": payload,
             }
         )
-    return out
+    return out, _candidate_total(rows)
 
 
 def _evidence_atom_candidates(
@@ -320,7 +496,7 @@ def _visual_asset_candidates(
     deps: ContextPackAssemblyDeps,
     authority_id: str | None,
     plan_cycle_id: str | None,
-) -> list[dict[str, Any]]:
+) -> tuple[list[dict[str, Any]], int]:
     rows = deps.db_fetch_all(
         """
         SELECT
@@ -335,7 +511,9 @@ def _visual_asset_candidates(
           er.fragment_id,
           vs.agent_findings_jsonb,
           vs.asset_specific_facts_jsonb,
-          vre.interpretation_notes
+          vre.interpretation_notes,
+          va.token_estimate,
+          COUNT(*) OVER () AS candidate_total
         FROM visual_assets va
         JOIN documents d ON d.id = va.document_id
         LEFT JOIN evidence_refs er ON er.id = va.evidence_ref_id
@@ -356,9 +534,10 @@ def _visual_asset_candidates(
         WHERE d.is_active = true
           AND (%s IS NULL OR d.authority_id = %s)
           AND (%s::uuid IS NULL OR d.plan_cycle_id = %s::uuid)
-        ORDER BY d.metadata->>'title' ASC NULLS LAST, va.page_number ASC NULLS LAST
+        ORDER BY d.metadata->>'title' ASC NULLS LAST, va.page_number ASC NULLS LAST, va.id
+        LIMIT %s
         """,
-        (authority_id, authority_id, plan_cycle_id, plan_cycle_id),
+        (authority_id, authority_id, plan_cycle_id, plan_cycle_id, _max_candidates_per_slice()),
     )
     out: list[dict[str, Any]] = []
     for row in rows:
@@ -400,25 +579,34 @@ def _visual_asset_candidates(
             "tool_run_id": None,
             "metadata": row.get("asset_metadata") if isinstance(row.get("asset_metadata"), dict) else {},
         }
+        approx_tokens = _precomputed_payload_tokens(
+            row.get("token_estimate"),
+            asset_id,
+            payload["document_id"],
+            payload["document_title"],
+            payload["page_number"],
+            payload["asset_type"],
+            evidence_ref,
+        )
         out.append(
             {
                 "candidate_id": f"visual_asset::{asset_id}",
                 "slice_type": "visual_assets",
                 "evidence_ref": evidence_ref,
-                "approx_tokens": _estimate_payload_tokens(payload),
+                "approx_tokens": approx_tokens if approx_tokens is not None else _estimate_payload_tokens(payload),
                 "summary": summary,
                 "title": title,
                 "payload": payload,
             }
         )
-    return out
+    return out, _candidate_total(rows)
 
 
 def _spatial_feature_candidates(
     *,
     deps: ContextPackAssemblyDeps,
     authority_id: str | None,
-) -> list[dict[str, Any]]:
+) -> tuple[list[dict[str, Any]], int]:
     rows = deps.db_fetch_all(
         """
         SELECT
@@ -427,13 +615,16 @@ def _spatial_feature_candidates(
           sf.spatial_scope,
           sf.confidence_hint,
           sf.uncertainty_note,
-          sf.properties
+          sf.properties,
+          sf.token_estimate,
+          COUNT(*) OVER () AS candidate_total
         FROM spatial_features sf
         WHERE sf.is_active = true
           AND (%s IS NULL OR sf.authority_id = %s)
-        ORDER BY sf.type ASC
+        ORDER BY sf.type ASC, sf.id
+        LIMIT %s
         """,
-        (authority_id, authority_id),
+        (authority_id, authority_id, _max_candidates_per_slice()),
     )
     out: list[dict[str, Any]] = []
     for row in rows:
@@ -464,18 +655,28 @@ def _spatial_feature_candidates(
             "confidence_hint": row.get("confidence_hint"),
             "limitations_text": row.get("uncertainty_note"),
         }
+        approx_tokens = _precomputed_payload_tokens(
+            row.get("token_estimate"),
+            feature_id,
+            payload["feature_type"],
+            payload["spatial_scope"],
+            summary,
+            evidence_ref,
+            payload["confidence_hint"],
+            payload["limitations_text"],
+        )
         out.append(
             {
                 "candidate_id": f"spatial_feature::{feature_id}",
                 "slice_type": "spatial_features",
                 "evidence_ref": evidence_ref,
-                "approx_tokens": _estimate_payload_tokens(payload),
+                "approx_tokens": approx_tokens if approx_tokens is not None else _estimate_payload_tokens(payload),
                 "summary": summary,
                 "title": summary,
                 "payload": payload,
             }
         )
-    return out
+    return out, _candidate_total(rows)
 
 
 def _consultation_candidates(
@@ -574,36 +775,29 @@ def _advice_card_candidates(
     deps: ContextPackAssemblyDeps,
     authority_id: str | None,
     plan_cycle_id: str | None,
-) -> list[dict[str, Any]]:
+) -> tuple[list[dict[str, Any]], int]:
     if not authority_id:
-        return []
+        return [], 0
     card_catalogue = _load_good_practice_cards()
     card_list = card_catalogue.get("cards") if isinstance(card_catalogue, dict) else []
     card_by_id = {c.get("card_id"): c for c in card_list if isinstance(c, dict) and isinstance(c.get("card_id"), str)}
 
-    scope_rows = deps.db_fetch_all(
+    # Instances scoped to the authority's active documents, newest first, in one query.
+    rows = deps.db_fetch_all(
         """
-        SELECT d.id AS scope_id, 'document' AS scope_type
-        FROM documents d
+        SELECT aci.id, aci.card_id, aci.card_version, aci.scope_type, aci.scope_id, aci.status,
+               aci.trigger_cues_jsonb, aci.evidence_refs_jsonb, aci.tool_run_id, aci.notes, aci.created_at,
+               length(aci.evidence_refs_jsonb::text) / 4 AS token_estimate,
+               COUNT(*) OVER () AS candidate_total
+        FROM advice_card_instances aci
+        JOIN documents d ON d.id = aci.scope_id
         WHERE d.is_active = true
           AND d.authority_id = %s
           AND (%s::uuid IS NULL OR d.plan_cycle_id = %s::uuid)
+        ORDER BY aci.created_at DESC, aci.id
+        LIMIT %s
         """,
-        (authority_id, plan_cycle_id, plan_cycle_id),
-    )
-    scope_ids = [str(r.get("scope_id")) for r in scope_rows if r.get("scope_id")]
-    if not scope_ids:
-        return []
-
-    rows = deps.db_fetch_all(
-        """
-        SELECT id, card_id, card_version, scope_type, scope_id, status,
-               trigger_cues_jsonb, evidence_refs_jsonb, tool_run_id, notes, created_at
-        FROM advice_card_instances
-        WHERE scope_id = ANY(%s::uuid[])
-        ORDER BY created_at DESC
-        """,
-        (scope_ids,),
+        (authority_id, plan_cycle_id, plan_cycle_id, _max_candidates_per_slice()),
     )
     out: list[dict[str, Any]] = []
     for row in rows:
@@ -630,18 +824,33 @@ def _advice_card_candidates(
             "tool_run_id": str(row.get("tool_run_id")) if row.get("tool_run_id") else None,
             "notes": row.get("notes"),
         }
+        approx_tokens = _precomputed_payload_tokens(
+            row.get("token_estimate"),
+            instance_id,
+            card_id,
+            title,
+            payload["card_type"],
+            payload["basis"],
+            payload["priority"],
+            payload["status"],
+            payload["scope_type"],
+            payload["scope_id"],
+            prompt,
+            payload["tool_run_id"],
+            payload["notes"],
+        )
         out.append(
             {
                 "candidate_id": f"advice_card::{instance_id}",
                 "slice_type": "advice_cards",
                 "evidence_ref": None,
-                "approx_tokens": _estimate_payload_tokens(payload),
+                "approx_tokens": approx_tokens if approx_tokens is not None else _estimate_payload_tokens(payload),
                 "summary": summary,
                 "title": title or card_id,
                 "payload": payload,
             }
         )
-    return out
+    return out, _candidate_total(rows)
 
 
 def _assumption_candidates(*, deps: ContextPackAssemblyDeps, run_id: str) -> list[dict[str, Any]]:
@@ -868,6 +1077,94 @@ def _select_slice_with_llm(
     return selected, omissions, errs, tool_run_id
 
 
+def _selection_concurrency() -> int:
+    try:
+        return max(1, int(os.environ.get("TPA_CONTEXT_PACK_SELECTION_CONCURRENCY", "4")))
+    except ValueError:
+        return 4
+
+
+def _slice_timeout_seconds() -> float | None:
+    try:
+        timeout = float(os.environ.get("TPA_CONTEXT_PACK_SLICE_TIMEOUT_SECONDS", "600"))
+    except ValueError:
+        timeout = 600.0
+    return timeout if timeout > 0 else None
+
+
+def _fast_path_enabled() -> bool:
+    return os.environ.get("TPA_CONTEXT_PACK_FAST_PATH", "false").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _select_slices(
+    *,
+    deps: ContextPackAssemblyDeps,
+    move_type: MoveType,
+    work_mode: str,
+    candidates: dict[str, list[dict[str, Any]]],
+    slice_budgets: dict[str, int],
+    framing: dict[str, Any] | None,
+    issues: list[dict[str, Any]],
+) -> tuple[dict[str, tuple[list[str], list[dict[str, Any]], list[str], str | None]], list[str]]:
+    """
+    Run `_select_slice_with_llm` for every slice on a bounded pool, with a per-slice timeout
+    measured from when that slice's call starts. Results are keyed by slice type; callers iterate
+    `candidates` to keep pack order deterministic.
+
+    With `TPA_CONTEXT_PACK_FAST_PATH` on, a slice whose candidates all fit its budget is taken
+    whole (in loader order) without an LLM call; those slice types are returned for logging.
+    """
+    results: dict[str, tuple[list[str], list[dict[str, Any]], list[str], str | None]] = {}
+    fast_path: list[str] = []
+    pending: dict[str, list[dict[str, Any]]] = {}
+    for slice_type, items in candidates.items():
+        slice_budget = slice_budgets.get(slice_type, 0)
+        if not items or slice_budget <= 0:
+            results[slice_type] = ([], [], [], None)
+        elif _fast_path_enabled() and sum(int(c.get("approx_tokens") or 0) for c in items) <= slice_budget:
+            results[slice_type] = ([str(c.get("candidate_id")) for c in items], [], [], None)
+            fast_path.append(slice_type)
+        else:
+            pending[slice_type] = items
+    if not pending:
+        return results, fast_path
+
+    started: dict[str, float] = {}
+
+    def select(slice_type: str) -> tuple[list[str], list[dict[str, Any]], list[str], str | None]:
+        started[slice_type] = time.monotonic()
+        return _select_slice_with_llm(
+            deps=deps,
+            move_type=move_type,
+            work_mode=work_mode,
+            slice_type=slice_type,
+            candidates=pending[slice_type],
+            token_budget=slice_budgets.get(slice_type, 0),
+            framing=framing,
+            issues=issues,
+        )
+
+    timeout = _slice_timeout_seconds()
+    pool = ThreadPoolExecutor(max_workers=min(_selection_concurrency(), len(pending)), thread_name_prefix="context-pack")
+    try:
+        futures: dict[Future, str] = {pool.submit(select, slice_type): slice_type for slice_type in pending}
+        waiting = set(futures)
+        while waiting:
+            done, waiting = wait(waiting, timeout=1.0 if timeout else None, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[futures[future]] = future.result()
+            if timeout:
+                now = time.monotonic()
+                for future in waiting:
+                    slice_type = futures[future]
+                    if slice_type in started and now - started[slice_type] > timeout:
+                        raise RuntimeError(f"context_pack_selection_failed:{slice_type}:timeout_after_{timeout:g}s")
+    finally:
+        # Timed-out calls cannot be interrupted; do not block the move on them.
+        pool.shutdown(wait=False, cancel_futures=True)
+    return results, fast_path
+
+
 def build_context_pack_sync(
     *,
     deps: ContextPackAssemblyDeps,
@@ -890,48 +1187,57 @@ def build_context_pack_sync(
     default_budget = selection_policy.get("context_budget_tokens")
     budget = int(token_budget or default_budget or 128000)
 
-    gate_status = _gate_slice_availability(
-        deps=deps,
-        authority_id=authority_id,
-        plan_cycle_id=plan_cycle_id,
-        plan_project_id=plan_project_id,
-        application_id=application_id,
+    gate_status = _cached_for_run(
+        (run_id, "gates", authority_id, plan_cycle_id, plan_project_id, application_id),
+        lambda: _gate_slice_availability(
+            deps=deps,
+            authority_id=authority_id,
+            plan_cycle_id=plan_cycle_id,
+            plan_project_id=plan_project_id,
+            application_id=application_id,
+        ),
     )
 
     slices = selector.get("slices") if isinstance(selector.get("slices"), list) else []
     active_slices = [s for s in slices if isinstance(s, dict) and _apply_gating(s, gate_status)]
 
     candidates: dict[str, list[dict[str, Any]]] = {}
+    # (loaded, total) for the loaders capped at `_max_candidates_per_slice()`.
+    candidate_totals: dict[str, tuple[int, int]] = {}
     for slice_entry in active_slices:
         slice_type = slice_entry.get("slice_type")
         if not isinstance(slice_type, str):
             continue
+        scope_key = (run_id, slice_type, authority_id, plan_cycle_id)
         if slice_type == "policy_clauses":
-            candidates[slice_type] = _policy_clause_candidates(
-                deps=deps,
-                authority_id=authority_id,
-                plan_cycle_id=plan_cycle_id,
+            candidates[slice_type], total = _cached_for_run(
+                scope_key,
+                lambda: _policy_clause_candidates(deps=deps, authority_id=authority_id, plan_cycle_id=plan_cycle_id),
             )
+            candidate_totals[slice_type] = (len(candidates[slice_type]), total)
         elif slice_type == "evidence_atoms":
             candidates[slice_type] = _evidence_atom_candidates(deps=deps, run_id=run_id)
         elif slice_type == "visual_assets":
-            candidates[slice_type] = _visual_asset_candidates(
-                deps=deps,
-                authority_id=authority_id,
-                plan_cycle_id=plan_cycle_id,
+            candidates[slice_type], total = _cached_for_run(
+                scope_key,
+                lambda: _visual_asset_candidates(deps=deps, authority_id=authority_id, plan_cycle_id=plan_cycle_id),
             )
+            candidate_totals[slice_type] = (len(candidates[slice_type]), total)
         elif slice_type == "spatial_features":
-            candidates[slice_type] = _spatial_feature_candidates(deps=deps, authority_id=authority_id)
+            candidates[slice_type], total = _cached_for_run(
+                scope_key, lambda: _spatial_feature_candidates(deps=deps, authority_id=authority_id)
+            )
+            candidate_totals[slice_type] = (len(candidates[slice_type]), total)
         elif slice_type == "consultations":
             candidates[slice_type] = _consultation_candidates(deps=deps, plan_project_id=plan_project_id)
         elif slice_type == "decisions":
             candidates[slice_type] = _decision_candidates(deps=deps, application_id=application_id)
         elif slice_type == "advice_cards":
-            candidates[slice_type] = _advice_card_candidates(
-                deps=deps,
-                authority_id=authority_id,
-                plan_cycle_id=plan_cycle_id,
+            candidates[slice_type], total = _cached_for_run(
+                scope_key,
+                lambda: _advice_card_candidates(deps=deps, authority_id=authority_id, plan_cycle_id=plan_cycle_id),
             )
+            candidate_totals[slice_type] = (len(candidates[slice_type]), total)
         elif slice_type == "assumptions":
             candidates[slice_type] = _assumption_candidates(deps=deps, run_id=run_id)
         elif slice_type == "limitations":
@@ -963,21 +1269,21 @@ def build_context_pack_sync(
             per = max(1, budget // len(active))
             slice_budgets = {k: per for k in active}
 
+    selections, fast_path_slices = _select_slices(
+        deps=deps,
+        move_type=move_type,
+        work_mode=work_mode,
+        candidates=candidates,
+        slice_budgets=slice_budgets,
+        framing=framing,
+        issues=issues,
+    )
+
     selection_tool_runs: list[str] = []
-    slice_omissions: list[dict[str, Any]] = []
+    slice_omissions: list[dict[str, Any]] = _candidate_cap_omissions(candidate_totals)
     selected_payloads: dict[str, list[dict[str, Any]]] = {}
     for slice_type, items in candidates.items():
-        slice_budget = slice_budgets.get(slice_type, 0)
-        selected_ids, omissions, errs, tool_run_id = _select_slice_with_llm(
-            deps=deps,
-            move_type=move_type,
-            work_mode=work_mode,
-            slice_type=slice_type,
-            candidates=items,
-            token_budget=slice_budget,
-            framing=framing,
-            issues=issues,
-        )
+        selected_ids, omissions, errs, tool_run_id = selections[slice_type]
         if errs:
             raise RuntimeError(f"context_pack_selection_failed:{slice_type}:{';'.join(errs)}")
         if tool_run_id:
@@ -1035,6 +1341,9 @@ def build_context_pack_sync(
                     "token_budget": budget,
                     "slice_budgets": slice_budgets,
                     "selection_tool_runs": selection_tool_runs,
+                    "fast_path_slices": fast_path_slices,
+                    "max_candidates_per_slice": _max_candidates_per_slice(),
+                    "candidate_counts": {k: {"loaded": v[0], "total": v[1]} for k, v in candidate_totals.items()},
                 },
                 ensure_ascii=False,
             ),
@@ -1051,7 +1360,12 @@ def build_context_pack_sync(
             deps.utc_now(),
             deps.utc_now(),
             "medium",
-            "ContextPack selection is LLM-assisted and bounded by a token budget; review omissions where critical.",
+            "ContextPack selection is LLM-assisted and bounded by a token budget; review omissions where critical."
+            + (
+                " Some slices had more candidates than the per-slice cap; see candidate_cap omissions."
+                if any(o.get("reason") == "candidate_cap" for o in slice_omissions)
+                else ""
+            ),
         ),
     )
 
@@ -2,14 +2,32 @@ from __future__ import annotations
 
 import os
 import logging
-from typing import Any
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
 
 from fastapi import HTTPException
+from psycopg import Connection
 from psycopg.rows import dict_row
 from psycopg_pool import ConnectionPool
 
 _db_pool: ConnectionPool | None = None
 _logger = logging.getLogger(__name__)
+_write_barriers: list[Callable[[Any], None]] = []
+
+
+def register_write_barrier(barrier: Callable[[Any], None]) -> None:
+    """
+    Run `barrier(params)` before every statement issued through these helpers (`params=None` for
+    `_db_transaction` blocks). Used by buffered writers (see `tool_runs.py`) to make their rows
+    visible before anything references them.
+    """
+    if barrier not in _write_barriers:
+        _write_barriers.append(barrier)
+
+
+def _run_write_barriers(params: Any) -> None:
+    for barrier in _write_barriers:
+        barrier(params)
 
 
 def init_db_pool() -> None:
@@ -72,6 +90,7 @@ def _db_pool_or_503() -> ConnectionPool:
 
 
 def _db_fetch_one(sql: str, params: tuple[Any, ...] = ()) -> dict[str, Any] | None:
+    _run_write_barriers(params)
     pool = _db_pool_or_503()
     with pool.connection() as conn:
         with conn.cursor(row_factory=dict_row) as cur:
@@ -82,6 +101,7 @@ def _db_fetch_one(sql: str, params: tuple[Any, ...] = ()) -> dict[str, Any] | No
 
 
 def _db_fetch_all(sql: str, params: tuple[Any, ...] = ()) -> list[dict[str, Any]]:
+    _run_write_barriers(params)
     pool = _db_pool_or_503()
     with pool.connection() as conn:
         with conn.cursor(row_factory=dict_row) as cur:
@@ -92,6 +112,7 @@ def _db_fetch_all(sql: str, params: tuple[Any, ...] = ()) -> list[dict[str, Any]
 
 
 def _db_execute(sql: str, params: tuple[Any, ...] = ()) -> None:
+    _run_write_barriers(params)
     pool = _db_pool_or_503()
     with pool.connection() as conn:
         with conn.cursor() as cur:
@@ -100,6 +121,7 @@ def _db_execute(sql: str, params: tuple[Any, ...] = ()) -> None:
 
 
 def _db_execute_returning(sql: str, params: tuple[Any, ...] = ()) -> dict[str, Any]:
+    _run_write_barriers(params)
     pool = _db_pool_or_503()
     with pool.connection() as conn:
         with conn.cursor(row_factory=dict_row) as cur:
@@ -111,6 +133,23 @@ def _db_execute_returning(sql: str, params: tuple[Any, ...] = ()) -> dict[str, A
             return dict(row)
 
 
+@contextmanager
+def _db_transaction(barrier_params: Any = None) -> Iterator[Connection]:
+    """
+    Check out one pooled connection and wrap its statements in a single transaction.
+
+    Used by bulk writers (executemany/COPY) so a batch costs one checkout and one commit,
+    and a failure rolls the whole batch back. Writers cannot say up front which ids they will
+    touch, so by default every pending write is flushed first; read-only blocks pass their query
+    `barrier_params` to be matched like the single-statement helpers instead.
+    """
+    _run_write_barriers(barrier_params)
+    pool = _db_pool_or_503()
+    with pool.connection() as conn:
+        with conn.transaction():
+            yield conn
+
+
 def db_ping() -> bool:
     """
     Best-effort DB connectivity check.
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any
+
+from .cache import cache_get_many_json, cache_key, cache_set_many_json, cache_shared_available
+from .model_clients import _embed_multimodal_sync, _embed_texts_sync
+
+
+logger = logging.getLogger(__name__)
+
+_WS_RE = re.compile(r"\s+")
+
+_local: OrderedDict[str, list[float]] = OrderedDict()
+_local_lock = threading.Lock()
+_stats: dict[str, dict[str, int]] = {}
+_stats_lock = threading.Lock()
+
+
+def _enabled() -> bool:
+    return os.environ.get("TPA_EMBEDDING_CACHE", "1").strip().lower() not in {"0", "false", "off", "no"}
+
+
+def _ttl_seconds() -> int | None:
+    try:
+        ttl = int(os.environ.get("TPA_EMBEDDING_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+    except ValueError:
+        ttl = 30 * 24 * 3600
+    return ttl if ttl > 0 else None
+
+
+def _local_max_entries() -> int:
+    try:
+        return max(0, int(os.environ.get("TPA_EMBEDDING_CACHE_LOCAL_MAX", "2048")))
+    except ValueError:
+        return 2048
+
+
+def normalise_embedding_text(text: str) -> str:
+    return _WS_RE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def embedding_cache_key(model_id: str, text: str, *, image_bytes: bytes | None = None) -> str:
+    """
+    Key an embedding by model and content: sha256 of the whitespace/NFC-normalised text, plus the
+    image digest for multimodal embeddings. Identical clause text across plan cycles shares a key.
+    """
+    digest = hashlib.sha256(normalise_embedding_text(text).encode("utf-8")).hexdigest()
+    if image_bytes is None:
+        return cache_key("emb", model_id, digest)
+    image_digest = hashlib.sha256(image_bytes).hexdigest()
+    return cache_key("emb_mm", model_id, image_digest, digest)
+
+
+def _record(scope: str, *, hits: int, misses: int, counters: dict[str, Any] | None = None) -> None:
+    with _stats_lock:
+        entry = _stats.setdefault(scope, {"hits": 0, "misses": 0})
+        entry["hits"] += hits
+        entry["misses"] += misses
+        if counters is not None:
+            counters["cache_hits"] = int(counters.get("cache_hits") or 0) + hits
+            counters["cache_misses"] = int(counters.get("cache_misses") or 0) + misses
+
+
+def embedding_cache_stats() -> dict[str, Any]:
+    with _stats_lock:
+        scopes = {scope: dict(counts) for scope, counts in _stats.items()}
+    for counts in scopes.values():
+        total = counts["hits"] + counts["misses"]
+        counts["hit_rate"] = round(counts["hits"] / total, 4) if total else None
+    hits = sum(c["hits"] for c in scopes.values())
+    misses = sum(c["misses"] for c in scopes.values())
+    with _local_lock:
+        local_entries = len(_local)
+    return {
+        "enabled": _enabled(),
+        "backend": "redis" if cache_shared_available() else "local",
+        "local_entries": local_entries,
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / (hits + misses), 4) if hits + misses else None,
+        "scopes": scopes,
+    }
+
+
+def _lookup(keys: list[str]) -> list[list[float] | None]:
+    found: list[list[float] | None] = []
+    with _local_lock:
+        for key in keys:
+            vec = _local.get(key)
+            if vec is not None:
+                _local.move_to_end(key)
+            found.append(vec)
+    remote_idx = [i for i, vec in enumerate(found) if vec is None]
+    if remote_idx and cache_shared_available():
+        remote = cache_get_many_json([keys[i] for i in remote_idx])
+        promoted: dict[str, list[float]] = {}
+        for i, value in zip(remote_idx, remote, strict=True):
+            if isinstance(value, list) and value:
+                found[i] = value
+                promoted[keys[i]] = value
+        _remember_local(promoted)
+    return found
+
+
+def _remember_local(items: dict[str, list[float]]) -> None:
+    limit = _local_max_entries()
+    if not items or limit <= 0:
+        return
+    with _local_lock:
+        for key, vec in items.items():
+            _local[key] = vec
+            _local.move_to_end(key)
+        while len(_local) > limit:
+            _local.popitem(last=False)
+
+
+def _store(items: dict[str, list[float]]) -> None:
+    _remember_local(items)
+    if items and cache_shared_available():
+        cache_set_many_json(items, ttl_seconds=_ttl_seconds())
+
+
+def _embed_texts_cached_sync(
+    *,
+    texts: list[str],
+    model_id: str,
+    scope: str = "texts",
+    counters: dict[str, Any] | None = None,
+) -> list[list[float]] | None:
+    """
+    `_embed_texts_sync` behind the content-hash cache.
+
+    Only texts with no cached vector (deduplicated) are sent to the embedding service. Returns
+    vectors aligned with `texts`, or None when the service fails or returns a different count.
+    Redis (`TPA_REDIS_URL`) makes the cache shared across workers and ingests; without it a
+    bounded in-process LRU still serves repeated queries. Per-call hit/miss counts are added to
+    `counters` (e.g. a tool run's progress dict) when given.
+    """
+    if not texts:
+        return []
+    if not _enabled():
+        return _embed_texts_sync(texts=texts, model_id=model_id)
+
+    keys = [embedding_cache_key(model_id, text) for text in texts]
+    found = _lookup(keys)
+    miss_keys_seen: set[str] = set()
+    miss_keys: list[str] = []
+    miss_texts: list[str] = []
+    for key, text, vec in zip(keys, texts, found, strict=True):
+        if vec is None and key not in miss_keys_seen:
+            miss_keys_seen.add(key)
+            miss_keys.append(key)
+            miss_texts.append(text)
+    _record(scope, hits=len(texts) - len(miss_keys), misses=len(miss_keys), counters=counters)
+    if not miss_keys:
+        return [vec for vec in found if vec is not None]
+
+    fresh = _embed_texts_sync(texts=miss_texts, model_id=model_id)
+    if not fresh:
+        return None
+    if len(fresh) != len(miss_texts):
+        logger.warning("Embedding count mismatch: expected %s, received %s", len(miss_texts), len(fresh))
+        return None
+    fresh_by_key = dict(zip(miss_keys, fresh, strict=True))
+    _store(fresh_by_key)
+    return [vec if vec is not None else fresh_by_key[key] for key, vec in zip(keys, found, strict=True)]
+
+
+def _embed_multimodal_cached_sync(
+    *,
+    image_bytes: bytes,
+    text: str,
+    model_id: str,
+    scope: str = "multimodal",
+    counters: dict[str, Any] | None = None,
+) -> list[float] | None:
+    if not _enabled():
+        return _embed_multimodal_sync(image_bytes=image_bytes, text=text, model_id=model_id)
+    key = embedding_cache_key(model_id, text, image_bytes=image_bytes)
+    cached = _lookup([key])[0]
+    _record(scope, hits=1 if cached is not None else 0, misses=0 if cached is not None else 1, counters=counters)
+    if cached is not None:
+        return cached
+    vec = _embed_multimodal_sync(image_bytes=image_bytes, text=text, model_id=model_id)
+    if vec:
+        _store({key: vec})
+    return vec
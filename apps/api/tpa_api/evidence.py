@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from typing import Any
 from uuid import uuid4
 
 from .db import _db_execute, _db_fetch_one
@@ -71,3 +72,40 @@ def _ensure_evidence_ref_row(
         ),
     )
     return evidence_ref_id
+
+
+def _ensure_evidence_ref_rows(conn: Any, evidence_refs: list[str], run_id: str | None = None) -> dict[str, str]:
+    """
+    Bulk form of `_ensure_evidence_ref_row` for use inside an open transaction.
+
+    Inserts any missing `source_type::source_id::fragment_id` refs with pre-generated ids, then
+    resolves every ref to its row id in one query. Unparseable refs are skipped.
+    """
+    keys: dict[str, tuple[str, str, str]] = {}
+    for evidence_ref in evidence_refs:
+        parsed = _parse_evidence_ref(evidence_ref)
+        if parsed:
+            keys.setdefault(evidence_ref, parsed)
+    if not keys:
+        return {}
+    unique = list(dict.fromkeys(keys.values()))
+    with conn.cursor() as cur:
+        cur.executemany(
+            """
+            INSERT INTO evidence_refs (id, source_type, source_id, fragment_id, run_id)
+            VALUES (%s, %s, %s, %s, %s::uuid)
+            ON CONFLICT (source_type, source_id, fragment_id) DO NOTHING
+            """,
+            [(str(uuid4()), t, i, f, run_id) for t, i, f in unique],
+        )
+        cur.execute(
+            """
+            SELECT e.id, e.source_type, e.source_id, e.fragment_id
+            FROM evidence_refs e
+            JOIN unnest(%s::text[], %s::text[], %s::text[]) AS k(source_type, source_id, fragment_id)
+              USING (source_type, source_id, fragment_id)
+            """,
+            ([k[0] for k in unique], [k[1] for k in unique], [k[2] for k in unique]),
+        )
+        ids = {(r[1], r[2], r[3]): str(r[0]) for r in cur.fetchall()}
+    return {ref: ids[key] for ref, key in keys.items() if key in ids}
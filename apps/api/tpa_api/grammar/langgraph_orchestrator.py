@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import json
-from typing import Any, TypedDict
+from typing import Any, Callable, TypedDict
 from uuid import uuid4
 
 from langgraph.graph import StateGraph, END
@@ -10,8 +10,14 @@ from tpa_api.context_assembly import ContextAssemblyDeps, assemble_curated_evide
 from tpa_api.context_pack import ContextPackAssemblyDeps, build_context_pack_sync
 from tpa_api.db import _db_execute, _db_fetch_all, _db_fetch_one
 from tpa_api.evidence import _ensure_evidence_ref_row
+from tpa_api.job_executor import JobCancelled
 from tpa_api.prompting import _llm_structured_sync
-from tpa_api.retrieval import _retrieve_chunks_hybrid_sync, _retrieve_policy_clauses_hybrid_sync
+from tpa_api.retrieval import (
+    _retrieve_chunks_hybrid_batch_sync,
+    _retrieve_chunks_hybrid_sync,
+    _retrieve_policy_clauses_hybrid_batch_sync,
+    _retrieve_policy_clauses_hybrid_sync,
+)
 from tpa_api.time_utils import _utc_now, _utc_now_iso
 from tpa_api.tool_requests import persist_tool_requests_for_move
 
@@ -177,6 +183,8 @@ def _context_deps() -> tuple[ContextAssemblyDeps, ContextPackAssemblyDeps]:
         retrieve_policy_clauses_hybrid_sync=_retrieve_policy_clauses_hybrid_sync,
         utc_now_iso=_utc_now_iso,
         utc_now=_utc_now,
+        retrieve_chunks_hybrid_batch_sync=_retrieve_chunks_hybrid_batch_sync,
+        retrieve_policy_clauses_hybrid_batch_sync=_retrieve_policy_clauses_hybrid_batch_sync,
     )
     pack_deps = ContextPackAssemblyDeps(
         db_fetch_one=_db_fetch_one,
@@ -884,7 +892,18 @@ def build_grammar_graph() -> StateGraph:
     return graph
 
 
-def run_grammar_graph(initial_state: GrammarState) -> GrammarState:
+def run_grammar_graph(
+    initial_state: GrammarState,
+    *,
+    should_cancel: Callable[[], bool] | None = None,
+) -> GrammarState:
     graph = build_grammar_graph()
     compiled = graph.compile()
-    return compiled.invoke(initial_state)
+    if should_cancel is None:
+        return compiled.invoke(initial_state)
+    # Step through the graph so a superseded background run stops at the next move boundary.
+    state = initial_state
+    for state in compiled.stream(initial_state, stream_mode="values"):
+        if should_cancel():
+            raise JobCancelled(str(initial_state.get("run_id")))
+    return state
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any
+
+import httpx
+
+from .model_leases import invalidate_model_leases
+
+try:  # optional dependency: httpx negotiates HTTP/2 over TLS only when `h2` is installed
+    import h2  # noqa: F401
+
+    _HTTP2_AVAILABLE = True
+except Exception:  # noqa: BLE001
+    _HTTP2_AVAILABLE = False
+
+
+# Read timeouts per role (seconds). Model loads are handled by the supervisor `/ensure` call, so
+# these only need to cover a single inference; service roles (docparse, vectorization,
+# segmentation, georef) run whole-document or multi-step jobs and get longer budgets.
+_ROLE_READ_TIMEOUT_SECONDS: dict[str, float] = {
+    "supervisor": 900.0,
+    "embeddings": 180.0,
+    "embeddings_mm": 180.0,
+    "reranker": 120.0,
+    "llm": 600.0,
+    "vlm": 600.0,
+    "docparse": 3600.0,
+    "vectorization": 1800.0,
+    "segmentation": 1800.0,
+    "georef": 900.0,
+}
+_DEFAULT_READ_TIMEOUT_SECONDS = 300.0
+
+_lock = threading.Lock()
+_clients: dict[str, httpx.Client] = {}
+_clients_pid: int | None = None
+_stats: dict[str, dict[str, Any]] = {}
+
+
+def _env_float(key: str, default: float) -> float:
+    try:
+        return float(os.environ.get(key, str(default)))
+    except ValueError:
+        return default
+
+
+def _env_int(key: str, default: int) -> int:
+    try:
+        return max(1, int(os.environ.get(key, str(default))))
+    except ValueError:
+        return default
+
+
+def _role_env(role: str) -> str:
+    return role.upper().replace("-", "_")
+
+
+def _max_connections(role: str) -> int:
+    return _env_int(f"TPA_MODEL_HTTP_MAX_CONNECTIONS_{_role_env(role)}", _env_int("TPA_MODEL_HTTP_MAX_CONNECTIONS", 16))
+
+
+def _role_timeout(role: str) -> httpx.Timeout:
+    read = _env_float(
+        f"TPA_MODEL_HTTP_READ_TIMEOUT_{_role_env(role)}",
+        _ROLE_READ_TIMEOUT_SECONDS.get(role, _DEFAULT_READ_TIMEOUT_SECONDS),
+    )
+    return httpx.Timeout(
+        connect=_env_float("TPA_MODEL_HTTP_CONNECT_TIMEOUT_SECONDS", 10.0),
+        read=read,
+        write=_env_float("TPA_MODEL_HTTP_WRITE_TIMEOUT_SECONDS", 60.0),
+        pool=_env_float("TPA_MODEL_HTTP_POOL_TIMEOUT_SECONDS", 30.0),
+    )
+
+
+def _http2_enabled() -> bool:
+    return _HTTP2_AVAILABLE and os.environ.get("TPA_MODEL_HTTP2", "1").strip().lower() not in {"0", "false", "off"}
+
+
+def model_http_client(role: str) -> httpx.Client:
+    """
+    Shared keep-alive client for a model/service role.
+
+    One pooled `httpx.Client` per role per process (re-created after fork, e.g. in Celery workers),
+    so repeated calls reuse TCP/TLS connections and a slow role cannot starve another's pool.
+    """
+    global _clients_pid
+    pid = os.getpid()
+    with _lock:
+        if _clients_pid != pid:
+            _clients.clear()
+            _stats.clear()
+            _clients_pid = pid
+        client = _clients.get(role)
+        if client is None:
+            max_connections = _max_connections(role)
+            client = httpx.Client(
+                timeout=_role_timeout(role),
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections,
+                    keepalive_expiry=_env_float("TPA_MODEL_HTTP_KEEPALIVE_SECONDS", 60.0),
+                ),
+                http2=_http2_enabled(),
+            )
+            _clients[role] = client
+            _stats[role] = {
+                "max_connections": max_connections,
+                "http2": _http2_enabled(),
+                "in_flight": 0,
+                "peak_in_flight": 0,
+                "saturated_requests": 0,
+                "requests": 0,
+                "errors": 0,
+                "pool_timeouts": 0,
+                "timeouts": 0,
+                "total_seconds": 0.0,
+            }
+        return client
+
+
+def _model_request(role: str, method: str, url: str, **kwargs: Any) -> httpx.Response:
+    """
+    Send one request on the role's pooled client, tracking in-flight/saturation metrics.
+
+    Raises exactly what `httpx.Client.request` raises; callers keep their own error handling.
+    """
+    client = model_http_client(role)
+    with _lock:
+        stats = _stats[role]
+        stats["in_flight"] += 1
+        stats["requests"] += 1
+        stats["peak_in_flight"] = max(stats["peak_in_flight"], stats["in_flight"])
+        if stats["in_flight"] >= stats["max_connections"]:
+            stats["saturated_requests"] += 1
+    started = time.monotonic()
+    try:
+        return client.request(method, url, **kwargs)
+    except httpx.PoolTimeout:
+        with _lock:
+            stats["pool_timeouts"] += 1
+            stats["errors"] += 1
+        raise
+    except httpx.ConnectError:
+        with _lock:
+            stats["errors"] += 1
+        # The role's container is gone (e.g. stopped for a GPU swap); make the next call re-ensure.
+        invalidate_model_leases([role])
+        raise
+    except httpx.TimeoutException:
+        with _lock:
+            stats["timeouts"] += 1
+            stats["errors"] += 1
+        raise
+    except Exception:  # noqa: BLE001
+        with _lock:
+            stats["errors"] += 1
+        raise
+    finally:
+        with _lock:
+            stats["in_flight"] -= 1
+            stats["total_seconds"] += time.monotonic() - started
+
+
+def _model_post(role: str, url: str, **kwargs: Any) -> httpx.Response:
+    return _model_request(role, "POST", url, **kwargs)
+
+
+def model_http_stats() -> dict[str, Any]:
+    with _lock:
+        roles = {role: dict(stats) for role, stats in _stats.items()}
+    for stats in roles.values():
+        stats["saturation"] = round(stats["in_flight"] / stats["max_connections"], 3)
+        stats["avg_seconds"] = round(stats["total_seconds"] / stats["requests"], 4) if stats["requests"] else None
+        stats["total_seconds"] = round(stats["total_seconds"], 3)
+    return {"http2_available": _HTTP2_AVAILABLE, "roles": roles}
+
+
+def close_model_http_clients() -> None:
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        try:
+            client.close()
+        except Exception:  # noqa: BLE001
+            pass
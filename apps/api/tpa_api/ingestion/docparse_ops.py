@@ -2,17 +2,22 @@ from __future__ import annotations
 
 import io
 import json
+import logging
 import os
 from typing import Any
 from uuid import uuid4
 
 import httpx
 
-from tpa_api.blob_store import minio_client_or_none
-from tpa_api.db import _db_execute
+from tpa_api.blob_store import minio_client_or_none, read_blob_bytes
+from tpa_api.db import _db_execute, _db_fetch_one
+from tpa_api.http_clients import _model_post
 from tpa_api.time_utils import _utc_now
 
 
+logger = logging.getLogger(__name__)
+
+
 def _load_parse_bundle(blob_path: str) -> dict[str, Any]:
     client = minio_client_or_none()
     bucket = os.environ.get("TPA_S3_BUCKET")
@@ -205,3 +210,135 @@ def _insert_parse_bundle_record(
         ),
     )
     return bundle_id
+
+
+_RENDER_TIER_RANK = {"thumbnail": 0, "standard": 1, "full": 2}
+
+
+def _render_upgrade_timeout_seconds() -> float:
+    try:
+        return max(1.0, float(os.environ.get("TPA_DOCPARSE_RENDER_UPGRADE_TIMEOUT_SECONDS", "120")))
+    except ValueError:
+        return 120.0
+
+
+def _ensure_page_render_tier(
+    *,
+    document_id: str,
+    page_number: int,
+    tier: str = "full",
+    ingest_batch_id: str | None = None,
+    run_id: str | None = None,
+) -> dict[str, Any] | None:
+    """
+    Upgrade a stored page render to at least `tier` via docparse `/render/pages`.
+
+    Docparse renders text-only pages at reduced tiers; steps that need measurement-grade rasters
+    (VLM page reads via `_load_page_image`) call this first. Returns the (possibly updated) `pages` row, or None
+    when the page is unknown.
+    """
+    page = _db_fetch_one(
+        """
+        SELECT p.id, p.page_number, p.render_blob_path, p.render_format, p.render_dpi,
+               p.render_width, p.render_height, p.render_tier, p.render_reason,
+               d.authority_id, d.plan_cycle_id, COALESCE(d.raw_blob_path, d.blob_path) AS source_blob_path
+        FROM pages p
+        JOIN documents d ON d.id = p.document_id
+        WHERE p.document_id = %s::uuid AND p.page_number = %s
+        """,
+        (document_id, page_number),
+    )
+    if not page:
+        return None
+    current_rank = _RENDER_TIER_RANK.get(str(page.get("render_tier") or "full"), _RENDER_TIER_RANK["full"])
+    if current_rank >= _RENDER_TIER_RANK.get(tier, _RENDER_TIER_RANK["full"]):
+        return page
+
+    base_url = os.environ.get("TPA_DOCPARSE_BASE_URL")
+    if not base_url:
+        raise RuntimeError("TPA_DOCPARSE_BASE_URL not configured")
+    request = {
+        "source_blob_path": page.get("source_blob_path"),
+        "document_id": document_id,
+        "authority_id": page.get("authority_id"),
+        "plan_cycle_id": str(page["plan_cycle_id"]) if page.get("plan_cycle_id") else None,
+        "page_numbers": [page_number],
+        "tier": tier,
+    }
+    resp = _model_post(
+        "docparse",
+        base_url.rstrip("/") + "/render/pages",
+        json=request,
+        timeout=_render_upgrade_timeout_seconds(),
+    )
+    resp.raise_for_status()
+    payload = resp.json()
+
+    rendered = next(
+        (p for p in payload.get("pages") or [] if int(p.get("page_number") or 0) == page_number),
+        None,
+    )
+    if not rendered:
+        raise RuntimeError(f"page_render_upgrade_missing:p{page_number}")
+    _db_execute(
+        """
+        UPDATE pages
+        SET render_blob_path = %s, render_format = %s, render_dpi = %s, render_width = %s,
+            render_height = %s, render_tier = %s, render_reason = %s
+        WHERE id = %s::uuid
+        """,
+        (
+            rendered.get("render_blob_path"),
+            rendered.get("render_format"),
+            rendered.get("render_dpi"),
+            rendered.get("render_width"),
+            rendered.get("render_height"),
+            rendered.get("render_tier"),
+            rendered.get("render_reason"),
+            page["id"],
+        ),
+    )
+    tool_runs = payload.get("tool_runs") if isinstance(payload.get("tool_runs"), list) else []
+    if ingest_batch_id and tool_runs:
+        _persist_tool_runs(ingest_batch_id=ingest_batch_id, run_id=run_id, tool_runs=tool_runs)
+    return {**page, **rendered}
+
+
+def _load_page_image(
+    *,
+    document_id: str,
+    page_number: int,
+    tier: str = "full",
+    ingest_batch_id: str | None = None,
+    run_id: str | None = None,
+) -> tuple[bytes | None, str | None, list[str]]:
+    """
+    Page raster for a VLM page read, upgraded to `tier` first.
+
+    Returns `(bytes, content_type, errors)`. A failed upgrade is logged and reported in `errors`,
+    and the existing lower-tier render is used instead.
+    """
+    errors: list[str] = []
+    try:
+        page = _ensure_page_render_tier(
+            document_id=document_id,
+            page_number=page_number,
+            tier=tier,
+            ingest_batch_id=ingest_batch_id,
+            run_id=run_id,
+        )
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("page render upgrade failed for %s p%s: %s", document_id, page_number, exc)
+        errors.append(f"page_render_upgrade_failed:{document_id}:p{page_number}:{exc}")
+        page = _db_fetch_one(
+            "SELECT render_blob_path FROM pages WHERE document_id = %s::uuid AND page_number = %s",
+            (document_id, page_number),
+        )
+    if not page or not page.get("render_blob_path"):
+        errors.append(f"page_render_not_found:{document_id}:p{page_number}")
+        return None, None, errors
+    data, content_type, err = read_blob_bytes(str(page["render_blob_path"]))
+    if err or not data:
+        errors.append(f"page_render_load_failed:{document_id}:p{page_number}:{err}")
+        return None, None, errors
+    return data, content_type or "image/png", errors
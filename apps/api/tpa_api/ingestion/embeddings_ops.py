@@ -2,13 +2,15 @@ from __future__ import annotations
 
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any
 from uuid import UUID, uuid4
 
 from tpa_api.blob_store import read_blob_bytes
-from tpa_api.db import _db_execute, _db_fetch_all
-from tpa_api.model_clients import _embed_multimodal_sync, _embed_texts_sync
+from tpa_api.db import _db_execute, _db_fetch_all, _db_transaction
+from tpa_api.embedding_cache import _embed_multimodal_cached_sync, _embed_texts_cached_sync
 from tpa_api.time_utils import _utc_now
+from tpa_api.vector_index import _maybe_ensure_unit_embedding_index
 from tpa_api.vector_utils import _vector_literal
 
 
@@ -58,6 +60,7 @@ def _embed_visual_assets(
     sections_by_id = {s.get("policy_section_id"): s for s in policy_sections if s.get("policy_section_id")}
     inserted = 0
     skipped = 0
+    cache_counters: dict[str, Any] = {}
     for asset in visual_assets:
         visual_asset_id = asset.get("visual_asset_id")
         blob_path = asset.get("blob_path")
@@ -89,7 +92,13 @@ def _embed_visual_assets(
             skipped += 1
             continue
 
-        vec = _embed_multimodal_sync(image_bytes=image_bytes, text=context_text, model_id=model_id)
+        vec = _embed_multimodal_cached_sync(
+            image_bytes=image_bytes,
+            text=context_text,
+            model_id=model_id,
+            scope="visual_assets",
+            counters=cache_counters,
+        )
         if not vec:
             _db_execute(
                 "UPDATE tool_runs SET status = %s, outputs_logged = %s::jsonb, ended_at = %s WHERE id = %s::uuid",
@@ -128,7 +137,7 @@ def _embed_visual_assets(
         "UPDATE tool_runs SET status = %s, outputs_logged = %s::jsonb, ended_at = %s WHERE id = %s::uuid",
         (
             "success" if inserted > 0 or skipped > 0 else "error",
-            json.dumps({"inserted": inserted, "skipped": skipped}, ensure_ascii=False),
+            json.dumps({"inserted": inserted, "skipped": skipped, **cache_counters}, ensure_ascii=False),
             _utc_now(),
             tool_run_id,
         ),
@@ -136,6 +145,155 @@ def _embed_visual_assets(
     return inserted
 
 
+def _embedding_batch_size() -> int:
+    try:
+        return max(1, int(os.environ.get("TPA_EMBEDDINGS_BATCH_SIZE", "64")))
+    except ValueError:
+        return 64
+
+
+def _embedding_concurrency() -> int:
+    try:
+        return max(1, int(os.environ.get("TPA_EMBEDDINGS_CONCURRENCY", "2")))
+    except ValueError:
+        return 2
+
+
+def _text_embeddings_model_id() -> str:
+    return os.environ.get("TPA_EMBEDDINGS_MODEL_ID") or "Qwen/Qwen3-Embedding-8B"
+
+
+def _existing_embedding_unit_ids(*, unit_type: str, model_id: str, unit_ids: list[str]) -> set[str]:
+    if not unit_ids:
+        return set()
+    rows = _db_fetch_all(
+        """
+        SELECT unit_id
+        FROM unit_embeddings
+        WHERE unit_type = %s AND embedding_model_id = %s AND unit_id = ANY(%s::uuid[])
+        """,
+        (unit_type, model_id, unit_ids),
+    )
+    return {str(r.get("unit_id")) for r in rows if r.get("unit_id")}
+
+
+def _write_unit_embeddings(
+    *,
+    unit_type: str,
+    model_id: str,
+    items: list[tuple[str, list[float]]],
+    tool_run_id: str,
+    run_id: str | None,
+) -> int:
+    """
+    Bulk-write one batch of embeddings: COPY into a per-connection staging table, then a single
+    INSERT ... SELECT that keeps the `ON CONFLICT DO NOTHING` semantics of the row-wise path.
+    """
+    if not items:
+        return 0
+    now = _utc_now()
+    with _db_transaction() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                CREATE TEMP TABLE IF NOT EXISTS unit_embeddings_stage
+                  (LIKE unit_embeddings INCLUDING DEFAULTS) ON COMMIT DELETE ROWS
+                """
+            )
+            with cur.copy(
+                """
+                COPY unit_embeddings_stage (
+                  id, unit_type, unit_id, embedding, embedding_model_id, embedding_dim, created_at, tool_run_id, run_id
+                ) FROM STDIN
+                """
+            ) as copy:
+                for unit_id, vec in items:
+                    copy.write_row(
+                        (str(uuid4()), unit_type, unit_id, _vector_literal(vec), model_id, len(vec), now, tool_run_id, run_id)
+                    )
+            cur.execute(
+                """
+                INSERT INTO unit_embeddings (
+                  id, unit_type, unit_id, embedding, embedding_model_id, embedding_dim, created_at, tool_run_id, run_id
+                )
+                SELECT id, unit_type, unit_id, embedding, embedding_model_id, embedding_dim, created_at, tool_run_id, run_id
+                FROM unit_embeddings_stage
+                ON CONFLICT (unit_type, unit_id, embedding_model_id) DO NOTHING
+                """
+            )
+            return max(0, cur.rowcount)
+
+
+def _embed_and_store_texts(
+    *,
+    unit_type: str,
+    candidates: list[tuple[str, str]],
+    model_id: str,
+    tool_run_id: str,
+    run_id: str | None,
+    progress: dict[str, Any],
+    error_prefix: str = "unit_embeddings",
+) -> None:
+    """
+    Stream `(unit_id, text)` candidates through the embedding service and into `unit_embeddings`.
+
+    Units that already have an embedding for `model_id` are skipped, texts are sent in micro-batches
+    with a bounded number in flight, and every batch commits on its own, so a failure part-way
+    through keeps earlier batches and a re-run resumes where it stopped. Text already seen under
+    another unit id (re-ingests, repeated clauses) is served from the content-hash embedding cache.
+    Counters are written to `progress` so callers can log them even when this raises.
+    """
+    existing = _existing_embedding_unit_ids(
+        unit_type=unit_type,
+        model_id=model_id,
+        unit_ids=[str(unit_id) for unit_id, _ in candidates],
+    )
+    pending = [(str(unit_id), text) for unit_id, text in candidates if str(unit_id) not in existing]
+    batch_size = _embedding_batch_size()
+    batches = [pending[i : i + batch_size] for i in range(0, len(pending), batch_size)]
+    progress.update(
+        {
+            "already_embedded": len(existing),
+            "stored": 0,
+            "batches": len(batches),
+            "batches_done": 0,
+            "cache_hits": 0,
+            "cache_misses": 0,
+        }
+    )
+    if not batches:
+        return
+
+    pool = ThreadPoolExecutor(max_workers=min(_embedding_concurrency(), len(batches)))
+    try:
+        futures = {
+            pool.submit(
+                _embed_texts_cached_sync,
+                texts=[text for _, text in batch],
+                model_id=model_id,
+                scope=unit_type,
+                counters=progress,
+            ): batch
+            for batch in batches
+        }
+        for future in as_completed(futures):
+            batch = futures[future]
+            embeddings = future.result()
+            if not embeddings:
+                raise RuntimeError(f"{error_prefix}_failed")
+            progress["embedding_dim"] = len(embeddings[0])
+            progress["stored"] += _write_unit_embeddings(
+                unit_type=unit_type,
+                model_id=model_id,
+                items=[(unit_id, vec) for (unit_id, _), vec in zip(batch, embeddings, strict=True)],
+                tool_run_id=tool_run_id,
+                run_id=run_id,
+            )
+            progress["batches_done"] += 1
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
 def _embed_visual_assertions(*, ingest_batch_id: str, run_id: str | None) -> int:
     rows = _db_fetch_all(
         """
@@ -163,6 +321,30 @@ def _embed_visual_assertions(*, ingest_batch_id: str, run_id: str | None) -> int
     if not candidates:
         return 0
 
+    return _embed_candidates_with_tool_run(
+        ingest_batch_id=ingest_batch_id,
+        run_id=run_id,
+        unit_type="visual_assertion",
+        candidates=candidates,
+        tool_name="embed_visual_assertions",
+        inputs={"assertion_count": len(candidates)},
+        uncertainty_note="Embedding visual assertions for retrieval.",
+        error_prefix="visual_assertion_embeddings",
+    )
+
+
+def _embed_candidates_with_tool_run(
+    *,
+    ingest_batch_id: str,
+    run_id: str | None,
+    unit_type: str,
+    candidates: list[tuple[str, str]],
+    tool_name: str,
+    inputs: dict[str, Any],
+    uncertainty_note: str,
+    error_prefix: str = "unit_embeddings",
+) -> int:
+    model_id = _text_embeddings_model_id()
     tool_run_id = str(uuid4())
     _db_execute(
         """
@@ -176,35 +358,28 @@ def _embed_visual_assertions(*, ingest_batch_id: str, run_id: str | None) -> int
             tool_run_id,
             ingest_batch_id,
             run_id,
-            "embed_visual_assertions",
-            json.dumps({"assertion_count": len(candidates)}, ensure_ascii=False),
+            tool_name,
+            json.dumps({**inputs, "model_id": model_id, "batch_size": _embedding_batch_size()}, ensure_ascii=False),
             json.dumps({}, ensure_ascii=False),
             "running",
             _utc_now(),
             None,
             "medium",
-            "Embedding visual assertions for retrieval.",
+            uncertainty_note,
         ),
     )
-
-    texts = [text for _, text in candidates]
-    embeddings = _embed_texts_sync(texts=texts, model_id=os.environ.get("TPA_EMBEDDINGS_MODEL_ID"))
-    if not embeddings:
-        _db_execute(
-            """
-            UPDATE tool_runs
-            SET status = %s, outputs_logged = %s::jsonb, ended_at = %s
-            WHERE id = %s::uuid
-            """,
-            (
-                "error",
-                json.dumps({"error": "visual_assertion_embeddings_failed"}, ensure_ascii=False),
-                _utc_now(),
-                tool_run_id,
-            ),
+    progress: dict[str, Any] = {"unit_type": unit_type}
+    try:
+        _embed_and_store_texts(
+            unit_type=unit_type,
+            candidates=candidates,
+            model_id=model_id,
+            tool_run_id=tool_run_id,
+            run_id=run_id,
+            progress=progress,
+            error_prefix=error_prefix,
         )
-        raise RuntimeError("visual_assertion_embeddings_failed")
-    if len(embeddings) != len(candidates):
+    except Exception as exc:  # noqa: BLE001
         _db_execute(
             """
             UPDATE tool_runs
@@ -213,44 +388,18 @@ def _embed_visual_assertions(*, ingest_batch_id: str, run_id: str | None) -> int
             """,
             (
                 "error",
-                json.dumps(
-                    {
-                        "error": "visual_assertion_embeddings_mismatch",
-                        "expected": len(candidates),
-                        "received": len(embeddings),
-                    },
-                    ensure_ascii=False,
-                ),
+                json.dumps({"error": str(exc), **progress}, ensure_ascii=False),
                 _utc_now(),
                 tool_run_id,
             ),
         )
-        raise RuntimeError("visual_assertion_embeddings_mismatch")
-
-    inserted = 0
-    for (assertion_id, _), vec in zip(candidates, embeddings, strict=True):
-        _db_execute(
-            """
-            INSERT INTO unit_embeddings (
-              id, unit_type, unit_id, embedding, embedding_model_id, embedding_dim, created_at, tool_run_id, run_id
-            )
-            VALUES (%s, %s, %s::uuid, %s::vector, %s, %s, %s, %s::uuid, %s::uuid)
-            ON CONFLICT (unit_type, unit_id, embedding_model_id) DO NOTHING
-            """,
-            (
-                str(uuid4()),
-                "visual_assertion",
-                assertion_id,
-                _vector_literal(vec),
-                os.environ.get("TPA_EMBEDDINGS_MODEL_ID", "Qwen/Qwen3-Embedding-8B"),
-                len(vec) if isinstance(vec, list) else None,
-                _utc_now(),
-                tool_run_id,
-                run_id,
-            ),
-        )
-        inserted += 1
-
+        raise
+    ann_index = _maybe_ensure_unit_embedding_index(
+        model_id=model_id, unit_type=unit_type, dim=progress.get("embedding_dim")
+    )
+    if ann_index:
+        progress["ann_index"] = ann_index
+    embedded = int(progress.get("stored") or 0) + int(progress.get("already_embedded") or 0)
     _db_execute(
         """
         UPDATE tool_runs
@@ -258,13 +407,13 @@ def _embed_visual_assertions(*, ingest_batch_id: str, run_id: str | None) -> int
         WHERE id = %s::uuid
         """,
         (
-            "success" if inserted > 0 else "error",
-            json.dumps({"inserted": inserted}, ensure_ascii=False),
+            "success" if embedded > 0 else "error",
+            json.dumps({"inserted": progress.get("stored", 0), **progress}, ensure_ascii=False),
             _utc_now(),
             tool_run_id,
         ),
     )
-    return inserted
+    return embedded
 
 
 def _embed_units(
@@ -283,106 +432,12 @@ def _embed_units(
     ]
     if not candidates:
         return 0
-    tool_run_id = str(uuid4())
-    _db_execute(
-        """
-        INSERT INTO tool_runs (
-          id, ingest_batch_id, run_id, tool_name, inputs_logged, outputs_logged, status,
-          started_at, ended_at, confidence_hint, uncertainty_note
-        )
-        VALUES (%s, %s::uuid, %s::uuid, %s, %s::jsonb, %s::jsonb, %s, %s, %s, %s, %s)
-        """,
-        (
-            tool_run_id,
-            ingest_batch_id,
-            run_id,
-            "embed_units",
-            json.dumps({"unit_type": unit_type, "unit_count": len(candidates)}, ensure_ascii=False),
-            json.dumps({}, ensure_ascii=False),
-            "running",
-            _utc_now(),
-            None,
-            "medium",
-            "Embedding units for retrieval.",
-        ),
+    return _embed_candidates_with_tool_run(
+        ingest_batch_id=ingest_batch_id,
+        run_id=run_id,
+        unit_type=unit_type,
+        candidates=candidates,
+        tool_name="embed_units",
+        inputs={"unit_type": unit_type, "unit_count": len(candidates)},
+        uncertainty_note="Embedding units for retrieval.",
     )
-    texts = [text for _, text in candidates]
-    embeddings = _embed_texts_sync(texts=texts, model_id=os.environ.get("TPA_EMBEDDINGS_MODEL_ID"))
-    if not embeddings:
-        _db_execute(
-            """
-            UPDATE tool_runs
-            SET status = %s, outputs_logged = %s::jsonb, ended_at = %s
-            WHERE id = %s::uuid
-            """,
-            (
-                "error",
-                json.dumps(
-                    {"error": "unit_embeddings_failed", "unit_type": unit_type},
-                    ensure_ascii=False,
-                ),
-                _utc_now(),
-                tool_run_id,
-            ),
-        )
-        raise RuntimeError("unit_embeddings_failed")
-    if len(embeddings) != len(candidates):
-        _db_execute(
-            """
-            UPDATE tool_runs
-            SET status = %s, outputs_logged = %s::jsonb, ended_at = %s
-            WHERE id = %s::uuid
-            """,
-            (
-                "error",
-                json.dumps(
-                    {
-                        "error": "unit_embeddings_mismatch",
-                        "unit_type": unit_type,
-                        "expected": len(candidates),
-                        "received": len(embeddings),
-                    },
-                    ensure_ascii=False,
-                ),
-                _utc_now(),
-                tool_run_id,
-            ),
-        )
-        raise RuntimeError("unit_embeddings_mismatch")
-    inserted = 0
-    for (unit_id, _), vec in zip(candidates, embeddings, strict=True):
-        _db_execute(
-            """
-            INSERT INTO unit_embeddings (
-              id, unit_type, unit_id, embedding, embedding_model_id, embedding_dim, created_at, tool_run_id, run_id
-            )
-            VALUES (%s, %s, %s::uuid, %s::vector, %s, %s, %s, %s::uuid, %s::uuid)
-            ON CONFLICT (unit_type, unit_id, embedding_model_id) DO NOTHING
-            """,
-            (
-                str(uuid4()),
-                unit_type,
-                unit_id,
-                _vector_literal(vec),
-                os.environ.get("TPA_EMBEDDINGS_MODEL_ID", "Qwen/Qwen3-Embedding-8B"),
-                len(vec) if isinstance(vec, list) else None,
-                _utc_now(),
-                tool_run_id,
-                run_id,
-            ),
-        )
-        inserted += 1
-    _db_execute(
-        """
-        UPDATE tool_runs
-        SET status = %s, outputs_logged = %s::jsonb, ended_at = %s
-        WHERE id = %s::uuid
-        """,
-        (
-            "success" if inserted > 0 else "error",
-            json.dumps({"inserted": inserted, "unit_type": unit_type}, ensure_ascii=False),
-            _utc_now(),
-            tool_run_id,
-        ),
-    )
-    return inserted
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import base64
 import json
+import logging
 import os
 from uuid import uuid4
 from typing import Any
@@ -9,12 +10,23 @@ from typing import Any
 import httpx
 
 from tpa_api.db import _db_execute, _db_fetch_one, _db_fetch_all
+from tpa_api.http_clients import _model_post
 from tpa_api.time_utils import _utc_now
+from tpa_api.tool_runs import record_tool_run
 from tpa_api.blob_store import read_blob_bytes # Still using legacy blob read here? Or provider?
 from tpa_api.providers.factory import get_blob_store_provider
 from tpa_api.evidence import _ensure_evidence_ref_row
 from tpa_api.ingestion.visual_extraction import detect_redline_boundary_mask, _merge_visual_asset_metadata, _load_redline_mask_base64
 
+logger = logging.getLogger(__name__)
+
+# Served as `Content-Type` by the projection artifact content endpoint.
+_ARTIFACT_CONTENT_TYPES = {
+    "geotiff": "image/tiff",
+    "overlay_png": "image/png",
+    "redline_mask": "image/png",
+}
+
 
 def _should_attempt_georef(asset_type: str | None, canonical_facts: dict[str, Any]) -> tuple[bool, str | None]:
     if not isinstance(canonical_facts, dict) or not canonical_facts:
@@ -100,16 +112,152 @@ def _create_image_frame(*, visual_asset_id: str, blob_path: str, page_number: in
 def _persist_georef_outputs(
     *,
     run_id: str | None,
-    tool_run_id: str,
+    tool_run_id: str | None,
     image_frame_id: str,
     target_epsg: int,
     payload: dict[str, Any],
 ) -> tuple[str | None, int, int, list[str]]:
-    # ... legacy logic copy ...
-    # Simplified for brevity in this step, effectively handles transforms/artifacts
-    transform_id = str(uuid4())
-    # ... Assume success ...
-    return transform_id, 1, 0, []
+    """
+    Store the agent's `/auto-georef` result: the transform, its control points and every
+    projection artifact (including the COG `geotiff` the agent already wrote to the blob store).
+
+    Returns `(transform_id, transform_count, projection_count, errors)`. Artifacts are stored even
+    when no transform came back (e.g. a redline mask), with `transform_id` NULL.
+    """
+    errors: list[str] = []
+    transform_id: str | None = None
+    transform_count = 0
+    transform = payload.get("transform") if isinstance(payload.get("transform"), dict) else None
+    if transform and isinstance(transform.get("matrix"), list):
+        transform_id = str(uuid4())
+        now = _utc_now()
+        control_points = payload.get("control_points") or transform.get("control_points") or []
+        control_point_ids: list[str] = []
+        cp_rows: list[tuple[Any, ...]] = []
+        for cp in control_points:
+            if not isinstance(cp, dict) or not isinstance(cp.get("src"), dict) or not isinstance(cp.get("dst"), dict):
+                continue
+            cp_id = str(uuid4())
+            control_point_ids.append(cp_id)
+            cp_rows.append(
+                (
+                    cp_id,
+                    transform_id,
+                    json.dumps(cp["src"], ensure_ascii=False),
+                    json.dumps(cp["dst"], ensure_ascii=False),
+                    cp.get("residual"),
+                    cp.get("weight"),
+                    now,
+                )
+            )
+        metadata = transform.get("metadata") if isinstance(transform.get("metadata"), dict) else {}
+        _db_execute(
+            """
+            INSERT INTO transforms (
+              id, from_frame_id, to_frame_id, method, matrix, matrix_shape, uncertainty_score,
+              control_point_ids_jsonb, tool_run_id, metadata_jsonb, created_at
+            )
+            VALUES (%s, %s::uuid, %s::uuid, %s, %s::jsonb, %s::jsonb, %s, %s::jsonb, %s::uuid, %s::jsonb, %s)
+            """,
+            (
+                transform_id,
+                image_frame_id,
+                _ensure_world_frame(epsg=target_epsg),
+                str(transform.get("method") or "unknown"),
+                json.dumps(transform["matrix"]),
+                json.dumps(transform.get("matrix_shape") or []),
+                transform.get("uncertainty_score"),
+                json.dumps(control_point_ids),
+                tool_run_id,
+                json.dumps(
+                    {**metadata, "status": payload.get("status"), "metrics": payload.get("metrics") or {}},
+                    ensure_ascii=False,
+                    default=str,
+                ),
+                now,
+            ),
+        )
+        transform_count = 1
+        for row in cp_rows:
+            _db_execute(
+                """
+                INSERT INTO control_points (id, transform_id, src_jsonb, dst_jsonb, residual, weight, created_at)
+                VALUES (%s, %s::uuid, %s::jsonb, %s::jsonb, %s, %s, %s)
+                """,
+                row,
+            )
+    elif payload.get("transform") is not None:
+        errors.append("transform_malformed")
+
+    projection_count = 0
+    for artifact in payload.get("projection_artifacts") or []:
+        if not isinstance(artifact, dict):
+            continue
+        artifact_type = artifact.get("artifact_type")
+        artifact_path = artifact.get("artifact_path")
+        if not isinstance(artifact_type, str) or not isinstance(artifact_path, str) or not artifact_path:
+            errors.append("projection_artifact_malformed")
+            continue
+        metadata = artifact.get("metadata") if isinstance(artifact.get("metadata"), dict) else {}
+        if "content_type" not in metadata:
+            # The content endpoint serves `metadata_jsonb.content_type`; the agent's COG metadata omits it.
+            metadata = {**metadata, "content_type": _ARTIFACT_CONTENT_TYPES.get(artifact_type, "application/octet-stream")}
+        evidence_ref_id = None
+        if isinstance(artifact.get("evidence_ref"), str):
+            evidence_ref_id = _ensure_evidence_ref_row(artifact["evidence_ref"], run_id=run_id)
+        _db_execute(
+            """
+            INSERT INTO projection_artifacts (
+              id, transform_id, artifact_type, artifact_path, evidence_ref_id, tool_run_id, metadata_jsonb, created_at
+            )
+            VALUES (%s, %s::uuid, %s, %s, %s::uuid, %s::uuid, %s::jsonb, %s)
+            """,
+            (
+                str(uuid4()),
+                transform_id,
+                artifact_type,
+                artifact_path,
+                evidence_ref_id,
+                tool_run_id,
+                json.dumps(metadata, ensure_ascii=False, default=str),
+                _utc_now(),
+            ),
+        )
+        projection_count += 1
+    return transform_id, transform_count, projection_count, errors
+
+
+def _log_georef_tool_run(
+    *,
+    ingest_batch_id: str,
+    run_id: str | None,
+    visual_asset_id: str,
+    base_url: str,
+    started_at: Any,
+    outputs: dict[str, Any],
+    status: str,
+    uncertainty_note: str,
+) -> str | None:
+    """
+    Record the `/auto-georef` call; returns the ToolRun id, or None if it could not be recorded
+    (the asset is still processed, with no provenance link). The queued row needs no explicit
+    flush: the write barrier commits it before `transforms`/`projection_artifacts` reference it.
+    """
+    try:
+        return record_tool_run(
+            tool_name="georef_auto",
+            inputs={"visual_asset_id": visual_asset_id, "base_url": base_url},
+            outputs=outputs,
+            status=status,
+            started_at=started_at,
+            confidence_hint="medium" if status == "success" else "low",
+            uncertainty_note=uncertainty_note,
+            run_id=run_id,
+            ingest_batch_id=ingest_batch_id,
+        )
+    except Exception:  # noqa: BLE001
+        logger.warning("Could not record georef ToolRun for visual asset %s.", visual_asset_id, exc_info=True)
+        return None
 
 
 def auto_georef_visual_assets(
@@ -173,9 +321,6 @@ def auto_georef_visual_assets(
                 blob_path=blob_path,
             )
             
-        tool_run_id = str(uuid4())
-        # Log tool run ... (skipping for brevity, assuming standard logging)
-        
         try:
             blob_data = blob_provider.get_blob(blob_path, run_id=run_id, ingest_batch_id=ingest_batch_id)
             image_bytes = blob_data["bytes"]
@@ -189,11 +334,82 @@ def auto_georef_visual_assets(
             
         payload = {
             "visual_asset_id": visual_asset_id,
+            "asset_type": asset_type,
+            "asset_subtype": semantic_row.get("asset_subtype"),
             "target_epsg": target_epsg,
             "image_base64": base64.b64encode(image_bytes).decode("ascii"),
-            # ... other fields ...
+            "redline_mask_base64": redline_mask_b64,
+            "redline_mask_id": redline_mask_id,
+            "canonical_facts": canonical_facts,
+            "asset_specific_facts": asset_specific,
         }
-        
-        # ... Execute HTTP call ...
-        
+
+        started_at = _utc_now()
+        try:
+            resp = _model_post("georef", base_url.rstrip("/") + "/auto-georef", json=payload)
+            resp.raise_for_status()
+            result = resp.json()
+            if not isinstance(result, dict):
+                raise ValueError("auto-georef returned a non-object response")
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("auto-georef failed for visual asset %s: %s", visual_asset_id, exc)
+            tool_run_id = _log_georef_tool_run(
+                ingest_batch_id=ingest_batch_id,
+                run_id=run_id,
+                visual_asset_id=visual_asset_id,
+                base_url=base_url,
+                started_at=started_at,
+                outputs={"error": str(exc)},
+                status="error",
+                uncertainty_note="Georef agent request failed; check georef agent logs.",
+            )
+            _merge_visual_asset_metadata(
+                visual_asset_id=visual_asset_id,
+                patch={"georef_status": "error", "georef_tool_run_id": tool_run_id},
+            )
+            continue
+
+        status = str(result.get("status") or ("success" if result.get("ok") else "failed"))
+        tool_run_id = _log_georef_tool_run(
+            ingest_batch_id=ingest_batch_id,
+            run_id=run_id,
+            visual_asset_id=visual_asset_id,
+            base_url=base_url,
+            started_at=started_at,
+            outputs={
+                "status": status,
+                "attempts": result.get("attempts"),
+                "errors": result.get("errors") or [],
+                "metrics": result.get("metrics") or {},
+                "provenance": result.get("provenance") or {},
+            },
+            status="success" if result.get("ok") else status,
+            uncertainty_note=str(result.get("limitations_text") or ""),
+        )
+        image_frame_id = _create_image_frame(
+            visual_asset_id=visual_asset_id,
+            blob_path=blob_path,
+            page_number=asset.get("page_number"),
+        )
+        transform_id, transforms_added, projections_added, persist_errors = _persist_georef_outputs(
+            run_id=run_id,
+            tool_run_id=tool_run_id,
+            image_frame_id=image_frame_id,
+            target_epsg=target_epsg,
+            payload=result,
+        )
+        transform_count += transforms_added
+        projection_count += projections_added
+        if result.get("ok") and transform_id:
+            successes += 1
+        _merge_visual_asset_metadata(
+            visual_asset_id=visual_asset_id,
+            patch={
+                "georef_status": status,
+                "georef_tool_run_id": tool_run_id,
+                "transform_id": transform_id,
+                "georef_errors": (result.get("errors") or []) + persist_errors,
+            },
+        )
+
     return attempts, successes, transform_count, projection_count
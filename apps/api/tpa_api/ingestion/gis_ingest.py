@@ -1,16 +1,21 @@
 from __future__ import annotations
 
 import json
+import logging
 import os
 import re
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any, Iterable, Iterator, TextIO
 from uuid import uuid4
 
-from tpa_api.db import _db_execute, _db_fetch_one
+from psycopg.rows import dict_row
+
+from tpa_api.db import _db_execute, _db_fetch_one, _db_transaction
 from tpa_api.time_utils import _utc_now
 
 
+logger = logging.getLogger(__name__)
+
 _NON_ALNUM = re.compile(r"[^a-z0-9]+")
 
 
@@ -23,52 +28,249 @@ def _normalize_key(value: str) -> str:
     return _NON_ALNUM.sub("_", lowered).strip("_")
 
 
-def _iter_coords(value: Any) -> Iterable[tuple[float, float]]:
-    if isinstance(value, (list, tuple)):
-        if len(value) == 0:
-            return
-        if isinstance(value[0], (int, float)) and len(value) >= 2:
-            yield (float(value[0]), float(value[1]))
-            return
-        for item in value:
-            yield from _iter_coords(item)
+def _env_int(key: str, default: int) -> int:
+    try:
+        return max(1, int(os.environ.get(key, str(default))))
+    except ValueError:
+        return default
 
 
-def _geometry_bounds(geometry: dict[str, Any]) -> tuple[float, float, float, float] | None:
-    if not isinstance(geometry, dict):
+def _simplify_tolerance(layer: dict[str, Any]) -> float | None:
+    """ST_SimplifyPreserveTopology tolerance (layer CRS units) from the layer entry or the env; None = off."""
+    raw = layer.get("simplify_tolerance")
+    if raw is None:
+        raw = os.environ.get("TPA_GIS_SIMPLIFY_TOLERANCE")
+    try:
+        tolerance = float(raw) if raw not in (None, "") else 0.0
+    except (TypeError, ValueError):
         return None
-    geom_type = geometry.get("type")
-    if geom_type == "GeometryCollection":
-        bounds = None
-        for geom in geometry.get("geometries") or []:
-            geom_bounds = _geometry_bounds(geom)
-            if not geom_bounds:
+    return tolerance if tolerance > 0 else None
+
+
+# GeoJSON layers can be hundreds of MB, so features are read incrementally (stdlib `raw_decode` over
+# a sliding text buffer; memory is bounded by the read size plus the largest single feature, capped
+# at `TPA_GIS_MAX_FEATURE_MB` so a malformed feature fails the layer instead of buffering the rest of
+# the file) and loaded in batches: COPY into a staging table, then one INSERT ... SELECT that parses,
+# optionally simplifies and measures the batch in PostGIS. A batch that fails falls back to
+# row-by-row inserts so one bad geometry is reported without losing its neighbours.
+_GEOJSON_READ_CHARS = 1 << 20
+_JSON_WS = " \t\r\n"
+_JSON_DECODER = json.JSONDecoder()
+
+
+class _JsonStream:
+    def __init__(self, handle: TextIO, read_chars: int, max_value_chars: int) -> None:
+        self.handle = handle
+        self.read_chars = max(1, read_chars)
+        self.max_value_chars = max(self.read_chars, max_value_chars)
+        self.buf = ""
+        self.pos = 0
+        self.offset = 0
+        self.eof = False
+
+    def _fill(self, size: int) -> bool:
+        if self.eof:
+            return False
+        chunk = self.handle.read(size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.offset += self.pos
+        self.buf = self.buf[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character without consuming it ("" at end of input)."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _JSON_WS:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill(self.read_chars):
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"expected {char!r} in GeoJSON stream")
+        self.pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        size = self.read_chars
+        while True:
+            try:
+                value, end = _JSON_DECODER.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError as exc:
+                # Incomplete value: read more (doubling, so a huge feature is not re-parsed per chunk).
+                buffered = len(self.buf) - self.pos
+                if buffered >= self.max_value_chars:
+                    raise ValueError(
+                        f"GeoJSON value starting at character {self.offset + self.pos} is still incomplete after "
+                        f"{buffered} characters (malformed feature, or larger than TPA_GIS_MAX_FEATURE_MB)"
+                    ) from exc
+                if not self._fill(min(size, self.max_value_chars - buffered)):
+                    raise
+                size *= 2
                 continue
-            if bounds is None:
-                bounds = geom_bounds
-            else:
-                bounds = (
-                    min(bounds[0], geom_bounds[0]),
-                    min(bounds[1], geom_bounds[1]),
-                    max(bounds[2], geom_bounds[2]),
-                    max(bounds[3], geom_bounds[3]),
-                )
+            # A number or literal ending exactly at the buffer edge may continue in the next chunk.
+            if end == len(self.buf) and self._fill(size):
+                continue
+            self.pos = end
+            return value
+
+
+def _iter_geojson_features(
+    path: Path,
+    *,
+    read_chars: int = _GEOJSON_READ_CHARS,
+    max_value_chars: int | None = None,
+) -> Iterator[Any]:
+    """Yield the members of a FeatureCollection's `features` array one at a time."""
+    if max_value_chars is None:
+        max_value_chars = _env_int("TPA_GIS_MAX_FEATURE_MB", 64) << 20
+    with path.open("r", encoding="utf-8-sig") as handle:
+        stream = _JsonStream(handle, read_chars, max_value_chars)
+        stream.expect("{")
+        while True:
+            char = stream.peek()
+            if char in ("}", ""):
+                return
+            if char == ",":
+                stream.pos += 1
+                continue
+            key = stream.value()
+            stream.expect(":")
+            if key != "features" or stream.peek() != "[":
+                stream.value()
+                continue
+            stream.pos += 1
+            while True:
+                char = stream.peek()
+                if char == "]":
+                    stream.pos += 1
+                    break
+                if char == "":
+                    raise ValueError("unterminated features array")
+                if char == ",":
+                    stream.pos += 1
+                    continue
+                yield stream.value()
+
+
+def _merge_bounds(
+    bounds: tuple[float, float, float, float] | None, row: dict[str, Any] | None
+) -> tuple[float, float, float, float] | None:
+    if not row or row.get("xmin") is None:
         return bounds
-    coords = geometry.get("coordinates")
-    if coords is None:
-        return None
-    minx = miny = float("inf")
-    maxx = maxy = float("-inf")
-    found = False
-    for x, y in _iter_coords(coords):
-        found = True
-        minx = min(minx, x)
-        miny = min(miny, y)
-        maxx = max(maxx, x)
-        maxy = max(maxy, y)
-    if not found:
-        return None
-    return (minx, miny, maxx, maxy)
+    other = (float(row["xmin"]), float(row["ymin"]), float(row["xmax"]), float(row["ymax"]))
+    if bounds is None:
+        return other
+    return (min(bounds[0], other[0]), min(bounds[1], other[1]), max(bounds[2], other[2]), max(bounds[3], other[3]))
+
+
+_GEOMETRY_SQL = """
+    CASE
+      WHEN %(tolerance)s::float8 IS NULL THEN ST_SetSRID(ST_GeomFromGeoJSON({source}), 4326)
+      ELSE ST_SimplifyPreserveTopology(ST_SetSRID(ST_GeomFromGeoJSON({source}), 4326), %(tolerance)s::float8)
+    END
+"""
+
+
+def _copy_feature_batch(
+    rows: list[tuple[str, str, str]],
+    *,
+    target: dict[str, Any],
+    tolerance: float | None,
+) -> tuple[int, dict[str, Any] | None]:
+    """COPY one batch of (id, geometry GeoJSON, properties JSON) rows; returns (inserted, batch extent row)."""
+    with _db_transaction() as conn:
+        with conn.cursor(row_factory=dict_row) as cur:
+            cur.execute(
+                """
+                CREATE TEMP TABLE IF NOT EXISTS spatial_features_stage (
+                  id uuid, geometry_geojson text, properties jsonb
+                ) ON COMMIT DELETE ROWS
+                """
+            )
+            with cur.copy("COPY spatial_features_stage (id, geometry_geojson, properties) FROM STDIN") as copy:
+                for row in rows:
+                    copy.write_row(row)
+            cur.execute(
+                f"""
+                WITH inserted AS (
+                  INSERT INTO spatial_features (
+                    id, authority_id, ingest_batch_id, type, spatial_scope,
+                    is_active, confidence_hint, uncertainty_note, geometry, properties
+                  )
+                  SELECT
+                    s.id, %(authority_id)s, %(ingest_batch_id)s::uuid, %(type)s, %(spatial_scope)s,
+                    true, %(confidence_hint)s, NULL,
+                    {_GEOMETRY_SQL.format(source="s.geometry_geojson")},
+                    s.properties
+                  FROM spatial_features_stage s
+                  RETURNING geometry
+                ), extent AS (
+                  SELECT COUNT(*) AS inserted, ST_Extent(geometry) AS box FROM inserted
+                )
+                SELECT inserted, ST_XMin(box) AS xmin, ST_YMin(box) AS ymin, ST_XMax(box) AS xmax, ST_YMax(box) AS ymax
+                FROM extent
+                """,
+                {**target, "tolerance": tolerance},
+            )
+            row = cur.fetchone()
+    return int((row or {}).get("inserted") or 0), row
+
+
+def _insert_feature_row(row: tuple[str, str, str], *, target: dict[str, Any], tolerance: float | None) -> dict[str, Any] | None:
+    feature_id, geometry_json, properties_json = row
+    return _db_fetch_one(
+        f"""
+        WITH inserted AS (
+          INSERT INTO spatial_features (
+            id, authority_id, ingest_batch_id, type, spatial_scope,
+            is_active, confidence_hint, uncertainty_note, geometry, properties
+          )
+          VALUES (
+            %(id)s, %(authority_id)s, %(ingest_batch_id)s::uuid, %(type)s, %(spatial_scope)s,
+            true, %(confidence_hint)s, NULL,
+            {_GEOMETRY_SQL.format(source="%(geometry)s")},
+            %(properties)s::jsonb
+          )
+          RETURNING geometry
+        )
+        SELECT ST_XMin(geometry) AS xmin, ST_YMin(geometry) AS ymin, ST_XMax(geometry) AS xmax, ST_YMax(geometry) AS ymax
+        FROM inserted
+        """,
+        {**target, "tolerance": tolerance, "id": feature_id, "geometry": geometry_json, "properties": properties_json},
+    )
+
+
+def _load_feature_batch(
+    rows: list[tuple[str, str, str]],
+    *,
+    target: dict[str, Any],
+    tolerance: float | None,
+    bounds: tuple[float, float, float, float] | None,
+    errors: list[str],
+) -> tuple[int, tuple[float, float, float, float] | None]:
+    if not rows:
+        return 0, bounds
+    try:
+        inserted, extent = _copy_feature_batch(rows, target=target, tolerance=tolerance)
+        return inserted, _merge_bounds(bounds, extent)
+    except Exception:  # noqa: BLE001
+        logger.exception(
+            "COPY of %s features for layer %s failed; retrying row by row", len(rows), target["spatial_scope"]
+        )
+    inserted = 0
+    for row in rows:
+        try:
+            bounds = _merge_bounds(bounds, _insert_feature_row(row, target=target, tolerance=tolerance))
+            inserted += 1
+        except Exception as exc:  # noqa: BLE001
+            errors.append(f"spatial_insert_failed:{target['spatial_scope']}:{exc}")
+    return inserted, bounds
 
 
 def _bbox_polygon(bounds: tuple[float, float, float, float]) -> dict[str, Any]:
@@ -150,87 +352,75 @@ def ingest_authority_gis_layers(
         if source_path and not local_path:
             local_path = Path(source_path)
 
-        features = []
+        feature_count = 0
         geometry_types: set[str] = set()
         attribute_keys: set[str] = set()
         bounds: tuple[float, float, float, float] | None = None
+        target = {
+            "authority_id": authority_id,
+            "ingest_batch_id": ingest_batch_id,
+            "type": layer_key,
+            "spatial_scope": layer_name,
+            "confidence_hint": "high" if local_path else "low",
+        }
+        tolerance = _simplify_tolerance(layer)
+        batch_size = _env_int("TPA_GIS_COPY_BATCH_FEATURES", 2000)
+        batch: list[tuple[str, str, str]] = []
 
+        features: Iterable[Any] = ()
         if local_path and local_path.exists():
-            try:
-                geojson = json.loads(local_path.read_text(encoding="utf-8"))
-            except Exception as exc:  # noqa: BLE001
-                errors.append(f"geojson_parse_failed:{layer_name}:{exc}")
-                geojson = {}
-            if isinstance(geojson, dict):
-                features = geojson.get("features") if isinstance(geojson.get("features"), list) else []
-
-        for idx, feature in enumerate(features):
-            if not isinstance(feature, dict):
-                continue
-            geometry = feature.get("geometry") if isinstance(feature.get("geometry"), dict) else None
-            if not geometry:
-                continue
-            geom_type = geometry.get("type")
-            if isinstance(geom_type, str):
-                geometry_types.add(geom_type)
-            geom_bounds = _geometry_bounds(geometry)
-            if geom_bounds:
-                bounds = geom_bounds if bounds is None else (
-                    min(bounds[0], geom_bounds[0]),
-                    min(bounds[1], geom_bounds[1]),
-                    max(bounds[2], geom_bounds[2]),
-                    max(bounds[3], geom_bounds[3]),
-                )
-            props = feature.get("properties") if isinstance(feature.get("properties"), dict) else {}
-            for key in props.keys():
-                if isinstance(key, str):
-                    attribute_keys.add(key)
-
-            properties = {
-                **props,
-                "layer_name": layer_name,
-                "layer_key": layer_key,
-                "source_path": str(local_path) if local_path else None,
-                "source_url": source_url,
-                "feature_index": idx,
-            }
-            feature_id = str(uuid4())
-            try:
-                _db_execute(
-                    """
-                    INSERT INTO spatial_features (
-                      id, authority_id, ingest_batch_id, type, spatial_scope,
-                      is_active, confidence_hint, uncertainty_note, geometry, properties
-                    )
-                    VALUES (
-                      %s, %s, %s::uuid, %s, %s, true, %s, %s,
-                      ST_SetSRID(ST_GeomFromGeoJSON(%s), 4326),
-                      %s::jsonb
-                    )
-                    """,
+            features = _iter_geojson_features(local_path)
+        try:
+            for idx, feature in enumerate(features):
+                feature_count += 1
+                if not isinstance(feature, dict):
+                    continue
+                geometry = feature.get("geometry") if isinstance(feature.get("geometry"), dict) else None
+                if not geometry:
+                    continue
+                geom_type = geometry.get("type")
+                if isinstance(geom_type, str):
+                    geometry_types.add(geom_type)
+                props = feature.get("properties") if isinstance(feature.get("properties"), dict) else {}
+                for key in props.keys():
+                    if isinstance(key, str):
+                        attribute_keys.add(key)
+
+                properties = {
+                    **props,
+                    "layer_name": layer_name,
+                    "layer_key": layer_key,
+                    "source_path": str(local_path) if local_path else None,
+                    "source_url": source_url,
+                    "feature_index": idx,
+                }
+                if tolerance is not None:
+                    properties["simplify_tolerance"] = tolerance
+                batch.append(
                     (
-                        feature_id,
-                        authority_id,
-                        ingest_batch_id,
-                        layer_key,
-                        layer_name,
-                        "high" if local_path else "low",
-                        None,
+                        str(uuid4()),
                         json.dumps(geometry, ensure_ascii=False),
                         json.dumps(properties, ensure_ascii=False),
-                    ),
+                    )
                 )
-                inserted_features += 1
-            except Exception as exc:  # noqa: BLE001
-                errors.append(f"spatial_insert_failed:{layer_name}:{exc}")
+                if len(batch) >= batch_size:
+                    inserted, bounds = _load_feature_batch(
+                        batch, target=target, tolerance=tolerance, bounds=bounds, errors=errors
+                    )
+                    inserted_features += inserted
+                    batch = []
+        except Exception as exc:  # noqa: BLE001
+            # Features read before the parse error are still loaded (and counted in the profile).
+            errors.append(f"geojson_parse_failed:{layer_name}:{exc}")
+        inserted, bounds = _load_feature_batch(batch, target=target, tolerance=tolerance, bounds=bounds, errors=errors)
+        inserted_features += inserted
 
-        profile_bounds = bounds or (None if not local_path else None)
-        profile_geometry = _bbox_polygon(profile_bounds) if profile_bounds else None
+        profile_geometry = _bbox_polygon(bounds) if bounds else None
         profile_props = {
             "layer_profile": True,
             "layer_name": layer_name,
             "layer_key": layer_key,
-            "feature_count": len(features),
+            "feature_count": feature_count,
             "geometry_types": sorted(geometry_types),
             "attribute_keys": sorted(attribute_keys),
             "source_url": source_url,
@@ -1,6 +1,8 @@
+import functools
 import json
 import logging
 import os
+import threading
 from pathlib import Path
 from typing import TypedDict, List, Dict, Any, Optional
 from uuid import UUID
@@ -1282,12 +1284,47 @@ def node_embeddings(state: IngestionState) -> IngestionState:
         return {**state, "error": str(exc)}
 
 
-def build_ingestion_graph(checkpointer=None, *, mode: str = "full"):
+# Concurrency pool each node draws from when several documents run through the graph at once
+# (see run_graph.py). "parse" is docling/CPU-bound; "gpu" nodes call model roles that share one GPU.
+# Nodes not listed (blob anchoring, canonical load) are I/O-bound and only limited per document.
+_NODE_STAGES: Dict[str, str] = {
+    "docparse": "parse",
+    "visual_pipeline": "gpu",
+    "document_identity": "gpu",
+    "structural_llm": "gpu",
+    "visual_linking": "gpu",
+    "imagination": "gpu",
+    "embeddings": "gpu",
+}
+
+
+def _gated(name: str, node, stage_gates: Dict[str, threading.Semaphore] | None):
+    gate = (stage_gates or {}).get(_NODE_STAGES.get(name, ""))
+    if gate is None:
+        return node
+
+    @functools.wraps(node)
+    def _run(state: IngestionState) -> IngestionState:
+        with gate:
+            return node(state)
+
+    return _run
+
+
+def build_ingestion_graph(
+    checkpointer=None,
+    *,
+    mode: str = "full",
+    stage_gates: Dict[str, threading.Semaphore] | None = None,
+):
     workflow = StateGraph(IngestionState)
 
-    workflow.add_node("anchor_raw", node_anchor_raw)
-    workflow.add_node("docparse", node_docparse)
-    workflow.add_node("canonical_load", node_canonical_load)
+    def add_node(name: str, node) -> None:
+        workflow.add_node(name, _gated(name, node, stage_gates))
+
+    add_node("anchor_raw", node_anchor_raw)
+    add_node("docparse", node_docparse)
+    add_node("canonical_load", node_canonical_load)
 
     workflow.set_entry_point("anchor_raw")
     workflow.add_edge("anchor_raw", "docparse")
@@ -1296,12 +1333,12 @@ def build_ingestion_graph(checkpointer=None, *, mode: str = "full"):
     if mode == "cpu_only":
         workflow.add_edge("canonical_load", END)
     else:
-        workflow.add_node("visual_pipeline", node_visual_pipeline)
-        workflow.add_node("document_identity", node_document_identity)
-        workflow.add_node("structural_llm", node_structural_llm)
-        workflow.add_node("visual_linking", node_visual_linking)
-        workflow.add_node("imagination", node_imagination)
-        workflow.add_node("embeddings", node_embeddings)
+        add_node("visual_pipeline", node_visual_pipeline)
+        add_node("document_identity", node_document_identity)
+        add_node("structural_llm", node_structural_llm)
+        add_node("visual_linking", node_visual_linking)
+        add_node("imagination", node_imagination)
+        add_node("embeddings", node_embeddings)
 
         workflow.add_edge("canonical_load", "visual_pipeline")
         workflow.add_edge("visual_pipeline", "document_identity")
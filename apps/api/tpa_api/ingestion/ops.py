@@ -4,9 +4,9 @@ import json
 from uuid import uuid4
 from typing import Any
 
-from tpa_api.db import _db_execute, _db_execute_returning
+from tpa_api.db import _db_execute, _db_transaction
 from tpa_api.time_utils import _utc_now
-from tpa_api.evidence import _ensure_evidence_ref_row, _parse_evidence_ref
+from tpa_api.evidence import _ensure_evidence_ref_row, _ensure_evidence_ref_rows, _parse_evidence_ref
 
 # Functions consolidated into ingestion modules.
 def _persist_pages(
@@ -139,9 +139,15 @@ def _persist_layout_blocks(
     blocks: list[dict[str, Any]],
     evidence_ref_map: dict[str, str] | None = None,
 ) -> list[dict[str, Any]]:
+    """
+    Upsert layout blocks and their evidence refs in one transaction.
+
+    Ids are generated client-side (reusing existing ids for re-parsed blocks) so evidence refs can be
+    resolved before the blocks are written, replacing the per-block insert/ensure/update round trips.
+    """
     page_texts = {int(p.get("page_number") or 0): str(p.get("text") or "") for p in pages}
-    rows: list[dict[str, Any]] = []
     evidence_ref_map = evidence_ref_map or {}
+    prepared: list[dict[str, Any]] = []
     for block in blocks:
         text = str(block.get("text") or "").strip()
         if not text:
@@ -150,20 +156,8 @@ def _persist_layout_blocks(
         layout_block_id = str(uuid4())
         block_id = str(block.get("block_id") or layout_block_id)
         span_start, span_end, span_quality = _find_span(page_texts.get(page_number, ""), text)
-        evidence_ref_id: str | None = None
-        used_external_ref = False
-        raw_ref = block.get("evidence_ref")
-        if isinstance(raw_ref, str):
-            parsed = _parse_evidence_ref(raw_ref)
-            if parsed:
-                evidence_ref_id = evidence_ref_map.get(parsed[2])
-                if evidence_ref_id:
-                    used_external_ref = True
-                else:
-                    evidence_ref_id = _ensure_evidence_ref_row(raw_ref, run_id=run_id)
-                    used_external_ref = bool(evidence_ref_id)
-        if not evidence_ref_id:
-            evidence_ref_id = str(uuid4())
+        raw_ref = block.get("evidence_ref") if isinstance(block.get("evidence_ref"), str) else None
+        parsed = _parse_evidence_ref(raw_ref) if raw_ref else None
         metadata = {}
         raw_meta = block.get("metadata") if isinstance(block.get("metadata"), dict) else {}
         if raw_meta:
@@ -172,74 +166,114 @@ def _persist_layout_blocks(
             metadata.setdefault("text_source", block.get("text_source"))
         if "text_source_reason" in block:
             metadata.setdefault("text_source_reason", block.get("text_source_reason"))
+        prepared.append(
+            {
+                "block": block,
+                "layout_block_id": layout_block_id,
+                "block_id": block_id,
+                "page_number": page_number,
+                "text": text,
+                "span": (span_start, span_end, span_quality),
+                "raw_ref": raw_ref,
+                "used_external_ref": bool(parsed),
+                "evidence_ref_id": evidence_ref_map.get(parsed[2]) if parsed else None,
+                "metadata": metadata,
+            }
+        )
+    if not prepared:
+        return []
 
-        row = _db_execute_returning(
-            """
-            INSERT INTO layout_blocks (
-              id, document_id, page_number, ingest_batch_id, run_id, source_artifact_id,
-              block_id, block_type, text, bbox, bbox_quality, section_path,
-              span_start, span_end, span_quality, evidence_ref_id, metadata_jsonb
+    with _db_transaction() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT block_id, id FROM layout_blocks WHERE document_id = %s::uuid AND block_id = ANY(%s::text[])",
+                (document_id, [item["block_id"] for item in prepared]),
             )
-            VALUES (%s, %s::uuid, %s, %s::uuid, %s::uuid, %s::uuid, %s, %s, %s, %s::jsonb, %s, %s, %s, %s, %s, %s::uuid, %s::jsonb)
-            ON CONFLICT (document_id, block_id) DO UPDATE
-            SET page_number = EXCLUDED.page_number,
-                ingest_batch_id = COALESCE(layout_blocks.ingest_batch_id, EXCLUDED.ingest_batch_id),
-                run_id = COALESCE(layout_blocks.run_id, EXCLUDED.run_id),
-                source_artifact_id = COALESCE(layout_blocks.source_artifact_id, EXCLUDED.source_artifact_id),
-                block_type = EXCLUDED.block_type,
-                text = EXCLUDED.text,
-                bbox = EXCLUDED.bbox,
-                bbox_quality = EXCLUDED.bbox_quality,
-                section_path = EXCLUDED.section_path,
-                span_start = EXCLUDED.span_start,
-                span_end = EXCLUDED.span_end,
-                span_quality = EXCLUDED.span_quality,
-                evidence_ref_id = COALESCE(layout_blocks.evidence_ref_id, EXCLUDED.evidence_ref_id),
-                metadata_jsonb = EXCLUDED.metadata_jsonb
-            RETURNING id, evidence_ref_id
-            """,
-            (
-                layout_block_id,
-                document_id,
-                page_number,
-                ingest_batch_id,
-                run_id,
-                source_artifact_id,
-                block_id,
-                block.get("type") or "unknown",
-                text,
-                json.dumps(block.get("bbox"), ensure_ascii=False) if block.get("bbox") is not None else None,
-                block.get("bbox_quality"),
-                block.get("section_path"),
-                span_start,
-                span_end,
-                span_quality,
-                evidence_ref_id,
-                json.dumps(metadata, ensure_ascii=False),
-            ),
+            existing_ids = {str(r[0]): str(r[1]) for r in cur.fetchall()}
+        for item in prepared:
+            # A block_id repeated within the batch upserts one row, so every occurrence reports its id.
+            item["layout_block_id"] = existing_ids.setdefault(item["block_id"], item["layout_block_id"])
+            if item["used_external_ref"]:
+                item["evidence_ref"] = item["raw_ref"]
+            else:
+                item["evidence_ref"] = f"layout_block::{item['layout_block_id']}::{item['block_id']}"
+
+        ensured = _ensure_evidence_ref_rows(
+            conn,
+            [item["evidence_ref"] for item in prepared if not item["evidence_ref_id"]],
+            run_id=run_id,
         )
-        layout_block_id = str(row.get("id") or layout_block_id)
-        evidence_ref_id = row.get("evidence_ref_id") or evidence_ref_id
-        evidence_ref_str = raw_ref if isinstance(raw_ref, str) else None
-        if not used_external_ref:
-            evidence_ref_str = f"layout_block::{layout_block_id}::{block_id}"
-            ensured_ref_id = _ensure_evidence_ref_row(evidence_ref_str, run_id=run_id)
-            if ensured_ref_id:
-                evidence_ref_id = ensured_ref_id
-                _db_execute(
-                    """
-                    UPDATE layout_blocks
-                    SET evidence_ref_id = COALESCE(evidence_ref_id, %s::uuid)
-                    WHERE id = %s::uuid
-                    """,
-                    (ensured_ref_id, layout_block_id),
+        for item in prepared:
+            if not item["evidence_ref_id"]:
+                item["evidence_ref_id"] = ensured.get(item["evidence_ref"])
+
+        with conn.cursor() as cur:
+            cur.executemany(
+                """
+                INSERT INTO layout_blocks (
+                  id, document_id, page_number, ingest_batch_id, run_id, source_artifact_id,
+                  block_id, block_type, text, bbox, bbox_quality, section_path,
+                  span_start, span_end, span_quality, evidence_ref_id, metadata_jsonb
                 )
+                VALUES (%s, %s::uuid, %s, %s::uuid, %s::uuid, %s::uuid, %s, %s, %s, %s::jsonb, %s, %s, %s, %s, %s, %s::uuid, %s::jsonb)
+                ON CONFLICT (document_id, block_id) DO UPDATE
+                SET page_number = EXCLUDED.page_number,
+                    ingest_batch_id = COALESCE(layout_blocks.ingest_batch_id, EXCLUDED.ingest_batch_id),
+                    run_id = COALESCE(layout_blocks.run_id, EXCLUDED.run_id),
+                    source_artifact_id = COALESCE(layout_blocks.source_artifact_id, EXCLUDED.source_artifact_id),
+                    block_type = EXCLUDED.block_type,
+                    text = EXCLUDED.text,
+                    bbox = EXCLUDED.bbox,
+                    bbox_quality = EXCLUDED.bbox_quality,
+                    section_path = EXCLUDED.section_path,
+                    span_start = EXCLUDED.span_start,
+                    span_end = EXCLUDED.span_end,
+                    span_quality = EXCLUDED.span_quality,
+                    evidence_ref_id = COALESCE(layout_blocks.evidence_ref_id, EXCLUDED.evidence_ref_id),
+                    metadata_jsonb = EXCLUDED.metadata_jsonb
+                """,
+                [
+                    (
+                        item["layout_block_id"],
+                        document_id,
+                        item["page_number"],
+                        ingest_batch_id,
+                        run_id,
+                        source_artifact_id,
+                        item["block_id"],
+                        item["block"].get("type") or "unknown",
+                        item["text"],
+                        json.dumps(item["block"].get("bbox"), ensure_ascii=False)
+                        if item["block"].get("bbox") is not None
+                        else None,
+                        item["block"].get("bbox_quality"),
+                        item["block"].get("section_path"),
+                        *item["span"],
+                        item["evidence_ref_id"],
+                        json.dumps(item["metadata"], ensure_ascii=False),
+                    )
+                    for item in prepared
+                ],
+            )
+            cur.execute(
+                "SELECT block_id, evidence_ref_id FROM layout_blocks WHERE document_id = %s::uuid AND block_id = ANY(%s::text[])",
+                (document_id, [item["block_id"] for item in prepared]),
+            )
+            stored_refs = {str(r[0]): str(r[1]) if r[1] else None for r in cur.fetchall()}
+
+    rows: list[dict[str, Any]] = []
+    for item in prepared:
+        block = item["block"]
+        span_start, span_end, span_quality = item["span"]
+        evidence_ref_id = item["evidence_ref_id"]
+        if item["used_external_ref"]:
+            evidence_ref_id = stored_refs.get(item["block_id"]) or evidence_ref_id
         rows.append(
             {
-                "layout_block_id": layout_block_id,
-                "block_id": block_id,
-                "page_number": page_number,
-                "text": text,
+                "layout_block_id": item["layout_block_id"],
+                "block_id": item["block_id"],
+                "page_number": item["page_number"],
+                "text": item["text"],
                 "type": block.get("type"),
                 "section_path": block.get("section_path"),
                 "bbox": block.get("bbox"),
@@ -248,7 +282,7 @@ def _persist_layout_blocks(
                 "span_end": span_end,
                 "span_quality": span_quality,
                 "evidence_ref_id": evidence_ref_id,
-                "evidence_ref": evidence_ref_str,
+                "evidence_ref": item["evidence_ref"],
             }
         )
     return rows
@@ -342,6 +376,8 @@ def _persist_chunks_from_blocks(
     block_rows: list[dict[str, Any]],
 ) -> list[dict[str, Any]]:
     chunk_rows: list[dict[str, Any]] = []
+    records: list[tuple[Any, ...]] = []
+    new_refs: list[tuple[Any, ...]] = []
     for block in block_rows:
         text = str(block.get("text") or "").strip()
         if not text:
@@ -352,15 +388,8 @@ def _persist_chunks_from_blocks(
         evidence_ref_id = block.get("evidence_ref_id")
         if not evidence_ref_id:
             evidence_ref_id = str(uuid4())
-        _db_execute(
-            """
-            INSERT INTO chunks (
-              id, document_id, page_number, ingest_batch_id, run_id, source_artifact_id,
-              text, bbox, bbox_quality, type, section_path, span_start, span_end,
-              span_quality, evidence_ref_id, metadata
-            )
-            VALUES (%s, %s::uuid, %s, %s::uuid, %s::uuid, %s::uuid, %s, %s::jsonb, %s, %s, %s, %s, %s, %s, %s::uuid, %s::jsonb)
-            """,
+            new_refs.append((evidence_ref_id, "chunk", chunk_id, fragment, run_id))
+        records.append(
             (
                 chunk_id,
                 document_id,
@@ -378,13 +407,8 @@ def _persist_chunks_from_blocks(
                 block.get("span_quality"),
                 evidence_ref_id,
                 json.dumps({"evidence_ref_fragment": fragment}, ensure_ascii=False),
-            ),
-        )
-        if evidence_ref_id and not block.get("evidence_ref_id"):
-            _db_execute(
-                "INSERT INTO evidence_refs (id, source_type, source_id, fragment_id, run_id) VALUES (%s, %s, %s, %s, %s::uuid)",
-                (evidence_ref_id, "chunk", chunk_id, fragment, run_id),
             )
+        )
         chunk_rows.append(
             {
                 "chunk_id": chunk_id,
@@ -399,6 +423,27 @@ def _persist_chunks_from_blocks(
                 "evidence_ref_id": evidence_ref_id,
             }
         )
+    if not records:
+        return chunk_rows
+
+    with _db_transaction() as conn:
+        with conn.cursor() as cur:
+            if new_refs:
+                cur.executemany(
+                    "INSERT INTO evidence_refs (id, source_type, source_id, fragment_id, run_id) VALUES (%s, %s, %s, %s, %s::uuid)",
+                    new_refs,
+                )
+            with cur.copy(
+                """
+                COPY chunks (
+                  id, document_id, page_number, ingest_batch_id, run_id, source_artifact_id,
+                  text, bbox, bbox_quality, type, section_path, span_start, span_end,
+                  span_quality, evidence_ref_id, metadata
+                ) FROM STDIN
+                """
+            ) as copy:
+                for record in records:
+                    copy.write_row(record)
     return chunk_rows
 
 
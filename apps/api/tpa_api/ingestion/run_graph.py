@@ -3,11 +3,13 @@ import sys
 import asyncio
 import json
 import mimetypes
+import threading
 from pathlib import Path
 from typing import Any
 from langgraph.checkpoint.memory import MemorySaver
 from tpa_api.ingestion.ingestion_graph import build_ingestion_graph
 from tpa_api.ingestion.run_state import create_ingest_run
+from tpa_api.ingestion.run_steps import _update_run_step_progress
 from tpa_api.db import init_db_pool, _db_fetch_one, _db_fetch_all
 from tpa_api.blob_store import read_blob_bytes
 
@@ -46,6 +48,24 @@ def _guess_content_type(path: Path, override: str | None = None) -> str:
     return guessed or "application/octet-stream"
 
 
+def _env_concurrency(key: str, default: int) -> int:
+    try:
+        return max(1, int(os.environ.get(key, str(default))))
+    except ValueError:
+        return default
+
+
+def _stage_gates() -> dict[str, threading.Semaphore]:
+    """
+    Per-stage limits shared by all documents of a job: docling parsing is CPU-bound, and GPU stages
+    default to one document at a time so concurrent documents do not force VLM/LLM swaps.
+    """
+    return {
+        "parse": threading.BoundedSemaphore(_env_concurrency("TPA_INGEST_PARSE_CONCURRENCY", 2)),
+        "gpu": threading.BoundedSemaphore(_env_concurrency("TPA_INGEST_GPU_CONCURRENCY", 1)),
+    }
+
+
 async def run_graph_for_job(job_id: str) -> dict[str, object]:
     init_db_pool()
 
@@ -148,22 +168,20 @@ async def run_graph_for_job(job_id: str) -> dict[str, object]:
     checkpointer = MemorySaver()
     queue_mode = os.environ.get("TPA_INGEST_QUEUE_MODE", "").lower()
     graph_mode = "cpu_only" if queue_mode == "separated" else "full"
-    graph = build_ingestion_graph(checkpointer, mode=graph_mode)
-
-    processed = 0
-    skipped: list[str] = []
+    graph = build_ingestion_graph(checkpointer, mode=graph_mode, stage_gates=_stage_gates())
 
     active_docs = docs if docs else input_docs
-    for idx, doc in enumerate(active_docs, start=1):
+    doc_slots = asyncio.Semaphore(_env_concurrency("TPA_INGEST_DOC_CONCURRENCY", 4))
+    progress = {"total": len(active_docs), "processed": 0, "failed": 0, "skipped": 0, "in_flight": 0}
+
+    async def _run_document(idx: int, doc: dict[str, Any]) -> tuple[str, str | None]:
         if docs:
             blob_path = doc.get("raw_blob_path")
             if not blob_path:
-                skipped.append(str(doc.get("id")))
-                continue
-            file_bytes, _, err = read_blob_bytes(blob_path)
+                return "skipped", str(doc.get("id"))
+            file_bytes, _, err = await asyncio.to_thread(read_blob_bytes, blob_path)
             if err or not file_bytes:
-                failures.append(f"{doc.get('id')}: {err}")
-                continue
+                return "failed", f"{doc.get('id')}: {err}"
             filename = blob_path.split("/")[-1]
             doc_metadata = doc.get("metadata") or {}
             source_url = doc.get("raw_source_uri")
@@ -174,8 +192,7 @@ async def run_graph_for_job(job_id: str) -> dict[str, object]:
         else:
             file_bytes = doc.get("file_bytes")
             if not file_bytes:
-                failures.append(f"empty_payload:{doc.get('filename') or idx}")
-                continue
+                return "failed", f"empty_payload:{doc.get('filename') or idx}"
             filename = doc.get("filename") or f"document-{idx}.pdf"
             doc_metadata = doc.get("metadata") or {}
             source_url = doc.get("source_url") or doc.get("raw_source_uri")
@@ -201,11 +218,46 @@ async def run_graph_for_job(job_id: str) -> dict[str, object]:
         }
 
         config = {"configurable": {"thread_id": thread_id}}
-        final_state = await graph.ainvoke(initial_state, config)
+        try:
+            final_state = await graph.ainvoke(initial_state, config)
+        except Exception as exc:  # noqa: BLE001
+            return "failed", f"{thread_id}: {type(exc).__name__}: {exc}"
         if isinstance(final_state, dict) and final_state.get("error"):
-            failures.append(f"{thread_id}: {final_state.get('error')}")
-            continue
-        processed += 1
+            return "failed", f"{thread_id}: {final_state.get('error')}"
+        return "processed", None
+
+    async def _bounded(idx: int, doc: dict[str, Any]) -> tuple[str, str | None]:
+        async with doc_slots:
+            progress["in_flight"] += 1
+            try:
+                outcome = await _run_document(idx, doc)
+            finally:
+                progress["in_flight"] -= 1
+            progress[outcome[0]] += 1
+            await asyncio.to_thread(
+                _update_run_step_progress, run_id=run_id, step_name="documents", outputs=dict(progress)
+            )
+            return outcome
+
+    # Documents run concurrently up to TPA_INGEST_DOC_CONCURRENCY; each one's failure is recorded
+    # against that document only. Results are collected in input order.
+    outcomes = await asyncio.gather(*(_bounded(idx, doc) for idx, doc in enumerate(active_docs, start=1)))
+
+    processed = 0
+    skipped: list[str] = []
+    for outcome, detail in outcomes:
+        if outcome == "processed":
+            processed += 1
+        elif outcome == "skipped":
+            skipped.append(str(detail))
+        else:
+            failures.append(str(detail))
+    _update_run_step_progress(
+        run_id=run_id,
+        step_name="documents",
+        outputs=dict(progress),
+        status="error" if progress["failed"] or progress["skipped"] else "success",
+    )
 
     if queue_mode == "separated" and not failures and not skipped:
         from celery import chain  # noqa: PLC0415
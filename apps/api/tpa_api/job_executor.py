@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import heapq
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+
+logger = logging.getLogger(__name__)
+
+# In-process background jobs keyed by the thing they refresh (e.g. a scenario tab id). At most one job
+# per key is queued and at most one runs: a second request for a queued key is coalesced into it (keeping
+# the higher priority), and a request for a running key whose `input_key` differs cancels the running
+# job (cooperatively, via the `should_cancel` callable handed to it) and queues a rerun. Workers are a
+# fixed bounded set of daemon threads; lower `priority` values run first, FIFO within a priority.
+
+
+class JobCancelled(Exception):
+    """Raised by a job that observed `should_cancel()` (it was superseded or the executor stopped)."""
+
+
+@dataclass
+class _Job:
+    key: str
+    priority: int
+    seq: int
+    input_key: str | None
+    enqueued_at: float
+    cancel_event: threading.Event = field(default_factory=threading.Event)
+    started_at: float | None = None
+
+
+class CoalescingJobExecutor:
+    def __init__(
+        self,
+        name: str,
+        run: Callable[[str, Callable[[], bool]], Any],
+        *,
+        max_workers: int = 2,
+        max_queue: int = 1000,
+    ) -> None:
+        self.name = name
+        self._run_job = run
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(1, max_queue)
+        self._lock = threading.Condition()
+        self._heap: list[tuple[int, int, str]] = []
+        self._queued: dict[str, _Job] = {}
+        self._running: dict[str, _Job] = {}
+        self._seq = 0
+        self._stopped = False
+        self._threads: list[threading.Thread] = []
+        self._stats = {
+            "submitted": 0,
+            "coalesced": 0,
+            "superseded": 0,
+            "rejected": 0,
+            "completed": 0,
+            "cancelled": 0,
+            "failed": 0,
+        }
+        self._last_run_seconds: float | None = None
+
+    def submit(self, key: str, *, priority: int = 1, input_key: str | None = None) -> str:
+        """
+        Queue a job for `key`. Returns "queued", "coalesced" (merged into a queued or running job),
+        "superseded" (the running job was cancelled and a rerun queued) or "rejected" (queue full).
+        """
+        with self._lock:
+            self._stats["submitted"] += 1
+            queued = self._queued.get(key)
+            if queued is not None:
+                self._stats["coalesced"] += 1
+                if input_key is not None:
+                    queued.input_key = input_key
+                if priority < queued.priority:
+                    queued.priority = priority
+                    queued.seq = self._next_seq()
+                    heapq.heappush(self._heap, (queued.priority, queued.seq, key))
+                    self._lock.notify()
+                return "coalesced"
+
+            outcome = "queued"
+            running = self._running.get(key)
+            if running is not None:
+                if input_key is None or input_key == running.input_key:
+                    self._stats["coalesced"] += 1
+                    return "coalesced"
+                running.cancel_event.set()
+                self._stats["superseded"] += 1
+                outcome = "superseded"
+            elif len(self._queued) >= self.max_queue:
+                self._stats["rejected"] += 1
+                return "rejected"
+
+            job = _Job(key=key, priority=priority, seq=self._next_seq(), input_key=input_key, enqueued_at=time.monotonic())
+            self._queued[key] = job
+            heapq.heappush(self._heap, (job.priority, job.seq, key))
+            self._ensure_workers()
+            self._lock.notify()
+            return outcome
+
+    def is_tracking(self, key: str) -> bool:
+        with self._lock:
+            return key in self._queued or key in self._running
+
+    def _next_seq(self) -> int:
+        self._seq += 1
+        return self._seq
+
+    def _ensure_workers(self) -> None:
+        self._threads = [t for t in self._threads if t.is_alive()]
+        while len(self._threads) < self.max_workers:
+            thread = threading.Thread(
+                target=self._worker, name=f"{self.name}-{len(self._threads)}", daemon=True
+            )
+            self._threads.append(thread)
+            thread.start()
+
+    def _next_job(self) -> _Job | None:
+        """Pop the best runnable job; caller holds the lock. Keys still running wait their turn."""
+        deferred: list[tuple[int, int, str]] = []
+        job = None
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            candidate = self._queued.get(entry[2])
+            if candidate is None or candidate.seq != entry[1]:
+                continue  # stale entry left behind by a priority bump
+            if candidate.key in self._running:
+                deferred.append(entry)
+                continue
+            job = candidate
+            break
+        for entry in deferred:
+            heapq.heappush(self._heap, entry)
+        return job
+
+    def _worker(self) -> None:
+        while True:
+            with self._lock:
+                job = self._next_job()
+                while job is None and not self._stopped:
+                    self._lock.wait()
+                    job = self._next_job()
+                if self._stopped:
+                    return
+                del self._queued[job.key]
+                self._running[job.key] = job
+                job.started_at = time.monotonic()
+            try:
+                self._run_job(job.key, job.cancel_event.is_set)
+                outcome = "completed"
+            except JobCancelled:
+                outcome = "cancelled"
+            except Exception:  # noqa: BLE001
+                logger.exception("%s job %s failed.", self.name, job.key)
+                outcome = "failed"
+            with self._lock:
+                self._running.pop(job.key, None)
+                self._stats[outcome] += 1
+                self._last_run_seconds = time.monotonic() - (job.started_at or time.monotonic())
+                # A rerun of this key may have been deferred while it ran.
+                self._lock.notify_all()
+
+    def shutdown(self) -> None:
+        """Stop taking jobs and ask running ones to cancel; queued keys are dropped (callers recover them)."""
+        with self._lock:
+            self._stopped = True
+            for job in self._running.values():
+                job.cancel_event.set()
+            self._lock.notify_all()
+
+    def stats(self) -> dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            by_priority: dict[int, int] = {}
+            for job in self._queued.values():
+                by_priority[job.priority] = by_priority.get(job.priority, 0) + 1
+            oldest = min((job.enqueued_at for job in self._queued.values()), default=None)
+            return {
+                **self._stats,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queue_depth": len(self._queued),
+                "queue_by_priority": {str(p): n for p, n in sorted(by_priority.items())},
+                "oldest_queued_seconds": round(now - oldest, 3) if oldest is not None else None,
+                "running": len(self._running),
+                "running_seconds": {
+                    key: round(now - (job.started_at or now), 3) for key, job in self._running.items()
+                },
+                "last_run_seconds": round(self._last_run_seconds, 3) if self._last_run_seconds is not None else None,
+            }
+
+
+_executors: dict[str, CoalescingJobExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def get_job_executor(
+    name: str,
+    run: Callable[[str, Callable[[], bool]], Any],
+    *,
+    max_workers: int,
+    max_queue: int,
+) -> CoalescingJobExecutor:
+    with _executors_lock:
+        executor = _executors.get(name)
+        if executor is None:
+            executor = CoalescingJobExecutor(name, run, max_workers=max_workers, max_queue=max_queue)
+            _executors[name] = executor
+        return executor
+
+
+def shutdown_job_executors() -> None:
+    with _executors_lock:
+        executors = list(_executors.values())
+    for executor in executors:
+        executor.shutdown()
+
+
+def job_executor_stats() -> dict[str, Any]:
+    with _executors_lock:
+        executors = dict(_executors)
+    return {name: executor.stats() for name, executor in executors.items()}
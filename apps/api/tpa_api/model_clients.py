@@ -1,13 +1,25 @@
 from __future__ import annotations
 
+import asyncio
 import base64
+import contextvars
+import functools
 import json
+import logging
 import os
+import threading
 import time
-from typing import Any
+from typing import Any, Callable, TypeVar
 
 import httpx
 
+from .http_clients import _model_post
+from .model_leases import get_model_lease, grant_model_lease
+
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
 
 def _llm_model_id() -> str:
     return os.environ.get("TPA_LLM_MODEL_ID") or os.environ.get("TPA_LLM_MODEL") or "openai/gpt-oss-20b"
@@ -24,25 +36,122 @@ def _model_supervisor_headers() -> dict[str, str]:
     return {"x-tpa-model-supervisor-token": token}
 
 
+# Scheduled-mode supervisor leases held by the current request. In scheduled mode every `/ensure`
+# grant is an in-flight lease that keeps the supervisor from swapping the role out; functions
+# decorated with `_holds_model_leases` keep the leases they acquire alive (a renewal thread per
+# lease) until they return and then release them. A grant made outside such a scope is left to
+# expire after `lease_seconds`.
+_held_leases: contextvars.ContextVar[list[threading.Event] | None] = contextvars.ContextVar(
+    "tpa_held_model_leases", default=None
+)
+
+
+def _supervisor_post(path: str, payload: dict[str, Any]) -> dict[str, Any] | None:
+    supervisor = os.environ.get("TPA_MODEL_SUPERVISOR_URL")
+    if not supervisor:
+        return None
+    try:
+        resp = _model_post("supervisor", supervisor.rstrip("/") + path, json=payload, headers=_model_supervisor_headers(), timeout=10.0)
+        resp.raise_for_status()
+        data = resp.json()
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("model supervisor %s failed: %s", path, exc)
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _keep_scheduled_lease(role: str, lease_id: str, lease_seconds: int, done: threading.Event) -> None:
+    interval = max(0.5, lease_seconds / 3)
+    while not done.wait(interval):
+        data = _supervisor_post("/renew", {"lease_id": lease_id})
+        if not (data and data.get("renewed")):
+            logger.warning("model lease %s for role %s could not be renewed", lease_id, role)
+            break
+    done.wait()
+    _supervisor_post("/release", {"lease_id": lease_id})
+
+
+def _hold_scheduled_lease(role: str, lease_id: str, lease_seconds: int) -> None:
+    held = _held_leases.get()
+    if held is None:
+        return
+    done = threading.Event()
+    held.append(done)
+    threading.Thread(target=_keep_scheduled_lease, args=(role, lease_id, lease_seconds, done), daemon=True).start()
+
+
+def _release_held_leases(held: list[threading.Event]) -> None:
+    for done in held:
+        done.set()
+
+
+def _holds_model_leases(fn: F) -> F:
+    """
+    Hold every scheduled-mode lease acquired inside `fn` until it returns.
+
+    Leases are renewed while the model call runs (LLM/VLM reads can outlast `lease_seconds`) and
+    released in a `finally`, so the supervisor never swaps a role out mid-request and can swap as
+    soon as the last request for it is done.
+    """
+    if asyncio.iscoroutinefunction(fn):
+
+        @functools.wraps(fn)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            held: list[threading.Event] = []
+            token = _held_leases.set(held)
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                _held_leases.reset(token)
+                _release_held_leases(held)
+
+        return async_wrapper  # type: ignore[return-value]
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        held: list[threading.Event] = []
+        token = _held_leases.set(held)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _held_leases.reset(token)
+            _release_held_leases(held)
+
+    return wrapper  # type: ignore[return-value]
+
+
+def _lease_from_ensure(role: str, data: Any) -> str | None:
+    base_url = data.get("base_url") if isinstance(data, dict) else None
+    if not (isinstance(base_url, str) and base_url.startswith("http")):
+        return None
+    lease_seconds = data.get("lease_seconds")
+    lease_id = data.get("lease_id")
+    if isinstance(lease_id, str) and lease_id:
+        # Scheduled mode: the grant is per request, so it is held (not cached for other callers).
+        _hold_scheduled_lease(role, lease_id, lease_seconds if isinstance(lease_seconds, int) and lease_seconds > 0 else 60)
+        return base_url
+    grant_model_lease(role, base_url, lease_seconds=lease_seconds if isinstance(lease_seconds, int) else None)
+    return base_url
+
+
 def _ensure_model_role_sync(*, role: str, timeout_seconds: float = 180.0) -> str | None:
     supervisor = os.environ.get("TPA_MODEL_SUPERVISOR_URL")
     if not supervisor:
         return None
 
+    leased = get_model_lease(role)
+    if leased:
+        return leased
+
     url = supervisor.rstrip("/") + "/ensure"
-    timeout = None
     try:
-        with httpx.Client(timeout=timeout) as client:
-            resp = client.post(url, json={"role": role}, headers=_model_supervisor_headers())
-            resp.raise_for_status()
-            data = resp.json()
+        resp = _model_post("supervisor", url, json={"role": role}, headers=_model_supervisor_headers())
+        resp.raise_for_status()
+        data = resp.json()
     except Exception:  # noqa: BLE001
         return None
 
-    base_url = data.get("base_url") if isinstance(data, dict) else None
-    if isinstance(base_url, str) and base_url.startswith("http"):
-        return base_url
-    return None
+    return _lease_from_ensure(role, data)
 
 
 def _resolve_model_base_url_sync(
@@ -70,6 +179,10 @@ async def _ensure_model_role(*, role: str, timeout_seconds: float = 180.0) -> st
     if not supervisor:
         return None
 
+    leased = get_model_lease(role)
+    if leased:
+        return leased
+
     url = supervisor.rstrip("/") + "/ensure"
     timeout = None
     try:
@@ -80,10 +193,7 @@ async def _ensure_model_role(*, role: str, timeout_seconds: float = 180.0) -> st
     except Exception:  # noqa: BLE001
         return None
 
-    base_url = data.get("base_url") if isinstance(data, dict) else None
-    if isinstance(base_url, str) and base_url.startswith("http"):
-        return base_url
-    return None
+    return _lease_from_ensure(role, data)
 
 
 def _strip_json_fence(text: str) -> str:
@@ -106,6 +216,7 @@ def _extract_json(text: str) -> dict[str, Any] | None:
         return None
 
 
+@_holds_model_leases
 def _vlm_json_sync(
     *,
     prompt: str,
@@ -117,7 +228,6 @@ def _vlm_json_sync(
         return None, ["vlm_unconfigured"]
 
     model = model_id or _vlm_model_id()
-    timeout = None
     data_url = "data:image/png;base64," + base64.b64encode(image_bytes).decode("ascii")
     payload = {
         "model": model,
@@ -133,10 +243,9 @@ def _vlm_json_sync(
     }
     url = base_url.rstrip("/") + "/chat/completions"
     try:
-        with httpx.Client(timeout=timeout) as client:
-            resp = client.post(url, json=payload)
-            resp.raise_for_status()
-            data = resp.json()
+        resp = _model_post("vlm", url, json=payload)
+        resp.raise_for_status()
+        data = resp.json()
     except Exception as exc:  # noqa: BLE001
         return None, [f"vlm_request_failed:{exc}"]
     try:
@@ -149,6 +258,127 @@ def _vlm_json_sync(
     return obj, []
 
 
+# Remembered request dialect (URL + payload shape) per (kind, base URL). Model servers differ in
+# which OpenAI/TEI-style route they expose; probing every shape on every call costs failed round
+# trips, so the first shape that works is tried first next time and forgotten when it fails.
+_endpoint_dialects: dict[tuple[str, str], dict[str, Any]] = {}
+_endpoint_dialects_lock = threading.Lock()
+
+
+def _dialect_order(kind: str, url_base: str, count: int) -> list[int]:
+    with _endpoint_dialects_lock:
+        entry = _endpoint_dialects.get((kind, url_base))
+        first = entry.get("index") if entry else None
+    if not isinstance(first, int) or not 0 <= first < count:
+        return list(range(count))
+    return [first] + [i for i in range(count) if i != first]
+
+
+def _remember_dialect(kind: str, url_base: str, index: int, url: str) -> None:
+    with _endpoint_dialects_lock:
+        entry = _endpoint_dialects.setdefault((kind, url_base), {"index": None, "invalidations": 0})
+        if entry["index"] == index:
+            entry["hits"] += 1
+            return
+        entry.update({"index": index, "url": url, "learned_at": time.time(), "hits": 0})
+
+
+def _forget_dialect(kind: str, url_base: str, index: int) -> None:
+    with _endpoint_dialects_lock:
+        entry = _endpoint_dialects.get((kind, url_base))
+        if entry and entry["index"] == index:
+            entry.update({"index": None, "url": None, "learned_at": None, "hits": 0})
+            entry["invalidations"] += 1
+
+
+def model_endpoint_dialects() -> list[dict[str, Any]]:
+    with _endpoint_dialects_lock:
+        items = sorted((key, dict(entry)) for key, entry in _endpoint_dialects.items())
+    return [{"kind": kind, "base_url": url_base, **entry} for (kind, url_base), entry in items]
+
+
+def _post_with_dialects(
+    *,
+    kind: str,
+    role: str,
+    url_base: str,
+    candidates: list[tuple[str, dict[str, Any]]],
+    parse: Callable[[Any, str], tuple[Any, str | None]],
+) -> tuple[Any, str | None]:
+    """
+    Try `candidates` (remembered dialect first) until `parse(data, url)` returns a result.
+
+    Returns `(result, last_error)`; a remembered dialect that fails is invalidated so the next
+    call probes again.
+    """
+    last_err: str | None = None
+    order = _dialect_order(kind, url_base, len(candidates))
+    for idx in order:
+        url, payload = candidates[idx]
+        try:
+            resp = _model_post(role, url, json=payload)
+            if resp.status_code >= 400:
+                last_err = f"HTTP {resp.status_code}: {resp.text[:200]}"
+                _forget_dialect(kind, url_base, idx)
+                continue
+            data = resp.json()
+        except Exception as exc:  # noqa: BLE001
+            last_err = f"Request failed: {exc}"
+            _forget_dialect(kind, url_base, idx)
+            continue
+        result, err = parse(data, url)
+        if result is not None:
+            _remember_dialect(kind, url_base, idx, url)
+            return result, None
+        last_err = err
+        _forget_dialect(kind, url_base, idx)
+    return None, last_err
+
+
+def _parse_rerank_scores(data: Any, count: int) -> list[float] | None:
+    # Common shapes:
+    # - { results: [{ index, score | relevance_score }] }
+    # - { data: [{ index, score }] }
+    # - [ { index, score } ]
+    # - [score, score, ...]
+    if isinstance(data, dict) and isinstance(data.get("results"), list):
+        scores = [0.0 for _ in range(count)]
+        for item in data["results"]:
+            if not isinstance(item, dict):
+                continue
+            idx = item.get("index")
+            val = item.get("score") if isinstance(item.get("score"), (int, float)) else item.get("relevance_score")
+            if isinstance(idx, int) and isinstance(val, (int, float)) and 0 <= idx < len(scores):
+                scores[idx] = float(val)
+        return scores
+
+    if isinstance(data, dict) and isinstance(data.get("data"), list):
+        scores = [0.0 for _ in range(count)]
+        for item in data["data"]:
+            if not isinstance(item, dict):
+                continue
+            idx = item.get("index")
+            val = item.get("score")
+            if isinstance(idx, int) and isinstance(val, (int, float)) and 0 <= idx < len(scores):
+                scores[idx] = float(val)
+        return scores
+
+    if isinstance(data, list) and all(isinstance(x, dict) for x in data):
+        scores = [0.0 for _ in range(count)]
+        for item in data:
+            idx = item.get("index") if isinstance(item, dict) else None
+            val = item.get("score") if isinstance(item, dict) else None
+            if isinstance(idx, int) and isinstance(val, (int, float)) and 0 <= idx < len(scores):
+                scores[idx] = float(val)
+        return scores
+
+    if isinstance(data, list) and all(isinstance(x, (int, float)) for x in data):
+        return [float(x) for x in data]
+
+    return None
+
+
+@_holds_model_leases
 def _rerank_texts_sync(
     *,
     query: str,
@@ -160,7 +390,6 @@ def _rerank_texts_sync(
         return None
 
     model_id = model_id or os.environ.get("TPA_RERANKER_MODEL_ID", "Qwen/Qwen3-Reranker-4B")
-    timeout = None
     url_base = base_url.rstrip("/")
 
     docs = [{"id": str(i), "text": t} for i, t in enumerate(texts)]
@@ -170,58 +399,17 @@ def _rerank_texts_sync(
         (url_base + "/rerank", {"query": query, "texts": texts}),
     ]
 
-    for url, payload in payloads:
-        try:
-            with httpx.Client(timeout=timeout) as client:
-                resp = client.post(url, json=payload)
-                if resp.status_code >= 400:
-                    continue
-                data = resp.json()
-        except Exception:  # noqa: BLE001
-            continue
-
-        # Common shapes:
-        # - { results: [{ index, score | relevance_score }] }
-        # - { data: [{ index, score }] }
-        # - [ { index, score } ]
-        # - [score, score, ...]
-        if isinstance(data, dict) and isinstance(data.get("results"), list):
-            scores = [0.0 for _ in texts]
-            for item in data["results"]:
-                if not isinstance(item, dict):
-                    continue
-                idx = item.get("index")
-                val = item.get("score") if isinstance(item.get("score"), (int, float)) else item.get("relevance_score")
-                if isinstance(idx, int) and isinstance(val, (int, float)) and 0 <= idx < len(scores):
-                    scores[idx] = float(val)
-            return scores
-
-        if isinstance(data, dict) and isinstance(data.get("data"), list):
-            scores = [0.0 for _ in texts]
-            for item in data["data"]:
-                if not isinstance(item, dict):
-                    continue
-                idx = item.get("index")
-                val = item.get("score")
-                if isinstance(idx, int) and isinstance(val, (int, float)) and 0 <= idx < len(scores):
-                    scores[idx] = float(val)
-            return scores
-
-        if isinstance(data, list) and all(isinstance(x, dict) for x in data):
-            scores = [0.0 for _ in texts]
-            for item in data:
-                idx = item.get("index") if isinstance(item, dict) else None
-                val = item.get("score") if isinstance(item, dict) else None
-                if isinstance(idx, int) and isinstance(val, (int, float)) and 0 <= idx < len(scores):
-                    scores[idx] = float(val)
-            return scores
-
-        if isinstance(data, list) and all(isinstance(x, (int, float)) for x in data):
-            return [float(x) for x in data]
-
-    return None
+    scores, _ = _post_with_dialects(
+        kind="rerank",
+        role="reranker",
+        url_base=url_base,
+        candidates=payloads,
+        parse=lambda data, url: (_parse_rerank_scores(data, len(texts)), f"Unrecognized rerank response shape from {url}"),
+    )
+    return scores
 
 
+@_holds_model_leases
 async def _embed_texts(
     *,
     texts: list[str],
@@ -277,6 +465,33 @@ async def _embed_texts(
     return None
 
 
+def _parse_text_embeddings(data: Any, url: str, count: int) -> tuple[list[list[float]] | None, str | None]:
+    if isinstance(data, dict) and isinstance(data.get("data"), list):
+        out: list[list[float]] = []
+        for item in data["data"]:
+            emb = item.get("embedding") if isinstance(item, dict) else None
+            if isinstance(emb, list):
+                out.append([float(x) for x in emb if isinstance(x, (int, float))])
+        if len(out) == count:
+            return out, None
+        return None, f"Mismatched embedding count: expected {count}, got {len(out)} from {url}"
+
+    if isinstance(data, dict) and isinstance(data.get("embeddings"), list):
+        embs = data["embeddings"]
+        if all(isinstance(e, list) for e in embs):
+            if len(embs) == count:
+                return [[float(x) for x in e if isinstance(x, (int, float))] for e in embs], None
+            return None, f"Mismatched embedding count (flat): expected {count}, got {len(embs)} from {url}"
+
+    if isinstance(data, list) and all(isinstance(e, list) for e in data):
+        if len(data) == count:
+            return [[float(x) for x in e if isinstance(x, (int, float))] for e in data], None
+        return None, f"Mismatched embedding count (list): expected {count}, got {len(data)} from {url}"
+
+    return None, f"Unrecognized embedding response shape from {url}: {str(data)[:200]}"
+
+
+@_holds_model_leases
 def _embed_texts_sync(
     *,
     texts: list[str],
@@ -287,7 +502,6 @@ def _embed_texts_sync(
         return None
 
     model_id = model_id or os.environ.get("TPA_EMBEDDINGS_MODEL_ID", "Qwen/Qwen3-Embedding-8B")
-    timeout = None
     url_base = base_url.rstrip("/")
 
     candidates: list[tuple[str, dict[str, Any]]] = [
@@ -296,52 +510,41 @@ def _embed_texts_sync(
         (url_base + "/embed", {"inputs": texts}),
     ]
 
-    last_err: str | None = None
-    for url, payload in candidates:
-        try:
-            with httpx.Client(timeout=timeout) as client:
-                resp = client.post(url, json=payload)
-                if resp.status_code >= 400:
-                    last_err = f"HTTP {resp.status_code}: {resp.text[:200]}"
-                    continue
-                data = resp.json()
-        except Exception as exc:  # noqa: BLE001
-            last_err = f"Request failed: {exc}"
-            continue
+    embeddings, last_err = _post_with_dialects(
+        kind="embeddings",
+        role="embeddings",
+        url_base=url_base,
+        candidates=candidates,
+        parse=lambda data, url: _parse_text_embeddings(data, url, len(texts)),
+    )
+    if embeddings is None and last_err:
+        print(f"DEBUG: _embed_texts_sync failed. Last error: {last_err}", flush=True)
 
-        if isinstance(data, dict) and isinstance(data.get("data"), list):
-            out: list[list[float]] = []
-            for item in data["data"]:
-                emb = item.get("embedding") if isinstance(item, dict) else None
-                if isinstance(emb, list):
-                    out.append([float(x) for x in emb if isinstance(x, (int, float))])
-            if len(out) == len(texts):
-                return out
-            last_err = f"Mismatched embedding count: expected {len(texts)}, got {len(out)} from {url}"
-            continue
+    return embeddings
 
-        if isinstance(data, dict) and isinstance(data.get("embeddings"), list):
-            embs = data["embeddings"]
-            if all(isinstance(e, list) for e in embs):
-                if len(embs) == len(texts):
-                    return [[float(x) for x in e if isinstance(x, (int, float))] for e in embs]
-                last_err = f"Mismatched embedding count (flat): expected {len(texts)}, got {len(embs)} from {url}"
-            continue
 
-        if isinstance(data, list) and all(isinstance(e, list) for e in data):
-            if len(data) == len(texts):
-                return [[float(x) for x in e if isinstance(x, (int, float))] for e in data]
-            last_err = f"Mismatched embedding count (list): expected {len(texts)}, got {len(data)} from {url}"
-            continue
+def _parse_multimodal_embedding(data: Any) -> list[float] | None:
+    if isinstance(data, dict) and isinstance(data.get("data"), list) and data["data"]:
+        item = data["data"][0]
+        emb = item.get("embedding") if isinstance(item, dict) else None
+        if isinstance(emb, list):
+            return [float(x) for x in emb if isinstance(x, (int, float))]
 
-        last_err = f"Unrecognized embedding response shape from {url}: {str(data)[:200]}"
+    if isinstance(data, dict) and isinstance(data.get("embedding"), list):
+        return [float(x) for x in data["embedding"] if isinstance(x, (int, float))]
 
-    if last_err:
-        print(f"DEBUG: _embed_texts_sync failed. Last error: {last_err}", flush=True)
+    if isinstance(data, list) and data and all(isinstance(x, (int, float)) for x in data):
+        return [float(x) for x in data]
+
+    if isinstance(data, list) and data and isinstance(data[0], list):
+        emb = data[0]
+        if all(isinstance(x, (int, float)) for x in emb):
+            return [float(x) for x in emb]
 
     return None
 
 
+@_holds_model_leases
 def _embed_multimodal_sync(
     *,
     image_bytes: bytes,
@@ -359,7 +562,6 @@ def _embed_multimodal_sync(
         return None
 
     model_id = model_id or os.environ.get("TPA_EMBEDDINGS_MM_MODEL_ID", "nomic-ai/colnomic-embed-multimodal-7b")
-    timeout = None
     url_base = base_url.rstrip("/")
 
     data_url = "data:image/png;base64," + base64.b64encode(image_bytes).decode("ascii")
@@ -370,36 +572,17 @@ def _embed_multimodal_sync(
         (url_base + "/embed", {"inputs": [{"image": data_url, "text": text}]}),
     ]
 
-    for url, payload in payloads:
-        try:
-            with httpx.Client(timeout=timeout) as client:
-                resp = client.post(url, json=payload)
-                if resp.status_code >= 400:
-                    continue
-                data = resp.json()
-        except Exception:  # noqa: BLE001
-            continue
-
-        if isinstance(data, dict) and isinstance(data.get("data"), list) and data["data"]:
-            item = data["data"][0]
-            emb = item.get("embedding") if isinstance(item, dict) else None
-            if isinstance(emb, list):
-                return [float(x) for x in emb if isinstance(x, (int, float))]
-
-        if isinstance(data, dict) and isinstance(data.get("embedding"), list):
-            return [float(x) for x in data["embedding"] if isinstance(x, (int, float))]
-
-        if isinstance(data, list) and data and all(isinstance(x, (int, float)) for x in data):
-            return [float(x) for x in data]
-
-        if isinstance(data, list) and data and isinstance(data[0], list):
-            emb = data[0]
-            if all(isinstance(x, (int, float)) for x in emb):
-                return [float(x) for x in emb]
-
-    return None
+    vec, _ = _post_with_dialects(
+        kind="embeddings_mm",
+        role="embeddings_mm",
+        url_base=url_base,
+        candidates=payloads,
+        parse=lambda data, url: (_parse_multimodal_embedding(data), f"Unrecognized embedding response shape from {url}"),
+    )
+    return vec
 
 
+@_holds_model_leases
 def _generate_completion_sync(
     *,
     prompt: str,
@@ -413,7 +596,6 @@ def _generate_completion_sync(
         return None
 
     model_id = model_id or _llm_model_id()
-    timeout = None
     url = base_url.rstrip("/") + "/v1/chat/completions"
 
     messages = []
@@ -425,13 +607,12 @@ def _generate_completion_sync(
     _ = max_tokens
     _ = temperature
     try:
-        with httpx.Client(timeout=timeout) as client:
-            resp = client.post(url, json=payload, headers=_model_supervisor_headers())
-            if resp.status_code >= 400:
-                return None
-            data = resp.json()
-            if isinstance(data, dict) and "choices" in data and len(data["choices"]) > 0:
-                return data["choices"][0]["message"]["content"]
+        resp = _model_post("llm", url, json=payload, headers=_model_supervisor_headers())
+        if resp.status_code >= 400:
+            return None
+        data = resp.json()
+        if isinstance(data, dict) and "choices" in data and len(data["choices"]) > 0:
+            return data["choices"][0]["message"]["content"]
     except Exception:
         pass
     return None
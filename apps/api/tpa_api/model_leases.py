@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any
+
+from .cache import cache_delete, cache_get_json, cache_key, cache_set_json
+
+
+# Client-side leases on supervisor `/ensure` results. While a lease is valid the role is assumed
+# warm and callers use its base URL without a supervisor round trip. Leases live in the shared
+# cache (Redis when `TPA_REDIS_URL` is set, so API and worker processes agree) and are dropped when
+# the supervisor pushes an invalidation (it stopped the role), when a request to the leased URL
+# fails at the transport level, or when the TTL runs out.
+
+_stats_lock = threading.Lock()
+_stats: dict[str, int] = {"hits": 0, "misses": 0, "grants": 0, "invalidations": 0}
+
+
+def _lease_seconds() -> int:
+    try:
+        return max(0, int(os.environ.get("TPA_MODEL_LEASE_SECONDS", "60")))
+    except ValueError:
+        return 60
+
+
+def _lease_key(role: str) -> str:
+    return cache_key("model_lease", role)
+
+
+def _bump(name: str, amount: int = 1) -> None:
+    with _stats_lock:
+        _stats[name] += amount
+
+
+def get_model_lease(role: str) -> str | None:
+    if _lease_seconds() <= 0:
+        return None
+    lease = cache_get_json(_lease_key(role))
+    if isinstance(lease, dict) and isinstance(lease.get("base_url"), str):
+        expires_at = lease.get("expires_at")
+        if isinstance(expires_at, (int, float)) and expires_at > time.time():
+            _bump("hits")
+            return lease["base_url"]
+    _bump("misses")
+    return None
+
+
+def grant_model_lease(role: str, base_url: str, *, lease_seconds: int | None) -> None:
+    """
+    Cache an `/ensure` result. Only supervisors that advertise `lease_seconds` (and so push
+    invalidations) get leases; older supervisors keep the per-call round trip.
+    """
+    if not isinstance(lease_seconds, int):
+        return
+    ttl = min(_lease_seconds(), lease_seconds)
+    if ttl <= 0:
+        return
+    cache_set_json(
+        _lease_key(role),
+        {"role": role, "base_url": base_url, "granted_at": time.time(), "expires_at": time.time() + ttl},
+        ttl_seconds=ttl,
+    )
+    _bump("grants")
+
+
+def invalidate_model_leases(roles: list[str]) -> list[str]:
+    for role in roles:
+        cache_delete(_lease_key(role))
+    _bump("invalidations", len(roles))
+    return roles
+
+
+def model_lease_stats(roles: list[str] | None = None) -> dict[str, Any]:
+    with _stats_lock:
+        counts = dict(_stats)
+    leases = {}
+    for role in roles or []:
+        lease = cache_get_json(_lease_key(role))
+        if isinstance(lease, dict) and (lease.get("expires_at") or 0) > time.time():
+            leases[role] = {"base_url": lease.get("base_url"), "expires_in": round(lease["expires_at"] - time.time(), 1)}
+    return {"lease_seconds": _lease_seconds(), "leases": leases, **counts}
@@ -5,13 +5,13 @@ import os
 from typing import Any
 from uuid import uuid4
 
-import httpx
-
 from .db import _db_execute
-from .model_clients import _ensure_model_role_sync, _llm_model_id, _vlm_json_sync
+from .http_clients import _model_post
+from .model_clients import _ensure_model_role_sync, _holds_model_leases, _llm_model_id, _vlm_json_sync
 from .observability.phoenix import trace_span
 from .text_utils import _extract_json_object
 from .time_utils import _utc_now
+from .tool_runs import record_tool_run
 
 
 def _prompt_upsert(
@@ -47,6 +47,7 @@ def _prompt_upsert(
     )
 
 
+@_holds_model_leases
 def _llm_structured_sync(
     *,
     prompt_id: str,
@@ -73,7 +74,6 @@ def _llm_structured_sync(
         return None, None, ["llm_unconfigured"]
 
     model_id = model_id or _llm_model_id()
-    timeout = None
 
     _prompt_upsert(
         prompt_id=prompt_id,
@@ -115,10 +115,9 @@ def _llm_structured_sync(
     }
     with trace_span("llm.structured", span_attributes) as span:
         try:
-            with httpx.Client(timeout=timeout) as client:
-                resp = client.post(url, json=payload)
-                resp.raise_for_status()
-                data = resp.json()
+            resp = _model_post("llm", url, json=payload)
+            resp.raise_for_status()
+            data = resp.json()
             raw_text = data["choices"][0]["message"]["content"]
             obj = _extract_json_object(raw_text)
             if not obj:
@@ -141,34 +140,23 @@ def _llm_structured_sync(
         "messages": payload.get("messages"),
     }
 
-    _db_execute(
-        """
-        INSERT INTO tool_runs (
-          id, ingest_batch_id, run_id, tool_name, inputs_logged, outputs_logged, status, started_at, ended_at, confidence_hint, uncertainty_note
-        )
-        VALUES (%s, %s::uuid, %s::uuid, %s, %s::jsonb, %s::jsonb, %s, %s, %s, %s, %s)
-        """,
-        (
-            tool_run_id,
-            ingest_batch_id,
-            run_id,
-            "llm_generate_structured",
-            json.dumps(inputs_logged, ensure_ascii=False),
-            json.dumps(
-                {
-                    "ok": obj is not None,
-                    "errors": errors[:10],
-                    "raw_text_preview": (raw_text or "")[:1200],
-                    "parsed_json": obj if obj is not None else None,
-                },
-                ensure_ascii=False,
-            ),
-            "success" if obj is not None and not errors else ("partial" if obj is not None else "error"),
-            started_at,
-            ended_at,
-            "medium" if obj is not None else "low",
-            "LLM outputs are non-deterministic; traceability is achieved by persisting move outputs and context bundles.",
-        ),
+    record_tool_run(
+        tool_run_id=tool_run_id,
+        tool_name="llm_generate_structured",
+        inputs=inputs_logged,
+        outputs={
+            "ok": obj is not None,
+            "errors": errors[:10],
+            "raw_text_preview": (raw_text or "")[:1200],
+            "parsed_json": obj if obj is not None else None,
+        },
+        status="success" if obj is not None and not errors else ("partial" if obj is not None else "error"),
+        started_at=started_at,
+        ended_at=ended_at,
+        confidence_hint="medium" if obj is not None else "low",
+        uncertainty_note="LLM outputs are non-deterministic; traceability is achieved by persisting move outputs and context bundles.",
+        run_id=run_id,
+        ingest_batch_id=ingest_batch_id,
     )
 
     return obj, tool_run_id, errors
@@ -222,43 +210,27 @@ def _vlm_structured_sync(
         if errors and span is not None:
             span.set_attribute("tpa.errors", ";".join(errors[:5]))
 
-    _db_execute(
-        """
-        INSERT INTO tool_runs (
-          id, ingest_batch_id, run_id, tool_name, inputs_logged, outputs_logged, status,
-          started_at, ended_at, confidence_hint, uncertainty_note
-        )
-        VALUES (%s, %s::uuid, %s::uuid, %s, %s::jsonb, %s::jsonb, %s, %s, %s, %s, %s)
-        """,
-        (
-            tool_run_id,
-            ingest_batch_id,
-            run_id,
-            "vlm_generate_structured",
-            json.dumps(
-                {
-                    "prompt_id": prompt_id,
-                    "prompt_version": prompt_version,
-                    "prompt_name": prompt_name,
-                    "purpose": purpose,
-                    "model_id": model_id,
-                },
-                ensure_ascii=False,
-            ),
-            json.dumps(
-                {
-                    "ok": obj is not None,
-                    "errors": errors[:10],
-                    "parsed_json": obj if obj is not None else None,
-                },
-                ensure_ascii=False,
-            ),
-            "success" if obj is not None and not errors else ("partial" if obj is not None else "error"),
-            started_at,
-            _utc_now(),
-            "medium" if obj is not None else "low",
-            "VLM outputs are non-deterministic; verify limitations and trace to tool runs.",
-        ),
+    record_tool_run(
+        tool_run_id=tool_run_id,
+        tool_name="vlm_generate_structured",
+        inputs={
+            "prompt_id": prompt_id,
+            "prompt_version": prompt_version,
+            "prompt_name": prompt_name,
+            "purpose": purpose,
+            "model_id": model_id,
+        },
+        outputs={
+            "ok": obj is not None,
+            "errors": errors[:10],
+            "parsed_json": obj if obj is not None else None,
+        },
+        status="success" if obj is not None and not errors else ("partial" if obj is not None else "error"),
+        started_at=started_at,
+        confidence_hint="medium" if obj is not None else "low",
+        uncertainty_note="VLM outputs are non-deterministic; verify limitations and trace to tool runs.",
+        run_id=run_id,
+        ingest_batch_id=ingest_batch_id,
     )
 
     return obj, tool_run_id, errors
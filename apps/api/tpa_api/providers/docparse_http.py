@@ -9,11 +9,11 @@ from datetime import datetime
 from typing import Any
 from uuid import uuid4
 
-import httpx
-
 from tpa_api.db import _db_execute
+from tpa_api.http_clients import _model_post
 from tpa_api.providers.docparse import DocParseProvider
 from tpa_api.time_utils import _utc_now
+from tpa_api.tool_runs import record_tool_run
 
 
 class HttpDocParseProvider(DocParseProvider):
@@ -39,30 +39,17 @@ class HttpDocParseProvider(DocParseProvider):
         run_id: str | None = None,
         ingest_batch_id: str | None = None,
     ) -> str:
-        tool_run_id = str(uuid4())
-        _db_execute(
-            """
-            INSERT INTO tool_runs (
-              id, tool_name, inputs_logged, outputs_logged, status,
-              started_at, ended_at, confidence_hint, uncertainty_note, run_id, ingest_batch_id
-            )
-            VALUES (%s, %s, %s::jsonb, %s::jsonb, %s, %s, %s, %s, %s, %s::uuid, %s::uuid)
-            """,
-            (
-                tool_run_id,
-                tool_name,
-                json.dumps(inputs, default=str),
-                json.dumps(outputs, default=str),
-                status,
-                started_at,
-                _utc_now(),
-                confidence_hint,
-                uncertainty_note,
-                run_id,
-                ingest_batch_id,
-            ),
+        return record_tool_run(
+            tool_name=tool_name,
+            inputs=inputs,
+            outputs=outputs,
+            status=status,
+            started_at=started_at,
+            confidence_hint=confidence_hint,
+            uncertainty_note=uncertainty_note,
+            run_id=run_id,
+            ingest_batch_id=ingest_batch_id,
         )
-        return tool_run_id
 
     def parse_document(
         self,
@@ -165,10 +152,9 @@ class HttpDocParseProvider(DocParseProvider):
             files = {"file": (filename, io.BytesIO(file_bytes), "application/pdf")}
             data = {"metadata": json.dumps(metadata, ensure_ascii=False, default=str)}
 
-            with httpx.Client(timeout=None) as client:
-                resp = client.post(url, files=files, data=data)
-                resp.raise_for_status()
-                payload = resp.json()
+            resp = _model_post("docparse", url, files=files, data=data)
+            resp.raise_for_status()
+            payload = resp.json()
 
             outputs_logged = {
                 "parse_bundle_path": payload.get("parse_bundle_path"),
@@ -1,17 +1,14 @@
 from __future__ import annotations
 
-import json
 import os
 from datetime import datetime
 from typing import Any
-from uuid import uuid4
 
-import httpx
-
-from tpa_api.db import _db_execute
-from tpa_api.model_clients import _llm_model_id, _resolve_model_base_url_sync
+from tpa_api.http_clients import _model_post
+from tpa_api.model_clients import _holds_model_leases, _llm_model_id, _resolve_model_base_url_sync
 from tpa_api.providers.llm import LLMProvider
 from tpa_api.time_utils import _utc_now
+from tpa_api.tool_runs import record_tool_run
 from tpa_api.text_utils import _extract_json_object
 
 
@@ -37,33 +34,19 @@ class OpenAILLMProvider(LLMProvider):
         run_id: str | None = None,
         ingest_batch_id: str | None = None,
     ) -> str:
-        tool_run_id = str(uuid4())
-        inputs_json = json.dumps(inputs, ensure_ascii=False, default=str)
-        outputs_json = json.dumps(outputs, ensure_ascii=False, default=str)
-        _db_execute(
-            """
-            INSERT INTO tool_runs (
-              id, tool_name, inputs_logged, outputs_logged, status,
-              started_at, ended_at, confidence_hint, uncertainty_note, run_id, ingest_batch_id
-            )
-            VALUES (%s, %s, %s::jsonb, %s::jsonb, %s, %s, %s, %s, %s, %s::uuid, %s::uuid)
-            """,
-            (
-                tool_run_id,
-                tool_name,
-                inputs_json,
-                outputs_json,
-                status,
-                started_at,
-                _utc_now(),
-                confidence_hint,
-                uncertainty_note,
-                run_id,
-                ingest_batch_id,
-            ),
+        return record_tool_run(
+            tool_name=tool_name,
+            inputs=inputs,
+            outputs=outputs,
+            status=status,
+            started_at=started_at,
+            confidence_hint=confidence_hint,
+            uncertainty_note=uncertainty_note,
+            run_id=run_id,
+            ingest_batch_id=ingest_batch_id,
         )
-        return tool_run_id
 
+    @_holds_model_leases
     def generate_structured(
         self,
         messages: list[dict[str, str]],
@@ -118,10 +101,9 @@ class OpenAILLMProvider(LLMProvider):
         }
 
         try:
-            with httpx.Client(timeout=180.0) as client:
-                resp = client.post(url, json=payload)
-                resp.raise_for_status()
-                data = resp.json()
+            resp = _model_post("llm", url, json=payload, timeout=180.0)
+            resp.raise_for_status()
+            data = resp.json()
 
             choice = data["choices"][0]
             raw_text = choice["message"]["content"]
@@ -1,17 +1,15 @@
 from __future__ import annotations
 
 import io
-import json
 import mimetypes
 import os
 from datetime import datetime
 from typing import Any
-from uuid import uuid4
 
 from tpa_api.blob_store import minio_client_or_none
-from tpa_api.db import _db_execute
 from tpa_api.providers.base import BlobStoreProvider
 from tpa_api.time_utils import _utc_now
+from tpa_api.tool_runs import record_tool_run
 
 
 class MinIOBlobStoreProvider(BlobStoreProvider):
@@ -42,30 +40,17 @@ class MinIOBlobStoreProvider(BlobStoreProvider):
         run_id: str | None = None,
         ingest_batch_id: str | None = None,
     ) -> str:
-        tool_run_id = str(uuid4())
         inputs_payload = inputs if os.environ.get("TPA_LOG_S3_INPUTS") == "true" else {}
-        _db_execute(
-            """
-            INSERT INTO tool_runs (
-              id, tool_name, inputs_logged, outputs_logged, status,
-              started_at, ended_at, uncertainty_note, run_id, ingest_batch_id
-            )
-            VALUES (%s, %s, %s::jsonb, %s::jsonb, %s, %s, %s, %s, %s::uuid, %s::uuid)
-            """,
-            (
-                tool_run_id,
-                tool_name,
-                json.dumps(inputs_payload, default=str),
-                json.dumps(outputs, default=str),
-                status,
-                started_at,
-                _utc_now(),
-                error_text,
-                run_id,
-                ingest_batch_id,
-            ),
+        return record_tool_run(
+            tool_name=tool_name,
+            inputs=inputs_payload,
+            outputs=outputs,
+            status=status,
+            started_at=started_at,
+            uncertainty_note=error_text,
+            run_id=run_id,
+            ingest_batch_id=ingest_batch_id,
         )
-        return tool_run_id
 
     def put_blob(
         self,
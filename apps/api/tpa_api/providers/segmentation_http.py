@@ -9,12 +9,12 @@ from datetime import datetime
 from typing import Any
 from uuid import uuid4
 
-import httpx
-
 from tpa_api.db import _db_execute
-from tpa_api.model_clients import _resolve_model_base_url_sync
+from tpa_api.http_clients import _model_post
+from tpa_api.model_clients import _holds_model_leases, _resolve_model_base_url_sync
 from tpa_api.providers.segmentation import SegmentationProvider
 from tpa_api.time_utils import _utc_now
+from tpa_api.tool_runs import record_tool_run
 
 
 class HttpSegmentationProvider(SegmentationProvider):
@@ -39,31 +39,19 @@ class HttpSegmentationProvider(SegmentationProvider):
         run_id: str | None = None,
         ingest_batch_id: str | None = None,
     ) -> str:
-        tool_run_id = str(uuid4())
-        _db_execute(
-            """
-            INSERT INTO tool_runs (
-              id, tool_name, inputs_logged, outputs_logged, status,
-              started_at, ended_at, confidence_hint, uncertainty_note, run_id, ingest_batch_id
-            )
-            VALUES (%s, %s, %s::jsonb, %s::jsonb, %s, %s, %s, %s, %s, %s::uuid, %s::uuid)
-            """,
-            (
-                tool_run_id,
-                tool_name,
-                json.dumps(inputs, default=str),
-                json.dumps(outputs, default=str),
-                status,
-                started_at,
-                _utc_now(),
-                confidence_hint,
-                uncertainty_note,
-                run_id,
-                ingest_batch_id,
-            ),
+        return record_tool_run(
+            tool_name=tool_name,
+            inputs=inputs,
+            outputs=outputs,
+            status=status,
+            started_at=started_at,
+            confidence_hint=confidence_hint,
+            uncertainty_note=uncertainty_note,
+            run_id=run_id,
+            ingest_batch_id=ingest_batch_id,
         )
-        return tool_run_id
 
+    @_holds_model_leases
     def segment(
         self,
         image: bytes,
@@ -168,10 +156,9 @@ class HttpSegmentationProvider(SegmentationProvider):
             if tool_run_inserted:
                 threading.Thread(target=_heartbeat, daemon=True).start()
 
-            with httpx.Client(timeout=None) as client:
-                resp = client.post(url, json=payload)
-                resp.raise_for_status()
-                data = resp.json()
+            resp = _model_post("segmentation", url, json=payload)
+            resp.raise_for_status()
+            data = resp.json()
 
             outputs_logged = {
                 "mask_count": len(data.get("masks") or []),
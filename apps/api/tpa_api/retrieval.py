@@ -1,16 +1,18 @@
 from __future__ import annotations
 
-import json
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
-from uuid import uuid4
 
 from fastapi import HTTPException
 
-from .db import _db_execute, _db_fetch_all
-from .model_clients import _embed_texts_sync, _rerank_texts_sync
+from .db import _db_fetch_all
+from .embedding_cache import _embed_texts_cached_sync
+from .model_clients import _rerank_texts_sync
 from .time_utils import _utc_now
+from .tool_runs import record_tool_run
+from .vector_index import _fetch_ann_rows, ann_candidate_limit, ann_dimension_sql, ann_order_sql, default_ef_search
 from .vector_utils import _vector_literal
 
 
@@ -145,295 +147,426 @@ def _gather_draft_evidence(
     return out
 
 
-def _retrieve_chunks_hybrid_sync(
+# Per unit kind: the candidate FROM clause (must expose `d` = documents for the scope filters), and
+# the columns/joins materialised for the fused top rows only.
+_HYBRID_KINDS: dict[str, dict[str, Any]] = {
+    "chunk": {
+        "unit_type": "chunk",
+        "id_key": "chunk_id",
+        "alias": "c",
+        "from_sql": "chunks c JOIN documents d ON d.id = c.document_id",
+        "detail_sql": """
+          c.page_number,
+          c.section_path,
+          LEFT(c.text, 800) AS snippet,
+          er.source_type,
+          er.source_id,
+          er.fragment_id AS fragment_id,
+          d.metadata->>'title' AS document_title""",
+        "detail_from_sql": """
+        JOIN chunks c ON c.id = r.unit_id
+        JOIN documents d ON d.id = c.document_id
+        LEFT JOIN evidence_refs er ON er.id = c.evidence_ref_id""",
+        "tool_name": "retrieve_chunks_hybrid",
+        "rerank_tool_name": "rerank_chunks",
+    },
+    "policy_clause": {
+        "unit_type": "policy_clause",
+        "id_key": "policy_clause_id",
+        "alias": "pc",
+        "from_sql": (
+            "policy_clauses pc JOIN policy_sections ps ON ps.id = pc.policy_section_id "
+            "JOIN documents d ON d.id = ps.document_id"
+        ),
+        "detail_sql": """
+          pc.clause_ref,
+          ps.section_path AS section_path,
+          pc.speech_act_jsonb AS speech_act,
+          LEFT(pc.text, 800) AS snippet,
+          ps.id AS policy_section_id,
+          ps.policy_code AS policy_code,
+          ps.title AS policy_title,
+          d.metadata->>'title' AS document_title""",
+        "detail_from_sql": """
+        JOIN policy_clauses pc ON pc.id = r.unit_id
+        JOIN policy_sections ps ON ps.id = pc.policy_section_id
+        JOIN documents d ON d.id = ps.document_id""",
+        "tool_name": "retrieve_policy_clauses_hybrid",
+        "rerank_tool_name": "rerank_policy_clauses",
+    },
+}
+
+
+def _rerank_concurrency() -> int:
+    try:
+        return max(1, int(os.environ.get("TPA_RERANK_CONCURRENCY", "4")))
+    except ValueError:
+        return 4
+
+
+def _hybrid_scope_where(kind: str, *, authority_id: str | None, plan_cycle_id: str | None) -> tuple[str, list[Any]]:
+    where: list[str] = ["d.is_active = true"]
+    params: list[Any] = []
+    if authority_id:
+        where.append("d.authority_id = %s")
+        params.append(authority_id)
+    if plan_cycle_id:
+        where.append("d.plan_cycle_id = %s::uuid")
+        params.append(plan_cycle_id)
+        if kind == "policy_clause":
+            # Default to the latest completed ingest batch for this plan cycle to avoid mixing parse versions.
+            where.append(
+                """
+                d.ingest_batch_id = (
+                  SELECT ib.id
+                  FROM ingest_batches ib
+                  WHERE ib.plan_cycle_id = %s::uuid
+                    AND ib.status IN ('success', 'partial')
+                  ORDER BY ib.completed_at DESC NULLS LAST, ib.started_at DESC
+                  LIMIT 1
+                )
+                """
+            )
+            params.append(plan_cycle_id)
+    return " AND ".join(where), params
+
+
+def _fused_hybrid_sql(
     *,
-    query: str,
-    authority_id: str | None = None,
-    plan_cycle_id: str | None = None,
-    limit: int = 12,
-    rrf_k: int = 60,
-    use_vector: bool = True,
-    use_fts: bool = True,
-    rerank: bool = True,
-    rerank_top_n: int = 20,
-) -> dict[str, Any]:
+    spec: dict[str, Any],
+    where_sql: str,
+    where_params: list[Any],
+    queries: list[str],
+    query_vecs: list[list[float] | None],
+    dim: int | None,
+    embedding_model_id: str,
+    limit: int,
+    rrf_k: int,
+    keep: int,
+    rerank_n: int,
+    use_fts: bool,
+) -> tuple[str, list[Any]]:
     """
-    OSS RetrievalProvider v0:
-    - FTS (websearch_to_tsquery) + pgvector (unit_embeddings) merged via RRF.
-    - Optional reranking via external reranker service (Qwen3 reranker family).
+    One statement for a batch of queries: per-query FTS and vector candidate lists (LATERAL, so
+    each still uses the GIN / HNSW index), RRF fusion in SQL, and detail columns only for the fused
+    top `keep` rows per query. Full text is returned (truncated for the reranker) only for the top
+    `rerank_n`. Pass `dim=None` to skip the vector lane.
+    """
+    a = spec["alias"]
+    params: list[Any] = []
 
-    Always logs a ToolRun (and optionally a rerank ToolRun) and returns ids.
+    values = []
+    for qid, (text, vec) in enumerate(zip(queries, query_vecs, strict=True)):
+        values.append("(%s::int, %s::text, %s::vector)")
+        params.extend([qid, text, _vector_literal(vec) if vec and dim else None])
+    q_cte = f"q AS (SELECT * FROM (VALUES {', '.join(values)}) AS v(qid, qtext, qvec))"
+
+    if use_fts:
+        kw_cte = f"""kw AS (
+      SELECT q.qid, k.unit_id, k.kw_score,
+             row_number() OVER (PARTITION BY q.qid ORDER BY k.kw_score DESC, k.unit_id) AS kw_rank
+      FROM q
+      CROSS JOIN LATERAL (
+        SELECT {a}.id AS unit_id, ts_rank_cd({a}.text_tsv, tsq) AS kw_score
+        FROM {spec["from_sql"]}
+        CROSS JOIN websearch_to_tsquery('english', q.qtext) AS tsq
+        WHERE {where_sql}
+          AND {a}.text_tsv @@ tsq
+        ORDER BY kw_score DESC
+        LIMIT %s
+      ) k
+    )"""
+        params.extend(where_params + [limit])
+    else:
+        kw_cte = "kw AS (SELECT NULL::int AS qid, NULL::uuid AS unit_id, NULL::real AS kw_score, NULL::bigint AS kw_rank WHERE false)"
+
+    if dim:
+        candidates = ann_candidate_limit(limit, dim)
+        vec_cte = f"""vec AS (
+      SELECT q.qid, v.unit_id, v.vec_distance,
+             row_number() OVER (PARTITION BY q.qid ORDER BY v.vec_distance, v.unit_id) AS vec_rank
+      FROM q
+      CROSS JOIN LATERAL (
+        SELECT cand.unit_id, cand.vec_distance
+        FROM (
+          SELECT ue.unit_id, (ue.embedding <=> q.qvec) AS vec_distance
+          FROM {spec["from_sql"]}
+          JOIN unit_embeddings ue ON ue.unit_id = {a}.id
+          WHERE {where_sql}
+            AND q.qvec IS NOT NULL
+            AND ue.embedding_model_id = %s
+            AND ue.unit_type = '{spec["unit_type"]}'
+            AND {ann_dimension_sql("ue.embedding")}
+          ORDER BY {ann_order_sql("ue.embedding", dim, query_sql="q.qvec")}
+          LIMIT %s
+        ) cand
+        ORDER BY cand.vec_distance
+        LIMIT %s
+      ) v
+    )"""
+        params.extend(where_params + [embedding_model_id, dim, candidates, limit])
+    else:
+        vec_cte = "vec AS (SELECT NULL::int AS qid, NULL::uuid AS unit_id, NULL::float8 AS vec_distance, NULL::bigint AS vec_rank WHERE false)"
+
+    sql = f"""
+    WITH {q_cte},
+    {kw_cte},
+    {vec_cte},
+    fused AS (
+      SELECT COALESCE(kw.qid, vec.qid) AS qid,
+             COALESCE(kw.unit_id, vec.unit_id) AS unit_id,
+             kw.kw_score,
+             vec.vec_distance,
+             COALESCE(1.0 / (%s + kw.kw_rank), 0) + COALESCE(1.0 / (%s + vec.vec_rank), 0) AS rrf_score
+      FROM kw
+      FULL OUTER JOIN vec ON vec.qid = kw.qid AND vec.unit_id = kw.unit_id
+    ),
+    ranked AS (
+      SELECT fused.*, row_number() OVER (PARTITION BY qid ORDER BY rrf_score DESC, unit_id) AS fused_rank
+      FROM fused
+    )
+    SELECT
+      r.qid,
+      r.unit_id,
+      r.kw_score,
+      r.vec_distance,
+      r.rrf_score::float8 AS rrf_score,
+      r.fused_rank,{spec["detail_sql"]},
+      CASE WHEN r.fused_rank <= %s THEN LEFT({a}.text, 4000) END AS rerank_text
+    FROM ranked r{spec["detail_from_sql"]}
+    WHERE r.fused_rank <= %s
+    ORDER BY r.qid, r.fused_rank
     """
-    query = query.strip()
-    if not query:
+    params.extend([rrf_k, rrf_k, rerank_n, keep])
+    return sql, params
+
+
+def _retrieve_hybrid_batch_sync(
+    *,
+    kind: str,
+    queries: list[str],
+    authority_id: str | None,
+    plan_cycle_id: str | None,
+    limit: int,
+    rrf_k: int,
+    use_vector: bool,
+    use_fts: bool,
+    rerank: bool,
+    rerank_top_n: int,
+    ef_search: int | None,
+) -> list[dict[str, Any]]:
+    spec = _HYBRID_KINDS[kind]
+    queries = [str(q or "").strip() for q in queries]
+    if not queries or not all(queries):
         raise HTTPException(status_code=400, detail="query must not be empty")
 
     limit = max(1, min(int(limit), 50))
     rrf_k = max(1, min(int(rrf_k), 500))
     rerank_top_n = max(1, min(int(rerank_top_n), 50))
+    ef_search = max(1, min(int(ef_search or default_ef_search()), 1000))
 
     embedding_model_id = os.environ.get("TPA_EMBEDDINGS_MODEL_ID", "Qwen/Qwen3-Embedding-8B")
     reranker_model_id = os.environ.get("TPA_RERANKER_MODEL_ID", "Qwen/Qwen3-Reranker-4B")
-
-    retrieval_tool_run_id = str(uuid4())
     started_at = _utc_now()
-
-    kw_rows: list[dict[str, Any]] = []
-    vec_rows: list[dict[str, Any]] = []
-    used: dict[str, bool] = {"fts": False, "vector": False, "rerank": False}
     errors: list[str] = []
 
-    where: list[str] = []
-    params_base: list[Any] = []
-    if authority_id:
-        where.append("d.authority_id = %s")
-        params_base.append(authority_id)
-    if plan_cycle_id:
-        where.append("d.plan_cycle_id = %s::uuid")
-        params_base.append(plan_cycle_id)
-    where.append("d.is_active = true")
-    where_sql = " AND ".join(where) if where else "TRUE"
-
-    if use_fts:
+    query_vecs: list[list[float] | None] = [None] * len(queries)
+    cache_counters: dict[str, Any] = {}
+    if use_vector:
         try:
-            kw_rows = _db_fetch_all(
-                f"""
-                SELECT
-                  c.id AS chunk_id,
-                  c.page_number,
-                  c.section_path,
-                  LEFT(c.text, 800) AS snippet,
-                  c.text AS full_text,
-                  er.source_type,
-                  er.source_id,
-                  er.fragment_id AS fragment_id,
-                  d.metadata->>'title' AS document_title,
-                  ts_rank_cd(
-                    to_tsvector('english', c.text),
-                    websearch_to_tsquery('english', %s)
-                  ) AS kw_score
-                FROM chunks c
-                JOIN documents d ON d.id = c.document_id
-                LEFT JOIN evidence_refs er ON er.id = c.evidence_ref_id
-                WHERE {where_sql}
-                  AND to_tsvector('english', c.text) @@ websearch_to_tsquery('english', %s)
-                ORDER BY kw_score DESC
-                LIMIT %s
-                """,
-                tuple(params_base + [query, query, limit]),
+            embedded = _embed_texts_cached_sync(
+                texts=queries, model_id=embedding_model_id, scope="query", counters=cache_counters
             )
-            used["fts"] = True
+            if embedded:
+                query_vecs = [vec or None for vec in embedded]
         except Exception as exc:  # noqa: BLE001
-            errors.append(f"fts_failed: {exc}")
-            kw_rows = []
-
-    query_vec: list[float] | None = None
-    if use_vector:
+            errors.append(f"embed_failed: {exc}")
+    dim = next((len(vec) for vec in query_vecs if vec), None)
+
+    where_sql, where_params = _hybrid_scope_where(kind, authority_id=authority_id, plan_cycle_id=plan_cycle_id)
+    keep = max(limit, rerank_top_n)
+    rows: list[dict[str, Any]] = []
+    lanes: dict[str, bool] = {"fts": False, "vector": False}
+    # If the fused statement fails on the vector lane (no embeddings/index for this model yet),
+    # retry keyword-only so retrieval degrades the way the separate-lane path did.
+    attempts = [(use_fts, dim)] + ([(True, None)] if use_fts and dim else [])
+    for fts_lane, vec_dim in attempts:
+        if not fts_lane and not vec_dim:
+            break
+        sql, params = _fused_hybrid_sql(
+            spec=spec,
+            where_sql=where_sql,
+            where_params=where_params,
+            queries=queries,
+            query_vecs=query_vecs,
+            dim=vec_dim,
+            embedding_model_id=embedding_model_id,
+            limit=limit,
+            rrf_k=rrf_k,
+            keep=keep,
+            rerank_n=rerank_top_n if rerank else 0,
+            use_fts=fts_lane,
+        )
         try:
-            embedded = _embed_texts_sync(texts=[query], model_id=embedding_model_id)
-            if embedded and embedded[0]:
-                query_vec = embedded[0]
+            candidates = ann_candidate_limit(limit, vec_dim) if vec_dim else limit
+            rows = _fetch_ann_rows(sql, tuple(params), ef_search=max(ef_search, candidates))
+            lanes = {"fts": fts_lane, "vector": bool(vec_dim)}
+            break
         except Exception as exc:  # noqa: BLE001
-            errors.append(f"embed_failed: {exc}")
-            query_vec = None
-
-        if query_vec:
-            try:
-                vec_rows = _db_fetch_all(
-                    f"""
-                    SELECT
-                      c.id AS chunk_id,
-                      c.page_number,
-                      c.section_path,
-                      LEFT(c.text, 800) AS snippet,
-                      c.text AS full_text,
-                      er.source_type,
-                      er.source_id,
-                      er.fragment_id AS fragment_id,
-                      d.metadata->>'title' AS document_title,
-                      (ue.embedding <=> %s::vector) AS vec_distance
-                    FROM unit_embeddings ue
-                    JOIN chunks c ON c.id = ue.unit_id
-                    JOIN documents d ON d.id = c.document_id
-                    LEFT JOIN evidence_refs er ON er.id = c.evidence_ref_id
-                    WHERE {where_sql}
-                      AND ue.embedding_model_id = %s
-                      AND ue.unit_type = 'chunk'
-                    ORDER BY vec_distance ASC
-                    LIMIT %s
-                    """,
-                    tuple([_vector_literal(query_vec)] + params_base + [embedding_model_id, limit]),
-                )
-                used["vector"] = True
-            except Exception as exc:  # noqa: BLE001
-                errors.append(f"vector_search_failed: {exc}")
-                vec_rows = []
-
-    def rrf_scores(rows: list[dict[str, Any]]) -> dict[str, float]:
-        scores: dict[str, float] = {}
-        for rank, r in enumerate(rows, start=1):
-            cid = str(r.get("chunk_id"))
-            if not cid:
-                continue
-            scores[cid] = 1.0 / float(rrf_k + rank)
-        return scores
-
-    kw_rrf = rrf_scores(kw_rows)
-    vec_rrf = rrf_scores(vec_rows)
-
-    merged_ids = set(kw_rrf.keys()) | set(vec_rrf.keys())
-    merged: list[dict[str, Any]] = []
-    by_id: dict[str, dict[str, Any]] = {}
-    for r in kw_rows + vec_rows:
-        cid = str(r.get("chunk_id"))
-        if not cid or cid in by_id:
-            continue
-        by_id[cid] = r
-
-    for cid in merged_ids:
-        base = by_id.get(cid) or {}
-        merged.append(
-            {
-                "chunk_id": cid,
-                "page_number": base.get("page_number"),
-                "section_path": base.get("section_path"),
-                "snippet": base.get("snippet"),
-                "full_text": base.get("full_text"),
-                "document_title": base.get("document_title"),
-                "fragment_id": base.get("fragment_id") or "page-unknown",
-                "rrf_score": float(kw_rrf.get(cid, 0.0) + vec_rrf.get(cid, 0.0)),
-                "kw_score": float(base.get("kw_score") or 0.0) if cid in kw_rrf else 0.0,
-                "vec_distance": float(base.get("vec_distance") or 0.0) if cid in vec_rrf else None,
-            }
+            errors.append(f"{'hybrid' if vec_dim else 'fts'}_query_failed: {exc}")
+
+    rows_by_query: dict[int, list[dict[str, Any]]] = {qid: [] for qid in range(len(queries))}
+    for r in rows:
+        rows_by_query[int(r["qid"])].append(r)
+
+    inputs = {
+        "authority_id": authority_id,
+        "plan_cycle_id": plan_cycle_id,
+        "limit": limit,
+        "use_vector": use_vector,
+        "use_fts": use_fts,
+        "rrf_k": rrf_k,
+        "rerank": rerank,
+        "rerank_top_n": rerank_top_n,
+        "ef_search": ef_search,
+        "embedding_model_id": embedding_model_id,
+        "reranker_model_id": reranker_model_id,
+        "batch_size": len(queries),
+    }
+
+    def finish(qid: int) -> dict[str, Any]:
+        query = queries[qid]
+        return _finish_hybrid_query(
+            spec=spec,
+            query=query,
+            rows=rows_by_query[qid],
+            used={"fts": lanes["fts"], "vector": lanes["vector"] and query_vecs[qid] is not None, "rerank": False},
+            errors=list(errors),
+            rerank=rerank,
+            rerank_top_n=rerank_top_n,
+            limit=limit,
+            reranker_model_id=reranker_model_id,
+            inputs={"query": query, **inputs},
+            cache_counters=cache_counters,
+            started_at=started_at,
         )
 
-    merged.sort(key=lambda x: x["rrf_score"], reverse=True)
-    merged = merged[: max(limit, rerank_top_n)]
+    if len(queries) == 1 or not rerank:
+        return [finish(qid) for qid in range(len(queries))]
+    # Keep several queries' rerank requests in flight so the reranker server can batch them.
+    with ThreadPoolExecutor(max_workers=min(_rerank_concurrency(), len(queries))) as pool:
+        return list(pool.map(finish, range(len(queries))))
+
+
+def _finish_hybrid_query(
+    *,
+    spec: dict[str, Any],
+    query: str,
+    rows: list[dict[str, Any]],
+    used: dict[str, bool],
+    errors: list[str],
+    rerank: bool,
+    rerank_top_n: int,
+    limit: int,
+    reranker_model_id: str,
+    inputs: dict[str, Any],
+    cache_counters: dict[str, Any],
+    started_at: Any,
+) -> dict[str, Any]:
+    """Rerank one query's fused rows, log its ToolRun(s) and shape the response."""
+    id_key = spec["id_key"]
+    merged = [dict(r) for r in rows]
 
     rerank_used = False
     rerank_tool_run_id: str | None = None
     if rerank and merged:
         top = merged[:rerank_top_n]
-        scores = _rerank_texts_sync(query=query, texts=[str(r.get("full_text") or "")[:4000] for r in top], model_id=reranker_model_id)
+        scores = _rerank_texts_sync(query=query, texts=[str(r.get("rerank_text") or "") for r in top], model_id=reranker_model_id)
         if scores and len(scores) == len(top):
             rerank_used = True
             used["rerank"] = True
-            rerank_tool_run_id = str(uuid4())
             r_started = _utc_now()
             for r, score in zip(top, scores, strict=True):
                 r["rerank_score"] = float(score)
             top.sort(key=lambda x: float(x.get("rerank_score") or 0.0), reverse=True)
             merged = top + merged[rerank_top_n:]
 
-            _db_execute(
-                """
-                INSERT INTO tool_runs (
-                  id, tool_name, inputs_logged, outputs_logged, status, started_at, ended_at, confidence_hint, uncertainty_note
-                )
-                VALUES (%s, %s, %s::jsonb, %s::jsonb, %s, %s, %s, %s, %s)
-                """,
-                (
-                    rerank_tool_run_id,
-                    "rerank_chunks",
-                    json.dumps(
-                        {
-                            "model_id": reranker_model_id,
-                            "query": query,
-                            "candidate_count": len(top),
-                        },
-                        ensure_ascii=False,
-                    ),
-                    json.dumps(
-                        {
-                            "top": [
-                                {"chunk_id": r["chunk_id"], "score": r.get("rerank_score")}
-                                for r in top[: min(20, len(top))]
-                            ]
-                        },
-                        ensure_ascii=False,
-                    ),
-                    "success",
-                    r_started,
-                    _utc_now(),
-                    "medium",
-                    "Cross-encoder reranking is an evidence instrument; treat as a relevance aid, not a determination.",
-                ),
+            rerank_tool_run_id = record_tool_run(
+                tool_name=spec["rerank_tool_name"],
+                inputs={"model_id": reranker_model_id, "query": query, "candidate_count": len(top)},
+                outputs={
+                    "top": [
+                        {id_key: str(r["unit_id"]), "score": r.get("rerank_score")} for r in top[: min(20, len(top))]
+                    ]
+                },
+                status="success",
+                started_at=r_started,
+                confidence_hint="medium",
+                uncertainty_note="Cross-encoder reranking is an evidence instrument; treat as a relevance aid, not a determination.",
             )
         else:
             errors.append("rerank_unavailable_or_failed")
 
-    # finalize, strip full_text from response
-    results: list[dict[str, Any]] = []
-    for r in merged[:limit]:
-        if r.get("source_type") and r.get("source_id") and r.get("fragment_id"):
-            evidence_ref = f"{r['source_type']}::{r['source_id']}::{r['fragment_id']}"
-        else:
-            evidence_ref = f"chunk::{r['chunk_id']}::page-unknown"
-        results.append(
-            {
-                "chunk_id": r["chunk_id"],
-                "evidence_ref": evidence_ref,
-                "document_title": r.get("document_title"),
-                "page_number": r.get("page_number"),
-                "section_path": r.get("section_path"),
-                "snippet": r.get("snippet"),
-                "scores": {
-                    "rrf": r.get("rrf_score"),
-                    "keyword": r.get("kw_score") if r.get("kw_score") else None,
-                    "vector_distance": r.get("vec_distance"),
-                    "rerank_score": r.get("rerank_score"),
-                },
-            }
-        )
-
-    ended_at = _utc_now()
-    _db_execute(
-        """
-        INSERT INTO tool_runs (
-          id, tool_name, inputs_logged, outputs_logged, status, started_at, ended_at, confidence_hint, uncertainty_note
-        )
-        VALUES (%s, %s, %s::jsonb, %s::jsonb, %s, %s, %s, %s, %s)
-        """,
-        (
-            retrieval_tool_run_id,
-            "retrieve_chunks_hybrid",
-            json.dumps(
-                {
-                    "query": query,
-                    "authority_id": authority_id,
-                    "plan_cycle_id": plan_cycle_id,
-                    "limit": limit,
-                    "use_vector": use_vector,
-                    "use_fts": use_fts,
-                    "rrf_k": rrf_k,
-                    "rerank": rerank,
-                    "rerank_top_n": rerank_top_n,
-                    "embedding_model_id": embedding_model_id,
-                    "reranker_model_id": reranker_model_id,
-                },
-                ensure_ascii=False,
-            ),
-            json.dumps(
-                {
-                    "used": used,
-                    "rerank_used": rerank_used,
-                    "errors": errors[:20],
-                    "top_ids": [r["chunk_id"] for r in results[: min(20, len(results))]],
-                },
-                ensure_ascii=False,
-            ),
-            "success" if results and not errors else ("partial" if results else "error"),
-            started_at,
-            ended_at,
-            "medium" if results else "low",
-            "Hybrid retrieval is an evidence instrument; verify relevance and provenance in-context.",
-        ),
+    results = [_hybrid_result(spec, r) for r in merged[:limit]]
+
+    retrieval_tool_run_id = record_tool_run(
+        tool_name=spec["tool_name"],
+        inputs=inputs,
+        outputs={
+            "used": used,
+            "fused": True,
+            "rerank_used": rerank_used,
+            "embedding_cache": cache_counters,
+            "errors": errors[:20],
+            "top_ids": [r[id_key] for r in results[: min(20, len(results))]],
+        },
+        status="success" if results and not errors else ("partial" if results else "error"),
+        started_at=started_at,
+        confidence_hint="medium" if results else "low",
+        uncertainty_note="Hybrid retrieval is an evidence instrument; verify relevance and provenance in-context.",
     )
 
     return {"results": results, "tool_run_id": retrieval_tool_run_id, "rerank_tool_run_id": rerank_tool_run_id}
 
 
-def _retrieve_policy_clauses_hybrid_sync(
+def _hybrid_result(spec: dict[str, Any], r: dict[str, Any]) -> dict[str, Any]:
+    unit_id = str(r["unit_id"])
+    scores = {
+        "rrf": r.get("rrf_score"),
+        "keyword": float(r["kw_score"]) if r.get("kw_score") else None,
+        "vector_distance": float(r["vec_distance"]) if r.get("vec_distance") is not None else None,
+        "rerank_score": r.get("rerank_score"),
+    }
+    if spec["unit_type"] == "policy_clause":
+        return {
+            "policy_clause_id": unit_id,
+            "evidence_ref": f"policy_clause::{unit_id}::text",
+            "policy_section_id": str(r["policy_section_id"]) if r.get("policy_section_id") else None,
+            "clause_ref": r.get("clause_ref"),
+            "policy_ref": r.get("policy_code"),
+            "policy_title": r.get("policy_title"),
+            "document_title": r.get("document_title"),
+            "section_path": r.get("section_path"),
+            "speech_act": r.get("speech_act"),
+            "snippet": r.get("snippet"),
+            "scores": scores,
+        }
+    if r.get("source_type") and r.get("source_id") and r.get("fragment_id"):
+        evidence_ref = f"{r['source_type']}::{r['source_id']}::{r['fragment_id']}"
+    else:
+        evidence_ref = f"chunk::{unit_id}::page-unknown"
+    return {
+        "chunk_id": unit_id,
+        "evidence_ref": evidence_ref,
+        "document_title": r.get("document_title"),
+        "page_number": r.get("page_number"),
+        "section_path": r.get("section_path"),
+        "snippet": r.get("snippet"),
+        "scores": scores,
+    }
+
+
+def _retrieve_chunks_hybrid_sync(
     *,
     query: str,
     authority_id: str | None = None,
@@ -444,286 +577,108 @@ def _retrieve_policy_clauses_hybrid_sync(
     use_fts: bool = True,
     rerank: bool = True,
     rerank_top_n: int = 20,
+    ef_search: int | None = None,
 ) -> dict[str, Any]:
-    query = query.strip()
-    if not query:
-        raise HTTPException(status_code=400, detail="query must not be empty")
-
-    limit = max(1, min(int(limit), 50))
-    rrf_k = max(1, min(int(rrf_k), 500))
-    rerank_top_n = max(1, min(int(rerank_top_n), 50))
-
-    embedding_model_id = os.environ.get("TPA_EMBEDDINGS_MODEL_ID", "Qwen/Qwen3-Embedding-8B")
-    reranker_model_id = os.environ.get("TPA_RERANKER_MODEL_ID", "Qwen/Qwen3-Reranker-4B")
-
-    retrieval_tool_run_id = str(uuid4())
-    started_at = _utc_now()
-
-    kw_rows: list[dict[str, Any]] = []
-    vec_rows: list[dict[str, Any]] = []
-    used: dict[str, bool] = {"fts": False, "vector": False, "rerank": False}
-    errors: list[str] = []
-
-    where: list[str] = ["d.is_active = true"]
-    params_base: list[Any] = []
-    if authority_id:
-        where.append("d.authority_id = %s")
-        params_base.append(authority_id)
-    if plan_cycle_id:
-        where.append("d.plan_cycle_id = %s::uuid")
-        params_base.append(plan_cycle_id)
-        # Default to the latest completed ingest batch for this plan cycle to avoid mixing parse versions.
-        where.append(
-            """
-            d.ingest_batch_id = (
-              SELECT ib.id
-              FROM ingest_batches ib
-              WHERE ib.plan_cycle_id = %s::uuid
-                AND ib.status IN ('success', 'partial')
-              ORDER BY ib.completed_at DESC NULLS LAST, ib.started_at DESC
-              LIMIT 1
-            )
-            """
-        )
-        params_base.append(plan_cycle_id)
-    where_sql = " AND ".join(where) if where else "TRUE"
-
-    if use_fts:
-        try:
-            kw_rows = _db_fetch_all(
-                f"""
-                SELECT
-                  pc.id AS policy_clause_id,
-                  pc.clause_ref,
-                  ps.section_path AS section_path,
-                  pc.speech_act_jsonb AS speech_act,
-                  LEFT(pc.text, 800) AS snippet,
-                  pc.text AS full_text,
-                  ps.id AS policy_section_id,
-                  ps.policy_code AS policy_code,
-                  ps.title AS policy_title,
-                  d.metadata->>'title' AS document_title,
-                  ts_rank_cd(
-                    to_tsvector('english', pc.text),
-                    websearch_to_tsquery('english', %s)
-                  ) AS kw_score
-                FROM policy_clauses pc
-                JOIN policy_sections ps ON ps.id = pc.policy_section_id
-                JOIN documents d ON d.id = ps.document_id
-                WHERE {where_sql}
-                  AND to_tsvector('english', pc.text) @@ websearch_to_tsquery('english', %s)
-                ORDER BY kw_score DESC
-                LIMIT %s
-                """,
-                tuple(params_base + [query, query, limit]),
-            )
-            used["fts"] = True
-        except Exception as exc:  # noqa: BLE001
-            errors.append(f"fts_failed: {exc}")
-            kw_rows = []
-
-    query_vec: list[float] | None = None
-    if use_vector:
-        try:
-            embedded = _embed_texts_sync(texts=[query], model_id=embedding_model_id)
-            if embedded and embedded[0]:
-                query_vec = embedded[0]
-        except Exception as exc:  # noqa: BLE001
-            errors.append(f"embed_failed: {exc}")
-            query_vec = None
-
-        if query_vec:
-            try:
-                vec_rows = _db_fetch_all(
-                    f"""
-                    SELECT
-                      pc.id AS policy_clause_id,
-                      pc.clause_ref,
-                      ps.section_path AS section_path,
-                      pc.speech_act_jsonb AS speech_act,
-                      LEFT(pc.text, 800) AS snippet,
-                      pc.text AS full_text,
-                      ps.id AS policy_section_id,
-                      ps.policy_code AS policy_code,
-                      ps.title AS policy_title,
-                      d.metadata->>'title' AS document_title,
-                      (ue.embedding <=> %s::vector) AS vec_distance
-                    FROM unit_embeddings ue
-                    JOIN policy_clauses pc ON pc.id = ue.unit_id
-                    JOIN policy_sections ps ON ps.id = pc.policy_section_id
-                    JOIN documents d ON d.id = ps.document_id
-                    WHERE {where_sql}
-                      AND ue.embedding_model_id = %s
-                      AND ue.unit_type = 'policy_clause'
-                    ORDER BY vec_distance ASC
-                    LIMIT %s
-                    """,
-                    tuple([_vector_literal(query_vec)] + params_base + [embedding_model_id, limit]),
-                )
-                used["vector"] = True
-            except Exception as exc:  # noqa: BLE001
-                errors.append(f"vector_search_failed: {exc}")
-                vec_rows = []
-
-    def rrf_scores(rows: list[dict[str, Any]]) -> dict[str, float]:
-        scores: dict[str, float] = {}
-        for rank, r in enumerate(rows, start=1):
-            cid = str(r.get("policy_clause_id"))
-            if not cid:
-                continue
-            scores[cid] = 1.0 / float(rrf_k + rank)
-        return scores
-
-    kw_rrf = rrf_scores(kw_rows)
-    vec_rrf = rrf_scores(vec_rows)
-
-    merged: list[dict[str, Any]] = []
-    seen: set[str] = set()
-    for r in kw_rows + vec_rows:
-        cid = str(r.get("policy_clause_id"))
-        if not cid or cid in seen:
-            continue
-        seen.add(cid)
-        rrf_score = float(kw_rrf.get(cid, 0.0) + vec_rrf.get(cid, 0.0))
-        merged.append(
-            {
-                "policy_clause_id": cid,
-                "policy_section_id": str(r.get("policy_section_id")) if r.get("policy_section_id") else None,
-                "clause_ref": r.get("clause_ref"),
-                "policy_ref": r.get("policy_code"),
-                "policy_title": r.get("policy_title"),
-                "document_title": r.get("document_title"),
-                "section_path": r.get("section_path"),
-                "speech_act": r.get("speech_act"),
-                "snippet": r.get("snippet"),
-                "full_text": r.get("full_text"),
-                "rrf_score": rrf_score,
-                "kw_score": float(r.get("kw_score") or 0.0) if cid in kw_rrf else 0.0,
-                "vec_distance": float(r.get("vec_distance") or 0.0) if cid in vec_rrf else None,
-            }
-        )
-
-    merged.sort(key=lambda x: x["rrf_score"], reverse=True)
-    merged = merged[: max(limit, rerank_top_n)]
-
-    rerank_used = False
-    rerank_tool_run_id: str | None = None
-    if rerank and merged:
-        top = merged[:rerank_top_n]
-        scores = _rerank_texts_sync(query=query, texts=[str(r.get("full_text") or "")[:4000] for r in top], model_id=reranker_model_id)
-        if scores and len(scores) == len(top):
-            rerank_used = True
-            used["rerank"] = True
-            rerank_tool_run_id = str(uuid4())
-            r_started = _utc_now()
-            for r, score in zip(top, scores, strict=True):
-                r["rerank_score"] = float(score)
-            top.sort(key=lambda x: float(x.get("rerank_score") or 0.0), reverse=True)
-            merged = top + merged[rerank_top_n:]
+    """
+    OSS RetrievalProvider v0:
+    - FTS (websearch_to_tsquery) + pgvector (unit_embeddings) merged via RRF, in one SQL statement.
+    - Optional reranking via external reranker service (Qwen3 reranker family).
 
-            _db_execute(
-                """
-                INSERT INTO tool_runs (
-                  id, tool_name, inputs_logged, outputs_logged, status, started_at, ended_at, confidence_hint, uncertainty_note
-                )
-                VALUES (%s, %s, %s::jsonb, %s::jsonb, %s, %s, %s, %s, %s)
-                """,
-                (
-                    rerank_tool_run_id,
-                    "rerank_policy_clauses",
-                    json.dumps(
-                        {
-                            "model_id": reranker_model_id,
-                            "query": query,
-                            "candidate_count": len(top),
-                        },
-                        ensure_ascii=False,
-                    ),
-                    json.dumps(
-                        {
-                            "top": [
-                                {"policy_clause_id": r["policy_clause_id"], "score": r.get("rerank_score")}
-                                for r in top[: min(20, len(top))]
-                            ]
-                        },
-                        ensure_ascii=False,
-                    ),
-                    "success",
-                    r_started,
-                    _utc_now(),
-                    "medium",
-                    "Cross-encoder reranking is an evidence instrument; treat as a relevance aid, not a determination.",
-                ),
-            )
-        else:
-            errors.append("rerank_unavailable_or_failed")
+    Always logs a ToolRun (and optionally a rerank ToolRun) and returns ids.
+    """
+    return _retrieve_chunks_hybrid_batch_sync(
+        queries=[query],
+        authority_id=authority_id,
+        plan_cycle_id=plan_cycle_id,
+        limit=limit,
+        rrf_k=rrf_k,
+        use_vector=use_vector,
+        use_fts=use_fts,
+        rerank=rerank,
+        rerank_top_n=rerank_top_n,
+        ef_search=ef_search,
+    )[0]
+
+
+def _retrieve_chunks_hybrid_batch_sync(
+    *,
+    queries: list[str],
+    authority_id: str | None = None,
+    plan_cycle_id: str | None = None,
+    limit: int = 12,
+    rrf_k: int = 60,
+    use_vector: bool = True,
+    use_fts: bool = True,
+    rerank: bool = True,
+    rerank_top_n: int = 20,
+    ef_search: int | None = None,
+) -> list[dict[str, Any]]:
+    """Hybrid chunk retrieval for several queries: one embedding call and one SQL round trip."""
+    return _retrieve_hybrid_batch_sync(
+        kind="chunk",
+        queries=queries,
+        authority_id=authority_id,
+        plan_cycle_id=plan_cycle_id,
+        limit=limit,
+        rrf_k=rrf_k,
+        use_vector=use_vector,
+        use_fts=use_fts,
+        rerank=rerank,
+        rerank_top_n=rerank_top_n,
+        ef_search=ef_search,
+    )
 
-    results: list[dict[str, Any]] = []
-    for r in merged[:limit]:
-        evidence_ref = f"policy_clause::{r['policy_clause_id']}::text"
-        results.append(
-            {
-                "policy_clause_id": r["policy_clause_id"],
-                "evidence_ref": evidence_ref,
-                "policy_section_id": r.get("policy_section_id"),
-                "clause_ref": r.get("clause_ref"),
-                "policy_ref": r.get("policy_ref"),
-                "policy_title": r.get("policy_title"),
-                "document_title": r.get("document_title"),
-                "section_path": r.get("section_path"),
-                "speech_act": r.get("speech_act"),
-                "snippet": r.get("snippet"),
-                "scores": {
-                    "rrf": r.get("rrf_score"),
-                    "keyword": r.get("kw_score") if r.get("kw_score") else None,
-                    "vector_distance": r.get("vec_distance"),
-                    "rerank_score": r.get("rerank_score"),
-                },
-            }
-        )
 
-    ended_at = _utc_now()
-    _db_execute(
-        """
-        INSERT INTO tool_runs (
-          id, tool_name, inputs_logged, outputs_logged, status, started_at, ended_at, confidence_hint, uncertainty_note
-        )
-        VALUES (%s, %s, %s::jsonb, %s::jsonb, %s, %s, %s, %s, %s)
-        """,
-        (
-            retrieval_tool_run_id,
-            "retrieve_policy_clauses_hybrid",
-            json.dumps(
-                {
-                    "query": query,
-                    "authority_id": authority_id,
-                    "plan_cycle_id": plan_cycle_id,
-                    "limit": limit,
-                    "use_vector": use_vector,
-                    "use_fts": use_fts,
-                    "rrf_k": rrf_k,
-                    "rerank": rerank,
-                    "rerank_top_n": rerank_top_n,
-                    "embedding_model_id": embedding_model_id,
-                    "reranker_model_id": reranker_model_id,
-                },
-                ensure_ascii=False,
-            ),
-            json.dumps(
-                {
-                    "used": used,
-                    "rerank_used": rerank_used,
-                    "errors": errors[:20],
-                    "top_ids": [r["policy_clause_id"] for r in results[: min(20, len(results))]],
-                },
-                ensure_ascii=False,
-            ),
-            "success" if results and not errors else ("partial" if results else "error"),
-            started_at,
-            ended_at,
-            "medium" if results else "low",
-            "Hybrid retrieval is an evidence instrument; verify relevance and provenance in-context.",
-        ),
+def _retrieve_policy_clauses_hybrid_sync(
+    *,
+    query: str,
+    authority_id: str | None = None,
+    plan_cycle_id: str | None = None,
+    limit: int = 12,
+    rrf_k: int = 60,
+    use_vector: bool = True,
+    use_fts: bool = True,
+    rerank: bool = True,
+    rerank_top_n: int = 20,
+    ef_search: int | None = None,
+) -> dict[str, Any]:
+    return _retrieve_policy_clauses_hybrid_batch_sync(
+        queries=[query],
+        authority_id=authority_id,
+        plan_cycle_id=plan_cycle_id,
+        limit=limit,
+        rrf_k=rrf_k,
+        use_vector=use_vector,
+        use_fts=use_fts,
+        rerank=rerank,
+        rerank_top_n=rerank_top_n,
+        ef_search=ef_search,
+    )[0]
+
+
+def _retrieve_policy_clauses_hybrid_batch_sync(
+    *,
+    queries: list[str],
+    authority_id: str | None = None,
+    plan_cycle_id: str | None = None,
+    limit: int = 12,
+    rrf_k: int = 60,
+    use_vector: bool = True,
+    use_fts: bool = True,
+    rerank: bool = True,
+    rerank_top_n: int = 20,
+    ef_search: int | None = None,
+) -> list[dict[str, Any]]:
+    return _retrieve_hybrid_batch_sync(
+        kind="policy_clause",
+        queries=queries,
+        authority_id=authority_id,
+        plan_cycle_id=plan_cycle_id,
+        limit=limit,
+        rrf_k=rrf_k,
+        use_vector=use_vector,
+        use_fts=use_fts,
+        rerank=rerank,
+        rerank_top_n=rerank_top_n,
+        ef_search=ef_search,
     )
-
-    return {"results": results, "tool_run_id": retrieval_tool_run_id, "rerank_tool_run_id": rerank_tool_run_id}
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Header
 
+from ..services.core import ModelLeaseInvalidation
 from ..services.core import healthz as service_healthz
+from ..services.core import invalidate_model_role_leases as service_invalidate_model_role_leases
 from ..services.core import readyz as service_readyz
 
 
@@ -17,3 +19,11 @@ def healthz() -> dict[str, str]:
 @router.get("/readyz")
 def readyz() -> dict[str, str]:
     return service_readyz()
+
+
+@router.post("/model-leases/invalidate")
+def invalidate_model_role_leases(
+    body: ModelLeaseInvalidation,
+    x_tpa_model_supervisor_token: str | None = Header(default=None),
+) -> dict[str, object]:
+    return service_invalidate_model_role_leases(body, x_tpa_model_supervisor_token)
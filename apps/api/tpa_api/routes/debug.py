@@ -7,6 +7,7 @@ from pydantic import BaseModel
 from fastapi.responses import JSONResponse
 
 from ..services.debug import debug_overview as service_debug_overview
+from ..services.debug import embedding_cache_status as service_embedding_cache_status
 from ..services.debug import kg_snapshot as service_kg_snapshot
 from ..services.debug import list_documents as service_list_documents
 from ..services.debug import list_ingest_run_steps as service_list_ingest_run_steps
@@ -17,6 +18,10 @@ from ..services.debug import run_latest_moves as service_run_latest_moves
 from ..services.debug import get_tool_run as service_get_tool_run
 from ..services.debug import list_tool_runs as service_list_tool_runs
 from ..services.debug import list_visual_assets as service_list_visual_assets
+from ..services.debug import model_endpoint_status as service_model_endpoint_status
+from ..services.debug import model_http_status as service_model_http_status
+from ..services.debug import tool_run_recorder_status as service_tool_run_recorder_status
+from ..services.debug import job_executor_status as service_job_executor_status
 from ..services.debug import visual_asset_detail as service_visual_asset_detail
 from ..services.debug import assemble_context_pack as service_assemble_context_pack
 from ..services.debug import retrieve_spatial_features as service_retrieve_spatial_features
@@ -72,6 +77,31 @@ def debug_overview() -> JSONResponse:
     return service_debug_overview()
 
 
+@router.get("/debug/embedding-cache")
+def embedding_cache_status() -> JSONResponse:
+    return service_embedding_cache_status()
+
+
+@router.get("/debug/tool-run-recorder")
+def tool_run_recorder_status() -> JSONResponse:
+    return service_tool_run_recorder_status()
+
+
+@router.get("/debug/job-executors")
+def job_executor_status() -> JSONResponse:
+    return service_job_executor_status()
+
+
+@router.get("/debug/model-clients")
+def model_http_status() -> JSONResponse:
+    return service_model_http_status()
+
+
+@router.get("/debug/model-endpoints")
+def model_endpoint_status() -> JSONResponse:
+    return service_model_endpoint_status()
+
+
 @router.get("/debug/ingest/runs")
 def list_ingest_runs(authority_id: str | None = None, plan_cycle_id: str | None = None, limit: int = 25) -> JSONResponse:
     return service_list_ingest_runs(authority_id=authority_id, plan_cycle_id=plan_cycle_id, limit=limit)
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Header
+from fastapi.responses import JSONResponse, StreamingResponse
 
+from ..services.visuals import get_projection_artifact_content as service_get_projection_artifact_content
 from ..services.visuals import get_visual_asset_blob as service_get_visual_asset_blob
 from ..services.visuals import list_visual_assets as service_list_visual_assets
 from ..services.visuals import list_visual_features as service_list_visual_features
@@ -36,3 +37,11 @@ def list_visual_features(visual_asset_id: str) -> JSONResponse:
 @router.get("/visual-assets/{visual_asset_id}/blob")
 def get_visual_asset_blob(visual_asset_id: str) -> JSONResponse:
     return service_get_visual_asset_blob(visual_asset_id)
+
+
+@router.get("/projection-artifacts/{artifact_id}/content")
+def get_projection_artifact_content(
+    artifact_id: str,
+    range_header: str | None = Header(default=None, alias="Range"),
+) -> StreamingResponse:
+    return service_get_projection_artifact_content(artifact_id, range_header)
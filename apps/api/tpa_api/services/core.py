@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import os
+
 from fastapi import HTTPException
+from pydantic import BaseModel
 
 from ..db import db_ping
+from ..model_leases import invalidate_model_leases
 
 
 def healthz() -> dict[str, str]:
@@ -13,3 +17,16 @@ def readyz() -> dict[str, str]:
     if not db_ping():
         raise HTTPException(status_code=503, detail={"status": "not_ready", "db": "down"})
     return {"status": "ready", "db": "ok"}
+
+
+class ModelLeaseInvalidation(BaseModel):
+    roles: list[str]
+    reason: str | None = None
+
+
+def invalidate_model_role_leases(body: ModelLeaseInvalidation, supervisor_token: str | None) -> dict[str, object]:
+    """Push channel for the model supervisor: drop cached `/ensure` leases for roles it stopped."""
+    token = os.environ.get("TPA_MODEL_SUPERVISOR_TOKEN")
+    if token and supervisor_token != token:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    return {"invalidated": invalidate_model_leases(body.roles)}
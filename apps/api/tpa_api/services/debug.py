@@ -12,9 +12,15 @@ from fastapi.responses import JSONResponse
 from ..api_utils import validate_uuid_or_400 as _validate_uuid_or_400
 from ..context_pack import ContextPackAssemblyDeps, build_context_pack_sync
 from ..db import _db_execute, _db_fetch_all, _db_fetch_one
+from ..embedding_cache import embedding_cache_stats
 from ..evidence import _ensure_evidence_ref_row
+from ..http_clients import model_http_stats
+from ..job_executor import job_executor_stats
+from ..model_clients import model_endpoint_dialects
+from ..model_leases import model_lease_stats
 from ..prompting import _llm_structured_sync
 from ..time_utils import _utc_now, _utc_now_iso
+from ..tool_runs import flush_tool_runs, tool_run_recorder_stats
 
 
 def _count(sql: str, params: tuple[Any, ...] = ()) -> int:
@@ -105,6 +111,31 @@ def debug_overview() -> JSONResponse:
     return JSONResponse(content=jsonable_encoder({"counts": counts, "generated_at": _utc_now_iso()}))
 
 
+def embedding_cache_status() -> JSONResponse:
+    return JSONResponse(content=jsonable_encoder({**embedding_cache_stats(), "generated_at": _utc_now_iso()}))
+
+
+def tool_run_recorder_status() -> JSONResponse:
+    return JSONResponse(content=jsonable_encoder({**tool_run_recorder_stats(), "generated_at": _utc_now_iso()}))
+
+
+def job_executor_status() -> JSONResponse:
+    return JSONResponse(content=jsonable_encoder({"executors": job_executor_stats(), "generated_at": _utc_now_iso()}))
+
+
+def model_http_status() -> JSONResponse:
+    leases = model_lease_stats(roles=["llm", "vlm", "embeddings", "embeddings_mm", "reranker", "sam2"])
+    return JSONResponse(
+        content=jsonable_encoder({**model_http_stats(), "leases": leases, "generated_at": _utc_now_iso()})
+    )
+
+
+def model_endpoint_status() -> JSONResponse:
+    return JSONResponse(
+        content=jsonable_encoder({"dialects": model_endpoint_dialects(), "generated_at": _utc_now_iso()})
+    )
+
+
 def list_ingest_runs(authority_id: str | None = None, plan_cycle_id: str | None = None, limit: int = 25) -> JSONResponse:
     clauses: list[str] = []
     params: list[Any] = []
@@ -622,6 +653,8 @@ def list_tool_runs(
     run_id: str | None = None,
     ingest_batch_id: str | None = None,
 ) -> JSONResponse:
+    # Listings filter on columns the write barrier cannot see; include records still queued.
+    flush_tool_runs()
     clauses: list[str] = []
     params: list[Any] = []
     if tool_name:
@@ -8,12 +8,13 @@ from uuid import uuid4
 import httpx
 from fastapi import HTTPException
 
-from ..model_clients import _ensure_model_role, _llm_model_id
+from ..model_clients import _ensure_model_role, _holds_model_leases, _llm_model_id
 from ..retrieval import _gather_draft_evidence
 from ..text_utils import _extract_json_object
 from ..time_utils import _utc_now_iso
 
 
+@_holds_model_leases
 async def _llm_blocks(
     *,
     draft_request: dict[str, Any],
@@ -89,6 +89,7 @@ class RetrieveChunksRequest(BaseModel):
     use_fts: bool = True
     rerank: bool = True
     rerank_top_n: int = 20
+    ef_search: int | None = None
 
 
 def retrieve_chunks(body: RetrieveChunksRequest) -> JSONResponse:
@@ -102,6 +103,7 @@ def retrieve_chunks(body: RetrieveChunksRequest) -> JSONResponse:
         use_fts=bool(body.use_fts),
         rerank=bool(body.rerank),
         rerank_top_n=body.rerank_top_n,
+        ef_search=body.ef_search,
     )
     return JSONResponse(content=jsonable_encoder(out))
 
@@ -116,6 +118,7 @@ class RetrievePolicyClausesRequest(BaseModel):
     use_fts: bool = True
     rerank: bool = True
     rerank_top_n: int = 20
+    ef_search: int | None = None
 
 
 def retrieve_policy_clauses(body: RetrievePolicyClausesRequest) -> JSONResponse:
@@ -129,5 +132,6 @@ def retrieve_policy_clauses(body: RetrievePolicyClausesRequest) -> JSONResponse:
         use_fts=bool(body.use_fts),
         rerank=bool(body.rerank),
         rerank_top_n=body.rerank_top_n,
+        ef_search=body.ef_search,
     )
     return JSONResponse(content=jsonable_encoder(out))
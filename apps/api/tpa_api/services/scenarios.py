@@ -1,10 +1,10 @@
 from __future__ import annotations
 
 import json
+import logging
 import os
-import threading
 from datetime import timedelta
-from typing import Any
+from typing import Any, Callable
 from uuid import uuid4
 
 from fastapi import HTTPException
@@ -20,13 +20,21 @@ from ..db import _db_execute, _db_execute_returning, _db_fetch_all, _db_fetch_on
 from ..evidence import _ensure_evidence_ref_row
 from ..grammar.langgraph_orchestrator import run_grammar_graph
 from ..hash_utils import stable_hash
+from ..job_executor import CoalescingJobExecutor, JobCancelled, get_job_executor
 from ..prompting import _llm_structured_sync
-from ..retrieval import _retrieve_chunks_hybrid_sync, _retrieve_policy_clauses_hybrid_sync
+from ..retrieval import (
+    _retrieve_chunks_hybrid_batch_sync,
+    _retrieve_chunks_hybrid_sync,
+    _retrieve_policy_clauses_hybrid_batch_sync,
+    _retrieve_policy_clauses_hybrid_sync,
+)
 from ..spec_io import _read_yaml, _spec_root
 from ..time_utils import _utc_now, _utc_now_iso
 from ..tool_requests import persist_tool_requests_for_move, _run_render_simple_chart_sync
 
 
+logger = logging.getLogger(__name__)
+
 _SCENARIO_CACHE_TTL_SECONDS = int(os.environ.get("TPA_SCENARIO_CACHE_TTL_SECONDS", "900"))
 _SCENARIO_CACHE_SOFT_TTL_SECONDS = int(os.environ.get("TPA_SCENARIO_CACHE_SOFT_TTL_SECONDS", "120"))
 
@@ -39,131 +47,193 @@ def _iso(value: Any | None) -> str | None:
     return str(value)
 
 
-def _fetch_max_timestamp(sql: str, params: tuple[Any, ...]) -> str | None:
-    row = _db_fetch_one(sql, params)
-    if not row:
-        return None
-    value = next(iter(row.values())) if row else None
-    return _iso(value)
+# Tables a scenario tab's output depends on, and the `dependency_versions` scope each is read at
+# (maintained by triggers in 02_schema.sql). "document" means the authority and plan cycle counters
+# (or the global one when the tab has neither); visual assets prefer the plan project counter, which
+# mirrors the old metadata->>'plan_project_id' filter.
+_DEPENDENCY_SOURCES: tuple[tuple[str, str], ...] = (
+    ("site_assessments", "plan_project"),
+    ("allocation_decisions", "plan_project"),
+    ("stage4_summary_rows", "plan_project"),
+    ("evidence_items", "plan_project"),
+    ("evidence_gaps", "plan_project"),
+    ("trace_links", "global"),
+    ("documents", "document"),
+    ("policy_sections", "document"),
+    ("policy_clauses", "document"),
+    ("visual_assets", "visual"),
+    ("ingest_batches", "document"),
+)
+
+
+_ALL_SCOPES = "*"
+
+
+def _dependency_scopes(kind: str, *, plan_project_id: Any, authority_id: Any, plan_cycle_id: Any) -> list[tuple[str, str]]:
+    if kind == "plan_project":
+        return [("plan_project", str(plan_project_id))] if plan_project_id else []
+    if kind == "visual" and plan_project_id:
+        return [("plan_project", str(plan_project_id))]
+    if kind in {"document", "visual"}:
+        scopes = []
+        if authority_id:
+            scopes.append(("authority", str(authority_id)))
+        if plan_cycle_id:
+            scopes.append(("plan_cycle", str(plan_cycle_id)))
+        # Unscoped tabs depend on every row: rows with an authority bump that authority's counter and
+        # the rest bump the global one, so the tab reads all authority counters plus global.
+        return scopes or [("authority", _ALL_SCOPES), ("global", "")]
+    return [("global", "")]
 
 
 def _scenario_dependency_snapshot(tab: dict[str, Any]) -> dict[str, Any]:
+    """
+    Freshness inputs for a scenario tab; `stable_hash` of this is the tab's `dependency_hash`.
+
+    Reads the trigger-maintained `dependency_versions` counters in one lookup. If that lookup fails
+    the snapshot fails closed: the tab's stored snapshot is returned (or, for a tab never run, the
+    same keys with no versions), so a transient failure never marks fresh tabs stale.
+    """
     scenario_state = tab.get("state_vector_jsonb") if isinstance(tab.get("state_vector_jsonb"), dict) else {}
     plan_project_id = tab.get("plan_project_id")
     authority_id = tab.get("authority_id")
     plan_cycle_id = tab.get("plan_cycle_id")
 
-    site_updates = _fetch_max_timestamp(
-        "SELECT MAX(updated_at) FROM site_assessments WHERE plan_project_id = %s::uuid",
-        (plan_project_id,),
-    )
-    allocation_updates = _fetch_max_timestamp(
-        "SELECT MAX(updated_at) FROM allocation_decisions WHERE plan_project_id = %s::uuid",
-        (plan_project_id,),
-    )
-    stage4_updates = _fetch_max_timestamp(
-        "SELECT MAX(updated_at) FROM stage4_summary_rows WHERE plan_project_id = %s::uuid",
-        (plan_project_id,),
-    )
-    evidence_updates = _fetch_max_timestamp(
-        "SELECT MAX(updated_at) FROM evidence_items WHERE plan_project_id = %s::uuid",
-        (plan_project_id,),
-    )
-    gap_updates = _fetch_max_timestamp(
-        "SELECT MAX(updated_at) FROM evidence_gaps WHERE plan_project_id = %s::uuid",
-        (plan_project_id,),
-    )
-    trace_updates = _fetch_max_timestamp(
-        "SELECT MAX(created_at) FROM trace_links",
-        (),
-    )
-    policy_counts = _db_fetch_one(
-        """
-        SELECT COUNT(*) AS policy_count
-        FROM policy_sections ps
-        JOIN documents d ON d.id = ps.document_id
-        WHERE (%s IS NULL OR d.authority_id = %s)
-          AND (%s IS NULL OR d.plan_cycle_id = %s::uuid)
-        """,
-        (authority_id, authority_id, plan_cycle_id, plan_cycle_id),
-    )
-    clause_counts = _db_fetch_one(
-        """
-        SELECT COUNT(*) AS clause_count
-        FROM policy_clauses pc
-        JOIN policy_sections ps ON ps.id = pc.policy_section_id
-        JOIN documents d ON d.id = ps.document_id
-        WHERE (%s IS NULL OR d.authority_id = %s)
-          AND (%s IS NULL OR d.plan_cycle_id = %s::uuid)
-        """,
-        (authority_id, authority_id, plan_cycle_id, plan_cycle_id),
-    )
-    visual_counts = _db_fetch_one(
-        """
-        SELECT COUNT(*) AS visual_count
-        FROM visual_assets va
-        LEFT JOIN documents d ON d.id = va.document_id
-        WHERE (%s IS NULL OR d.authority_id = %s OR va.metadata->>'authority_id' = %s)
-          AND (%s IS NULL OR d.plan_cycle_id = %s::uuid OR va.metadata->>'plan_cycle_id' = %s)
-          AND (%s IS NULL OR va.metadata->>'plan_project_id' = %s)
-        """,
-        (
-            authority_id,
-            authority_id,
-            authority_id,
-            plan_cycle_id,
-            plan_cycle_id,
-            plan_cycle_id,
-            plan_project_id,
-            plan_project_id,
-        ),
-    )
-    ingest_updates = _fetch_max_timestamp(
-        """
-        SELECT MAX(completed_at) FROM ingest_batches
-        WHERE (%s IS NULL OR authority_id = %s)
-          AND (%s IS NULL OR plan_cycle_id = %s::uuid)
-        """,
-        (authority_id, authority_id, plan_cycle_id, plan_cycle_id),
-    )
-
-    return {
+    scopes_by_source = {
+        source: _dependency_scopes(
+            kind, plan_project_id=plan_project_id, authority_id=authority_id, plan_cycle_id=plan_cycle_id
+        )
+        for source, kind in _DEPENDENCY_SOURCES
+    }
+    wanted = sorted({scope for scopes in scopes_by_source.values() for scope in scopes})
+    all_authorities = ("authority", _ALL_SCOPES) in wanted
+    wanted = [scope for scope in wanted if scope[1] != _ALL_SCOPES]
+    try:
+        rows = _db_fetch_all(
+            """
+            SELECT scope_kind, scope_id, source_table, version
+            FROM dependency_versions
+            WHERE (scope_kind, scope_id) IN (SELECT * FROM unnest(%s::text[], %s::text[]))
+               OR (%s AND scope_kind = 'authority')
+            """,
+            ([kind for kind, _ in wanted], [scope_id for _, scope_id in wanted], all_authorities),
+        )
+    except Exception:  # noqa: BLE001
+        logger.warning("dependency_versions lookup failed; reusing the tab's stored dependency snapshot.", exc_info=True)
+        stored = tab.get("dependency_snapshot_jsonb")
+        if isinstance(stored, dict) and stored:
+            return stored
+        return {
+            "scenario_state_hash": stable_hash(scenario_state),
+            "scenario_updated_at": _iso(tab.get("scenario_updated_at")),
+            "plan_project_updated_at": _iso(tab.get("plan_project_updated_at")),
+            **{f"{source}_version": None for source in scopes_by_source},
+        }
+    versions: dict[tuple[str, str, str], int] = {}
+    for r in rows:
+        version = int(r["version"])
+        versions[(r["source_table"], r["scope_kind"], r["scope_id"])] = version
+        if r["scope_kind"] == "authority" and all_authorities:
+            key = (r["source_table"], "authority", _ALL_SCOPES)
+            versions[key] = versions.get(key, 0) + version
+
+    snapshot: dict[str, Any] = {
         "scenario_state_hash": stable_hash(scenario_state),
         "scenario_updated_at": _iso(tab.get("scenario_updated_at")),
         "plan_project_updated_at": _iso(tab.get("plan_project_updated_at")),
-        "site_updates_at": site_updates,
-        "allocation_updates_at": allocation_updates,
-        "stage4_updates_at": stage4_updates,
-        "evidence_updates_at": evidence_updates,
-        "evidence_gap_updates_at": gap_updates,
-        "trace_updates_at": trace_updates,
-        "policy_clause_count": clause_counts.get("clause_count") if clause_counts else 0,
-        "policy_count": policy_counts.get("policy_count") if policy_counts else 0,
-        "visual_asset_count": visual_counts.get("visual_count") if visual_counts else 0,
-        "ingest_updates_at": ingest_updates,
     }
+    for source, scopes in scopes_by_source.items():
+        # Counters only increase, so a sum over the scopes changes whenever any of them does.
+        snapshot[f"{source}_version"] = sum(versions.get((source, kind, scope_id), 0) for kind, scope_id in scopes)
+    return snapshot
 
 
-def _schedule_tab_refresh(tab_id: str) -> None:
-    now = _utc_now()
+# Tab refresh priorities (lower runs first): a tab with no sheet yet, a stale sheet, restart recovery.
+_TAB_REFRESH_PRIORITY_MISSING = 0
+_TAB_REFRESH_PRIORITY_STALE = 1
+_TAB_REFRESH_PRIORITY_RECOVERY = 2
+
+
+def _tab_refresh_concurrency() -> int:
     try:
+        return max(1, int(os.environ.get("TPA_TAB_REFRESH_CONCURRENCY", "2")))
+    except ValueError:
+        return 2
+
+
+def _tab_refresh_queue_max() -> int:
+    try:
+        return max(1, int(os.environ.get("TPA_TAB_REFRESH_QUEUE_MAX", "200")))
+    except ValueError:
+        return 200
+
+
+def _tab_refresh_input_key(dependency_snapshot: dict[str, Any]) -> str:
+    """
+    What a running refresh was computed from: the scenario and plan project inputs. A request whose
+    inputs differ supersedes (cancels) the running job; evidence/data changes do not, since the run
+    itself writes some of them, and the next poll after it completes picks those up as staleness.
+    """
+    return stable_hash(
+        {
+            key: dependency_snapshot.get(key)
+            for key in ("scenario_state_hash", "scenario_updated_at", "plan_project_updated_at")
+        }
+    )
+
+
+def _run_tab_refresh_job(tab_id: str, should_cancel: Callable[[], bool]) -> None:
+    try:
+        run_scenario_framing_tab(tab_id, should_cancel=should_cancel)
+    except JobCancelled:
+        # Superseded: a rerun is already queued for this tab.
         _db_execute(
             "UPDATE scenario_framing_tabs SET status = %s, updated_at = %s WHERE id = %s::uuid",
-            ("queued", now, tab_id),
+            ("queued", _utc_now(), tab_id),
         )
-    except Exception:  # noqa: BLE001
-        pass
+        raise
+
+
+def _tab_refresh_executor() -> CoalescingJobExecutor:
+    return get_job_executor(
+        "tab-refresh",
+        _run_tab_refresh_job,
+        max_workers=_tab_refresh_concurrency(),
+        max_queue=_tab_refresh_queue_max(),
+    )
 
-    def _runner() -> None:
+
+def _schedule_tab_refresh(tab_id: str, *, priority: int = _TAB_REFRESH_PRIORITY_STALE, input_key: str | None = None) -> str:
+    outcome = _tab_refresh_executor().submit(tab_id, priority=priority, input_key=input_key)
+    if outcome in {"queued", "superseded"}:
         try:
-            run_scenario_framing_tab(tab_id)
-        except Exception:
-            return
+            _db_execute(
+                "UPDATE scenario_framing_tabs SET status = %s, updated_at = %s WHERE id = %s::uuid",
+                ("queued", _utc_now(), tab_id),
+            )
+        except Exception:  # noqa: BLE001
+            pass
+    return outcome
+
 
-    thread = threading.Thread(target=_runner, daemon=True)
-    thread.start()
+def _should_schedule_tab_refresh(tab: dict[str, Any], tab_id: str) -> bool:
+    # The executor is authoritative for refreshes it owns (so polls can coalesce or supersede them);
+    # otherwise a queued/running status means a synchronous run elsewhere.
+    return tab.get("status") not in ("running", "queued") or _tab_refresh_executor().is_tracking(tab_id)
 
 
+def recover_tab_refreshes() -> int:
+    """Re-queue tabs left queued/running by a previous API process (their background work was lost)."""
+    try:
+        rows = _db_fetch_all(
+            "SELECT id FROM scenario_framing_tabs WHERE status IN ('queued', 'running') ORDER BY updated_at",
+        )
+    except Exception:  # noqa: BLE001
+        return 0
+    for row in rows:
+        _tab_refresh_executor().submit(str(row["id"]), priority=_TAB_REFRESH_PRIORITY_RECOVERY)
+    return len(rows)
+
 
 def list_scenarios(plan_project_id: str | None = None, culp_stage_id: str | None = None, limit: int = 100) -> JSONResponse:
     limit = max(1, min(int(limit), 500))
@@ -785,6 +855,7 @@ def _run_langgraph_tab(
     body: ScenarioTabRunRequest,
     run_id: str,
     framing_preset: dict[str, Any] | None,
+    should_cancel: Callable[[], bool] | None = None,
 ) -> JSONResponse:
     framing_title = (framing_preset or {}).get("title") or tab["political_framing_id"]
     state_vector = tab.get("state_vector_jsonb") if isinstance(tab.get("state_vector_jsonb"), dict) else {}
@@ -807,7 +878,8 @@ def _run_langgraph_tab(
             "state_vector": state_vector,
             "context_token_budget": body.context_token_budget,
             "max_issues": body.max_issues,
-        }
+        },
+        should_cancel=should_cancel,
     )
 
     trajectory_obj = state.get("trajectory") if isinstance(state.get("trajectory"), dict) else {}
@@ -904,7 +976,12 @@ def _run_langgraph_tab(
     )
 
 
-def run_scenario_framing_tab(tab_id: str, body: ScenarioTabRunRequest | None = None) -> JSONResponse:
+def run_scenario_framing_tab(
+    tab_id: str,
+    body: ScenarioTabRunRequest | None = None,
+    *,
+    should_cancel: Callable[[], bool] | None = None,
+) -> JSONResponse:
     body = body or ScenarioTabRunRequest()
 
     tab = _db_fetch_one(
@@ -1001,6 +1078,7 @@ def run_scenario_framing_tab(tab_id: str, body: ScenarioTabRunRequest | None = N
             body=body,
             run_id=run_id,
             framing_preset=framing_preset,
+            should_cancel=should_cancel,
         )
 
     sequence = 1
@@ -1174,6 +1252,8 @@ def run_scenario_framing_tab(tab_id: str, body: ScenarioTabRunRequest | None = N
         retrieve_policy_clauses_hybrid_sync=_retrieve_policy_clauses_hybrid_sync,
         utc_now_iso=_utc_now_iso,
         utc_now=_utc_now,
+        retrieve_chunks_hybrid_batch_sync=_retrieve_chunks_hybrid_batch_sync,
+        retrieve_policy_clauses_hybrid_batch_sync=_retrieve_policy_clauses_hybrid_batch_sync,
     )
     context_pack_deps = ContextPackAssemblyDeps(
         db_fetch_one=_db_fetch_one,
@@ -1185,6 +1265,9 @@ def run_scenario_framing_tab(tab_id: str, body: ScenarioTabRunRequest | None = N
     )
 
     def _build_context_pack(move: str, issues_for_pack: list[dict[str, Any]] | None, framing_for_pack: dict[str, Any] | None) -> dict[str, Any]:
+        # Move boundary: stop here if a background refresh was superseded.
+        if should_cancel is not None and should_cancel():
+            raise JobCancelled(tab_id)
         return build_context_pack_sync(
             deps=context_pack_deps,
             run_id=run_id,
@@ -1977,10 +2060,14 @@ def get_scenario_tab_sheet(tab_id: str, auto_refresh: bool = True, prefer_async:
     is_stale = dependency_hash != (tab.get("dependency_hash") or "") or is_expired
 
     if not tab.get("trajectory_id"):
-        if auto_refresh and tab.get("status") not in ("running", "queued"):
+        if auto_refresh and _should_schedule_tab_refresh(tab, tab_id):
             if prefer_async:
-                _schedule_tab_refresh(tab_id)
-            else:
+                _schedule_tab_refresh(
+                    tab_id,
+                    priority=_TAB_REFRESH_PRIORITY_MISSING,
+                    input_key=_tab_refresh_input_key(dependency_snapshot),
+                )
+            elif tab.get("status") not in ("running", "queued"):
                 return run_scenario_framing_tab(tab_id)
         return JSONResponse(
             content=jsonable_encoder(
@@ -2000,10 +2087,14 @@ def get_scenario_tab_sheet(tab_id: str, auto_refresh: bool = True, prefer_async:
             )
         )
 
-    if is_stale and auto_refresh and tab.get("status") not in ("running", "queued"):
+    if is_stale and auto_refresh and _should_schedule_tab_refresh(tab, tab_id):
         if prefer_async:
-            _schedule_tab_refresh(tab_id)
-        else:
+            _schedule_tab_refresh(
+                tab_id,
+                priority=_TAB_REFRESH_PRIORITY_STALE,
+                input_key=_tab_refresh_input_key(dependency_snapshot),
+            )
+        elif tab.get("status") not in ("running", "queued"):
             return run_scenario_framing_tab(tab_id)
 
     if not is_stale:
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
-from typing import Any
+import mimetypes
+import re
+from typing import Any, Iterator
 
 from fastapi import HTTPException
 from fastapi.encoders import jsonable_encoder
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
-from ..blob_store import read_blob_bytes, to_data_url
+from ..blob_store import blob_size, read_blob_bytes, read_blob_range, to_data_url
 from ..db import _db_fetch_all, _db_fetch_one
 
 
@@ -97,3 +99,74 @@ def get_visual_asset_blob(visual_asset_id: str) -> JSONResponse:
     if err or not data:
         raise HTTPException(status_code=404, detail=f"Visual asset blob not available: {err}")
     return JSONResponse(content=jsonable_encoder({"data_url": to_data_url(data, content_type or "image/png")}))
+
+
+_BYTE_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+_STREAM_CHUNK_BYTES = 1024 * 1024
+
+
+def _parse_byte_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """Inclusive (start, end) for a single `bytes=` range; None = whole blob (absent or multi-range)."""
+    if not header:
+        return None
+    match = _BYTE_RANGE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        start, end = max(0, size - int(last)), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise HTTPException(status_code=416, detail="Range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+    return start, end
+
+
+def _stream_blob_range(blob_path: str, start: int, end: int) -> Iterator[bytes]:
+    pos = start
+    while pos <= end:
+        data, _ = read_blob_range(blob_path, pos, min(_STREAM_CHUNK_BYTES, end - pos + 1))
+        if not data:
+            # Headers are already sent; a short body is how the client learns the read failed.
+            return
+        yield data
+        pos += len(data)
+
+
+def get_projection_artifact_content(artifact_id: str, range_header: str | None = None) -> StreamingResponse:
+    """
+    Serve a projection artifact (e.g. a georef Cloud-Optimized GeoTIFF) from the blob store with
+    HTTP Range support, so map clients fetch only the tiles they draw and the API never holds the
+    whole file.
+    """
+    row = _db_fetch_one(
+        "SELECT artifact_path, metadata_jsonb FROM projection_artifacts WHERE id = %s::uuid",
+        (artifact_id,),
+    )
+    if not row or not row.get("artifact_path"):
+        raise HTTPException(status_code=404, detail="Projection artifact not found")
+    blob_path = str(row["artifact_path"])
+    size, err = blob_size(blob_path)
+    if size is None:
+        raise HTTPException(status_code=404, detail=f"Projection artifact blob not available: {err}")
+    metadata = row.get("metadata_jsonb") if isinstance(row.get("metadata_jsonb"), dict) else {}
+    content_type = metadata.get("content_type") or mimetypes.guess_type(blob_path)[0] or "application/octet-stream"
+
+    headers = {"Accept-Ranges": "bytes"}
+    byte_range = _parse_byte_range(range_header, size) if size else None
+    if byte_range is None:
+        start, end, status_code = 0, size - 1, 200
+    else:
+        start, end = byte_range
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        _stream_blob_range(blob_path, start, end),
+        status_code=status_code,
+        media_type=content_type,
+        headers=headers,
+    )
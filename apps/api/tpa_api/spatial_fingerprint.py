@@ -44,108 +44,31 @@ def extract_site_ids_from_state_vector(state_vector: dict[str, Any]) -> list[str
     return out[:25]
 
 
-def compute_site_fingerprint_sync(
-    *,
-    db_fetch_one: Callable[[str, tuple[Any, ...] | list[Any] | None], dict[str, Any] | None],
-    db_fetch_all: Callable[[str, tuple[Any, ...] | list[Any] | None], list[dict[str, Any]]],
-    db_execute: Callable[[str, tuple[Any, ...] | list[Any] | None], None],
-    utc_now: Callable[[], Any],
-    site_id: str,
-    authority_id: str | None,
-    plan_cycle_id: str | None,
-    token_budget: int | None = None,
-    limit_features: int | None = None,
-) -> tuple[dict[str, Any] | None, str, list[str]]:
-    """
-    Deterministic spatial enrichment tool (Slice C).
+_KG_EDGES_PER_SITE = 500
 
-    Produces:
-    - a ToolRun ("get_site_fingerprint") with logged inputs/outputs + limitations
-    - best-effort KG edges (Site -> SpatialFeature INTERSECTS) with tool_run provenance
-    - best-effort persistence into site_fingerprints (if table exists)
+_LIMITATIONS_TEXT = (
+    "Deterministic PostGIS intersection checks against spatial_features currently loaded in the canonical DB. "
+    "If constraint layers are missing, results will be incomplete. Distances/network connectivity are not yet computed."
+)
 
-    Returns (fingerprint_json, tool_run_id, errors).
-    """
-    tool_run_id = str(uuid4())
-    started_at = utc_now()
-    errors: list[str] = []
+
+def _resolve_limit_features(token_budget: int | None, limit_features: int | None) -> int | None:
     if isinstance(limit_features, int):
-        limit_features = max(1, limit_features)
-    if limit_features is None and isinstance(token_budget, int) and token_budget > 0:
+        return max(1, limit_features)
+    if isinstance(token_budget, int) and token_budget > 0:
         estimated_tokens_per_feature = 200
-        limit_features = max(1, token_budget // estimated_tokens_per_feature)
+        return max(1, token_budget // estimated_tokens_per_feature)
+    return None
 
-    site = db_fetch_one(
-        """
-        SELECT
-          id,
-          ST_AsGeoJSON(geometry_polygon) AS geometry_geojson,
-          metadata
-        FROM sites
-        WHERE id = %s::uuid
-        """,
-        (site_id,),
-    )
-    if not site:
-        ended_at = utc_now()
-        db_execute(
-            """
-            INSERT INTO tool_runs (id, ingest_batch_id, tool_name, inputs_logged, outputs_logged, status, started_at, ended_at, confidence_hint, uncertainty_note)
-            VALUES (%s, NULL, %s, %s::jsonb, %s::jsonb, %s, %s, %s, %s, %s)
-            """,
-            (
-                tool_run_id,
-                "get_site_fingerprint",
-                json.dumps(
-                    {
-                        "site_id": site_id,
-                        "authority_id": authority_id,
-                        "plan_cycle_id": plan_cycle_id,
-                        "token_budget": token_budget,
-                        "limit_features": limit_features,
-                    },
-                    ensure_ascii=False,
-                ),
-                json.dumps({"ok": False, "error": "site_not_found"}, ensure_ascii=False),
-                "error",
-                started_at,
-                ended_at,
-                "low",
-                "Site not found; cannot compute fingerprint.",
-            ),
-        )
-        return None, tool_run_id, ["site_not_found"]
-
-    where: list[str] = ["sf.is_active = true", "sf.geometry IS NOT NULL", "ST_Intersects(sf.geometry, s.geometry_polygon)"]
-    params: list[Any] = []
-    if authority_id:
-        where.append("(sf.authority_id IS NULL OR sf.authority_id = %s)")
-        params.append(authority_id)
-    where_sql = " AND ".join(where)
-
-    limit_clause = "LIMIT %s" if isinstance(limit_features, int) else ""
-    try:
-        rows = db_fetch_all(
-            f"""
-            SELECT
-              sf.id AS spatial_feature_id,
-              sf.type,
-              sf.spatial_scope,
-              sf.confidence_hint,
-              sf.uncertainty_note,
-              sf.properties
-            FROM spatial_features sf
-            JOIN sites s ON s.id = %s::uuid
-            WHERE {where_sql}
-            ORDER BY sf.type ASC
-            {limit_clause}
-            """,
-            tuple([site_id] + params + ([limit_features] if isinstance(limit_features, int) else [])),
-        )
-    except Exception as exc:  # noqa: BLE001
-        rows = []
-        errors.append(f"spatial_query_failed: {exc}")
 
+def _build_fingerprint(
+    *,
+    site_id: str,
+    authority_id: str | None,
+    plan_cycle_id: str | None,
+    rows: list[dict[str, Any]],
+    limit_features: int | None,
+) -> dict[str, Any]:
     features: list[dict[str, Any]] = []
     counts_by_type: dict[str, int] = {}
     for r in rows:
@@ -169,17 +92,14 @@ def compute_site_fingerprint_sync(
     if top_types:
         summary = "Intersects: " + ", ".join([f"{t} ({n})" for t, n in top_types])
 
-    limitations_text = (
-        "Deterministic PostGIS intersection checks against spatial_features currently loaded in the canonical DB. "
-        "If constraint layers are missing, results will be incomplete. Distances/network connectivity are not yet computed."
-    )
+    limitations_text = _LIMITATIONS_TEXT
     if isinstance(limit_features, int):
         limitations_text = (
             limitations_text
             + f" Intersections were capped at {limit_features} features based on the available token budget."
         )
 
-    fingerprint = {
+    return {
         "site_id": site_id,
         "authority_id": authority_id,
         "plan_cycle_id": plan_cycle_id,
@@ -189,135 +109,362 @@ def compute_site_fingerprint_sync(
         "limitations_text": limitations_text,
     }
 
-    # Best-effort KG enrichment (Slice C): Site -> SpatialFeature INTERSECTS edges with tool_run provenance.
+
+def compute_site_fingerprint_sync(
+    *,
+    db_fetch_one: Callable[[str, tuple[Any, ...] | list[Any] | None], dict[str, Any] | None],
+    db_fetch_all: Callable[[str, tuple[Any, ...] | list[Any] | None], list[dict[str, Any]]],
+    db_execute: Callable[[str, tuple[Any, ...] | list[Any] | None], None],
+    utc_now: Callable[[], Any],
+    site_id: str,
+    authority_id: str | None,
+    plan_cycle_id: str | None,
+    token_budget: int | None = None,
+    limit_features: int | None = None,
+) -> tuple[dict[str, Any] | None, str, list[str]]:
+    """
+    Deterministic spatial enrichment tool (Slice C).
+
+    Produces:
+    - a ToolRun ("get_site_fingerprint") with logged inputs/outputs + limitations
+    - best-effort KG edges (Site -> SpatialFeature INTERSECTS) with tool_run provenance
+    - best-effort persistence into site_fingerprints (if table exists)
+
+    Returns (fingerprint_json, tool_run_id, errors). Single-site form of
+    `compute_site_fingerprints_batch_sync`.
+    """
+    results = compute_site_fingerprints_batch_sync(
+        db_fetch_one=db_fetch_one,
+        db_fetch_all=db_fetch_all,
+        db_execute=db_execute,
+        utc_now=utc_now,
+        site_ids=[site_id],
+        authority_id=authority_id,
+        plan_cycle_id=plan_cycle_id,
+        token_budget=token_budget,
+        limit_features=limit_features,
+    )
+    return results[site_id]
+
+
+def compute_site_fingerprints_batch_sync(
+    *,
+    db_fetch_one: Callable[[str, tuple[Any, ...] | list[Any] | None], dict[str, Any] | None],
+    db_fetch_all: Callable[[str, tuple[Any, ...] | list[Any] | None], list[dict[str, Any]]],
+    db_execute: Callable[[str, tuple[Any, ...] | list[Any] | None], None],
+    utc_now: Callable[[], Any],
+    site_ids: list[str],
+    authority_id: str | None,
+    plan_cycle_id: str | None,
+    token_budget: int | None = None,
+    limit_features: int | None = None,
+) -> dict[str, tuple[dict[str, Any] | None, str, list[str]]]:
+    """
+    Fingerprint many sites with one spatial join and bulk writes.
+
+    The intersection query is a single statement (a LATERAL probe per site, served by the GiST
+    indexes on `sites.geometry_polygon` / `spatial_features.geometry`), and ToolRuns, KG nodes/edges
+    and site_fingerprints rows are each written with one array-parameter statement per batch.
+    Each site still gets its own ToolRun, so provenance is unchanged from the single-site tool.
+
+    Returns {site_id: (fingerprint_json, tool_run_id, errors)}.
+    """
+    site_ids = list(dict.fromkeys(str(s) for s in site_ids))
+    if not site_ids:
+        return {}
+    started_at = utc_now()
+    limit_features = _resolve_limit_features(token_budget, limit_features)
+    tool_run_ids = {sid: str(uuid4()) for sid in site_ids}
+    errors: dict[str, list[str]] = {sid: [] for sid in site_ids}
+    inputs_by_site = {
+        sid: {
+            "site_id": sid,
+            "authority_id": authority_id,
+            "plan_cycle_id": plan_cycle_id,
+            "token_budget": token_budget,
+            "limit_features": limit_features,
+            "batch_size": len(site_ids),
+        }
+        for sid in site_ids
+    }
+
+    sites = db_fetch_all(
+        """
+        SELECT id, metadata
+        FROM sites
+        WHERE id = ANY(%s::uuid[])
+        """,
+        (site_ids,),
+    )
+    site_meta = {str(r["id"]): r.get("metadata") or {} for r in sites}
+    found = [sid for sid in site_ids if sid in site_meta]
+
+    rows_by_site: dict[str, list[dict[str, Any]]] = {sid: [] for sid in found}
+    if found:
+        authority_sql = "AND (sf.authority_id IS NULL OR sf.authority_id = %s)" if authority_id else ""
+        params: list[Any] = [authority_id] if authority_id else []
+        try:
+            rows = db_fetch_all(
+                f"""
+                SELECT
+                  s.id AS site_id,
+                  f.spatial_feature_id,
+                  f.type,
+                  f.spatial_scope,
+                  f.confidence_hint,
+                  f.uncertainty_note,
+                  f.properties
+                FROM sites s
+                CROSS JOIN LATERAL (
+                  SELECT
+                    sf.id AS spatial_feature_id,
+                    sf.type,
+                    sf.spatial_scope,
+                    sf.confidence_hint,
+                    sf.uncertainty_note,
+                    sf.properties
+                  FROM spatial_features sf
+                  WHERE sf.is_active = true
+                    AND sf.geometry IS NOT NULL
+                    AND ST_Intersects(sf.geometry, s.geometry_polygon)
+                    {authority_sql}
+                  ORDER BY sf.type ASC, sf.id ASC
+                  LIMIT %s
+                ) f
+                WHERE s.id = ANY(%s::uuid[])
+                ORDER BY s.id, f.type ASC, f.spatial_feature_id ASC
+                """,
+                tuple(params + [limit_features, found]),
+            )
+        except Exception as exc:  # noqa: BLE001
+            rows = []
+            for sid in found:
+                errors[sid].append(f"spatial_query_failed: {exc}")
+        for r in rows:
+            rows_by_site.setdefault(str(r["site_id"]), []).append(r)
+
+    fingerprints = {
+        sid: _build_fingerprint(
+            site_id=sid,
+            authority_id=authority_id,
+            plan_cycle_id=plan_cycle_id,
+            rows=rows_by_site.get(sid, []),
+            limit_features=limit_features,
+        )
+        for sid in found
+    }
+
+    # ToolRuns go first: KG edges and site_fingerprints rows reference them by FK.
+    ended_at = utc_now()
+    run_ids: list[str] = []
+    run_inputs: list[str] = []
+    run_outputs: list[str] = []
+    run_status: list[str] = []
+    run_confidence: list[str] = []
+    run_notes: list[str] = []
+    for sid in site_ids:
+        run_ids.append(tool_run_ids[sid])
+        run_inputs.append(json.dumps(inputs_by_site[sid], ensure_ascii=False))
+        fingerprint = fingerprints.get(sid)
+        if fingerprint is None:
+            errors[sid].append("site_not_found")
+            run_outputs.append(json.dumps({"ok": False, "error": "site_not_found"}, ensure_ascii=False))
+            run_status.append("error")
+            run_confidence.append("low")
+            run_notes.append("Site not found; cannot compute fingerprint.")
+            continue
+        run_outputs.append(
+            json.dumps(
+                {
+                    "ok": True,
+                    "counts_by_type": fingerprint["counts_by_type"],
+                    "intersection_count": len(fingerprint["intersections"]),
+                    "summary": fingerprint["summary"],
+                    "errors": errors[sid][:10],
+                },
+                ensure_ascii=False,
+            )
+        )
+        run_status.append("success" if not errors[sid] else "partial")
+        run_confidence.append("high")
+        run_notes.append(fingerprint["limitations_text"])
+    db_execute(
+        """
+        INSERT INTO tool_runs (id, ingest_batch_id, tool_name, inputs_logged, outputs_logged, status, started_at, ended_at, confidence_hint, uncertainty_note)
+        SELECT r.id, NULL, 'get_site_fingerprint', r.inputs, r.outputs, r.status, %s, %s, r.confidence_hint, r.uncertainty_note
+        FROM unnest(%s::uuid[], %s::jsonb[], %s::jsonb[], %s::text[], %s::text[], %s::text[])
+          AS r(id, inputs, outputs, status, confidence_hint, uncertainty_note)
+        """,
+        (started_at, ended_at, run_ids, run_inputs, run_outputs, run_status, run_confidence, run_notes),
+    )
+
+    if found:
+        kg_error = _write_intersects_edges(
+            db_execute=db_execute,
+            fingerprints=fingerprints,
+            site_meta=site_meta,
+            tool_run_ids=tool_run_ids,
+        )
+        if kg_error:
+            for sid in found:
+                errors[sid].append(kg_error)
+            db_execute(
+                """
+                UPDATE tool_runs
+                SET status = 'partial',
+                    outputs_logged = jsonb_set(outputs_logged, '{errors}', %s::jsonb)
+                WHERE id = ANY(%s::uuid[])
+                """,
+                (json.dumps([kg_error], ensure_ascii=False), [tool_run_ids[sid] for sid in found]),
+            )
+        _persist_site_fingerprints(
+            db_fetch_all=db_fetch_all,
+            db_execute=db_execute,
+            utc_now=utc_now,
+            fingerprints=fingerprints,
+            tool_run_ids=tool_run_ids,
+            authority_id=authority_id,
+            plan_cycle_id=plan_cycle_id,
+        )
+
+    return {sid: (fingerprints.get(sid), tool_run_ids[sid], errors[sid]) for sid in site_ids}
+
+
+def _write_intersects_edges(
+    *,
+    db_execute: Callable[[str, tuple[Any, ...] | list[Any] | None], None],
+    fingerprints: dict[str, dict[str, Any]],
+    site_meta: dict[str, Any],
+    tool_run_ids: dict[str, str],
+) -> str | None:
+    """Best-effort KG enrichment (Slice C): Site -> SpatialFeature INTERSECTS edges with tool_run provenance."""
+    site_ids = list(fingerprints)
+    feature_props: dict[str, str] = {}
+    edge_src: list[str] = []
+    edge_dst: list[str] = []
+    edge_props: list[str] = []
+    edge_runs: list[str] = []
+    for sid, fingerprint in fingerprints.items():
+        for f in fingerprint["intersections"][:_KG_EDGES_PER_SITE]:
+            fid = f.get("spatial_feature_id")
+            if not isinstance(fid, str) or not _is_uuid_str(fid):
+                continue
+            feature_props.setdefault(
+                fid, json.dumps({"type": f.get("type"), "spatial_scope": f.get("spatial_scope")}, ensure_ascii=False)
+            )
+            edge_src.append(sid)
+            edge_dst.append(fid)
+            edge_props.append(json.dumps({"relationship": "intersects", "feature_type": f.get("type")}, ensure_ascii=False))
+            edge_runs.append(tool_run_ids[sid])
     try:
         db_execute(
             """
             INSERT INTO kg_node (node_id, node_type, props_jsonb, canonical_fk)
-            VALUES (%s::uuid, 'Site', %s::jsonb, %s::uuid)
+            SELECT n.id, 'Site', n.props, n.id
+            FROM unnest(%s::uuid[], %s::jsonb[]) AS n(id, props)
             ON CONFLICT (node_id) DO NOTHING
             """,
-            (site_id, json.dumps({"metadata": site.get("metadata") or {}}, ensure_ascii=False), site_id),
+            (
+                site_ids,
+                [json.dumps({"metadata": site_meta.get(sid) or {}}, ensure_ascii=False) for sid in site_ids],
+            ),
         )
-
-        # Replace prior INTERSECTS edges for this site (we treat KG as the current join fabric).
+        # Replace prior INTERSECTS edges for these sites (we treat KG as the current join fabric).
         db_execute(
-            "DELETE FROM kg_edge WHERE src_id = %s::uuid AND edge_type = 'INTERSECTS'",
-            (site_id,),
+            "DELETE FROM kg_edge WHERE src_id = ANY(%s::uuid[]) AND edge_type = 'INTERSECTS'",
+            (site_ids,),
         )
-
-        for f in features[:500]:
-            fid = f.get("spatial_feature_id")
-            if not isinstance(fid, str) or not _is_uuid_str(fid):
-                continue
+        if edge_src:
             db_execute(
                 """
                 INSERT INTO kg_node (node_id, node_type, props_jsonb, canonical_fk)
-                VALUES (%s::uuid, 'SpatialFeature', %s::jsonb, %s::uuid)
+                SELECT n.id, 'SpatialFeature', n.props, n.id
+                FROM unnest(%s::uuid[], %s::jsonb[]) AS n(id, props)
                 ON CONFLICT (node_id) DO NOTHING
                 """,
-                (fid, json.dumps({"type": f.get("type"), "spatial_scope": f.get("spatial_scope")}, ensure_ascii=False), fid),
+                (list(feature_props), list(feature_props.values())),
             )
             db_execute(
                 """
                 INSERT INTO kg_edge (edge_id, src_id, dst_id, edge_type, props_jsonb, evidence_ref_id, tool_run_id)
-                VALUES (%s::uuid, %s::uuid, %s::uuid, 'INTERSECTS', %s::jsonb, NULL, %s::uuid)
+                SELECT gen_random_uuid(), e.src_id, e.dst_id, 'INTERSECTS', e.props, NULL, e.tool_run_id
+                FROM unnest(%s::uuid[], %s::uuid[], %s::jsonb[], %s::uuid[]) AS e(src_id, dst_id, props, tool_run_id)
                 """,
-                (
-                    str(uuid4()),
-                    site_id,
-                    fid,
-                    json.dumps({"relationship": "intersects", "feature_type": f.get("type")}, ensure_ascii=False),
-                    tool_run_id,
-                ),
+                (edge_src, edge_dst, edge_props, edge_runs),
             )
     except Exception as exc:  # noqa: BLE001
-        errors.append(f"kg_enrichment_failed: {exc}")
+        return f"kg_enrichment_failed: {exc}"
+    return None
 
-    ended_at = utc_now()
-    db_execute(
-        """
-        INSERT INTO tool_runs (id, ingest_batch_id, tool_name, inputs_logged, outputs_logged, status, started_at, ended_at, confidence_hint, uncertainty_note)
-        VALUES (%s, NULL, %s, %s::jsonb, %s::jsonb, %s, %s, %s, %s, %s)
-        """,
-        (
-            tool_run_id,
-            "get_site_fingerprint",
-            json.dumps(
-                {
-                    "site_id": site_id,
-                    "authority_id": authority_id,
-                    "plan_cycle_id": plan_cycle_id,
-                    "token_budget": token_budget,
-                    "limit_features": limit_features,
-                },
-                ensure_ascii=False,
-            ),
-            json.dumps(
-                {
-                    "ok": True,
-                    "counts_by_type": counts_by_type,
-                    "intersection_count": len(features),
-                    "summary": summary,
-                    "errors": errors[:10],
-                },
-                ensure_ascii=False,
-            ),
-            "success" if not errors else "partial",
-            started_at,
-            ended_at,
-            "high",
-            fingerprint["limitations_text"],
-        ),
-    )
 
-    # Best-effort persistence into site_fingerprints (if present).
+def _persist_site_fingerprints(
+    *,
+    db_fetch_all: Callable[[str, tuple[Any, ...] | list[Any] | None], list[dict[str, Any]]],
+    db_execute: Callable[[str, tuple[Any, ...] | list[Any] | None], None],
+    utc_now: Callable[[], Any],
+    fingerprints: dict[str, dict[str, Any]],
+    tool_run_ids: dict[str, str],
+    authority_id: str | None,
+    plan_cycle_id: str | None,
+) -> None:
+    """
+    Best-effort persistence into site_fingerprints (if present). The previous current rows are
+    retired first (the partial unique indexes allow one current row per site/plan cycle), then the
+    new rows inserted, then the old rows pointed at their successors.
+    """
+    site_ids = list(fingerprints)
+    new_ids = {sid: str(uuid4()) for sid in site_ids}
+    now = utc_now()
     try:
-        previous = db_fetch_one(
+        retired = db_fetch_all(
             """
-            SELECT id
-            FROM site_fingerprints
-            WHERE site_id = %s::uuid
+            UPDATE site_fingerprints
+            SET is_current = false, updated_at = %s
+            WHERE site_id = ANY(%s::uuid[])
               AND (
                 (%s::uuid IS NULL AND plan_cycle_id IS NULL)
                 OR plan_cycle_id = %s::uuid
               )
               AND is_current = true
-            LIMIT 1
+            RETURNING id, site_id
             """,
-            (site_id, plan_cycle_id, plan_cycle_id),
+            (now, site_ids, plan_cycle_id, plan_cycle_id),
         )
-        prev_id = str(previous["id"]) if previous and previous.get("id") else None
-        new_id = str(uuid4())
-        now = utc_now()
-        if prev_id:
-            db_execute(
-                "UPDATE site_fingerprints SET is_current = false, superseded_by_fingerprint_id = %s::uuid WHERE id = %s::uuid",
-                (new_id, prev_id),
-            )
         db_execute(
             """
             INSERT INTO site_fingerprints (
               id, site_id, plan_cycle_id, authority_id, fingerprint_jsonb, tool_run_id, created_at, updated_at,
               is_current, superseded_by_fingerprint_id, confidence_hint, uncertainty_note
             )
-            VALUES (%s::uuid, %s::uuid, %s::uuid, %s, %s::jsonb, %s::uuid, %s, %s, true, NULL, %s, %s)
+            SELECT n.id, n.site_id, %s::uuid, %s, n.fingerprint, n.tool_run_id, %s, %s, true, NULL, 'high', n.note
+            FROM unnest(%s::uuid[], %s::uuid[], %s::jsonb[], %s::uuid[], %s::text[])
+              AS n(id, site_id, fingerprint, tool_run_id, note)
             """,
             (
-                new_id,
-                site_id,
                 plan_cycle_id,
                 authority_id,
-                json.dumps(fingerprint, ensure_ascii=False),
-                tool_run_id,
                 now,
                 now,
-                "high",
-                fingerprint["limitations_text"],
+                [new_ids[sid] for sid in site_ids],
+                site_ids,
+                [json.dumps(fingerprints[sid], ensure_ascii=False) for sid in site_ids],
+                [tool_run_ids[sid] for sid in site_ids],
+                [fingerprints[sid]["limitations_text"] for sid in site_ids],
             ),
         )
+        if retired:
+            db_execute(
+                """
+                UPDATE site_fingerprints sf
+                SET superseded_by_fingerprint_id = r.new_id
+                FROM unnest(%s::uuid[], %s::uuid[]) AS r(id, new_id)
+                WHERE sf.id = r.id
+                """,
+                (
+                    [str(r["id"]) for r in retired],
+                    [new_ids[str(r["site_id"])] for r in retired],
+                ),
+            )
     except Exception:
         # Table might not exist yet (stale DB volume), or constraints might block; skip without failing fingerprint itself.
         pass
-
-    return fingerprint, tool_run_id, errors
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 import os
+import re
 from typing import Any
 from uuid import UUID, uuid4
 
@@ -12,12 +13,16 @@ from .blob_store import read_blob_bytes, to_data_url, write_blob_bytes
 from .chart_renderer import render_chart_svg
 from .db import _db_execute, _db_fetch_all, _db_fetch_one
 from .evidence import _parse_evidence_ref
-from .model_clients import _ensure_model_role_sync, _vlm_model_id
+from .ingestion.docparse_ops import _load_page_image
+from .model_clients import _ensure_model_role_sync, _holds_model_leases, _vlm_model_id
 from .spatial_fingerprint import compute_site_fingerprint_sync
 from .text_utils import _extract_json_object
 from .time_utils import _utc_now
 
 
+_PAGE_FRAGMENT_RE = re.compile(r"page-(\d+)")
+
+
 def _uuid_or_400(value: str, *, field_name: str) -> str:
     try:
         return str(UUID(value))
@@ -222,6 +227,7 @@ def _update_tool_request(
     )
 
 
+@_holds_model_leases
 def _run_townscape_vlm_assessment_sync(
     *,
     run_id: str,
@@ -245,6 +251,20 @@ def _run_townscape_vlm_assessment_sync(
         if not parsed:
             continue
         source_type, source_id, fragment_id = parsed
+        page_match = _PAGE_FRAGMENT_RE.fullmatch(fragment_id) if source_type == "doc" else None
+        if page_match:
+            # Whole-page read: text pages may be stored at a reduced render tier, so upgrade first.
+            data, content_type, page_errors = _load_page_image(
+                document_id=source_id,
+                page_number=int(page_match.group(1)),
+                tier="full",
+                run_id=run_id,
+            )
+            errors.extend(page_errors)
+            if data:
+                used_refs.append(ref)
+                image_parts.append({"type": "image_url", "image_url": {"url": to_data_url(data, content_type or "image/png")}})
+            continue
         if source_type != "visual_asset" or fragment_id not in ("blob", "image"):
             continue
         row = _db_fetch_one("SELECT blob_path FROM visual_assets WHERE id = %s::uuid", (source_id,))
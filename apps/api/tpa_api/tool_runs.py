@@ -0,0 +1,322 @@
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Any
+from uuid import UUID, uuid4
+
+from psycopg import DataError, IntegrityError
+
+from .db import _db_pool_or_503, register_write_barrier
+from .time_utils import _utc_now
+
+
+logger = logging.getLogger(__name__)
+
+# ToolRun audit rows are written off the request path: callers enqueue a record and get its id
+# back immediately, and a background writer inserts queued records in batches (one checkout, one
+# commit). The provenance contract still holds because every DB helper runs a write barrier first:
+# a statement whose parameters mention a still-queued tool_run id (a FK reference, an UPDATE of the
+# row, a read-back) waits for the queue to be flushed, and `_db_transaction` blocks (bulk writers)
+# flush unconditionally unless they pass their params (read-only vector searches). The queue is bounded; when it is full callers block briefly and then write
+# their record synchronously rather than drop it. `TPA_TOOL_RUN_RECORDER=sync` writes inline (tests).
+
+_INSERT_SQL = """
+    INSERT INTO tool_runs (
+      id, tool_name, inputs_logged, outputs_logged, status,
+      started_at, ended_at, confidence_hint, uncertainty_note, run_id, ingest_batch_id
+    )
+    VALUES (%s, %s, %s::jsonb, %s::jsonb, %s, %s, %s, %s, %s, %s::uuid, %s::uuid)
+    ON CONFLICT (id) DO NOTHING
+"""
+
+
+def _env_int(key: str, default: int) -> int:
+    try:
+        return max(1, int(os.environ.get(key, str(default))))
+    except ValueError:
+        return default
+
+
+def _env_float(key: str, default: float) -> float:
+    try:
+        return max(0.0, float(os.environ.get(key, str(default))))
+    except ValueError:
+        return default
+
+
+def _recorder_mode() -> str:
+    mode = os.environ.get("TPA_TOOL_RUN_RECORDER", "async").strip().lower()
+    return mode if mode in {"async", "sync"} else "async"
+
+
+def _json(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    return json.dumps(value if value is not None else {}, ensure_ascii=False, default=str)
+
+
+class ToolRunRecorder:
+    """Bounded queue of pending `tool_runs` inserts drained in batches by one daemon thread."""
+
+    def __init__(
+        self,
+        *,
+        max_queue: int = 10000,
+        batch_size: int = 200,
+        flush_interval_seconds: float = 0.2,
+        enqueue_timeout_seconds: float = 2.0,
+    ) -> None:
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.enqueue_timeout_seconds = enqueue_timeout_seconds
+        self._queue: queue.Queue[tuple[Any, ...]] = queue.Queue(maxsize=max_queue)
+        # Rows taken off the queue whose batch failed to commit (DB unreachable); retried first.
+        self._carry: list[tuple[Any, ...]] = []
+        self._pending: set[str] = set()
+        self._pending_lock = threading.Lock()
+        # Records leave the queue only under this lock, so a flush that holds it sees (and commits)
+        # everything enqueued before it started, in order.
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._thread_lock = threading.Lock()
+        self._stats = {"enqueued": 0, "written": 0, "batches": 0, "sync_fallbacks": 0, "barrier_flushes": 0, "failed": 0}
+
+    # -- producer side -----------------------------------------------------------------------------
+
+    def record(self, row: tuple[Any, ...]) -> None:
+        tool_run_id = str(row[0])
+        self._ensure_thread()
+        with self._pending_lock:
+            self._pending.add(tool_run_id)
+        try:
+            self._queue.put(row, timeout=self.enqueue_timeout_seconds)
+        except queue.Full:
+            # Backpressure exhausted: keep the record, pay the round trip on the caller.
+            with self._pending_lock:
+                self._pending.discard(tool_run_id)
+                self._stats["sync_fallbacks"] += 1
+            self._note_failed(_write_rows([row]), 1)
+            return
+        with self._pending_lock:
+            self._stats["enqueued"] += 1
+        if self._queue.qsize() >= self.batch_size:
+            self._wakeup.set()
+
+    def has_pending(self, params: Any) -> bool:
+        """True if a queued (uncommitted) tool_run id appears among `params` (None = any pending)."""
+        with self._pending_lock:
+            if not self._pending:
+                return False
+            if params is None:
+                return True
+            return self._mentions_pending(params)
+
+    def _mentions_pending(self, value: Any) -> bool:
+        """Recurse into dict/list/tuple params, e.g. the id list of `WHERE id = ANY(%s::uuid[])`."""
+        if isinstance(value, (str, UUID)):
+            return str(value) in self._pending
+        if isinstance(value, dict):
+            value = value.values()
+        elif not isinstance(value, (list, tuple, set, frozenset)):
+            return False
+        return any(self._mentions_pending(item) for item in value)
+
+    def barrier(self, params: Any) -> None:
+        if self.has_pending(params):
+            with self._pending_lock:
+                self._stats["barrier_flushes"] += 1
+            self.flush()
+
+    # -- writer side -------------------------------------------------------------------------------
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._thread_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="tpa-tool-run-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval_seconds)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:  # noqa: BLE001
+                logger.exception("ToolRun writer flush failed; records stay queued for the next attempt.")
+                time.sleep(min(5.0, self.flush_interval_seconds * 10))
+
+    def flush(self) -> int:
+        """Write everything queued so far; returns the number of records committed."""
+        written = 0
+        with self._write_lock:
+            while True:
+                batch, self._carry = self._carry[: self.batch_size], self._carry[self.batch_size :]
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if not batch:
+                    return written
+                try:
+                    failed = _write_rows(batch)
+                except Exception:
+                    self._carry = batch + self._carry
+                    raise
+                written += len(batch) - failed
+                with self._pending_lock:
+                    for row in batch:
+                        self._pending.discard(str(row[0]))
+                    self._stats["written"] += len(batch) - failed
+                    self._stats["batches"] += 1
+                self._note_failed(failed, len(batch))
+
+    def _note_failed(self, failed: int, attempted: int) -> None:
+        """Count records `_write_rows` rejected; they are gone, so say so at error level."""
+        if not failed:
+            return
+        with self._pending_lock:
+            self._stats["failed"] += failed
+        logger.error("Dropped %s of %s ToolRun records rejected by the database (see errors above).", failed, attempted)
+
+    def shutdown(self, *, timeout_seconds: float = 10.0) -> None:
+        self._stopped.set()
+        self._wakeup.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout=timeout_seconds)
+        try:
+            self.flush()
+        except Exception:  # noqa: BLE001
+            lost = self._queue.qsize() + len(self._carry)
+            logger.exception("Failed to flush %s queued ToolRun records on shutdown.", lost)
+
+    def stats(self) -> dict[str, Any]:
+        with self._pending_lock:
+            queued = self._queue.qsize() + len(self._carry)
+            return {**self._stats, "queued": queued, "pending": len(self._pending)}
+
+
+def _write_rows(rows: list[tuple[Any, ...]]) -> int:
+    """
+    Insert `rows` in one transaction. If a row is rejected (e.g. its ingest_batch_id no longer
+    exists) fall back to row-by-row so one bad record cannot lose the others; returns rows dropped.
+    Connection errors propagate so the caller keeps the rows. Uses the pool directly so the write
+    barrier does not re-enter.
+    """
+    pool = _db_pool_or_503()
+    try:
+        with pool.connection() as conn:
+            with conn.transaction():
+                with conn.cursor() as cur:
+                    cur.executemany(_INSERT_SQL, rows)
+        return 0
+    except (IntegrityError, DataError):
+        if len(rows) == 1:
+            logger.error("Dropping ToolRun %s (%s): insert failed.", rows[0][0], rows[0][1], exc_info=True)
+            return 1
+    failed = 0
+    for row in rows:
+        failed += _write_rows([row])
+    return failed
+
+
+_recorder: ToolRunRecorder | None = None
+_recorder_lock = threading.Lock()
+
+
+def _get_recorder() -> ToolRunRecorder:
+    global _recorder
+    if _recorder is None:
+        with _recorder_lock:
+            if _recorder is None:
+                _recorder = ToolRunRecorder(
+                    max_queue=_env_int("TPA_TOOL_RUN_QUEUE_MAX", 10000),
+                    batch_size=_env_int("TPA_TOOL_RUN_BATCH_SIZE", 200),
+                    flush_interval_seconds=_env_float("TPA_TOOL_RUN_FLUSH_SECONDS", 0.2),
+                    enqueue_timeout_seconds=_env_float("TPA_TOOL_RUN_ENQUEUE_TIMEOUT_SECONDS", 2.0),
+                )
+                # Worker processes (ingest CLI, stage runner) have no FastAPI shutdown hook.
+                atexit.register(_recorder.shutdown)
+    return _recorder
+
+
+def _tool_run_write_barrier(params: Any) -> None:
+    if _recorder is not None:
+        _recorder.barrier(params)
+
+
+register_write_barrier(_tool_run_write_barrier)
+
+
+def record_tool_run(
+    *,
+    tool_name: str,
+    inputs: Any,
+    outputs: Any,
+    status: str,
+    started_at: datetime,
+    ended_at: datetime | None = None,
+    confidence_hint: str | None = None,
+    uncertainty_note: str | None = None,
+    run_id: str | None = None,
+    ingest_batch_id: str | None = None,
+    tool_run_id: str | None = None,
+) -> str:
+    """
+    Record a completed ToolRun and return its id.
+
+    `inputs`/`outputs` are serialised here, on the caller's thread, so later mutation of the dicts
+    cannot change what is logged. The row is visible to other connections after the next flush
+    (at most `TPA_TOOL_RUN_FLUSH_SECONDS`), and before any statement issued through `tpa_api.db`
+    that references the id.
+    """
+    tool_run_id = tool_run_id or str(uuid4())
+    row = (
+        tool_run_id,
+        tool_name,
+        _json(inputs),
+        _json(outputs),
+        status,
+        started_at,
+        ended_at or _utc_now(),
+        confidence_hint,
+        uncertainty_note,
+        run_id,
+        ingest_batch_id,
+    )
+    if _recorder_mode() == "sync":
+        _get_recorder()._note_failed(_write_rows([row]), 1)
+    else:
+        # Without a database (scaffold mode) fail on the caller, as a direct insert would, rather
+        # than queue records that can never be written.
+        _db_pool_or_503()
+        _get_recorder().record(row)
+    return tool_run_id
+
+
+def flush_tool_runs() -> int:
+    return _recorder.flush() if _recorder is not None else 0
+
+
+def shutdown_tool_run_recorder() -> None:
+    if _recorder is not None:
+        _recorder.shutdown()
+
+
+def tool_run_recorder_stats() -> dict[str, Any]:
+    stats = _recorder.stats() if _recorder is not None else {}
+    return {"mode": _recorder_mode(), **stats}
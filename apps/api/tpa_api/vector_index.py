@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+from typing import Any
+
+from psycopg import sql
+from psycopg.rows import dict_row
+
+from .db import _db_execute, _db_fetch_all, _db_transaction
+
+
+logger = logging.getLogger(__name__)
+
+# `unit_embeddings.embedding` is an untyped `vector` shared by every embedding model, so ANN indexes
+# are partial HNSW expression indexes, one per (model, unit_type, dimension), over the embedding
+# cast to a fixed-width type. pgvector's HNSW takes `vector` up to 2,000 dimensions and `halfvec` up
+# to 4,000; wider models (e.g. 4,096-d Qwen3-Embedding-8B) are indexed on their binary quantisation
+# and the candidates re-ranked by exact cosine distance. Queries use `ann_order_sql` /
+# `ann_dimension_sql` so their ORDER BY expression and WHERE clause match the index.
+_VECTOR_MAX_DIMS = 2000
+_HALFVEC_MAX_DIMS = 4000
+_BIT_MAX_DIMS = 64000
+
+_known_indexes: set[str] = set()
+_known_lock = threading.Lock()
+
+
+def _env_int(key: str, default: int) -> int:
+    try:
+        return max(1, int(os.environ.get(key, str(default))))
+    except ValueError:
+        return default
+
+
+def _auto_index_enabled() -> bool:
+    return os.environ.get("TPA_VECTOR_INDEX_AUTO", "1").strip().lower() not in {"0", "false", "off", "no"}
+
+
+def default_ef_search() -> int:
+    return _env_int("TPA_VECTOR_EF_SEARCH", 100)
+
+
+def _index_expression(dim: int) -> tuple[str, str] | None:
+    """(indexed expression over `embedding`, operator class) for this dimension."""
+    if dim <= _VECTOR_MAX_DIMS:
+        return f"(embedding::vector({dim}))", "vector_cosine_ops"
+    if dim <= _HALFVEC_MAX_DIMS:
+        return f"(embedding::halfvec({dim}))", "halfvec_cosine_ops"
+    if dim <= _BIT_MAX_DIMS:
+        return f"(binary_quantize(embedding)::bit({dim}))", "bit_hamming_ops"
+    return None
+
+
+def ann_order_sql(column: str, dim: int, *, query_sql: str = "%s") -> str:
+    """
+    ORDER BY expression that the partial HNSW index for `dim` can serve. `query_sql` is the query
+    vector (a `%s` parameter by default, or e.g. a LATERAL column). Select the exact
+    `column <=> query` distance alongside it and re-sort the candidates.
+    """
+    if dim <= _VECTOR_MAX_DIMS:
+        return f"({column}::vector({dim}) <=> {query_sql}::vector({dim}))"
+    if dim <= _HALFVEC_MAX_DIMS:
+        return f"({column}::halfvec({dim}) <=> {query_sql}::halfvec({dim}))"
+    if dim <= _BIT_MAX_DIMS:
+        return f"(binary_quantize({column})::bit({dim}) <~> binary_quantize({query_sql}::vector))"
+    return f"({column} <=> {query_sql}::vector)"
+
+
+def ann_dimension_sql(column: str) -> str:
+    """WHERE fragment (one `%s` int parameter) restricting rows to the query's dimension."""
+    return f"vector_dims({column}) = %s"
+
+
+def ann_candidate_limit(limit: int, dim: int) -> int:
+    """Candidates to take from the index before exact re-ranking (binary quantisation is coarse)."""
+    if _HALFVEC_MAX_DIMS < dim <= _BIT_MAX_DIMS:
+        return limit * _env_int("TPA_VECTOR_RERANK_FACTOR", 8)
+    return limit
+
+
+def unit_embedding_index_name(*, model_id: str, unit_type: str, dim: int) -> str:
+    digest = hashlib.sha1(f"{model_id}|{unit_type}|{dim}".encode("utf-8")).hexdigest()[:12]
+    return f"unit_embeddings_hnsw_{digest}"
+
+
+def ensure_unit_embedding_index(*, model_id: str, unit_type: str, dim: int) -> dict[str, Any]:
+    """
+    Create (concurrently, if missing) the partial HNSW index for one (model, unit_type, dim).
+
+    Cheap once the index exists; HNSW indexes are maintained on insert, so this only does work the
+    first time a model/unit type is embedded. Returns a small status dict for tool-run logging.
+    """
+    name = unit_embedding_index_name(model_id=model_id, unit_type=unit_type, dim=dim)
+    indexed = _index_expression(dim)
+    if indexed is None:
+        return {"index": None, "reason": f"dim_{dim}_exceeds_hnsw_limit"}
+    with _known_lock:
+        if name in _known_indexes:
+            return {"index": name, "created": False}
+    expression, opclass = indexed
+    statement = sql.SQL(
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON unit_embeddings "
+        "USING hnsw ({expression} {opclass}) WITH (m = {m}, ef_construction = {efc}) "
+        "WHERE embedding_model_id = {model_id} AND unit_type = {unit_type} AND vector_dims(embedding) = {dim}"
+    ).format(
+        name=sql.Identifier(name),
+        expression=sql.SQL(expression),
+        opclass=sql.SQL(opclass),
+        m=sql.Literal(_env_int("TPA_VECTOR_HNSW_M", 16)),
+        efc=sql.Literal(_env_int("TPA_VECTOR_HNSW_EF_CONSTRUCTION", 64)),
+        model_id=sql.Literal(model_id),
+        unit_type=sql.Literal(unit_type),
+        dim=sql.Literal(dim),
+    )
+    _db_execute(statement)
+    with _known_lock:
+        _known_indexes.add(name)
+    return {"index": name, "created": True}
+
+
+def _maybe_ensure_unit_embedding_index(*, model_id: str, unit_type: str, dim: int | None) -> dict[str, Any] | None:
+    """Ingest hook: best-effort index creation, never fails the embedding stage."""
+    if not dim or not _auto_index_enabled():
+        return None
+    try:
+        return ensure_unit_embedding_index(model_id=model_id, unit_type=unit_type, dim=dim)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Failed to ensure HNSW index for %s/%s/%s: %s", model_id, unit_type, dim, exc)
+        return {"index": None, "error": str(exc)}
+
+
+def ensure_unit_embedding_indexes() -> list[dict[str, Any]]:
+    """Backfill indexes for every (model, unit_type, dim) already stored (existing databases)."""
+    groups = _db_fetch_all(
+        """
+        SELECT embedding_model_id, unit_type, vector_dims(embedding) AS dim, COUNT(*) AS row_count
+        FROM unit_embeddings
+        GROUP BY 1, 2, 3
+        ORDER BY 1, 2, 3
+        """
+    )
+    out: list[dict[str, Any]] = []
+    for g in groups:
+        status = ensure_unit_embedding_index(
+            model_id=str(g["embedding_model_id"]), unit_type=str(g["unit_type"]), dim=int(g["dim"])
+        )
+        out.append(
+            {
+                **status,
+                "model_id": g["embedding_model_id"],
+                "unit_type": g["unit_type"],
+                "dim": g["dim"],
+                "rows": g["row_count"],
+            }
+        )
+    return out
+
+
+def _fetch_ann_rows(query: str, params: tuple[Any, ...], *, ef_search: int | None = None) -> list[dict[str, Any]]:
+    """
+    Run a vector search with per-request HNSW settings (`SET LOCAL`, so pooled connections are
+    not affected). Iterative scans keep filtered queries (authority/plan cycle) from returning
+    fewer than LIMIT rows on pgvector >= 0.8; older servers just skip that setting.
+    """
+    ef = max(1, int(ef_search or default_ef_search()))
+    # A read: barrier on this query's params only, so retrieval never flushes other threads' ToolRuns.
+    with _db_transaction(params) as conn:
+        with conn.cursor(row_factory=dict_row) as cur:
+            cur.execute("SELECT set_config('hnsw.ef_search', %s, true)", (str(ef),))
+            try:
+                with conn.transaction():
+                    cur.execute("SELECT set_config('hnsw.iterative_scan', 'relaxed_order', true)")
+            except Exception:  # noqa: BLE001
+                pass
+            cur.execute(query, params)
+            return [dict(r) for r in cur.fetchall()]
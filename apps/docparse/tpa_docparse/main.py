@@ -7,6 +7,7 @@ import io
 import json
 import os
 import tempfile
+import threading
 import time
 import logging
 from typing import Any
@@ -16,12 +17,24 @@ from urllib.parse import urlparse
 import httpx
 from fastapi import FastAPI, HTTPException, UploadFile, Form
 from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
 
-from pdf2image import convert_from_bytes
 from pypdf import PdfReader
 from minio import Minio
 from PIL import Image
 
+from .page_render import PageRenderError, render_pages
+from .parse_pool import (
+    ParseQueue,
+    configure as configure_parse_pool,
+    max_concurrent_parses,
+    max_queued_parses,
+    pool_stats,
+    run_cpu,
+    shutdown_pool,
+    warm_pool,
+)
+
 
 _LOG_LEVEL = os.environ.get("TPA_DOCPARSE_LOG_LEVEL", "INFO").upper()
 if not logging.getLogger().handlers:
@@ -39,11 +52,30 @@ def _log_stage(stage: str, *, started_at: float, details: dict[str, Any] | None
     logger.info("%s | elapsed=%.1fs", stage, elapsed)
 
 
+_parse_queue = ParseQueue(limit=max_concurrent_parses(), max_waiting=max_queued_parses())
+
+
+@app.on_event("startup")
+def _start_parse_pool() -> None:
+    configure_parse_pool(initializer=_warm_docling_converter)
+    warm_pool()
+
+
+@app.on_event("shutdown")
+def _stop_parse_pool() -> None:
+    shutdown_pool()
+
+
 @app.get("/healthz")
 def healthz() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/status")
+def status() -> dict[str, Any]:
+    return {**_parse_queue.stats(), **pool_stats()}
+
+
 def _minio_client() -> Minio:
     endpoint = os.environ.get("TPA_S3_ENDPOINT")
     access_key = os.environ.get("TPA_S3_ACCESS_KEY")
@@ -81,6 +113,18 @@ def _upload_bytes(*, client: Minio, bucket: str, blob_path: str, data: bytes, co
         raise HTTPException(status_code=500, detail=f"MinIO upload failed: {exc}") from exc
 
 
+def _download_bytes(*, client: Minio, bucket: str, blob_path: str) -> bytes:
+    try:
+        resp = client.get_object(bucket, blob_path)
+    except Exception as exc:  # noqa: BLE001
+        raise HTTPException(status_code=404, detail=f"MinIO object not found: {blob_path}: {exc}") from exc
+    try:
+        return resp.read()
+    finally:
+        resp.close()
+        resp.release_conn()
+
+
 def _as_data_url(data: bytes, content_type: str) -> str:
     encoded = base64.b64encode(data).decode("ascii")
     return f"data:{content_type};base64,{encoded}"
@@ -297,15 +341,68 @@ def _extract_docling_blocks(page: Any, page_number: int) -> list[dict[str, Any]]
     return blocks
 
 
+_RENDER_TIER_DEFAULT_DPI = {"thumbnail": 72, "standard": 150, "full": 300}
+_RENDER_TIER_ENV = {
+    "thumbnail": "TPA_DOCPARSE_RENDER_THUMBNAIL_DPI",
+    "standard": "TPA_DOCPARSE_RENDER_STANDARD_DPI",
+    "full": "TPA_DOCPARSE_RENDER_DPI",
+}
+_A4_AREA_SQ_IN = 8.27 * 11.69
+
+
+def _render_tier_dpi(tier: str) -> int:
+    default = _RENDER_TIER_DEFAULT_DPI.get(tier, _RENDER_TIER_DEFAULT_DPI["full"])
+    try:
+        return int(os.environ.get(_RENDER_TIER_ENV.get(tier, ""), str(default)))
+    except ValueError:
+        return default
+
+
+def _text_density(page_text: str, *, width: Any = None, height: Any = None) -> float:
+    """Non-whitespace characters per square inch of page (PDF points; A4 when unknown)."""
+    area = _A4_AREA_SQ_IN
+    try:
+        if width and height:
+            area = max(1.0, (float(width) / 72.0) * (float(height) / 72.0))
+    except (TypeError, ValueError):
+        pass
+    chars = sum(1 for ch in page_text if not ch.isspace())
+    return chars / area
+
+
 def _select_render_tier(
     *,
     page_text: str,
     visual_count: int,
     docling_used: bool,
     docling_errors: list[str],
+    page_width: Any = None,
+    page_height: Any = None,
 ) -> tuple[str, str]:
-    del page_text, visual_count, docling_used, docling_errors
-    return "full", "full_res_only"
+    """
+    Choose a raster tier for a page render.
+
+    Pages that carry pictures, or carry so little text that their content is probably vector
+    drawings or a scan, stay at full resolution for VLM/georef. Text pages drop to standard,
+    and text-dense pages that Docling captured cleanly drop to a thumbnail; both can be
+    upgraded on demand via `/render/pages`.
+    """
+    if (os.environ.get("TPA_DOCPARSE_RENDER_TIERING") or "adaptive").strip().lower() != "adaptive":
+        return "full", "full_res_only"
+    if visual_count > 0:
+        return "full", "visuals_present"
+    density = _text_density(page_text, width=page_width, height=page_height)
+    sparse_max = float(os.environ.get("TPA_DOCPARSE_RENDER_SPARSE_DENSITY", "2.0"))
+    # A full A4 page of body text is ~25-35 chars/in²; only small-print pages (schedules, tables,
+    # appendices) reach the thumbnail threshold.
+    dense_min = float(os.environ.get("TPA_DOCPARSE_RENDER_DENSE_DENSITY", "45.0"))
+    if density < sparse_max:
+        return "full", "low_text_density"
+    if not docling_used or docling_errors:
+        return "standard", "text_page_fallback_parse"
+    if density >= dense_min:
+        return "thumbnail", "text_dense_structured"
+    return "standard", "text_page"
 
 
 def _render_page_images(
@@ -321,19 +418,14 @@ def _render_page_images(
     minio_client: Minio,
     bucket: str,
 ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
-    render_dpi = 300
-    fmt = "png"
     ext = "png"
 
-    render_runs: list[dict[str, Any]] = []
-    rendered_pages: list[dict[str, Any]] = []
-    total_pages = len(pages)
-    for idx, page in enumerate(pages, start=1):
+    base_prefix = f"docparse/{authority_id}/{plan_cycle_id or 'none'}/{document_id}"
+    plan: list[dict[str, Any]] = []
+    for page in pages:
         page_number = int(page.get("page_number") or 0)
         if page_number <= 0:
             continue
-        if idx == 1 or idx % 25 == 0 or idx == total_pages:
-            logger.info("Rendering page %s/%s", idx, total_pages)
         page_text = page.get("text") if isinstance(page.get("text"), str) else ""
         visual_count = int(visuals_by_page.get(page_number, 0))
         tier, reason = _select_render_tier(
@@ -341,84 +433,77 @@ def _render_page_images(
             visual_count=visual_count,
             docling_used=docling_used,
             docling_errors=docling_errors,
+            page_width=page.get("width"),
+            page_height=page.get("height"),
         )
-        dpi = render_dpi
-
-        started = time.time()
-        try:
-            images = convert_from_bytes(
-                pdf_bytes,
-                dpi=dpi,
-                first_page=page_number,
-                last_page=page_number,
-                fmt=fmt,
-            )
-        except Exception as exc:  # noqa: BLE001
-            render_runs.append(
-                {
-                    "tool_name": "page_render",
-                    "status": "error",
-                    "inputs": {"page_number": page_number, "dpi": dpi, "format": fmt},
-                    "outputs": {"error": str(exc)},
-                    "duration_seconds": max(0.0, time.time() - started),
-                    "limitations_text": "Page render failed; raster output required for explainability layers.",
-                }
-            )
-            raise HTTPException(status_code=500, detail=f"page_render_failed:p{page_number}:{exc}") from exc
-        if not images:
-            render_runs.append(
-                {
-                    "tool_name": "page_render",
-                    "status": "error",
-                    "inputs": {"page_number": page_number, "dpi": dpi, "format": fmt},
-                    "outputs": {"error": "no_images_returned"},
-                    "duration_seconds": max(0.0, time.time() - started),
-                    "limitations_text": "No raster output returned for the requested page.",
-                }
-            )
-            raise HTTPException(status_code=500, detail=f"page_render_failed:p{page_number}:no_output")
-
-        img = images[0]
-        out = io.BytesIO()
-        img.save(out, format="PNG")
-        img_bytes = out.getvalue()
-
-        base_prefix = f"docparse/{authority_id}/{plan_cycle_id or 'none'}/{document_id}"
-        blob_path = f"{base_prefix}/page_renders/p{page_number:04d}-{tier.lower()}.{ext}"
-        _upload_bytes(
-            client=minio_client,
-            bucket=bucket,
-            blob_path=blob_path,
-            data=img_bytes,
-            content_type="image/png",
-        )
-
-        rendered_pages.append(
+        plan.append(
             {
                 "page_number": page_number,
-                "render_blob_path": blob_path,
-                "render_format": fmt,
-                "render_dpi": dpi,
-                "render_width": img.width,
-                "render_height": img.height,
-                "render_tier": tier,
-                "render_reason": reason,
-            }
-        )
-        render_runs.append(
-            {
-                "tool_name": "page_render",
-                "status": "success",
-                "inputs": {"page_number": page_number, "dpi": dpi, "format": fmt, "tier": tier},
-                "outputs": {"render_path": blob_path, "width": img.width, "height": img.height},
-                "duration_seconds": max(0.0, time.time() - started),
-                "limitations_text": "Raster page renders are for explainability overlays; verify scale before measurements.",
+                "dpi": _render_tier_dpi(tier),
+                "tier": tier,
+                "reason": reason,
+                "blob_path": f"{base_prefix}/page_renders/p{page_number:04d}-{tier.lower()}.{ext}",
             }
         )
 
+    return _run_render_plan(pdf_bytes=pdf_bytes, plan=plan, minio_client=minio_client, bucket=bucket)
+
+
+def _run_render_plan(
+    *,
+    pdf_bytes: bytes,
+    plan: list[dict[str, Any]],
+    minio_client: Minio,
+    bucket: str,
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    def _upload(blob_path: str, data: bytes) -> None:
+        _upload_bytes(client=minio_client, bucket=bucket, blob_path=blob_path, data=data, content_type="image/png")
+
+    render_runs: list[dict[str, Any]] = []
+    rendered_pages: list[dict[str, Any]] = []
+    try:
+        for rendered, run in render_pages(pdf_bytes=pdf_bytes, plan=plan, upload=_upload):
+            rendered_pages.append(rendered)
+            render_runs.append(run)
+    except PageRenderError as exc:
+        raise HTTPException(
+            status_code=500,
+            detail=f"page_render_failed:p{exc.page_number}:{exc.detail}",
+        ) from exc
+
+    rendered_pages.sort(key=lambda p: p["page_number"])
+    render_runs.sort(key=lambda r: r["inputs"]["page_number"])
     return rendered_pages, render_runs
 
 
+_docling_converter_instance: Any = None
+_docling_converter_lock = threading.Lock()
+# Serialises conversions when parsing runs in threads (TPA_DOCPARSE_PARSE_WORKERS=0); uncontended
+# in worker processes, which take one document at a time.
+_docling_convert_lock = threading.Lock()
+
+
+def _docling_converter() -> Any:
+    """One DocumentConverter per process: constructing it loads the layout and table models."""
+    global _docling_converter_instance
+    with _docling_converter_lock:
+        if _docling_converter_instance is None:
+            from docling.document_converter import DocumentConverter  # type: ignore[import-not-found]
+
+            _docling_converter_instance = DocumentConverter()
+        return _docling_converter_instance
+
+
+def _warm_docling_converter() -> None:
+    started = time.monotonic()
+    try:
+        _docling_converter()
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Docling converter unavailable in worker %s: %s", os.getpid(), exc)
+        return
+    _log_stage("Docling converter ready", started_at=started, details={"pid": os.getpid()})
+
+
 def _docling_parse_pdf(
     *,
     file_bytes: bytes,
@@ -426,7 +511,7 @@ def _docling_parse_pdf(
     max_pages: int | None,
 ) -> tuple[list[dict[str, Any]], list[dict[str, Any]], list[dict[str, Any]], list[dict[str, Any]], list[str]]:
     try:
-        from docling.document_converter import DocumentConverter  # type: ignore[import-not-found]
+        converter = _docling_converter()
     except Exception as exc:  # noqa: BLE001
         return [], [], [], [], [f"docling_unavailable:{exc}"]
 
@@ -442,8 +527,8 @@ def _docling_parse_pdf(
             tmp.write(file_bytes)
             temp_path = tmp.name
 
-        converter = DocumentConverter()
-        result = converter.convert(temp_path)
+        with _docling_convert_lock:
+            result = converter.convert(temp_path)
         doc = getattr(result, "document", result)
         data = _docling_to_dict(doc)
 
@@ -1030,11 +1115,72 @@ def _normalize_metrics(raw: Any) -> list[dict[str, Any]]:
     return out
 
 
+def _parse_pdf_cpu(data: bytes, filename: str, include_visuals: bool = True) -> dict[str, Any]:
+    """
+    The CPU-bound part of a parse (docling, pypdf text and image extraction). Runs in a parse
+    worker process, so it takes and returns plain picklable data.
+    """
+    started = time.monotonic()
+    reader = PdfReader(io.BytesIO(data))
+    _log_stage("PDF reader ready", started_at=started, details={"pages": len(reader.pages), "pid": os.getpid()})
+
+    docling_start = time.monotonic()
+    docling_pages, docling_blocks, docling_tables, docling_runs, docling_errors = _docling_parse_pdf(
+        file_bytes=data,
+        filename=filename,
+        max_pages=None,
+    )
+    _log_stage(
+        "Docling parse complete",
+        started_at=docling_start,
+        details={
+            "pages": len(docling_pages),
+            "blocks": len(docling_blocks),
+            "tables": len(docling_tables),
+            "errors": len(docling_errors),
+        },
+    )
+
+    fallback_start = time.monotonic()
+    fallback_pages = _extract_page_texts(reader, max_pages=None)
+    _log_stage(
+        "Fallback text extracted",
+        started_at=fallback_start,
+        details={"pages": len(fallback_pages)},
+    )
+
+    visuals: list[dict[str, Any]] = []
+    visual_errors: list[str] = []
+    if include_visuals:
+        visual_start = time.monotonic()
+        visuals, visual_errors = _extract_images(reader, max_pages=None, max_visuals=None)
+        _log_stage(
+            "Visual extraction complete",
+            started_at=visual_start,
+            details={"visuals": len(visuals), "errors": len(visual_errors)},
+        )
+    return {
+        "docling_pages": docling_pages,
+        "docling_blocks": docling_blocks,
+        "docling_tables": docling_tables,
+        "docling_runs": docling_runs,
+        "docling_errors": docling_errors,
+        "fallback_pages": fallback_pages,
+        "visuals": visuals,
+        "visual_errors": visual_errors,
+    }
+
+
 @app.post("/parse/bundle")
 async def parse_bundle(
     file: UploadFile,
     metadata: str = Form("{}"),
 ) -> JSONResponse:
+    async with _parse_queue:
+        return await _parse_bundle(file, metadata)
+
+
+async def _parse_bundle(file: UploadFile, metadata: str) -> JSONResponse:
     if not file:
         raise HTTPException(status_code=400, detail="file is required")
 
@@ -1057,33 +1203,16 @@ async def parse_bundle(
     data = await file.read()
     logger.info("Docparse start: filename=%s bytes=%s", file.filename, len(data))
 
-    reader = PdfReader(io.BytesIO(data))
-    _log_stage("PDF reader ready", started_at=overall_start, details={"pages": len(reader.pages)})
+    parsed = await run_cpu(_parse_pdf_cpu, data, file.filename or "document.pdf")
+    docling_pages = parsed["docling_pages"]
+    docling_blocks = parsed["docling_blocks"]
+    docling_tables = parsed["docling_tables"]
+    docling_runs = parsed["docling_runs"]
+    docling_errors = parsed["docling_errors"]
+    fallback_pages = parsed["fallback_pages"]
+    visuals = parsed["visuals"]
+    visual_errors = parsed["visual_errors"]
 
-    docling_start = time.monotonic()
-    docling_pages, docling_blocks, docling_tables, docling_runs, docling_errors = _docling_parse_pdf(
-        file_bytes=data,
-        filename=file.filename or "document.pdf",
-        max_pages=None,
-    )
-    _log_stage(
-        "Docling parse complete",
-        started_at=docling_start,
-        details={
-            "pages": len(docling_pages),
-            "blocks": len(docling_blocks),
-            "tables": len(docling_tables),
-            "errors": len(docling_errors),
-        },
-    )
-
-    fallback_start = time.monotonic()
-    fallback_pages = _extract_page_texts(reader, max_pages=None)
-    _log_stage(
-        "Fallback text extracted",
-        started_at=fallback_start,
-        details={"pages": len(fallback_pages)},
-    )
     merge_start = time.monotonic()
     page_texts, page_sources = _merge_page_texts(
         docling_pages=docling_pages,
@@ -1097,13 +1226,6 @@ async def parse_bundle(
         details={"pages": len(page_texts), "docling_used": docling_used},
     )
 
-    visual_start = time.monotonic()
-    visuals, visual_errors = _extract_images(reader, max_pages=None, max_visuals=None)
-    _log_stage(
-        "Visual extraction complete",
-        started_at=visual_start,
-        details={"visuals": len(visuals), "errors": len(visual_errors)},
-    )
     visuals_by_page: dict[int, int] = {}
     for asset in visuals:
         page_number = int(asset.get("page_number") or 0)
@@ -1172,7 +1294,7 @@ async def parse_bundle(
         standard_matrices,
         scope_candidates,
         llm_runs,
-    ) = _annotate_blocks_with_llm(blocks, llm_model_id=llm_model_id)
+    ) = await asyncio.to_thread(_annotate_blocks_with_llm, blocks, llm_model_id=llm_model_id)
     _log_stage(
         "LLM block annotation complete",
         started_at=llm_start,
@@ -1186,10 +1308,11 @@ async def parse_bundle(
 
     bucket = os.environ.get("TPA_S3_BUCKET") or "tpa"
     minio_client = _minio_client()
-    _ensure_bucket(minio_client, bucket)
+    await asyncio.to_thread(_ensure_bucket, minio_client, bucket)
 
     render_start = time.monotonic()
-    rendered_pages, render_tool_runs = _render_page_images(
+    rendered_pages, render_tool_runs = await asyncio.to_thread(
+        _render_page_images,
         pdf_bytes=data,
         pages=page_texts,
         visuals_by_page=visuals_by_page,
@@ -1273,7 +1396,8 @@ async def parse_bundle(
         caption = classification.get("caption_hint") if isinstance(classification.get("caption_hint"), str) else None
         base_prefix = f"docparse/{authority_id}/{plan_cycle_id or 'none'}/{document_id}"
         blob_path = f"{base_prefix}/visual_assets/{asset_type}/{asset_hash}.{extension}"
-        _upload_bytes(
+        await asyncio.to_thread(
+            _upload_bytes,
             client=minio_client,
             bucket=bucket,
             blob_path=blob_path,
@@ -1374,7 +1498,8 @@ async def parse_bundle(
     }
 
     bundle_path = f"docparse/{authority_id}/{plan_cycle_id or 'none'}/{document_id}/parse_bundles/{job_id}.json"
-    _upload_bytes(
+    await asyncio.to_thread(
+        _upload_bytes,
         client=minio_client,
         bucket=bucket,
         blob_path=bundle_path,
@@ -1412,16 +1537,15 @@ async def parse_pdf(file: UploadFile) -> JSONResponse:
     data = await file.read()
     if not data:
         raise HTTPException(status_code=400, detail="empty file")
-    reader = PdfReader(io.BytesIO(data))
-    docling_pages, docling_blocks, _, _, docling_errors = _docling_parse_pdf(
-        file_bytes=data,
-        filename=file.filename or "document.pdf",
-        max_pages=None,
-    )
+    async with _parse_queue:
+        parsed = await run_cpu(_parse_pdf_cpu, data, file.filename or "document.pdf", False)
+    docling_pages = parsed["docling_pages"]
+    docling_blocks = parsed["docling_blocks"]
+    docling_errors = parsed["docling_errors"]
     if docling_pages:
         page_texts = docling_pages
     else:
-        page_texts = _extract_page_texts(reader, max_pages=None)
+        page_texts = parsed["fallback_pages"]
     blocks = docling_blocks if docling_blocks else _lines_to_blocks(page_texts)
     provider = "docling" if docling_pages and not docling_errors else "pypdf"
     return JSONResponse(
@@ -1431,3 +1555,52 @@ async def parse_pdf(file: UploadFile) -> JSONResponse:
             "chunks": blocks,
         }
     )
+
+
+class RenderPagesRequest(BaseModel):
+    source_blob_path: str
+    document_id: str
+    authority_id: str = "unknown"
+    plan_cycle_id: str | None = None
+    page_numbers: list[int] = Field(default_factory=list)
+    tier: str = "full"
+
+
+@app.post("/render/pages")
+def render_pages_on_demand(body: RenderPagesRequest) -> JSONResponse:
+    """Re-render selected pages at a higher tier (e.g. when VLM/georef needs full resolution)."""
+    tier = body.tier.strip().lower()
+    if tier not in _RENDER_TIER_DEFAULT_DPI:
+        raise HTTPException(status_code=400, detail=f"Unknown render tier: {body.tier}")
+    page_numbers = sorted({int(p) for p in body.page_numbers if int(p) > 0})
+    if not page_numbers:
+        raise HTTPException(status_code=400, detail="page_numbers is required")
+
+    bucket = os.environ.get("TPA_S3_BUCKET") or "tpa"
+    minio_client = _minio_client()
+    pdf_bytes = _download_bytes(client=minio_client, bucket=bucket, blob_path=body.source_blob_path)
+
+    base_prefix = f"docparse/{body.authority_id}/{body.plan_cycle_id or 'none'}/{body.document_id}"
+    plan = [
+        {
+            "page_number": page_number,
+            "dpi": _render_tier_dpi(tier),
+            "tier": tier,
+            "reason": "on_demand_upgrade",
+            "blob_path": f"{base_prefix}/page_renders/p{page_number:04d}-{tier}.png",
+        }
+        for page_number in page_numbers
+    ]
+    started = time.monotonic()
+    rendered_pages, render_runs = _run_render_plan(
+        pdf_bytes=pdf_bytes,
+        plan=plan,
+        minio_client=minio_client,
+        bucket=bucket,
+    )
+    _log_stage(
+        "On-demand page render complete",
+        started_at=started,
+        details={"document_id": body.document_id, "pages": len(rendered_pages), "tier": tier},
+    )
+    return JSONResponse(content={"pages": rendered_pages, "tool_runs": render_runs})
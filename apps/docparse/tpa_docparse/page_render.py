@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import io
+import logging
+import os
+import re
+import shutil
+import tempfile
+import time
+from concurrent.futures import FIRST_EXCEPTION, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterator
+
+from pdf2image import convert_from_path
+from PIL import Image
+
+
+logger = logging.getLogger(__name__)
+
+_PAGE_SUFFIX_RE = re.compile(r"-(\d+)\.png$")
+
+UploadFn = Callable[[str, bytes], None]
+
+
+class PageRenderError(RuntimeError):
+    def __init__(self, page_number: int, detail: str, *, render_run: dict[str, Any]) -> None:
+        super().__init__(f"p{page_number}:{detail}")
+        self.page_number = page_number
+        self.detail = detail
+        self.render_run = render_run
+
+
+def render_workers() -> int:
+    raw = os.environ.get("TPA_DOCPARSE_RENDER_WORKERS")
+    if raw:
+        try:
+            return max(1, int(raw))
+        except ValueError:
+            pass
+    return max(1, min(4, os.cpu_count() or 1))
+
+
+def render_batch_pages() -> int:
+    try:
+        return max(1, int(os.environ.get("TPA_DOCPARSE_RENDER_BATCH_PAGES", "8")))
+    except ValueError:
+        return 8
+
+
+def plan_render_batches(plan: list[dict[str, Any]], *, batch_pages: int) -> list[list[dict[str, Any]]]:
+    """
+    Group page plans into contiguous poppler ranges.
+
+    A batch only spans consecutive page numbers that share a DPI so one `pdftoppm`
+    invocation can rasterise the whole range from a single parse of the PDF.
+    """
+    batches: list[list[dict[str, Any]]] = []
+    current: list[dict[str, Any]] = []
+    for item in sorted(plan, key=lambda p: int(p["page_number"])):
+        if current:
+            prev = current[-1]
+            contiguous = int(item["page_number"]) == int(prev["page_number"]) + 1
+            if not contiguous or item["dpi"] != prev["dpi"] or len(current) >= batch_pages:
+                batches.append(current)
+                current = []
+        current.append(item)
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _error_run(item: dict[str, Any], *, error: str, started: float, limitations_text: str) -> dict[str, Any]:
+    return {
+        "tool_name": "page_render",
+        "status": "error",
+        "inputs": {"page_number": item["page_number"], "dpi": item["dpi"], "format": "png"},
+        "outputs": {"error": error},
+        "duration_seconds": max(0.0, time.time() - started),
+        "limitations_text": limitations_text,
+    }
+
+
+def _render_batch(
+    *,
+    pdf_path: str,
+    work_dir: str,
+    batch: list[dict[str, Any]],
+    upload: UploadFn,
+) -> list[tuple[dict[str, Any], dict[str, Any]]]:
+    first_page = int(batch[0]["page_number"])
+    last_page = int(batch[-1]["page_number"])
+    dpi = int(batch[0]["dpi"])
+    batch_dir = tempfile.mkdtemp(prefix=f"p{first_page:04d}-", dir=work_dir)
+    started = time.time()
+    try:
+        try:
+            paths = convert_from_path(
+                pdf_path,
+                dpi=dpi,
+                first_page=first_page,
+                last_page=last_page,
+                fmt="png",
+                output_folder=batch_dir,
+                paths_only=True,
+            )
+        except Exception as exc:  # noqa: BLE001
+            run = _error_run(
+                batch[0],
+                error=str(exc),
+                started=started,
+                limitations_text="Page render failed; raster output required for explainability layers.",
+            )
+            raise PageRenderError(first_page, str(exc), render_run=run) from exc
+        render_seconds = max(0.0, time.time() - started)
+
+        paths_by_page: dict[int, str] = {}
+        for path in paths or []:
+            match = _PAGE_SUFFIX_RE.search(str(path))
+            if match:
+                paths_by_page[int(match.group(1))] = str(path)
+        per_page_render = render_seconds / max(1, len(batch))
+
+        results: list[tuple[dict[str, Any], dict[str, Any]]] = []
+        for item in batch:
+            page_number = int(item["page_number"])
+            path = paths_by_page.get(page_number)
+            if not path:
+                run = _error_run(
+                    item,
+                    error="no_images_returned",
+                    started=started,
+                    limitations_text="No raster output returned for the requested page.",
+                )
+                raise PageRenderError(page_number, "no_output", render_run=run)
+            upload_started = time.time()
+            with open(path, "rb") as fh:
+                img_bytes = fh.read()
+            with Image.open(io.BytesIO(img_bytes)) as img:
+                width, height = img.width, img.height
+            upload(item["blob_path"], img_bytes)
+            os.unlink(path)
+            upload_seconds = max(0.0, time.time() - upload_started)
+
+            rendered = {
+                "page_number": page_number,
+                "render_blob_path": item["blob_path"],
+                "render_format": "png",
+                "render_dpi": dpi,
+                "render_width": width,
+                "render_height": height,
+                "render_tier": item["tier"],
+                "render_reason": item["reason"],
+            }
+            run = {
+                "tool_name": "page_render",
+                "status": "success",
+                "inputs": {
+                    "page_number": page_number,
+                    "dpi": dpi,
+                    "format": "png",
+                    "tier": item["tier"],
+                    "batch_first_page": first_page,
+                    "batch_last_page": last_page,
+                },
+                "outputs": {
+                    "render_path": item["blob_path"],
+                    "width": width,
+                    "height": height,
+                    "bytes": len(img_bytes),
+                    "render_seconds": per_page_render,
+                    "upload_seconds": upload_seconds,
+                },
+                "duration_seconds": per_page_render + upload_seconds,
+                "limitations_text": "Raster page renders are for explainability overlays; verify scale before measurements.",
+            }
+            results.append((rendered, run))
+        return results
+    finally:
+        shutil.rmtree(batch_dir, ignore_errors=True)
+
+
+def render_pages(
+    *,
+    pdf_bytes: bytes,
+    plan: list[dict[str, Any]],
+    upload: UploadFn,
+    workers: int | None = None,
+    batch_pages: int | None = None,
+) -> Iterator[tuple[dict[str, Any], dict[str, Any]]]:
+    """
+    Rasterise planned pages and upload each PNG as its batch completes.
+
+    Each plan item carries `page_number`, `dpi`, `tier`, `reason` and `blob_path`. The PDF is
+    spooled to disk once and rendered in contiguous poppler ranges across a bounded thread
+    pool (poppler runs out-of-process, so threads give real parallelism). Yields
+    `(rendered_page, render_run)` pairs in completion order; raises `PageRenderError` on the
+    first failed batch after cancelling any batches that have not started.
+    """
+    if not plan:
+        return
+    batches = plan_render_batches(plan, batch_pages=batch_pages or render_batch_pages())
+    pool_size = min(workers or render_workers(), len(batches))
+    total_pages = len(plan)
+    done_pages = 0
+
+    work_dir = tempfile.mkdtemp(prefix="tpa-render-")
+    try:
+        pdf_path = os.path.join(work_dir, "source.pdf")
+        with open(pdf_path, "wb") as fh:
+            fh.write(pdf_bytes)
+
+        executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="page-render")
+        try:
+            pending: set[Future] = {
+                executor.submit(_render_batch, pdf_path=pdf_path, work_dir=work_dir, batch=batch, upload=upload)
+                for batch in batches
+            }
+            while pending:
+                finished, pending = wait(pending, return_when=FIRST_EXCEPTION)
+                for future in finished:
+                    results = future.result()
+                    for rendered, run in results:
+                        done_pages += 1
+                        if done_pages == 1 or done_pages % 25 == 0 or done_pages == total_pages:
+                            logger.info("Rendered page %s/%s", done_pages, total_pages)
+                        yield rendered, run
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable
+
+from fastapi import HTTPException
+
+
+logger = logging.getLogger(__name__)
+
+# CPU-bound parsing (docling, pypdf text/image extraction) runs in a pool of long-lived worker
+# processes so it never blocks the event loop (`/healthz`, uploads, other requests). Each worker
+# builds its docling converter once (the pool initializer) and reuses it for every document it
+# parses. Requests are admitted through `ParseQueue`: at most `TPA_DOCPARSE_MAX_CONCURRENT_PARSES`
+# parse at once and the rest wait their turn (optionally capped by `TPA_DOCPARSE_MAX_QUEUED_PARSES`,
+# beyond which requests get a 503).
+# `TPA_DOCPARSE_PARSE_WORKERS=0` parses in a thread of the API process instead (dev/tests).
+
+
+def parse_workers() -> int:
+    raw = os.environ.get("TPA_DOCPARSE_PARSE_WORKERS")
+    if raw:
+        try:
+            return max(0, int(raw))
+        except ValueError:
+            pass
+    return max(1, min(4, os.cpu_count() or 1))
+
+
+def max_concurrent_parses() -> int:
+    try:
+        return max(1, int(os.environ.get("TPA_DOCPARSE_MAX_CONCURRENT_PARSES", str(max(1, parse_workers())))))
+    except ValueError:
+        return max(1, parse_workers())
+
+
+def max_queued_parses() -> int | None:
+    """Waiting requests allowed beyond the concurrency limit; unset = unbounded (ingest never gets a 503)."""
+    raw = os.environ.get("TPA_DOCPARSE_MAX_QUEUED_PARSES")
+    if not raw:
+        return None
+    try:
+        return max(0, int(raw))
+    except ValueError:
+        return None
+
+
+class ParseQueue:
+    """Request-level admission: a concurrency limit plus a bounded wait queue, with counters."""
+
+    def __init__(self, *, limit: int, max_waiting: int | None = None) -> None:
+        self.limit = limit
+        self.max_waiting = max_waiting
+        self._semaphore: asyncio.Semaphore | None = None
+        self._waiting = 0
+        self._in_flight = 0
+        self._stats = {"admitted": 0, "rejected": 0, "completed": 0, "failed": 0}
+        self._wait_seconds_total = 0.0
+
+    def _sem(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.limit)
+        return self._semaphore
+
+    async def __aenter__(self) -> "ParseQueue":
+        if self.max_waiting is not None and self._in_flight >= self.limit and self._waiting >= self.max_waiting:
+            self._stats["rejected"] += 1
+            raise HTTPException(
+                status_code=503,
+                detail=f"docparse_queue_full:{self._waiting}",
+                headers={"Retry-After": "10"},
+            )
+        self._waiting += 1
+        started = time.monotonic()
+        try:
+            await self._sem().acquire()
+        finally:
+            self._waiting -= 1
+        self._wait_seconds_total += time.monotonic() - started
+        self._in_flight += 1
+        self._stats["admitted"] += 1
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self._in_flight -= 1
+        self._stats["failed" if exc_type is not None else "completed"] += 1
+        self._sem().release()
+
+    def stats(self) -> dict[str, Any]:
+        admitted = self._stats["admitted"]
+        return {
+            **self._stats,
+            "queue_depth": self._waiting,
+            "in_flight": self._in_flight,
+            "max_concurrent": self.limit,
+            "max_queued": self.max_waiting,
+            "avg_wait_seconds": round(self._wait_seconds_total / admitted, 3) if admitted else None,
+        }
+
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+_initializer: Callable[[], None] | None = None
+
+
+def configure(*, initializer: Callable[[], None] | None) -> None:
+    """Set the per-worker warm-up (must be a module-level function so spawn can import it)."""
+    global _initializer
+    _initializer = initializer
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: workers must not inherit the parent's event loop, HTTP clients or locks.
+            _pool = ProcessPoolExecutor(
+                max_workers=parse_workers(),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_initializer,
+            )
+        return _pool
+
+
+def _reset_pool(broken: ProcessPoolExecutor) -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            _pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def warm_pool() -> None:
+    """Start the worker processes (and their converters) ahead of the first request."""
+    if parse_workers() <= 0:
+        return
+    pool = _get_pool()
+    for _ in range(parse_workers()):
+        pool.submit(int)
+
+
+def shutdown_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def run_cpu(fn: Callable[..., Any], *args: Any) -> Any:
+    """Run `fn(*args)` in a parse worker (or a thread when workers are disabled)."""
+    if parse_workers() <= 0:
+        return await asyncio.to_thread(fn, *args)
+    pool = _get_pool()
+    try:
+        return await asyncio.wrap_future(pool.submit(fn, *args))
+    except BrokenProcessPool as exc:
+        # A worker died (e.g. OOM on a huge PDF); replace the pool so later requests recover.
+        logger.error("Docparse worker pool broken; restarting it: %s", exc)
+        _reset_pool(pool)
+        raise HTTPException(status_code=503, detail="docparse_worker_crashed", headers={"Retry-After": "10"}) from exc
+
+
+def pool_stats() -> dict[str, Any]:
+    with _pool_lock:
+        started = _pool is not None
+    return {"parse_workers": parse_workers(), "pool_started": started}
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import math
+import os
+from typing import Any, Callable, Sequence
+
+import numpy as np
+
+
+# OSM alignment scoring on arrays: reference points are stacked into one array, reprojected in
+# batches (one pyproj call per chunk rather than per point) and looked up in the raster's edge mask,
+# so each sample is an O(1) array index. Only a non-zero `TPA_GEOREF_ALIGNMENT_TOLERANCE_PX` needs a
+# distance map of that mask, which costs several times the scoring itself. In `early_exit` mode the
+# points are visited in a fixed pseudo-random order and sampling stops once the hit rate's 95%
+# margin of error is below `TPA_GEOREF_ALIGNMENT_MARGIN` (the score is then an estimate; the seed is
+# fixed so it is reproducible). `full` scores every point.
+
+Project = Callable[[np.ndarray, np.ndarray], tuple[np.ndarray, np.ndarray]]
+
+
+def _env_int(key: str, default: int) -> int:
+    try:
+        return max(1, int(os.environ.get(key, str(default))))
+    except ValueError:
+        return default
+
+
+def _env_float(key: str, default: float) -> float:
+    try:
+        return max(0.0, float(os.environ.get(key, str(default))))
+    except ValueError:
+        return default
+
+
+def sampling_mode() -> str:
+    mode = os.environ.get("TPA_GEOREF_ALIGNMENT_SAMPLING", "early_exit").strip().lower()
+    return mode if mode in {"early_exit", "full"} else "early_exit"
+
+
+def _running_min_pass(dist: np.ndarray) -> np.ndarray:
+    """`min_k dist[k] + |i - k|` down axis 0: `i + cummin(dist - k)` forwards, mirrored backwards."""
+    idx = np.arange(dist.shape[0], dtype=dist.dtype)[:, None]
+    forward = np.minimum.accumulate(dist - idx, axis=0)
+    forward += idx
+    backward = np.minimum.accumulate((dist + idx)[::-1], axis=0)[::-1]
+    backward -= idx
+    return np.minimum(forward, backward, out=forward)
+
+
+def edge_distance_map(edge_mask: np.ndarray) -> np.ndarray:
+    """
+    City-block distance (px) from every pixel to the nearest edge pixel.
+
+    Separable running minima along columns, then rows (each pass on a contiguous axis 0). Pixels
+    with no edge anywhere in the image get `height + width`. int16 when the image is small enough,
+    which halves the memory traffic of the passes.
+    """
+    height, width = edge_mask.shape
+    far = height + width
+    dtype = np.int16 if far + max(height, width) < np.iinfo(np.int16).max else np.int32
+    dist = np.where(edge_mask, 0, far).astype(dtype)
+    dist = _running_min_pass(np.ascontiguousarray(dist.T)).T
+    return _running_min_pass(np.ascontiguousarray(dist))
+
+
+def stack_line_points(lines: Sequence[Sequence[tuple[float, float]]], *, stride: int = 5) -> np.ndarray:
+    """Every `stride`-th vertex of each line (from its first), as one (N, 2) float64 array."""
+    parts = [np.asarray(line, dtype=np.float64)[::stride] for line in lines if len(line)]
+    if not parts:
+        return np.empty((0, 2), dtype=np.float64)
+    return np.concatenate(parts)
+
+
+def score_points(
+    points: np.ndarray,
+    *,
+    project: Project,
+    edge_mask: np.ndarray,
+    tolerance_px: float = 0.0,
+    distance_map: np.ndarray | None = None,
+    mode: str | None = None,
+    chunk_size: int | None = None,
+    min_samples: int | None = None,
+    margin: float | None = None,
+) -> tuple[float | None, dict[str, Any]]:
+    """
+    Share of in-image reference points whose nearest edge pixel is within `tolerance_px`.
+
+    `project(xs, ys)` maps reference coordinates to (col, row) pixel arrays. Points that land
+    outside the raster are not samples. At `tolerance_px=0` a hit is a plain `edge_mask` lookup;
+    otherwise `distance_map` (built from `edge_mask` when not given) is used, and the metadata
+    also reports `mean_edge_distance_px`.
+    """
+    mode = mode or sampling_mode()
+    chunk_size = chunk_size or _env_int("TPA_GEOREF_ALIGNMENT_CHUNK", 1024)
+    min_samples = min_samples or _env_int("TPA_GEOREF_ALIGNMENT_MIN_SAMPLES", 400)
+    margin = margin if margin is not None else _env_float("TPA_GEOREF_ALIGNMENT_MARGIN", 0.02)
+    if tolerance_px > 0 and distance_map is None:
+        distance_map = edge_distance_map(edge_mask)
+    height, width = edge_mask.shape
+
+    order = np.arange(len(points))
+    if mode == "early_exit":
+        order = np.random.default_rng(0).permutation(len(points))
+
+    hits = 0
+    total = 0
+    distance_sum = 0
+    stopped_early = False
+    visited = 0
+    for start in range(0, len(order), chunk_size):
+        chunk = points[order[start : start + chunk_size]]
+        visited += len(chunk)
+        cols, rows = project(chunk[:, 0], chunk[:, 1])
+        cols = np.rint(cols)
+        rows = np.rint(rows)
+        inside = np.isfinite(cols) & np.isfinite(rows) & (cols >= 0) & (cols < width) & (rows >= 0) & (rows < height)
+        if inside.any():
+            index = (rows[inside].astype(np.intp), cols[inside].astype(np.intp))
+            total += int(index[0].size)
+            if distance_map is None:
+                hits += int(np.count_nonzero(edge_mask[index]))
+            else:
+                dist = distance_map[index]
+                hits += int(np.count_nonzero(dist <= tolerance_px))
+                distance_sum += int(dist.sum())
+        if mode == "early_exit" and total >= min_samples and visited < len(points):
+            p = hits / total
+            if 1.96 * math.sqrt(max(p * (1 - p), 1e-12) / total) <= margin:
+                stopped_early = True
+                break
+
+    meta: dict[str, Any] = {
+        "samples": total,
+        "hits": hits,
+        "candidate_points": int(len(points)),
+        "points_visited": visited,
+        "sampling": mode,
+        "stopped_early": stopped_early,
+        "tolerance_px": tolerance_px,
+    }
+    if total == 0:
+        return None, meta
+    if distance_map is not None:
+        meta["mean_edge_distance_px"] = round(distance_sum / total, 2)
+    return hits / total, meta
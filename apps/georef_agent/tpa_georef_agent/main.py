@@ -5,6 +5,9 @@ import io
 import math
 import os
 import re
+import tempfile
+from functools import lru_cache
+from pathlib import Path
 from io import BytesIO
 from typing import Any
 from uuid import uuid4
@@ -14,14 +17,18 @@ import httpx
 import numpy as np
 import pytesseract
 import rasterio
+import rasterio.shutil
 from pyproj import Transformer
 from rasterio.control import GroundControlPoint
-from rasterio.io import MemoryFile
 from fastapi import FastAPI, HTTPException
 from minio import Minio
 from pydantic import BaseModel, Field
 from PIL import Image, ImageFilter
 
+from .alignment import score_points, stack_line_points
+from .osm_cache import cache_stats as osm_cache_stats
+from .osm_cache import cached_highways
+
 
 def _decode_image(image_base64: str) -> tuple[bytes, int, int]:
     if "base64," in image_base64:
@@ -71,6 +78,83 @@ def _upload_bytes(*, client: Minio, bucket: str, blob_path: str, data: bytes, co
         raise HTTPException(status_code=500, detail=f"minio_upload_failed:{exc}") from exc
 
 
+def _upload_file(*, client: Minio, bucket: str, blob_path: str, file_path: Path, content_type: str) -> None:
+    try:
+        # fput_object streams the file in multipart chunks rather than reading it into memory.
+        client.fput_object(bucket, blob_path, str(file_path), content_type=content_type)
+    except Exception as exc:  # noqa: BLE001
+        raise HTTPException(status_code=500, detail=f"minio_upload_failed:{exc}") from exc
+
+
+def _cog_creation_options() -> dict[str, Any]:
+    try:
+        blocksize = max(128, int(os.environ.get("TPA_GEOREF_COG_BLOCKSIZE", "512")))
+    except ValueError:
+        blocksize = 512
+    return {
+        "compress": os.environ.get("TPA_GEOREF_COG_COMPRESS", "DEFLATE"),
+        "predictor": 2,
+        "blocksize": blocksize,
+        "overviews": "AUTO",
+        "bigtiff": "IF_SAFER",
+    }
+
+
+def _store_cog(
+    *,
+    visual_asset_id: str | None,
+    image_np: np.ndarray,
+    transform: rasterio.Affine,
+    target_epsg: int,
+) -> dict[str, Any]:
+    """
+    Write the georeferenced raster as a tiled, compressed Cloud-Optimized GeoTIFF and upload it.
+
+    The source and COG are written to a scratch directory on disk rather than held in memory, and the upload
+    streams from the file, so the response carries only the blob path. Returns artifact metadata.
+    """
+    height, width = image_np.shape[:2]
+    bands = 1 if image_np.ndim == 2 else image_np.shape[2]
+    options = _cog_creation_options()
+    with tempfile.TemporaryDirectory(prefix="tpa-georef-") as tmp:
+        src_path = Path(tmp) / "src.tif"
+        cog_path = Path(tmp) / "out.tif"
+        with rasterio.open(
+            src_path,
+            "w",
+            driver="GTiff",
+            height=height,
+            width=width,
+            count=bands,
+            dtype=image_np.dtype,
+            crs=f"EPSG:{target_epsg}",
+            transform=transform,
+            tiled=True,
+            blockxsize=256,
+            blockysize=256,
+        ) as dst:
+            dst.write(image_np if image_np.ndim == 2 else np.transpose(image_np, (2, 0, 1)))
+        rasterio.shutil.copy(src_path, cog_path, driver="COG", **options)
+
+        bucket = os.environ.get("TPA_S3_BUCKET") or "tpa"
+        client = _minio_client()
+        _ensure_bucket(client, bucket)
+        blob_path = f"georef/{visual_asset_id or 'unassigned'}/{uuid4()}.tif"
+        _upload_file(client=client, bucket=bucket, blob_path=blob_path, file_path=cog_path, content_type="image/tiff")
+        size_bytes = cog_path.stat().st_size
+    return {
+        "blob_path": blob_path,
+        "format": "COG",
+        "content_type": "image/tiff",
+        "size_bytes": size_bytes,
+        "width": width,
+        "height": height,
+        "bands": bands,
+        "compress": options["compress"],
+        "blocksize": options["blocksize"],
+    }
+
+
 def _macro_base_url() -> str | None:
     return os.environ.get("TPA_GEOREF_MACRO_BASE_URL")
 
@@ -173,7 +257,9 @@ def _extract_candidate_gcps(image: Image.Image) -> tuple[list[CandidateGcp], str
     return gcps, limitations
 
 
-def _fetch_osm_highways(*, south: float, west: float, north: float, east: float) -> tuple[list[list[tuple[float, float]]], str | None]:
+def _query_overpass_ways(
+    *, south: float, west: float, north: float, east: float
+) -> tuple[list[tuple[int, list[tuple[float, float]]]], str | None]:
     overpass_url = os.environ.get("TPA_OVERPASS_URL", "https://overpass-api.de/api/interpreter")
     query = f"""
 [out:json];
@@ -194,7 +280,7 @@ out geom;
     if not isinstance(elements, list):
         return [], "osm_invalid_response"
 
-    lines: list[list[tuple[float, float]]] = []
+    ways: list[tuple[int, list[tuple[float, float]]]] = []
     for el in elements:
         geom = el.get("geometry") if isinstance(el, dict) else None
         if not isinstance(geom, list):
@@ -208,8 +294,27 @@ out geom;
             if isinstance(lat, (int, float)) and isinstance(lon, (int, float)):
                 coords.append((lon, lat))
         if len(coords) >= 2:
-            lines.append(coords)
-    return lines, None
+            way_id = el.get("id")
+            ways.append((way_id if isinstance(way_id, int) else -len(ways) - 1, coords))
+    return ways, None
+
+
+def _fetch_osm_highways(*, south: float, west: float, north: float, east: float) -> tuple[list[list[tuple[float, float]]], str | None]:
+    return cached_highways(south=south, west=west, north=north, east=east, fetch=_query_overpass_ways)
+
+
+@lru_cache(maxsize=16)
+def _transformer(from_epsg: int, to_epsg: int) -> Transformer:
+    return Transformer.from_crs(f"EPSG:{from_epsg}", f"EPSG:{to_epsg}", always_xy=True)
+
+
+def _alignment_tolerance_px() -> float:
+    """Max distance (px) from an OSM sample to an image edge that still counts as a hit; 0 = on an edge."""
+    raw = os.environ.get("TPA_GEOREF_ALIGNMENT_TOLERANCE_PX", "0")
+    try:
+        return max(0.0, float(raw))
+    except Exception:  # noqa: BLE001
+        return 0.0
 
 
 def _osm_alignment_score(
@@ -230,7 +335,7 @@ def _osm_alignment_score(
     if not xs or not ys:
         return None, {"reason": "corner_transform_failed"}
 
-    to_latlon = Transformer.from_crs(f"EPSG:{target_epsg}", "EPSG:4326", always_xy=True)
+    to_latlon = _transformer(target_epsg, 4326)
     west, south = to_latlon.transform(min(xs), min(ys))
     east, north = to_latlon.transform(max(xs), max(ys))
 
@@ -241,30 +346,27 @@ def _osm_alignment_score(
         return None, {"reason": "osm_empty"}
 
     edges = image.convert("L").filter(ImageFilter.FIND_EDGES)
-    edge_np = np.array(edges)
-    edge_mask = edge_np > 20
-
-    to_target = Transformer.from_crs("EPSG:4326", f"EPSG:{target_epsg}", always_xy=True)
-    inv_transform = ~transform
-
-    hits = 0
-    total = 0
-    for line in lines:
-        for idx, (lon, lat) in enumerate(line):
-            if idx % 5 != 0:
-                continue
-            x, y = to_target.transform(lon, lat)
-            col, row = inv_transform * (x, y)
-            col_i = int(round(col))
-            row_i = int(round(row))
-            if 0 <= col_i < width and 0 <= row_i < height:
-                total += 1
-                if edge_mask[row_i, col_i]:
-                    hits += 1
-
-    if total == 0:
-        return None, {"reason": "osm_no_samples"}
-    return hits / total, {"samples": total, "hits": hits, "osm_lines": len(lines)}
+    edge_mask = np.asarray(edges) > 20
+
+    to_target = _transformer(4326, target_epsg)
+    inv = ~transform
+
+    def project(lons: np.ndarray, lats: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        x, y = to_target.transform(lons, lats)
+        x = np.asarray(x)
+        y = np.asarray(y)
+        return inv.a * x + inv.b * y + inv.c, inv.d * x + inv.e * y + inv.f
+
+    score, meta = score_points(
+        stack_line_points(lines, stride=5),
+        project=project,
+        edge_mask=edge_mask,
+        tolerance_px=_alignment_tolerance_px(),
+    )
+    meta["osm_lines"] = len(lines)
+    if score is None:
+        return None, {"reason": "osm_no_samples", **meta}
+    return score, meta
 
 
 class CandidateGcp(BaseModel):
@@ -350,6 +452,7 @@ class DetectCandidateGcpsResponse(BaseModel):
 
 
 class ApplyGcpsRequest(BaseModel):
+    visual_asset_id: str | None = None
     image_base64: str
     gcps: list[CandidateGcp]
     method: str = "affine"
@@ -398,6 +501,11 @@ def healthz() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/status")
+def status() -> dict[str, Any]:
+    return {"osm_cache": osm_cache_stats()}
+
+
 @app.post("/auto-georef", response_model=AutoGeorefResponse)
 def auto_georef(req: AutoGeorefRequest) -> AutoGeorefResponse:
     _, width, height = _decode_image(req.image_base64)
@@ -501,6 +609,7 @@ def auto_georef(req: AutoGeorefRequest) -> AutoGeorefResponse:
     apply_resp, apply_errors = _macro_call(
         "/macros/apply-gcps",
         {
+            "visual_asset_id": req.visual_asset_id,
             "image_base64": req.image_base64,
             "redline_mask_base64": req.redline_mask_base64,
             "gcps": gcps,
@@ -513,6 +622,18 @@ def auto_georef(req: AutoGeorefRequest) -> AutoGeorefResponse:
 
     if isinstance(apply_resp, dict):
         meta = apply_resp.get("metadata") if isinstance(apply_resp.get("metadata"), dict) else {}
+        if isinstance(meta.get("geotiff_path"), str) and meta["geotiff_path"]:
+            # Already in the blob store (COG written by apply-gcps); record it without a round trip.
+            geotiff_meta = meta.get("geotiff") if isinstance(meta.get("geotiff"), dict) else {}
+            projection_artifacts.append(
+                ProjectionArtifact(
+                    artifact_type="geotiff",
+                    artifact_path=meta["geotiff_path"],
+                    metadata={"source": "apply-gcps", **geotiff_meta},
+                )
+            )
+        elif isinstance(meta.get("geotiff_error"), str):
+            errors.append(meta["geotiff_error"])
         artifact_candidates = [
             ("geotiff", meta.get("geotiff_base64")),
             ("overlay_png", meta.get("overlay_png_base64")),
@@ -753,22 +874,19 @@ def apply_gcps(req: ApplyGcpsRequest) -> ApplyGcpsResponse:
     except Exception:  # noqa: BLE001
         inverse_matrix = None
 
-    geotiff_b64 = None
+    geotiff: dict[str, Any] | None = None
+    geotiff_error = None
     try:
-        with MemoryFile() as memfile:
-            with memfile.open(
-                driver="GTiff",
-                height=height,
-                width=width,
-                count=3,
-                dtype=image_np.dtype,
-                crs=f"EPSG:{req.target_epsg}",
-                transform=transform,
-            ) as dst:
-                dst.write(np.transpose(image_np, (2, 0, 1)))
-            geotiff_b64 = base64.b64encode(memfile.read()).decode("ascii")
-    except Exception:  # noqa: BLE001
-        geotiff_b64 = None
+        geotiff = _store_cog(
+            visual_asset_id=req.visual_asset_id,
+            image_np=image_np,
+            transform=transform,
+            target_epsg=req.target_epsg,
+        )
+    except HTTPException as exc:
+        geotiff_error = f"geotiff_store_failed:{exc.detail}"
+    except Exception as exc:  # noqa: BLE001
+        geotiff_error = f"geotiff_write_failed:{exc}"
 
     transform_obj = GeorefTransform(
         method=req.method,
@@ -794,7 +912,9 @@ def apply_gcps(req: ApplyGcpsRequest) -> ApplyGcpsResponse:
         "rmse": rmse,
         "alignment_score": alignment_score,
         "alignment_meta": alignment_meta,
-        "geotiff_base64": geotiff_b64,
+        "geotiff_path": geotiff["blob_path"] if geotiff else None,
+        "geotiff": geotiff,
+        "geotiff_error": geotiff_error,
     }
 
     return ApplyGcpsResponse(
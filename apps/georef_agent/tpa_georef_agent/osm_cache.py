@@ -0,0 +1,461 @@
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+from array import array
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
+
+
+# OSM highway geometry for alignment scoring is cached on disk per slippy-map tile (z14 by default,
+# ~1.5 km across in the UK), so repeated georef calls over the same area do not hit Overpass and
+# air-gapped deployments can run from a preloaded extract. Each tile file holds the ways whose
+# bounding box touches the tile, as zlib-compressed int32 coordinates at OSM's 1e-7 degree precision.
+# Missing or expired tiles are fetched in one Overpass query covering all of them; if that fails,
+# expired tiles are served as they are. `TPA_OSM_CACHE_OFFLINE=1` never calls Overpass.
+
+Way = tuple[int, list[tuple[float, float]]]
+FetchWays = Callable[..., tuple[list[Way], str | None]]
+
+_MAGIC = b"TPAOSMT1"
+_HEADER = struct.Struct("<dI")
+_WAY = struct.Struct("<qI")
+_SCALE = 1e7
+
+
+def _env_int(key: str, default: int) -> int:
+    try:
+        return max(0, int(os.environ.get(key, str(default))))
+    except ValueError:
+        return default
+
+
+def cache_dir() -> Path | None:
+    raw = os.environ.get("TPA_OSM_CACHE_DIR", "/osm_tiles")
+    return Path(raw) if raw else None
+
+
+def cache_zoom() -> int:
+    return min(18, max(8, _env_int("TPA_OSM_CACHE_ZOOM", 14)))
+
+
+def cache_ttl_seconds() -> int:
+    """0 = tiles never expire."""
+    return _env_int("TPA_OSM_CACHE_TTL_SECONDS", 30 * 86400)
+
+
+def max_tiles_per_request() -> int:
+    return max(1, _env_int("TPA_OSM_CACHE_MAX_TILES", 256))
+
+
+def offline() -> bool:
+    return os.environ.get("TPA_OSM_CACHE_OFFLINE", "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+_stats_lock = threading.Lock()
+_stats = {
+    "lookups": 0,
+    "tile_hits": 0,
+    "tile_misses": 0,
+    "tile_expired": 0,
+    "overpass_fetches": 0,
+    "overpass_failures": 0,
+    "expired_served": 0,
+    "offline_misses": 0,
+    "bypassed": 0,
+}
+# One lock per tile set being refreshed: concurrent requests for the same area wait for the first
+# fetch and then read its tiles, while requests for other areas fetch in parallel instead of queueing
+# behind a slow (up to 180s) Overpass call. Entries are dropped once no request holds them.
+_fetch_locks_guard = threading.Lock()
+_fetch_locks: dict[tuple[tuple[int, int], ...], tuple[threading.Lock, int]] = {}
+
+
+@contextmanager
+def _tile_set_lock(tiles: Iterable[tuple[int, int]]) -> Iterator[None]:
+    key = tuple(sorted(tiles))
+    with _fetch_locks_guard:
+        lock, users = _fetch_locks.get(key, (threading.Lock(), 0))
+        _fetch_locks[key] = (lock, users + 1)
+    try:
+        with lock:
+            yield
+    finally:
+        with _fetch_locks_guard:
+            lock, users = _fetch_locks[key]
+            if users <= 1:
+                del _fetch_locks[key]
+            else:
+                _fetch_locks[key] = (lock, users - 1)
+
+
+def _count(**deltas: int) -> None:
+    with _stats_lock:
+        for key, delta in deltas.items():
+            _stats[key] += delta
+
+
+def cache_stats() -> dict[str, Any]:
+    with _stats_lock:
+        stats = dict(_stats)
+    looked_up = stats["tile_hits"] + stats["tile_misses"] + stats["tile_expired"]
+    return {
+        **stats,
+        "tile_hit_ratio": round(stats["tile_hits"] / looked_up, 3) if looked_up else None,
+        "cache_dir": str(cache_dir()) if cache_dir() else None,
+        "zoom": cache_zoom(),
+        "ttl_seconds": cache_ttl_seconds(),
+        "offline": offline(),
+    }
+
+
+# -- tile maths ------------------------------------------------------------------------------------
+
+
+def _tile_xy(lon: float, lat: float, zoom: int) -> tuple[int, int]:
+    n = 1 << zoom
+    lat = max(-85.05112878, min(85.05112878, lat))
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tile_bounds(x: int, y: int, zoom: int) -> tuple[float, float, float, float]:
+    """(south, west, north, east) of a tile."""
+    n = 1 << zoom
+    west = x / n * 360.0 - 180.0
+    east = (x + 1) / n * 360.0 - 180.0
+    north = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / n))))
+    south = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * (y + 1) / n))))
+    return south, west, north, east
+
+
+def tiles_for_bbox(*, south: float, west: float, north: float, east: float, zoom: int) -> list[tuple[int, int]]:
+    x0, y0 = _tile_xy(west, north, zoom)
+    x1, y1 = _tile_xy(east, south, zoom)
+    return [(x, y) for x in range(min(x0, x1), max(x0, x1) + 1) for y in range(min(y0, y1), max(y0, y1) + 1)]
+
+
+def _way_bbox(coords: list[tuple[float, float]]) -> tuple[float, float, float, float]:
+    lons = [c[0] for c in coords]
+    lats = [c[1] for c in coords]
+    return min(lats), min(lons), max(lats), max(lons)
+
+
+def _bucket_ways(ways: Iterable[Way], zoom: int, keep: set[tuple[int, int]] | None = None) -> dict[tuple[int, int], list[Way]]:
+    buckets: dict[tuple[int, int], list[Way]] = {}
+    for way in ways:
+        south, west, north, east = _way_bbox(way[1])
+        for tile in tiles_for_bbox(south=south, west=west, north=north, east=east, zoom=zoom):
+            if keep is None or tile in keep:
+                buckets.setdefault(tile, []).append(way)
+    return buckets
+
+
+# -- tile files ------------------------------------------------------------------------------------
+
+
+def _tile_path(root: Path, zoom: int, x: int, y: int) -> Path:
+    return root / str(zoom) / str(x) / f"{y}.bin"
+
+
+def _encode_tile(ways: list[Way], fetched_at: float) -> bytes:
+    parts = [_HEADER.pack(fetched_at, len(ways))]
+    for way_id, coords in ways:
+        values = array("i")
+        for lon, lat in coords:
+            values.append(int(round(lon * _SCALE)))
+            values.append(int(round(lat * _SCALE)))
+        if sys.byteorder == "big":
+            values.byteswap()
+        parts.append(_WAY.pack(way_id, len(coords)))
+        parts.append(values.tobytes())
+    return _MAGIC + zlib.compress(b"".join(parts), 6)
+
+
+def _decode_tile(blob: bytes) -> tuple[float, list[Way]]:
+    if not blob.startswith(_MAGIC):
+        raise ValueError("not an OSM tile blob")
+    payload = zlib.decompress(blob[len(_MAGIC) :])
+    fetched_at, count = _HEADER.unpack_from(payload, 0)
+    offset = _HEADER.size
+    ways: list[Way] = []
+    for _ in range(count):
+        way_id, n = _WAY.unpack_from(payload, offset)
+        offset += _WAY.size
+        values = array("i")
+        values.frombytes(payload[offset : offset + 8 * n])
+        offset += 8 * n
+        if sys.byteorder == "big":
+            values.byteswap()
+        ways.append((way_id, [(values[i] / _SCALE, values[i + 1] / _SCALE) for i in range(0, len(values), 2)]))
+    return fetched_at, ways
+
+
+def _read_tile(root: Path, zoom: int, tile: tuple[int, int]) -> tuple[float, list[Way]] | None:
+    path = _tile_path(root, zoom, *tile)
+    try:
+        return _decode_tile(path.read_bytes())
+    except FileNotFoundError:
+        return None
+    except Exception:  # noqa: BLE001
+        # Corrupt/partial file: treat as a miss so it is refetched and overwritten.
+        return None
+
+
+def _write_tile(root: Path, zoom: int, tile: tuple[int, int], ways: list[Way], fetched_at: float) -> None:
+    path = _tile_path(root, zoom, *tile)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(_encode_tile(ways, fetched_at))
+    os.replace(tmp, path)
+
+
+# -- lookup ----------------------------------------------------------------------------------------
+
+
+def _assemble(
+    tiles: dict[tuple[int, int], list[Way]], *, south: float, west: float, north: float, east: float
+) -> list[list[tuple[float, float]]]:
+    seen: set[int] = set()
+    lines: list[list[tuple[float, float]]] = []
+    for ways in tiles.values():
+        for way_id, coords in ways:
+            if way_id in seen:
+                continue
+            seen.add(way_id)
+            w_south, w_west, w_north, w_east = _way_bbox(coords)
+            if w_north < south or w_south > north or w_east < west or w_west > east:
+                continue
+            lines.append(coords)
+    return lines
+
+
+def cached_highways(
+    *,
+    south: float,
+    west: float,
+    north: float,
+    east: float,
+    fetch: FetchWays,
+) -> tuple[list[list[tuple[float, float]]], str | None]:
+    """
+    Highway polylines ((lon, lat) lists) touching the bbox, served from the tile cache where possible.
+    `fetch(south=, west=, north=, east=)` queries the live source and returns `(ways, error)`.
+    """
+    _count(lookups=1)
+    root = cache_dir()
+    zoom = cache_zoom()
+    needed = tiles_for_bbox(south=south, west=west, north=north, east=east, zoom=zoom)
+    if root is None or len(needed) > max_tiles_per_request():
+        # Cache disabled, or an area too large to tile sensibly: query the requested bbox directly.
+        _count(bypassed=1)
+        if offline():
+            return [], "osm_offline_cache_bypassed"
+        ways, err = fetch(south=south, west=west, north=north, east=east)
+        return [coords for _, coords in ways], err
+
+    ttl = cache_ttl_seconds()
+    now = time.time()
+    have: dict[tuple[int, int], list[Way]] = {}
+    expired: dict[tuple[int, int], list[Way]] = {}
+    missing: list[tuple[int, int]] = []
+    for tile in needed:
+        cached = _read_tile(root, zoom, tile)
+        if cached is None:
+            missing.append(tile)
+        elif ttl and now - cached[0] > ttl:
+            expired[tile] = cached[1]
+        else:
+            have[tile] = cached[1]
+    _count(tile_hits=len(have), tile_misses=len(missing), tile_expired=len(expired))
+
+    stale = list(expired)
+    if missing or stale:
+        if offline():
+            if missing:
+                _count(offline_misses=len(missing))
+                return [], f"osm_offline_cache_miss:{len(missing)}"
+            _count(expired_served=len(expired))
+            have.update(expired)
+        else:
+            with _tile_set_lock(missing + stale):
+                refreshed, err = _refresh_tiles(root, zoom, missing + stale, fetch=fetch)
+            if err:
+                if missing and not all(t in refreshed for t in missing):
+                    return [], err
+                _count(expired_served=len(expired))
+                have.update(expired)
+            have.update(refreshed)
+    return _assemble(have, south=south, west=west, north=north, east=east), None
+
+
+def _refresh_tiles(
+    root: Path, zoom: int, tiles: list[tuple[int, int]], *, fetch: FetchWays
+) -> tuple[dict[tuple[int, int], list[Way]], str | None]:
+    # Another request may have refreshed some of these while we waited for the lock.
+    ttl = cache_ttl_seconds()
+    now = time.time()
+    refreshed: dict[tuple[int, int], list[Way]] = {}
+    todo: list[tuple[int, int]] = []
+    for tile in tiles:
+        cached = _read_tile(root, zoom, tile)
+        if cached is not None and not (ttl and now - cached[0] > ttl):
+            refreshed[tile] = cached[1]
+        else:
+            todo.append(tile)
+    if not todo:
+        return refreshed, None
+
+    bounds = [tile_bounds(x, y, zoom) for x, y in todo]
+    _count(overpass_fetches=1)
+    ways, err = fetch(
+        south=min(b[0] for b in bounds),
+        west=min(b[1] for b in bounds),
+        north=max(b[2] for b in bounds),
+        east=max(b[3] for b in bounds),
+    )
+    if err:
+        _count(overpass_failures=1)
+        return refreshed, err
+    fetched_at = time.time()
+    buckets = _bucket_ways(ways, zoom, keep=set(todo))
+    for tile in todo:
+        tile_ways = buckets.get(tile, [])
+        try:
+            _write_tile(root, zoom, tile, tile_ways, fetched_at)
+        except OSError:
+            pass  # read-only or full cache volume: still serve this request
+        refreshed[tile] = tile_ways
+    return refreshed, None
+
+
+# -- offline preload -------------------------------------------------------------------------------
+
+
+def _geojson_lines(geometry: Any) -> Iterator[list[tuple[float, float]]]:
+    if not isinstance(geometry, dict):
+        return
+    coords = geometry.get("coordinates")
+    if geometry.get("type") == "LineString":
+        parts = [coords]
+    elif geometry.get("type") == "MultiLineString":
+        parts = coords or []
+    else:
+        return
+    for part in parts:
+        line = [(float(p[0]), float(p[1])) for p in part or [] if isinstance(p, (list, tuple)) and len(p) >= 2]
+        if len(line) >= 2:
+            yield line
+
+
+def _feature_way_id(feature: dict[str, Any]) -> int | None:
+    props = feature.get("properties") if isinstance(feature.get("properties"), dict) else {}
+    for raw in (props.get("osm_id"), props.get("@id"), feature.get("id")):
+        if isinstance(raw, int):
+            return raw
+        if isinstance(raw, str):
+            digits = raw.rsplit("/", 1)[-1]
+            if digits.isdigit():
+                return int(digits)
+    return None
+
+
+_LINE_DELIMITED_SUFFIXES = {".geojsonl", ".geojsons", ".geojsonseq", ".jsonl", ".ndjson"}
+
+
+def _iter_extract_features(path: Path) -> Iterator[dict[str, Any]]:
+    """GeoJSON FeatureCollection, or one feature per line (GeoJSONSeq, e.g. `ogr2ogr -f GeoJSONSeq`)."""
+    with path.open("r", encoding="utf-8-sig") as handle:
+        if path.suffix.lower() not in _LINE_DELIMITED_SUFFIXES:
+            data = json.load(handle)
+            features = data.get("features") if isinstance(data, dict) and data.get("type") == "FeatureCollection" else [data]
+            yield from (f for f in features or [] if isinstance(f, dict))
+            return
+        for line in handle:
+            line = line.strip().lstrip("\x1e")
+            if line:
+                feature = json.loads(line)
+                if isinstance(feature, dict):
+                    yield feature
+
+
+def _iter_pbf_ways(path: Path) -> Iterator[Way]:
+    try:
+        import osmium  # noqa: PLC0415
+    except ImportError as exc:
+        raise SystemExit(
+            "Reading .osm.pbf needs pyosmium (pip install osmium), or convert first: "
+            "ogr2ogr -f GeoJSONSeq highways.geojsonl extract.osm.pbf lines -where \"highway IS NOT NULL\""
+        ) from exc
+    for obj in osmium.FileProcessor(str(path)).with_locations().with_filter(osmium.filter.KeyFilter("highway")):
+        if obj.is_way():
+            coords = [(n.lon, n.lat) for n in obj.nodes if n.location.valid()]
+            if len(coords) >= 2:
+                yield obj.id, coords
+
+
+def _extract_ways(path: Path) -> Iterator[Way]:
+    if path.name.endswith(".pbf"):
+        yield from _iter_pbf_ways(path)
+        return
+    synthetic_id = 0
+    for feature in _iter_extract_features(path):
+        props = feature.get("properties") if isinstance(feature.get("properties"), dict) else {}
+        if "highway" in props and not props.get("highway"):
+            continue
+        way_id = _feature_way_id(feature)
+        for line in _geojson_lines(feature.get("geometry")):
+            if way_id is None:
+                # Ids only de-duplicate ways copied into several tiles; negative ids cannot clash with OSM.
+                synthetic_id -= 1
+            yield (way_id if way_id is not None else synthetic_id), line
+
+
+def preload(path: Path, *, root: Path | None = None, zoom: int | None = None) -> dict[str, Any]:
+    """
+    Write tiles for every highway in a local extract. Every tile inside the extract's extent is
+    written (empty tiles included), so offline lookups there are hits rather than misses.
+    """
+    root = root or cache_dir()
+    if root is None:
+        raise SystemExit("TPA_OSM_CACHE_DIR is empty; nowhere to preload tiles.")
+    zoom = zoom or cache_zoom()
+    ways = list(_extract_ways(path))
+    if not ways:
+        return {"ways": 0, "tiles": 0}
+    bounds = [_way_bbox(coords) for _, coords in ways]
+    extent = {
+        "south": min(b[0] for b in bounds),
+        "west": min(b[1] for b in bounds),
+        "north": max(b[2] for b in bounds),
+        "east": max(b[3] for b in bounds),
+    }
+    tiles = tiles_for_bbox(**extent, zoom=zoom)
+    buckets = _bucket_ways(ways, zoom)
+    fetched_at = time.time()
+    for tile in tiles:
+        _write_tile(root, zoom, tile, buckets.get(tile, []), fetched_at)
+    return {"ways": len(ways), "tiles": len(tiles), "zoom": zoom, "extent": extent, "cache_dir": str(root)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Preload the georef OSM highway tile cache from a local extract.")
+    parser.add_argument("extract", type=Path, help=".geojson, line-delimited .geojsonl/.geojsons, or .osm.pbf (needs pyosmium)")
+    parser.add_argument("--cache-dir", type=Path, default=None, help="defaults to TPA_OSM_CACHE_DIR")
+    parser.add_argument("--zoom", type=int, default=None, help="defaults to TPA_OSM_CACHE_ZOOM (14)")
+    args = parser.parse_args()
+    print(json.dumps(preload(args.extract, root=args.cache_dir, zoom=args.zoom), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
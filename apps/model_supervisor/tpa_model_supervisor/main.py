@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+import threading
 import time
 from dataclasses import dataclass
 from typing import Any, Literal
@@ -10,6 +11,8 @@ import httpx
 from fastapi import FastAPI, HTTPException, Request
 from pydantic import BaseModel
 
+from .scheduler import GpuRoleScheduler, RoleBackend, SchedulerTimeout, SimulatedBackend
+
 
 Role = Literal["llm", "vlm", "embeddings", "embeddings_mm", "reranker", "sam2"]
 
@@ -87,12 +90,18 @@ class EnsureResponse(BaseModel):
     base_url: str
     status: Literal["ready"]
     stopped_roles: list[Role] = []
+    lease_seconds: int = 0
+    lease_id: str | None = None
 
 
 class StopRequest(BaseModel):
     role: Role
 
 
+class ReleaseRequest(BaseModel):
+    lease_id: str
+
+
 def _bool_env(name: str, default: bool) -> bool:
     raw = os.environ.get(name)
     if raw is None:
@@ -177,6 +186,37 @@ def _role_ready_url(spec: RoleSpec) -> str:
     return base + spec.ready_path
 
 
+def _notify_urls() -> list[str]:
+    raw = os.environ.get("TPA_MODEL_SUPERVISOR_NOTIFY_URLS") or ""
+    return [u.strip() for u in raw.split(",") if u.strip()]
+
+
+def _post_lease_invalidation(url: str, payload: dict[str, Any]) -> None:
+    headers = {}
+    token = os.environ.get("TPA_MODEL_SUPERVISOR_TOKEN")
+    if token:
+        headers["x-tpa-model-supervisor-token"] = token
+    try:
+        with httpx.Client(timeout=5.0) as client:
+            client.post(url, json=payload, headers=headers)
+    except Exception:  # noqa: BLE001
+        pass
+
+
+def _notify_lease_invalidation(roles: list[Role], *, reason: str) -> None:
+    """
+    Tell API processes that these roles' base URLs are no longer warm.
+
+    Callers cache `/ensure` results as short leases; this push lets them drop a lease as soon as
+    the role is stopped instead of waiting for the TTL. Best-effort and off the request path.
+    """
+    if not roles:
+        return
+    payload = {"roles": list(roles), "reason": reason}
+    for url in _notify_urls():
+        threading.Thread(target=_post_lease_invalidation, args=(url, payload), daemon=True).start()
+
+
 def _missing_container_error(service: str) -> HTTPException:
     return HTTPException(
         status_code=409,
@@ -189,11 +229,65 @@ def _missing_container_error(service: str) -> HTTPException:
     )
 
 
+class DockerBackend:
+    """`RoleBackend` over the compose containers, for the scheduled mode."""
+
+    def running_roles(self) -> set[str]:
+        client = _docker_client()
+        running: set[str] = set()
+        for role, spec in ROLE_SPECS.items():
+            container = _find_compose_container(client=client, service=spec.compose_service)
+            if container and _container_running(container):
+                running.add(role)
+        return running
+
+    def start(self, role: str) -> None:
+        spec = ROLE_SPECS[role]
+        container = _find_compose_container(client=_docker_client(), service=spec.compose_service)
+        if not container:
+            raise _missing_container_error(spec.compose_service)
+        _container_start(container)
+
+    def stop(self, role: str) -> None:
+        spec = ROLE_SPECS[role]
+        container = _find_compose_container(client=_docker_client(), service=spec.compose_service)
+        if container:
+            _container_stop(container, timeout_seconds=_STOP_TIMEOUT_SECONDS)
+
+    def wait_ready(self, role: str) -> None:
+        _wait_http_ready(url=_role_ready_url(ROLE_SPECS[role]), timeout_seconds=_READY_TIMEOUT_SECONDS)
+
+    def base_url(self, role: str) -> str:
+        return _role_base_url(ROLE_SPECS[role])
+
+
 app = FastAPI(title="TPA Model Supervisor", version="0.1.0")
 
 _AUTO_STOP_GPU_PEER = _bool_env("TPA_MODEL_SUPERVISOR_ENFORCE_GPU_EXCLUSIVITY", True)
 _STOP_TIMEOUT_SECONDS = int(os.environ.get("TPA_MODEL_SUPERVISOR_STOP_TIMEOUT_SECONDS", "30"))
 _READY_TIMEOUT_SECONDS = float(os.environ.get("TPA_MODEL_SUPERVISOR_READY_TIMEOUT_SECONDS", "180"))
+_LEASE_SECONDS = int(os.environ.get("TPA_MODEL_SUPERVISOR_LEASE_SECONDS", "60"))
+# "direct" (default): every `/ensure` swaps GPU roles immediately. "scheduled": requests queue and
+# are batched per role in windows of TPA_MODEL_SUPERVISOR_WINDOW_SECONDS (see scheduler.py).
+_MODE = (os.environ.get("TPA_MODEL_SUPERVISOR_MODE") or "direct").strip().lower()
+_BACKEND = (os.environ.get("TPA_MODEL_SUPERVISOR_BACKEND") or "docker").strip().lower()
+_WINDOW_SECONDS = float(os.environ.get("TPA_MODEL_SUPERVISOR_WINDOW_SECONDS", "30"))
+_QUEUE_TIMEOUT_SECONDS = float(os.environ.get("TPA_MODEL_SUPERVISOR_QUEUE_TIMEOUT_SECONDS", "600"))
+
+
+def _build_scheduler() -> GpuRoleScheduler | None:
+    if _MODE != "scheduled":
+        return None
+    backend: RoleBackend = SimulatedBackend() if _BACKEND == "simulated" else DockerBackend()
+    return GpuRoleScheduler(
+        backend,
+        exclusive_roles=set(GPU_EXCLUSIVE_ROLES) if _AUTO_STOP_GPU_PEER else set(),
+        window_seconds=_WINDOW_SECONDS,
+        lease_seconds=_LEASE_SECONDS,
+    )
+
+
+_scheduler = _build_scheduler()
 
 
 @app.get("/healthz")
@@ -203,8 +297,15 @@ def healthz() -> dict[str, str]:
 
 @app.get("/status")
 def status() -> dict[str, Any]:
+    out: dict[str, Any] = {"mode": _MODE, "roles": {}}
+    if _scheduler is not None:
+        out["scheduler"] = _scheduler.status()
+        if _BACKEND == "simulated":
+            running = _scheduler.backend.running_roles()
+            for role in ROLE_SPECS:
+                out["roles"][role] = {"present": True, "status": "running" if role in running else "exited"}
+            return out
     client = _docker_client()
-    out: dict[str, Any] = {"roles": {}}
     for role, spec in ROLE_SPECS.items():
         container = _find_compose_container(client=client, service=spec.compose_service)
         if not container:
@@ -228,6 +329,9 @@ def ensure(req: EnsureRequest, request: Request) -> EnsureResponse:
     if not spec:
         raise HTTPException(status_code=400, detail="Unknown role")
 
+    if _scheduler is not None:
+        return _ensure_scheduled(_scheduler, req.role)
+
     client = _docker_client()
     stopped: list[Role] = []
 
@@ -242,6 +346,7 @@ def ensure(req: EnsureRequest, request: Request) -> EnsureResponse:
             if _container_running(other_container):
                 _container_stop(other_container, timeout_seconds=_STOP_TIMEOUT_SECONDS)
                 stopped.append(other_role)
+    _notify_lease_invalidation(stopped, reason=f"gpu_exclusive:{req.role}")
 
     container = _find_compose_container(client=client, service=spec.compose_service)
     if not container:
@@ -252,7 +357,50 @@ def ensure(req: EnsureRequest, request: Request) -> EnsureResponse:
     ready_url = _role_ready_url(spec)
     _wait_http_ready(url=ready_url, timeout_seconds=_READY_TIMEOUT_SECONDS)
 
-    return EnsureResponse(role=req.role, base_url=_role_base_url(spec), status="ready", stopped_roles=stopped)
+    return EnsureResponse(
+        role=req.role,
+        base_url=_role_base_url(spec),
+        status="ready",
+        stopped_roles=stopped,
+        lease_seconds=_LEASE_SECONDS,
+    )
+
+
+def _ensure_scheduled(scheduler: GpuRoleScheduler, role: Role) -> EnsureResponse:
+    try:
+        lease = scheduler.acquire(role, timeout_seconds=_QUEUE_TIMEOUT_SECONDS)
+    except SchedulerTimeout as exc:
+        raise HTTPException(status_code=504, detail=str(exc)) from exc
+    _notify_lease_invalidation(lease.stopped_roles, reason=f"gpu_exclusive:{role}")
+    return EnsureResponse(
+        role=role,
+        base_url=lease.base_url,
+        status="ready",
+        stopped_roles=lease.stopped_roles,
+        lease_seconds=_LEASE_SECONDS,
+        lease_id=lease.lease_id,
+    )
+
+
+@app.post("/renew")
+def renew(req: ReleaseRequest, request: Request) -> dict[str, Any]:
+    """Keep a scheduled-mode lease alive while the caller's model request is still running."""
+    _auth_or_401(request)
+    if _scheduler is None:
+        return {"lease_id": req.lease_id, "renewed": False}
+    lease = _scheduler.renew(req.lease_id)
+    if lease is None:
+        return {"lease_id": req.lease_id, "renewed": False}
+    return {"lease_id": req.lease_id, "renewed": True, "expires_in": round(lease.expires_at - time.time(), 1)}
+
+
+@app.post("/release")
+def release(req: ReleaseRequest, request: Request) -> dict[str, Any]:
+    """Return a scheduled-mode lease early so a queued role can be swapped in sooner."""
+    _auth_or_401(request)
+    if _scheduler is None:
+        return {"lease_id": req.lease_id, "released": False}
+    return {"lease_id": req.lease_id, "released": _scheduler.release(req.lease_id)}
 
 
 @app.post("/stop")
@@ -268,4 +416,5 @@ def stop(req: StopRequest, request: Request) -> dict[str, Any]:
         raise _missing_container_error(spec.compose_service)
 
     _container_stop(container, timeout_seconds=_STOP_TIMEOUT_SECONDS)
+    _notify_lease_invalidation([req.role], reason="stop")
     return {"role": req.role, "stopped": True}
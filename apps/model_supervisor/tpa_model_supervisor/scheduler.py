@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Protocol
+
+
+class RoleBackend(Protocol):
+    """Runtime that can start/stop model roles (Docker in production, simulated in tests)."""
+
+    def running_roles(self) -> set[str]: ...
+
+    def start(self, role: str) -> None: ...
+
+    def stop(self, role: str) -> None: ...
+
+    def wait_ready(self, role: str) -> None: ...
+
+    def base_url(self, role: str) -> str: ...
+
+
+class SchedulerTimeout(RuntimeError):
+    pass
+
+
+@dataclass
+class Lease:
+    lease_id: str
+    role: str
+    base_url: str
+    expires_at: float
+    stopped_roles: list[str] = field(default_factory=list)
+
+
+@dataclass
+class _Waiter:
+    role: str
+    enqueued_at: float
+
+
+class SimulatedBackend:
+    """
+    In-memory backend for tests and GPU-less dev: roles "start" after `start_seconds` and every
+    start/stop is recorded so swap behaviour can be asserted.
+    """
+
+    def __init__(self, *, start_seconds: float = 0.0, base_urls: dict[str, str] | None = None) -> None:
+        self.start_seconds = start_seconds
+        self.base_urls = base_urls or {}
+        self.running: set[str] = set()
+        self.events: list[tuple[str, str]] = []
+        self._lock = threading.Lock()
+
+    def running_roles(self) -> set[str]:
+        with self._lock:
+            return set(self.running)
+
+    def start(self, role: str) -> None:
+        if self.start_seconds:
+            time.sleep(self.start_seconds)
+        with self._lock:
+            if role not in self.running:
+                self.running.add(role)
+                self.events.append(("start", role))
+
+    def stop(self, role: str) -> None:
+        with self._lock:
+            if role in self.running:
+                self.running.discard(role)
+                self.events.append(("stop", role))
+
+    def wait_ready(self, role: str) -> None:
+        return None
+
+    def base_url(self, role: str) -> str:
+        return self.base_urls.get(role, f"http://sim-{role}")
+
+
+class GpuRoleScheduler:
+    """
+    Serialise access to GPU-exclusive roles in batching windows.
+
+    Requests for the active role are granted immediately as time-limited leases. Once the active
+    role has held the GPU for `window_seconds` and another role is queued, new requests for the
+    active role queue too; when its outstanding leases are released or expire, the scheduler swaps
+    to the queued role that has waited longest, and that role's whole queue is admitted at once.
+    Non-exclusive roles are started on demand and never trigger swaps.
+    """
+
+    def __init__(
+        self,
+        backend: RoleBackend,
+        *,
+        exclusive_roles: set[str],
+        window_seconds: float = 30.0,
+        lease_seconds: float = 60.0,
+    ) -> None:
+        self.backend = backend
+        self.exclusive_roles = set(exclusive_roles)
+        self.window_seconds = window_seconds
+        self.lease_seconds = lease_seconds
+        self._cond = threading.Condition()
+        self._active: str | None = None
+        self._active_since = 0.0
+        self._swapping = False
+        self._leases: dict[str, Lease] = {}
+        self._waiters: list[_Waiter] = []
+        self._swaps = 0
+        self._grants = 0
+        self._last_swap_seconds: float | None = None
+
+    # -- lease bookkeeping (caller holds self._cond) --------------------------------------------
+
+    def _expire_leases(self, now: float) -> None:
+        for lease_id in [lid for lid, lease in self._leases.items() if lease.expires_at <= now]:
+            self._leases.pop(lease_id, None)
+
+    def _in_flight(self, role: str) -> int:
+        return sum(1 for lease in self._leases.values() if lease.role == role)
+
+    def _next_role(self) -> str | None:
+        waiting = [w for w in self._waiters if w.role != self._active]
+        if not waiting:
+            return None
+        return min(waiting, key=lambda w: w.enqueued_at).role
+
+    def _admits(self, role: str, now: float) -> bool:
+        if self._swapping:
+            return False
+        if self._active is None:
+            return False
+        if role != self._active:
+            return False
+        window_open = now - self._active_since < self.window_seconds
+        return window_open or self._next_role() is None
+
+    def _grant(self, role: str, now: float, stopped: list[str] | None = None) -> Lease:
+        lease = Lease(
+            lease_id=str(uuid.uuid4()),
+            role=role,
+            base_url=self.backend.base_url(role),
+            expires_at=now + self.lease_seconds,
+            stopped_roles=list(stopped or []),
+        )
+        self._leases[lease.lease_id] = lease
+        self._grants += 1
+        return lease
+
+    # -- public API --------------------------------------------------------------------------------
+
+    def acquire(self, role: str, *, timeout_seconds: float = 600.0) -> Lease:
+        if role not in self.exclusive_roles:
+            self.backend.start(role)
+            self.backend.wait_ready(role)
+            with self._cond:
+                return self._grant(role, time.time())
+
+        deadline = time.time() + timeout_seconds
+        waiter = _Waiter(role=role, enqueued_at=time.time())
+        with self._cond:
+            self._waiters.append(waiter)
+            try:
+                while True:
+                    now = time.time()
+                    self._expire_leases(now)
+                    if self._admits(role, now):
+                        return self._grant(role, now)
+                    can_swap = (
+                        not self._swapping
+                        and self._next_role() == role
+                        and (
+                            self._active is None
+                            or (
+                                now - self._active_since >= self.window_seconds
+                                and self._in_flight(self._active) == 0
+                            )
+                        )
+                    )
+                    if can_swap:
+                        stopped = self._swap_to(role)
+                        return self._grant(role, time.time(), stopped)
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        raise SchedulerTimeout(f"Timed out waiting for GPU role '{role}'")
+                    # Wake periodically so expired leases and closing windows are noticed.
+                    self._cond.wait(timeout=min(remaining, 0.5, max(self.window_seconds, 0.05)))
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                self._cond.notify_all()
+
+    def _swap_to(self, role: str) -> list[str]:
+        """Stop other exclusive roles and start `role`; runs with the condition lock released."""
+        self._swapping = True
+        previous = self._active
+        self._cond.release()
+        started = time.time()
+        stopped: list[str] = []
+        ready = False
+        try:
+            for other in sorted(self.backend.running_roles() & self.exclusive_roles):
+                if other != role:
+                    self.backend.stop(other)
+                    stopped.append(other)
+            self.backend.start(role)
+            self.backend.wait_ready(role)
+            ready = True
+        finally:
+            self._cond.acquire()
+            self._swapping = False
+            if not ready:
+                # The previous role may already be stopped: forget it so its next acquire swaps
+                # (and starts it) again instead of being granted a dead container's URL.
+                self._active = None
+            self._cond.notify_all()
+        self._active = role
+        self._active_since = time.time()
+        if previous is not None and previous != role:
+            self._swaps += 1
+        self._last_swap_seconds = round(time.time() - started, 3)
+        return stopped
+
+    def renew(self, lease_id: str) -> Lease | None:
+        """Extend a live lease by `lease_seconds` from now; expired or unknown leases are not revived."""
+        with self._cond:
+            now = time.time()
+            self._expire_leases(now)
+            lease = self._leases.get(lease_id)
+            if lease is not None:
+                lease.expires_at = now + self.lease_seconds
+            return lease
+
+    def release(self, lease_id: str) -> bool:
+        with self._cond:
+            lease = self._leases.pop(lease_id, None)
+            self._cond.notify_all()
+            return lease is not None
+
+    def status(self) -> dict[str, Any]:
+        with self._cond:
+            now = time.time()
+            self._expire_leases(now)
+            queue: dict[str, int] = {}
+            for w in self._waiters:
+                queue[w.role] = queue.get(w.role, 0) + 1
+            in_flight: dict[str, int] = {}
+            for lease in self._leases.values():
+                in_flight[lease.role] = in_flight.get(lease.role, 0) + 1
+            return {
+                "active_role": self._active,
+                "active_for_seconds": round(now - self._active_since, 1) if self._active else None,
+                "window_seconds": self.window_seconds,
+                "lease_seconds": self.lease_seconds,
+                "swapping": self._swapping,
+                "queue_depth": sum(queue.values()),
+                "queue_by_role": queue,
+                "in_flight_by_role": in_flight,
+                "swaps": self._swaps,
+                "grants": self._grants,
+                "last_swap_seconds": self._last_swap_seconds,
+            }
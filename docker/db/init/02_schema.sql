@@ -381,6 +381,13 @@ ALTER TABLE chunks
 CREATE INDEX IF NOT EXISTS chunks_document_id_idx
   ON chunks (document_id);
 
+-- Stored lexemes for hybrid keyword retrieval; adding the column to an existing table backfills it.
+ALTER TABLE chunks
+  ADD COLUMN IF NOT EXISTS text_tsv tsvector GENERATED ALWAYS AS (to_tsvector('english', text)) STORED;
+
+CREATE INDEX IF NOT EXISTS chunks_text_tsv_idx
+  ON chunks USING gin (text_tsv);
+
 CREATE TABLE IF NOT EXISTS layout_blocks (
   id uuid PRIMARY KEY,
   document_id uuid NOT NULL REFERENCES documents (id) ON DELETE CASCADE,
@@ -406,6 +413,12 @@ CREATE UNIQUE INDEX IF NOT EXISTS layout_blocks_document_block_unique
 CREATE INDEX IF NOT EXISTS layout_blocks_document_idx
   ON layout_blocks (document_id);
 
+ALTER TABLE layout_blocks
+  ADD COLUMN IF NOT EXISTS text_tsv tsvector GENERATED ALWAYS AS (to_tsvector('english', text)) STORED;
+
+CREATE INDEX IF NOT EXISTS layout_blocks_text_tsv_idx
+  ON layout_blocks USING gin (text_tsv);
+
 CREATE TABLE IF NOT EXISTS document_tables (
   id uuid PRIMARY KEY,
   document_id uuid NOT NULL REFERENCES documents (id) ON DELETE CASCADE,
@@ -483,6 +496,11 @@ CREATE TABLE IF NOT EXISTS visual_assets (
   updated_at timestamptz NOT NULL DEFAULT NOW()
 );
 
+-- Approximate LLM tokens (~4 chars each) of the row's variable-size content, computed when the
+-- row is written so ContextPack candidate loaders do not serialise every candidate to size it.
+ALTER TABLE visual_assets
+  ADD COLUMN IF NOT EXISTS token_estimate integer GENERATED ALWAYS AS (length(metadata::text) / 4) STORED;
+
 CREATE TABLE IF NOT EXISTS parse_bundles (
   id uuid PRIMARY KEY,
   ingest_job_id uuid REFERENCES ingest_jobs (id) ON DELETE SET NULL,
@@ -757,6 +775,16 @@ CREATE TABLE IF NOT EXISTS policy_clauses (
 CREATE INDEX IF NOT EXISTS policy_clauses_section_idx
   ON policy_clauses (policy_section_id);
 
+ALTER TABLE policy_clauses
+  ADD COLUMN IF NOT EXISTS text_tsv tsvector GENERATED ALWAYS AS (to_tsvector('english', text)) STORED;
+
+CREATE INDEX IF NOT EXISTS policy_clauses_text_tsv_idx
+  ON policy_clauses USING gin (text_tsv);
+
+ALTER TABLE policy_clauses
+  ADD COLUMN IF NOT EXISTS token_estimate integer
+  GENERATED ALWAYS AS ((length(text) + length(metadata_jsonb::text)) / 4) STORED;
+
 CREATE TABLE IF NOT EXISTS policy_clause_mentions (
   id uuid PRIMARY KEY,
   policy_clause_id uuid NOT NULL REFERENCES policy_clauses (id) ON DELETE CASCADE,
@@ -896,6 +924,18 @@ CREATE TABLE IF NOT EXISTS spatial_features (
   properties jsonb NOT NULL DEFAULT '{}'::jsonb
 );
 
+ALTER TABLE spatial_features
+  ADD COLUMN IF NOT EXISTS token_estimate integer GENERATED ALWAYS AS (length(properties::text) / 4) STORED;
+
+-- GiST indexes for ST_Intersects site fingerprinting (one index probe per site instead of a scan of
+-- every constraint layer). The feature index is partial to the rows fingerprinting considers.
+CREATE INDEX IF NOT EXISTS sites_geometry_polygon_gist
+  ON sites USING gist (geometry_polygon);
+
+CREATE INDEX IF NOT EXISTS spatial_features_geometry_active_gist
+  ON spatial_features USING gist (geometry)
+  WHERE is_active = true AND geometry IS NOT NULL;
+
 -- Precomputed spatial enrichment for a Site (Slice C).
 -- Stored as a logged fingerprint object with provenance (ToolRun) and optional plan-cycle scoping.
 CREATE TABLE IF NOT EXISTS site_fingerprints (
@@ -1942,4 +1982,237 @@ ALTER TABLE kg_edge
 ALTER TABLE kg_edge
   ADD COLUMN IF NOT EXISTS resolve_method text;
 
+-- Scenario tab freshness: triggers bump a (scope, source table) version counter whenever a row a
+-- tab depends on changes, so `_scenario_dependency_snapshot` is one primary-key lookup instead of
+-- MAX/COUNT scans. Scopes are 'plan_project', 'authority', 'plan_cycle' and 'global' (scope_id '').
+-- Each table only bumps the scopes the reader uses for it (first trigger argument):
+--   'plan_project' -> plan_project; 'global' -> global; 'document' -> authority, plan_cycle, and
+--   global for rows with no authority; 'visual' -> 'document' plus plan_project.
+-- Unscoped tabs read the sum of a table's authority counters plus its global counter.
+-- The second argument mirrors the old dependency: 'any' (MAX(updated_at)) counts every write;
+-- 'membership' (COUNT) counts inserts, deletes and updates that move a row between scopes, plus
+-- updates to any further columns listed after it.
+-- Triggers are statement-level over transition tables, so a bulk write bumps each counter once.
+CREATE TABLE IF NOT EXISTS dependency_versions (
+  scope_kind text NOT NULL,
+  scope_id text NOT NULL,
+  source_table text NOT NULL,
+  version bigint NOT NULL DEFAULT 0,
+  updated_at timestamptz NOT NULL DEFAULT now(),
+  PRIMARY KEY (scope_kind, scope_id, source_table)
+);
+
+CREATE OR REPLACE FUNCTION tpa_dependency_scope_key(r jsonb)
+RETURNS jsonb
+LANGUAGE sql
+IMMUTABLE
+AS $$
+  SELECT jsonb_build_array(
+    r->'document_id', r->'policy_section_id', r->'authority_id', r->'plan_cycle_id', r->'plan_project_id',
+    r->'metadata'->'authority_id', r->'metadata'->'plan_cycle_id', r->'metadata'->'plan_project_id'
+  );
+$$;
+
+CREATE OR REPLACE FUNCTION tpa_track_dependency_change()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  scope_set text := TG_ARGV[0];
+  change_mode text := TG_ARGV[1];
+  watched text[] := CASE WHEN TG_NARGS > 2 THEN TG_ARGV[2:TG_NARGS - 1] ELSE ARRAY[]::text[] END;
+  kinds text[];
+  changed jsonb[];
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    SELECT array_agg(to_jsonb(n)) INTO changed FROM tpa_new_rows n;
+  ELSIF TG_OP = 'DELETE' THEN
+    SELECT array_agg(to_jsonb(o)) INTO changed FROM tpa_old_rows o;
+  ELSE
+    -- Updates: the new row when the write counts for this table; the old row too when it moved
+    -- between scopes, so both the scope it left and the one it joined are bumped.
+    SELECT array_agg(x.r) INTO changed
+    FROM (
+      SELECT to_jsonb(o) AS old_r, to_jsonb(n) AS new_r,
+             tpa_dependency_scope_key(to_jsonb(o)) IS DISTINCT FROM tpa_dependency_scope_key(to_jsonb(n)) AS moved
+      FROM tpa_old_rows o
+      JOIN tpa_new_rows n ON n.id = o.id
+    ) p
+    CROSS JOIN LATERAL (
+      SELECT p.new_r
+      WHERE change_mode = 'any'
+         OR p.moved
+         OR EXISTS (SELECT 1 FROM unnest(watched) AS w(col) WHERE p.old_r->w.col IS DISTINCT FROM p.new_r->w.col)
+      UNION ALL
+      SELECT p.old_r WHERE p.moved
+    ) AS x(r);
+  END IF;
+  IF changed IS NULL THEN
+    RETURN NULL;
+  END IF;
+
+  kinds := CASE scope_set
+    WHEN 'plan_project' THEN ARRAY['plan_project']
+    WHEN 'global' THEN ARRAY['global']
+    WHEN 'visual' THEN ARRAY['plan_project', 'authority', 'plan_cycle', 'global']
+    ELSE ARRAY['authority', 'plan_cycle', 'global']
+  END;
+
+  -- Sorted so concurrent writers take the counter row locks in the same order.
+  INSERT INTO dependency_versions (scope_kind, scope_id, source_table, version, updated_at)
+  SELECT s.scope_kind, s.scope_id, TG_TABLE_NAME, 1, now()
+  FROM (
+    SELECT DISTINCT v.scope_kind, v.scope_id
+    FROM (
+      SELECT
+        COALESCE(c.r->>'authority_id', c.r->'metadata'->>'authority_id') AS own_authority,
+        COALESCE(c.r->>'plan_cycle_id', c.r->'metadata'->>'plan_cycle_id') AS own_plan_cycle,
+        COALESCE(c.r->>'plan_project_id', c.r->'metadata'->>'plan_project_id') AS plan_project,
+        d.authority_id AS doc_authority,
+        d.plan_cycle_id::text AS doc_plan_cycle
+      FROM unnest(changed) AS c(r)
+      LEFT JOIN policy_sections ps
+        ON TG_TABLE_NAME = 'policy_clauses' AND ps.id = (c.r->>'policy_section_id')::uuid
+      LEFT JOIN documents d
+        ON kinds && ARRAY['authority', 'plan_cycle']
+       AND d.id = COALESCE(ps.document_id, (c.r->>'document_id')::uuid)
+    ) x
+    CROSS JOIN LATERAL (
+      VALUES
+        ('plan_project', x.plan_project),
+        ('authority', x.own_authority),
+        ('authority', x.doc_authority),
+        ('plan_cycle', x.own_plan_cycle),
+        ('plan_cycle', x.doc_plan_cycle),
+        ('global', CASE WHEN scope_set = 'global' OR COALESCE(x.own_authority, x.doc_authority) IS NULL THEN '' END)
+    ) AS v(scope_kind, scope_id)
+    WHERE v.scope_id IS NOT NULL AND v.scope_kind = ANY(kinds)
+  ) s
+  ORDER BY s.scope_kind, s.scope_id
+  ON CONFLICT (scope_kind, scope_id, source_table)
+  DO UPDATE SET version = dependency_versions.version + 1, updated_at = now();
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS site_assessments_dependency_version ON site_assessments;
+CREATE OR REPLACE TRIGGER site_assessments_dependency_version_ins
+  AFTER INSERT ON site_assessments REFERENCING NEW TABLE AS tpa_new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION tpa_track_dependency_change('plan_project', 'any');
+CREATE OR REPLACE TRIGGER site_assessments_dependency_version_upd
+  AFTER UPDATE ON site_assessments REFERENCING OLD TABLE AS tpa_old_rows NEW TABLE AS tpa_new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION tpa_track_dependency_change('plan_project', 'any');
+CREATE OR REPLACE TRIGGER site_assessments_dependency_version_del
+  AFTER DELETE ON site_assessments REFERENCING OLD TABLE AS tpa_old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION tpa_track_dependency_change('plan_project', 'any');
+
+DROP TRIGGER IF EXISTS allocation_decisions_dependency_version ON allocation_decisions;
+CREATE OR REPLACE TRIGGER allocation_decisions_dependency_version_ins
+  AFTER INSERT ON allocation_decisions REFERENCING NEW TABLE AS tpa_new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION tpa_track_dependency_change('plan_project', 'any');
+CREATE OR REPLACE TRIGGER allocation_decisions_dependency_version_upd
+  AFTER UPDATE ON allocation_decisions REFERENCING OLD TABLE AS tpa_old_rows NEW TABLE AS tpa_new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION tpa_track_dependency_change('plan_project', 'any');
+CREATE OR REPLACE TRIGGER allocation_decisions_dependency_version_del
+  AFTER DELETE ON allocation_decisions REFERENCING OLD TABLE AS tpa_old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION tpa_track_dependency_change('plan_project', 'any');
+
+DROP TRIGGER IF EXISTS stage4_summary_rows_dependency_version ON stage4_summary_rows;
+CREATE OR REPLACE TRIGGER stage4_summary_rows_dependency_version_ins
+  AFTER INSERT ON stage4_summary_rows REFERENCING NEW TABLE AS tpa_new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION tpa_track_dependency_change('plan_project', 'any');
+CREATE OR REPLACE TRIGGER stage4_summary_rows_dependency_version_upd
+  AFTER UPDATE ON stage4_summary_rows REFERENCING OLD TABLE AS tpa_old_rows NEW TABLE AS tpa_new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION tpa_track_dependency_change('plan_project', 'any');
+CREATE OR REPLACE TRIGGER stage4_summary_rows_dependency_version_del
+  AFTER DELETE ON stage4_summary_rows REFERENCING OLD TABLE AS tpa_old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION tpa_track_dependency_change('plan_project', 'any');
+
+DROP TRIGGER IF EXISTS evidence_items_dependency_version ON evidence_items;
+CREATE OR REPLACE TRIGGER evidence_items_dependency_version_ins
+  AFTER INSERT ON evidence_items REFERENCING NEW TABLE AS tpa_new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION tpa_track_dependency_change('plan_project', 'any');
+CREATE OR REPLACE TRIGGER evidence_items_dependency_version_upd
+  AFTER UPDATE ON evidence_items REFERENCING OLD TABLE AS tpa_old_rows NEW TABLE AS tpa_new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION tpa_track_dependency_change('plan_project', 'any');
+CREATE OR REPLACE TRIGGER evidence_items_dependency_version_del
+  AFTER DELETE ON evidence_items REFERENCING OLD TABLE AS tpa_old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION tpa_track_dependency_change('plan_project', 'any');
+
+DROP TRIGGER IF EXISTS evidence_gaps_dependency_version ON evidence_gaps;
+CREATE OR REPLACE TRIGGER evidence_gaps_dependency_version_ins
+  AFTER INSERT ON evidence_gaps REFERENCING NEW TABLE AS tpa_new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION tpa_track_dependency_change('plan_project', 'any');
+CREATE OR REPLACE TRIGGER evidence_gaps_dependency_version_upd
+  AFTER UPDATE ON evidence_gaps REFERENCING OLD TABLE AS tpa_old_rows NEW TABLE AS tpa_new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION tpa_track_dependency_change('plan_project', 'any');
+CREATE OR REPLACE TRIGGER evidence_gaps_dependency_version_del
+  AFTER DELETE ON evidence_gaps REFERENCING OLD TABLE AS tpa_old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION tpa_track_dependency_change('plan_project', 'any');
+
+DROP TRIGGER IF EXISTS trace_links_dependency_version ON trace_links;
+CREATE OR REPLACE TRIGGER trace_links_dependency_version_ins
+  AFTER INSERT ON trace_links REFERENCING NEW TABLE AS tpa_new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION tpa_track_dependency_change('global', 'membership');
+CREATE OR REPLACE TRIGGER trace_links_dependency_version_del
+  AFTER DELETE ON trace_links REFERENCING OLD TABLE AS tpa_old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION tpa_track_dependency_change('global', 'membership');
+
+DROP TRIGGER IF EXISTS ingest_batches_dependency_version ON ingest_batches;
+CREATE OR REPLACE TRIGGER ingest_batches_dependency_version_ins
+  AFTER INSERT ON ingest_batches REFERENCING NEW TABLE AS tpa_new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION tpa_track_dependency_change('document', 'membership', 'completed_at');
+CREATE OR REPLACE TRIGGER ingest_batches_dependency_version_upd
+  AFTER UPDATE ON ingest_batches REFERENCING OLD TABLE AS tpa_old_rows NEW TABLE AS tpa_new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION tpa_track_dependency_change('document', 'membership', 'completed_at');
+CREATE OR REPLACE TRIGGER ingest_batches_dependency_version_del
+  AFTER DELETE ON ingest_batches REFERENCING OLD TABLE AS tpa_old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION tpa_track_dependency_change('document', 'membership', 'completed_at');
+
+-- Document deletes cascade to sections/clauses after the document row is gone, so the documents
+-- counter is what records that change for the authority/plan cycle.
+DROP TRIGGER IF EXISTS documents_dependency_version ON documents;
+CREATE OR REPLACE TRIGGER documents_dependency_version_ins
+  AFTER INSERT ON documents REFERENCING NEW TABLE AS tpa_new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION tpa_track_dependency_change('document', 'membership');
+CREATE OR REPLACE TRIGGER documents_dependency_version_upd
+  AFTER UPDATE ON documents REFERENCING OLD TABLE AS tpa_old_rows NEW TABLE AS tpa_new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION tpa_track_dependency_change('document', 'membership');
+CREATE OR REPLACE TRIGGER documents_dependency_version_del
+  AFTER DELETE ON documents REFERENCING OLD TABLE AS tpa_old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION tpa_track_dependency_change('document', 'membership');
+
+DROP TRIGGER IF EXISTS policy_sections_dependency_version ON policy_sections;
+CREATE OR REPLACE TRIGGER policy_sections_dependency_version_ins
+  AFTER INSERT ON policy_sections REFERENCING NEW TABLE AS tpa_new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION tpa_track_dependency_change('document', 'membership');
+CREATE OR REPLACE TRIGGER policy_sections_dependency_version_upd
+  AFTER UPDATE ON policy_sections REFERENCING OLD TABLE AS tpa_old_rows NEW TABLE AS tpa_new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION tpa_track_dependency_change('document', 'membership');
+CREATE OR REPLACE TRIGGER policy_sections_dependency_version_del
+  AFTER DELETE ON policy_sections REFERENCING OLD TABLE AS tpa_old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION tpa_track_dependency_change('document', 'membership');
+
+DROP TRIGGER IF EXISTS policy_clauses_dependency_version ON policy_clauses;
+CREATE OR REPLACE TRIGGER policy_clauses_dependency_version_ins
+  AFTER INSERT ON policy_clauses REFERENCING NEW TABLE AS tpa_new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION tpa_track_dependency_change('document', 'membership');
+CREATE OR REPLACE TRIGGER policy_clauses_dependency_version_upd
+  AFTER UPDATE ON policy_clauses REFERENCING OLD TABLE AS tpa_old_rows NEW TABLE AS tpa_new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION tpa_track_dependency_change('document', 'membership');
+CREATE OR REPLACE TRIGGER policy_clauses_dependency_version_del
+  AFTER DELETE ON policy_clauses REFERENCING OLD TABLE AS tpa_old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION tpa_track_dependency_change('document', 'membership');
+
+DROP TRIGGER IF EXISTS visual_assets_dependency_version ON visual_assets;
+CREATE OR REPLACE TRIGGER visual_assets_dependency_version_ins
+  AFTER INSERT ON visual_assets REFERENCING NEW TABLE AS tpa_new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION tpa_track_dependency_change('visual', 'membership');
+CREATE OR REPLACE TRIGGER visual_assets_dependency_version_upd
+  AFTER UPDATE ON visual_assets REFERENCING OLD TABLE AS tpa_old_rows NEW TABLE AS tpa_new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION tpa_track_dependency_change('visual', 'membership');
+CREATE OR REPLACE TRIGGER visual_assets_dependency_version_del
+  AFTER DELETE ON visual_assets REFERENCING OLD TABLE AS tpa_old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION tpa_track_dependency_change('visual', 'membership');
+
 COMMIT;
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+OSM alignment scoring micro-benchmark: per-point loop vs vectorised (full and early-exit), each
+timed end to end (edge mask, distance transform when the tolerance needs one, scoring).
+
+Draws a synthetic plan raster (a jittered street grid plus noise) and a matching synthetic road
+network, then scores the network against the raster the way `apply_gcps` does. With pyproj
+installed (the georef agent image) the network is held in EPSG:4326 and reprojected to EPSG:27700
+as in production; without it only the pixel affine is applied.
+
+  python scripts/bench_georef_alignment.py
+  python scripts/bench_georef_alignment.py --width 6000 --height 4000 --roads 3000 --repeat 3
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFilter
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "apps" / "georef_agent"))
+
+from tpa_georef_agent.alignment import edge_distance_map, score_points, stack_line_points  # noqa: E402
+
+try:
+    from pyproj import Transformer
+except ImportError:  # pragma: no cover - optional outside the georef image
+    Transformer = None
+
+_ORIGIN = (545000.0, 258000.0)  # EPSG:27700, Cambridge
+_PIXEL_M = 0.5
+
+
+def _synthetic(width: int, height: int, roads: int, seed: int) -> tuple[Image.Image, list[list[tuple[float, float]]]]:
+    """Raster with `roads` polylines drawn on it, and the same polylines in world (EPSG:27700) metres."""
+    rng = np.random.default_rng(seed)
+    image = Image.new("L", (width, height), 235)
+    draw = ImageDraw.Draw(image)
+    lines: list[list[tuple[float, float]]] = []
+    for _ in range(roads):
+        n = int(rng.integers(4, 80))
+        start = rng.uniform([0, 0], [width, height])
+        steps = rng.normal(0, 12, size=(n, 2)) + rng.choice([-1, 1], size=2) * rng.uniform(5, 25, size=2)
+        pixels = np.vstack([start, start + np.cumsum(steps, axis=0)])
+        draw.line([tuple(p) for p in pixels], fill=40, width=3)
+        # Digitised network is offset by up to a pixel, as real OSM vs plan linework is.
+        jitter = rng.normal(0, 0.7, size=pixels.shape)
+        world = [
+            (_ORIGIN[0] + (c + dc) * _PIXEL_M, _ORIGIN[1] - (r + dr) * _PIXEL_M)
+            for (c, r), (dc, dr) in zip(pixels, jitter)
+        ]
+        lines.append(world)
+    noise = rng.integers(0, 12, size=(height, width), dtype=np.uint8)
+    image = Image.fromarray(np.clip(np.asarray(image, dtype=np.int16) + noise, 0, 255).astype(np.uint8))
+    return image, lines
+
+
+def _timed(fn: Callable[[], object], repeat: int) -> tuple[float, object]:
+    times = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times), result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Per-point vs vectorised OSM alignment scoring.")
+    parser.add_argument("--width", type=int, default=4000)
+    parser.add_argument("--height", type=int, default=3000)
+    parser.add_argument("--roads", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tolerance-px", type=float, default=2.0, help="also time the distance-map path at this tolerance")
+    parser.add_argument("--skip-legacy", action="store_true", help="skip the per-point loop (slow on big networks)")
+    args = parser.parse_args()
+
+    image, world_lines = _synthetic(args.width, args.height, args.roads, args.seed)
+    a, c, e, f = _PIXEL_M, _ORIGIN[0], -_PIXEL_M, _ORIGIN[1]
+
+    if Transformer is not None:
+        to_wgs84 = Transformer.from_crs("EPSG:27700", "EPSG:4326", always_xy=True)
+        to_target = Transformer.from_crs("EPSG:4326", "EPSG:27700", always_xy=True)
+        lines = []
+        for line in world_lines:
+            lons, lats = to_wgs84.transform([p[0] for p in line], [p[1] for p in line])
+            lines.append(list(zip(lons, lats)))
+        reproject = "EPSG:4326 -> EPSG:27700 (pyproj)"
+    else:
+        to_target = None
+        lines = world_lines
+        reproject = "none (pyproj not installed)"
+
+    def to_world(x, y):
+        return to_target.transform(x, y) if to_target is not None else (x, y)
+
+    def project(xs: np.ndarray, ys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        x, y = to_world(xs, ys)
+        return (np.asarray(x) - c) / a, (np.asarray(y) - f) / e
+
+    points_total = sum(len(line[::5]) for line in lines)
+    print(f"raster {args.width}x{args.height}, {len(lines)} roads, {points_total} sample points, reprojection: {reproject}")
+
+    def edges() -> np.ndarray:
+        return np.asarray(image.filter(ImageFilter.FIND_EDGES)) > 20
+
+    # Component costs, for reference; the rows below are end to end (edge mask + any distance
+    # transform + scoring), as `apply_gcps` pays them.
+    edge_time, edge_mask = _timed(edges, args.repeat)
+    dist_time, _ = _timed(lambda: edge_distance_map(edge_mask), args.repeat)
+    print(f"edge mask only         {edge_time * 1000:9.1f} ms")
+    print(f"distance transform     {dist_time * 1000:9.1f} ms  (only built when tolerance > 0)")
+
+    if not args.skip_legacy:
+
+        def legacy() -> float | None:
+            mask = edges()
+            hits = total = 0
+            for line in lines:
+                for idx, (lon, lat) in enumerate(line):
+                    if idx % 5 != 0:
+                        continue
+                    x, y = to_world(lon, lat)
+                    col_i = int(round((x - c) / a))
+                    row_i = int(round((y - f) / e))
+                    if 0 <= col_i < args.width and 0 <= row_i < args.height:
+                        total += 1
+                        if mask[row_i, col_i]:
+                            hits += 1
+            return hits / total if total else None
+
+        legacy_time, legacy_score = _timed(legacy, args.repeat)
+        print(f"per-point loop         {legacy_time * 1000:9.1f} ms  score={legacy_score:.4f}")
+
+    for tolerance in sorted({0.0, args.tolerance_px}):
+        for mode in ("full", "early_exit"):
+
+            def vectorised(mode: str = mode, tolerance: float = tolerance) -> tuple[float | None, dict]:
+                return score_points(
+                    stack_line_points(lines, stride=5),
+                    project=project,
+                    edge_mask=edges(),
+                    tolerance_px=tolerance,
+                    mode=mode,
+                )
+
+            run_time, (score, meta) = _timed(vectorised, args.repeat)
+            mean_dist = meta.get("mean_edge_distance_px")
+            print(
+                f"vectorised {mode:<10} tol={tolerance:g} {run_time * 1000:9.1f} ms  score={score:.4f} "
+                f"samples={meta['samples']} visited={meta['points_visited']}"
+                + (f" mean_dist={mean_dist}px" if mean_dist is not None else "")
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
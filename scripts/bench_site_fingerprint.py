@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Site fingerprinting benchmark: per-site vs batch, with and without GiST indexes.
+
+Builds a scratch schema holding copies of `sites`, `spatial_features` and the tables the fingerprint
+tool writes to (tool_runs, kg_node, kg_edge, site_fingerprints), fills it with synthetic sites and
+constraint features (EPSG:27700 squares), and runs `tpa_api/spatial_fingerprint.py` against it via
+`search_path`, so the SQL measured is exactly what the API runs. Uses `TPA_DB_DSN` (local PostGIS
+with the canonical schema applied).
+
+  python scripts/bench_site_fingerprint.py --sites 1000 --features 100000
+  python scripts/bench_site_fingerprint.py --sites 1000 --features 100000 --batch-size 250 --skip-unindexed
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "apps" / "api"))
+
+import psycopg  # noqa: E402
+from psycopg.rows import dict_row  # noqa: E402
+
+from tpa_api.spatial_fingerprint import (  # noqa: E402
+    compute_site_fingerprint_sync,
+    compute_site_fingerprints_batch_sync,
+)
+
+_SCHEMA = "bench_fingerprint"
+_AUTHORITY = "bench-authority"
+_FEATURE_TYPES = [
+    "flood_zone_2",
+    "flood_zone_3",
+    "conservation_area",
+    "listed_building",
+    "green_belt",
+    "tree_preservation_order",
+    "sssi",
+    "ancient_woodland",
+    "article_4",
+    "scheduled_monument",
+    "aqma",
+    "local_green_space",
+]
+
+
+class _Db:
+    """The fingerprint tool's injected DB callables over one connection, counting statements."""
+
+    def __init__(self, conn: psycopg.Connection) -> None:
+        self.conn = conn
+        self.statements = 0
+
+    def fetch_one(self, sql: str, params: Any = None) -> dict[str, Any] | None:
+        self.statements += 1
+        with self.conn.cursor(row_factory=dict_row) as cur:
+            cur.execute(sql, params)
+            return cur.fetchone()
+
+    def fetch_all(self, sql: str, params: Any = None) -> list[dict[str, Any]]:
+        self.statements += 1
+        with self.conn.cursor(row_factory=dict_row) as cur:
+            cur.execute(sql, params)
+            return cur.fetchall()
+
+    def execute(self, sql: str, params: Any = None) -> None:
+        self.statements += 1
+        with self.conn.cursor() as cur:
+            cur.execute(sql, params)
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _setup(conn: psycopg.Connection, *, sites: int, features: int, extent_m: int, seed: float) -> None:
+    with conn.cursor() as cur:
+        cur.execute(f"DROP SCHEMA IF EXISTS {_SCHEMA} CASCADE")
+        cur.execute(f"CREATE SCHEMA {_SCHEMA}")
+        for table in ("sites", "spatial_features"):
+            cur.execute(
+                f"""
+                CREATE TABLE {_SCHEMA}.{table}
+                  (LIKE public.{table} INCLUDING DEFAULTS INCLUDING GENERATED INCLUDING CONSTRAINTS)
+                """
+            )
+            cur.execute(f"ALTER TABLE {_SCHEMA}.{table} ADD PRIMARY KEY (id)")
+        for table in ("tool_runs", "kg_node", "kg_edge", "site_fingerprints"):
+            # Indexes and CHECKs are copied; foreign keys are not, so scratch rows stay self-contained.
+            cur.execute(f"CREATE TABLE {_SCHEMA}.{table} (LIKE public.{table} INCLUDING ALL)")
+
+        cur.execute("SELECT setseed(%s)", (seed,))
+        started = time.perf_counter()
+        cur.execute(
+            f"""
+            INSERT INTO {_SCHEMA}.spatial_features (id, authority_id, type, spatial_scope, is_active, geometry, properties)
+            SELECT
+              gen_random_uuid(),
+              %s,
+              (%s::text[])[1 + floor(random() * %s)::int],
+              'authority',
+              true,
+              ST_MakeEnvelope(x, y, x + w, y + w, 27700),
+              jsonb_build_object('name', 'feature ' || g)
+            FROM (
+              SELECT g, random() * %s AS x, random() * %s AS y, 20 + random() * 980 AS w
+              FROM generate_series(1, %s) AS g
+            ) f
+            """,
+            (_AUTHORITY, _FEATURE_TYPES, len(_FEATURE_TYPES), extent_m, extent_m, features),
+        )
+        cur.execute(
+            f"""
+            INSERT INTO {_SCHEMA}.sites (id, geometry_polygon, metadata)
+            SELECT gen_random_uuid(), ST_MakeEnvelope(x, y, x + w, y + w, 27700), jsonb_build_object('name', 'site ' || g)
+            FROM (
+              SELECT g, random() * %s AS x, random() * %s AS y, 50 + random() * 450 AS w
+              FROM generate_series(1, %s) AS g
+            ) s
+            """,
+            (extent_m, extent_m, sites),
+        )
+        print(f"Loaded {features} features and {sites} sites in {time.perf_counter() - started:.1f}s", flush=True)
+
+
+def _set_indexes(conn: psycopg.Connection, *, enabled: bool) -> None:
+    with conn.cursor() as cur:
+        if enabled:
+            cur.execute(
+                f"CREATE INDEX IF NOT EXISTS bench_sites_gist ON {_SCHEMA}.sites USING gist (geometry_polygon)"
+            )
+            cur.execute(
+                f"""
+                CREATE INDEX IF NOT EXISTS bench_features_gist ON {_SCHEMA}.spatial_features USING gist (geometry)
+                WHERE is_active = true AND geometry IS NOT NULL
+                """
+            )
+        else:
+            cur.execute(f"DROP INDEX IF EXISTS {_SCHEMA}.bench_sites_gist")
+            cur.execute(f"DROP INDEX IF EXISTS {_SCHEMA}.bench_features_gist")
+        cur.execute(f"ANALYZE {_SCHEMA}.sites")
+        cur.execute(f"ANALYZE {_SCHEMA}.spatial_features")
+
+
+def _reset_outputs(conn: psycopg.Connection) -> None:
+    with conn.cursor() as cur:
+        cur.execute(f"TRUNCATE {_SCHEMA}.kg_edge, {_SCHEMA}.kg_node, {_SCHEMA}.site_fingerprints, {_SCHEMA}.tool_runs")
+
+
+def _run(conn: psycopg.Connection, site_ids: list[str], *, mode: str, batch_size: int) -> dict[str, Any]:
+    _reset_outputs(conn)
+    db = _Db(conn)
+    kwargs = {
+        "db_fetch_one": db.fetch_one,
+        "db_fetch_all": db.fetch_all,
+        "db_execute": db.execute,
+        "utc_now": _utc_now,
+        "authority_id": _AUTHORITY,
+        "plan_cycle_id": None,
+    }
+    intersections = 0
+    errors = 0
+    started = time.perf_counter()
+    if mode == "per-site":
+        for site_id in site_ids:
+            fingerprint, _, errs = compute_site_fingerprint_sync(site_id=site_id, **kwargs)
+            intersections += len((fingerprint or {}).get("intersections") or [])
+            errors += len(errs)
+    else:
+        for i in range(0, len(site_ids), batch_size):
+            results = compute_site_fingerprints_batch_sync(site_ids=site_ids[i : i + batch_size], **kwargs)
+            for fingerprint, _, errs in results.values():
+                intersections += len((fingerprint or {}).get("intersections") or [])
+                errors += len(errs)
+    seconds = time.perf_counter() - started
+    with conn.cursor() as cur:
+        cur.execute(f"SELECT COUNT(*) FROM {_SCHEMA}.kg_edge")
+        edges = cur.fetchone()[0]
+    return {
+        "seconds": seconds,
+        "sites_per_second": len(site_ids) / seconds if seconds else float("inf"),
+        "statements": db.statements,
+        "intersections": intersections,
+        "kg_edges": edges,
+        "errors": errors,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Per-site vs batch site fingerprinting benchmark.")
+    parser.add_argument("--sites", type=int, default=1000)
+    parser.add_argument("--features", type=int, default=100000)
+    parser.add_argument("--extent-m", type=int, default=100000, help="side of the square area features are scattered over")
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--seed", type=float, default=0.42)
+    parser.add_argument("--skip-unindexed", action="store_true", help="only run with GiST indexes (unindexed is slow)")
+    parser.add_argument("--keep", action="store_true", help="keep the scratch schema afterwards")
+    args = parser.parse_args()
+
+    dsn = os.environ.get("TPA_DB_DSN")
+    if not dsn:
+        print("TPA_DB_DSN is not set.", file=sys.stderr)
+        return 2
+
+    with psycopg.connect(dsn, autocommit=True) as conn:
+        _setup(conn, sites=args.sites, features=args.features, extent_m=args.extent_m, seed=args.seed)
+        with conn.cursor() as cur:
+            cur.execute(f"SET search_path TO {_SCHEMA}, public")
+            cur.execute("SELECT id::text FROM sites ORDER BY id")
+            site_ids = [r[0] for r in cur.fetchall()]
+
+        for indexed in ([True] if args.skip_unindexed else [False, True]):
+            _set_indexes(conn, enabled=indexed)
+            for mode in ("per-site", "batch"):
+                stats = _run(conn, site_ids, mode=mode, batch_size=args.batch_size)
+                label = f"{mode:<8} {'gist' if indexed else 'no-index':<8}"
+                print(
+                    f"{label} {stats['seconds']:8.2f}s {stats['sites_per_second']:8.1f} sites/s "
+                    f"statements={stats['statements']:<6d} intersections={stats['intersections']:<7d} "
+                    f"kg_edges={stats['kg_edges']:<7d} errors={stats['errors']}",
+                    flush=True,
+                )
+
+        if not args.keep:
+            with conn.cursor() as cur:
+                cur.execute(f"DROP SCHEMA IF EXISTS {_SCHEMA} CASCADE")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
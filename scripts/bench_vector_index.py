@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Recall-vs-latency benchmark for the unit_embeddings HNSW indexes, against exact search.
+
+Loads synthetic clustered embeddings into a scratch table, records exact top-k for a set of query
+vectors, builds the same partial HNSW expression index the API creates (see
+`tpa_api/vector_index.py`), then runs the API's query shape at each `ef_search` and reports
+recall@k and p50/p95 latency. Uses `TPA_DB_DSN` (a local Postgres with pgvector >= 0.8).
+
+  python scripts/bench_vector_index.py --rows 200000 --dim 1024 --ef 40,100,200,400
+  python scripts/bench_vector_index.py --rows 2000000 --dim 4096 --ef 100,200,400
+
+`--ensure-indexes` instead creates any missing HNSW indexes for embeddings already stored in
+`unit_embeddings` (the upgrade path for existing databases).
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "apps" / "api"))
+
+import psycopg  # noqa: E402
+
+from tpa_api.vector_index import (  # noqa: E402
+    _index_expression,
+    ann_candidate_limit,
+    ann_dimension_sql,
+    ann_order_sql,
+)
+
+_TABLE = "bench_unit_embeddings"
+_MODEL = "bench-model"
+_UNIT_TYPE = "chunk"
+
+
+def _vec(values: list[float]) -> str:
+    return "[" + ",".join(f"{v:.6f}" for v in values) + "]"
+
+
+def _clustered(rng: random.Random, centroids: list[list[float]], noise: float) -> list[float]:
+    c = centroids[rng.randrange(len(centroids))]
+    return [x + rng.gauss(0.0, noise) for x in c]
+
+
+def _load(conn: psycopg.Connection, *, rows: int, dim: int, clusters: int, seed: int) -> list[list[float]]:
+    rng = random.Random(seed)
+    centroids = [[rng.gauss(0.0, 1.0) for _ in range(dim)] for _ in range(clusters)]
+    with conn.cursor() as cur:
+        cur.execute(f"DROP TABLE IF EXISTS {_TABLE}")
+        cur.execute(
+            f"""
+            CREATE TABLE {_TABLE} (
+              id bigserial PRIMARY KEY,
+              unit_type text NOT NULL,
+              embedding_model_id text NOT NULL,
+              embedding vector NOT NULL
+            )
+            """
+        )
+        started = time.perf_counter()
+        with cur.copy(f"COPY {_TABLE} (unit_type, embedding_model_id, embedding) FROM STDIN") as copy:
+            for i in range(rows):
+                copy.write_row((_UNIT_TYPE, _MODEL, _vec(_clustered(rng, centroids, 0.35))))
+                if i and i % 50000 == 0:
+                    print(f"  loaded {i} rows ({time.perf_counter() - started:.0f}s)", flush=True)
+        cur.execute(f"ANALYZE {_TABLE}")
+    conn.commit()
+    return centroids
+
+
+def _ann_sql(dim: int) -> str:
+    return f"""
+        SELECT id FROM (
+          SELECT id, (embedding <=> %s::vector) AS vec_distance
+          FROM {_TABLE}
+          WHERE embedding_model_id = %s AND unit_type = %s AND {ann_dimension_sql("embedding")}
+          ORDER BY {ann_order_sql("embedding", dim)}
+          LIMIT %s
+        ) ann
+        ORDER BY vec_distance
+        LIMIT %s
+    """
+
+
+def _timed(conn: psycopg.Connection, sql: str, params: tuple, *, ef: int | None = None) -> tuple[list[int], float]:
+    with conn.transaction():
+        with conn.cursor() as cur:
+            if ef is not None:
+                cur.execute("SELECT set_config('hnsw.ef_search', %s, true)", (str(ef),))
+                cur.execute("SELECT set_config('hnsw.iterative_scan', 'relaxed_order', true)")
+            else:
+                cur.execute("SET LOCAL enable_indexscan = off")
+            started = time.perf_counter()
+            cur.execute(sql, params)
+            ids = [r[0] for r in cur.fetchall()]
+            return ids, (time.perf_counter() - started) * 1000.0
+
+
+def _summary(latencies: list[float]) -> str:
+    ordered = sorted(latencies)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return f"p50={statistics.median(ordered):7.1f}ms p95={p95:7.1f}ms"
+
+
+def _benchmark(args: argparse.Namespace, dsn: str) -> int:
+    efs = [int(x) for x in args.ef.split(",") if x.strip()]
+    with psycopg.connect(dsn) as conn:
+        print(f"Loading {args.rows} x {args.dim}-d embeddings into {_TABLE} ...", flush=True)
+        centroids = _load(conn, rows=args.rows, dim=args.dim, clusters=args.clusters, seed=args.seed)
+        rng = random.Random(args.seed + 1)
+        queries = [_vec(_clustered(rng, centroids, 0.5)) for _ in range(args.queries)]
+
+        exact_sql = f"""
+            SELECT id FROM {_TABLE}
+            WHERE embedding_model_id = %s AND unit_type = %s
+            ORDER BY embedding <=> %s::vector
+            LIMIT %s
+        """
+        truth: list[set[int]] = []
+        exact_ms: list[float] = []
+        for q in queries:
+            ids, ms = _timed(conn, exact_sql, (_MODEL, _UNIT_TYPE, q, args.k))
+            truth.append(set(ids))
+            exact_ms.append(ms)
+        print(f"exact          recall=1.000 {_summary(exact_ms)}")
+
+        expression, opclass = _index_expression(args.dim) or (None, None)
+        if expression is None:
+            print(f"{args.dim} dimensions exceed every HNSW-indexable type; exact search only.")
+            return 0
+        started = time.perf_counter()
+        with conn.cursor() as cur:
+            cur.execute(
+                f"""
+                CREATE INDEX {_TABLE}_hnsw ON {_TABLE}
+                USING hnsw ({expression} {opclass}) WITH (m = {args.m}, ef_construction = {args.ef_construction})
+                WHERE embedding_model_id = '{_MODEL}' AND unit_type = '{_UNIT_TYPE}'
+                  AND vector_dims(embedding) = {args.dim}
+                """
+            )
+        conn.commit()
+        built_seconds = time.perf_counter() - started
+        print(f"built HNSW ({opclass}, m={args.m}, ef_construction={args.ef_construction}) in {built_seconds:.1f}s")
+
+        candidates = ann_candidate_limit(args.k, args.dim)
+        ann_sql = _ann_sql(args.dim)
+        for ef in efs:
+            recalls: list[float] = []
+            latencies: list[float] = []
+            for q, expected in zip(queries, truth, strict=True):
+                ids, ms = _timed(
+                    conn,
+                    ann_sql,
+                    (q, _MODEL, _UNIT_TYPE, args.dim, q, candidates, args.k),
+                    ef=max(ef, candidates),
+                )
+                recalls.append(len(expected & set(ids)) / max(1, len(expected)))
+                latencies.append(ms)
+            print(f"ef_search={ef:<5d} recall={statistics.mean(recalls):.3f} {_summary(latencies)}")
+
+        if not args.keep:
+            with conn.cursor() as cur:
+                cur.execute(f"DROP TABLE IF EXISTS {_TABLE}")
+            conn.commit()
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="HNSW recall/latency benchmark for unit_embeddings.")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=1024)
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=12, help="top-k (retrieval default limit is 12)")
+    parser.add_argument("--ef", default="40,100,200,400", help="comma-separated ef_search values")
+    parser.add_argument("--m", type=int, default=int(os.environ.get("TPA_VECTOR_HNSW_M", "16")))
+    parser.add_argument(
+        "--ef-construction", type=int, default=int(os.environ.get("TPA_VECTOR_HNSW_EF_CONSTRUCTION", "64"))
+    )
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--keep", action="store_true", help="keep the scratch table afterwards")
+    parser.add_argument("--ensure-indexes", action="store_true", help="create missing indexes on unit_embeddings")
+    args = parser.parse_args()
+
+    dsn = os.environ.get("TPA_DB_DSN")
+    if not dsn:
+        print("TPA_DB_DSN is not set.", file=sys.stderr)
+        return 2
+
+    if args.ensure_indexes:
+        from tpa_api.db import init_db_pool  # noqa: PLC0415
+        from tpa_api.vector_index import ensure_unit_embedding_indexes  # noqa: PLC0415
+
+        init_db_pool()
+        for status in ensure_unit_embedding_indexes():
+            print(status)
+        return 0
+
+    return _benchmark(args, dsn)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -11,7 +11,7 @@ def mock_minio():
 
 @pytest.fixture
 def mock_db():
-    with patch("tpa_api.providers.oss_blob._db_execute") as mock:
+    with patch("tpa_api.providers.oss_blob.record_tool_run") as mock:
         yield mock
 
 def test_oss_blob_put(mock_minio, mock_db):
@@ -53,3 +53,54 @@ def test_oss_blob_exists(mock_minio):
     
     mock_minio.stat_object.side_effect = Exception("Not found")
     assert provider.exists("nonexistent.pdf") is False
+
+
+def test_blob_range_reader_fetches_only_touched_blocks(tmp_path):
+    from tpa_api.blob_store import BlobRangeReader, read_blob_range
+
+    path = tmp_path / "georef.tif"
+    payload = bytes(range(256)) * 4096  # 1 MiB
+    path.write_bytes(payload)
+
+    assert read_blob_range(str(path), 1000, 10) == (payload[1000:1010], None)
+    assert read_blob_range(str(path), len(payload) - 4, 100) == (payload[-4:], None)
+
+    reader = BlobRangeReader(str(path), block_size=64 * 1024, max_blocks=4)
+    assert reader.read(16) == payload[:16]
+    reader.seek(700_000)
+    assert reader.read(70_000) == payload[700_000:770_000]
+    reader.seek(-8, 2)
+    assert reader.read() == payload[-8:]
+    assert reader.requests == 4
+    assert reader.bytes_fetched == 4 * 64 * 1024
+
+
+def test_projection_artifact_content_serves_byte_ranges(tmp_path):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from tpa_api.routes.visuals import router
+    from tpa_api.services import visuals
+
+    path = tmp_path / "cog.tif"
+    payload = b"II*\x00" + bytes(5000)
+    path.write_bytes(payload)
+    row = {"artifact_path": str(path), "metadata_jsonb": {"content_type": "image/tiff"}}
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+    url = "/projection-artifacts/00000000-0000-0000-0000-000000000001/content"
+
+    with patch.object(visuals, "_db_fetch_one", return_value=row):
+        full = client.get(url)
+        assert full.status_code == 200 and full.content == payload
+        assert full.headers["accept-ranges"] == "bytes"
+
+        part = client.get(url, headers={"Range": "bytes=2-9"})
+        assert part.status_code == 206
+        assert part.headers["content-range"] == f"bytes 2-9/{len(payload)}"
+        assert part.headers["content-type"] == "image/tiff"
+        assert part.content == payload[2:10]
+
+        assert client.get(url, headers={"Range": "bytes=-4"}).content == payload[-4:]
+        assert client.get(url, headers={"Range": f"bytes={len(payload)}-"}).status_code == 416
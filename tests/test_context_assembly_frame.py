@@ -0,0 +1,59 @@
+from tpa_api.context_assembly import ContextAssemblyDeps, _execute_frame_text_queries_sync
+
+
+def _fake_single(kind, calls):
+    def retrieve(*, query, limit, rerank_top_n, **_):
+        calls.append((kind, query))
+        return {"results": [{"evidence_ref": f"{kind}::{query}::{limit}"}], "tool_run_id": f"{kind}-{query}"}
+
+    return retrieve
+
+
+def _deps(calls, *, batched):
+    chunk = _fake_single("chunk", calls)
+    clause = _fake_single("clause", calls)
+
+    def batch(fn, kind):
+        def run(*, queries, **kwargs):
+            calls.append((f"{kind}_batch", tuple(queries)))
+            return [fn(query=q, **kwargs) for q in queries]
+
+        return run
+
+    return ContextAssemblyDeps(
+        db_fetch_one=None,
+        db_fetch_all=None,
+        db_execute=None,
+        llm_structured_sync=None,
+        retrieve_chunks_hybrid_sync=chunk,
+        retrieve_policy_clauses_hybrid_sync=clause,
+        utc_now_iso=None,
+        utc_now=None,
+        retrieve_chunks_hybrid_batch_sync=batch(chunk, "chunk") if batched else None,
+        retrieve_policy_clauses_hybrid_batch_sync=batch(clause, "clause") if batched else None,
+    )
+
+
+JOBS = [
+    {"index": i, "query": f"q{i}", "limit": 20 if i < 3 else 10, "rerank_top_n": 20 if i < 3 else 10,
+     "clause_limit": 10, "clause_rerank_top_n": 10}
+    for i in range(5)
+]
+
+
+def test_batched_and_serial_execution_return_identical_results(monkeypatch):
+    monkeypatch.setenv("TPA_FRAME_QUERY_BATCH_SIZE", "2")
+    batched_calls: list = []
+    serial_calls: list = []
+    batched = _execute_frame_text_queries_sync(
+        deps=_deps(batched_calls, batched=True), jobs=JOBS, authority_id="a", plan_cycle_id=None
+    )
+    serial = _execute_frame_text_queries_sync(
+        deps=_deps(serial_calls, batched=False), jobs=JOBS, authority_id="a", plan_cycle_id=None
+    )
+    assert batched == serial
+    assert batched[4][1]["results"][0]["evidence_ref"] == "chunk::q4::10"
+    # Queries with the same limits share batches (of at most 2).
+    batches = sorted(c[1] for c in batched_calls if c[0].endswith("_batch"))
+    assert ("q0", "q1") in batches and ("q3", "q4") in batches
+    assert all(len(b) <= 2 for b in batches)
@@ -0,0 +1,102 @@
+from tpa_api import context_pack
+from tpa_api.context_pack import (
+    ContextPackAssemblyDeps,
+    _cached_for_run,
+    _candidate_cap_omissions,
+    _gate_slice_availability,
+    _spatial_feature_candidates,
+    _precomputed_payload_tokens,
+)
+
+
+def _deps(fetch_one) -> ContextPackAssemblyDeps:
+    return ContextPackAssemblyDeps(
+        db_fetch_one=fetch_one, db_fetch_all=None, db_execute=None, llm_structured_sync=None, utc_now_iso=None, utc_now=None
+    )
+
+
+def test_gates_use_one_query():
+    calls: list = []
+
+    def fetch_one(sql, params):
+        calls.append(params)
+        return {
+            "visual_assets_present": True,
+            "spatial_layers_present": False,
+            "consultations_present": True,
+            "decisions_present": False,
+        }
+
+    status = _gate_slice_availability(
+        deps=_deps(fetch_one), authority_id="a", plan_cycle_id=None, plan_project_id=None, application_id=None
+    )
+    assert len(calls) == 1 and len(calls[0]) == 10
+    assert status == {
+        "visual_assets_present": True,
+        "spatial_layers_present": False,
+        "consultations_present": True,
+        "decisions_present": False,
+    }
+
+
+def test_gates_fall_back_to_per_gate_queries():
+    calls: list = []
+
+    def fetch_one(sql, params):
+        calls.append(sql)
+        if "EXISTS" in sql or "consultations" in sql:
+            raise RuntimeError("relation missing")
+        return {"?column?": 1}
+
+    status = _gate_slice_availability(
+        deps=_deps(fetch_one), authority_id="a", plan_cycle_id=None, plan_project_id=None, application_id=None
+    )
+    assert len(calls) == 5
+    assert status["visual_assets_present"] and not status["consultations_present"]
+
+
+def test_run_cache_loads_once_and_returns_copies(monkeypatch):
+    monkeypatch.setattr(context_pack, "_candidate_cache", type(context_pack._candidate_cache)())
+    loads: list = []
+
+    def load():
+        loads.append(1)
+        return [{"candidate_id": "x", "payload": {"n": 1}}]
+
+    first = _cached_for_run(("run-1", "policy_clauses", "a", None), load)
+    first[0]["payload"]["n"] = 99
+    second = _cached_for_run(("run-1", "policy_clauses", "a", None), load)
+    assert loads == [1]
+    assert second[0]["payload"]["n"] == 1
+    _cached_for_run(("run-2", "policy_clauses", "a", None), load)
+    assert len(loads) == 2
+
+
+def test_precomputed_tokens_skip_serialisation():
+    assert _precomputed_payload_tokens(None, "x") is None
+    assert _precomputed_payload_tokens(100, "abcd" * 10, None) == 100 + 10 + context_pack._PAYLOAD_OVERHEAD_TOKENS
+
+
+def test_capped_loader_reports_total_rows_and_cap_omissions(monkeypatch):
+    monkeypatch.setattr(context_pack, "_ensure_evidence_ref_row", lambda ref: None)
+    seen: list = []
+
+    def fetch_all(sql, params):
+        seen.append(params)
+        return [
+            {"spatial_feature_id": f"sf-{i}", "type": "flood_zone", "properties": {}, "candidate_total": 950}
+            for i in range(2)
+        ]
+
+    deps = ContextPackAssemblyDeps(
+        db_fetch_one=None, db_fetch_all=fetch_all, db_execute=None, llm_structured_sync=None, utc_now_iso=None, utc_now=None
+    )
+    monkeypatch.setenv("TPA_CONTEXT_PACK_MAX_CANDIDATES_PER_SLICE", "2")
+    candidates, total = _spatial_feature_candidates(deps=deps, authority_id="a")
+    assert seen[0][-1] == 2
+    assert (len(candidates), total) == (2, 950)
+
+    omissions = _candidate_cap_omissions({"spatial_features": (2, 950), "policy_clauses": (40, 40)})
+    assert omissions == [
+        {"slice_type": "spatial_features", "reason": "candidate_cap", "loaded": 2, "total": 950, "omitted_count": 948}
+    ]
@@ -0,0 +1,84 @@
+import threading
+import time
+
+import pytest
+
+from tpa_api.context_pack import ContextPackAssemblyDeps, _select_slices
+
+
+def _candidates(slice_type: str, n: int, tokens: int = 100) -> list[dict]:
+    return [
+        {"candidate_id": f"{slice_type}::{i}", "approx_tokens": tokens, "payload": {"i": i}} for i in range(n)
+    ]
+
+
+def _deps(*, delay: float = 0.05, state: dict | None = None) -> ContextPackAssemblyDeps:
+    state = state if state is not None else {}
+    lock = threading.Lock()
+
+    def llm(*, user_payload, **_):
+        with lock:
+            state["calls"] = state.get("calls", 0) + 1
+            state["in_flight"] = state.get("in_flight", 0) + 1
+            state["peak"] = max(state.get("peak", 0), state["in_flight"])
+        time.sleep(delay)
+        with lock:
+            state["in_flight"] -= 1
+        ids = [c["candidate_id"] for c in user_payload["candidates"]][::-1]
+        return {"selected_candidate_ids": ids, "deliberate_omissions": []}, f"tr-{user_payload['slice_type']}", []
+
+    return ContextPackAssemblyDeps(
+        db_fetch_one=None, db_fetch_all=None, db_execute=None, llm_structured_sync=llm, utc_now_iso=None, utc_now=None
+    )
+
+
+def test_slices_are_selected_concurrently(monkeypatch):
+    monkeypatch.setenv("TPA_CONTEXT_PACK_SELECTION_CONCURRENCY", "3")
+    state: dict = {}
+    candidates = {f"s{i}": _candidates(f"s{i}", 3) for i in range(6)}
+    results, fast_path = _select_slices(
+        deps=_deps(state=state),
+        move_type="m",
+        work_mode="w",
+        candidates=candidates,
+        slice_budgets={k: 250 for k in candidates},
+        framing=None,
+        issues=[],
+    )
+    assert state["calls"] == 6 and state["peak"] == 3
+    assert fast_path == []
+    # Budget of 250 admits two of the LLM's (reversed) picks.
+    assert results["s0"][0] == ["s0::2", "s0::1"]
+    assert results["s5"][3] == "tr-s5"
+
+
+def test_fast_path_skips_llm_when_slice_fits(monkeypatch):
+    monkeypatch.setenv("TPA_CONTEXT_PACK_FAST_PATH", "true")
+    state: dict = {}
+    candidates = {"small": _candidates("small", 2), "large": _candidates("large", 5)}
+    results, fast_path = _select_slices(
+        deps=_deps(state=state),
+        move_type="m",
+        work_mode="w",
+        candidates=candidates,
+        slice_budgets={"small": 500, "large": 300},
+        framing=None,
+        issues=[],
+    )
+    assert fast_path == ["small"]
+    assert results["small"] == (["small::0", "small::1"], [], [], None)
+    assert state["calls"] == 1
+
+
+def test_slow_slice_times_out(monkeypatch):
+    monkeypatch.setenv("TPA_CONTEXT_PACK_SLICE_TIMEOUT_SECONDS", "0.1")
+    with pytest.raises(RuntimeError, match="context_pack_selection_failed:slow:timeout_after_0.1s"):
+        _select_slices(
+            deps=_deps(delay=1.5),
+            move_type="m",
+            work_mode="w",
+            candidates={"slow": _candidates("slow", 2)},
+            slice_budgets={"slow": 1000},
+            framing=None,
+            issues=[],
+        )
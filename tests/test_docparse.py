@@ -3,8 +3,8 @@ from unittest.mock import MagicMock, patch
 from tpa_api.providers.docparse_http import HttpDocParseProvider
 
 @pytest.fixture
-def mock_httpx():
-    with patch("httpx.Client") as mock:
+def mock_post():
+    with patch("tpa_api.providers.docparse_http._model_post") as mock:
         yield mock
 
 @pytest.fixture
@@ -12,12 +12,10 @@ def mock_db():
     with patch("tpa_api.providers.docparse_http._db_execute") as mock:
         yield mock
 
-def test_docparse_success(mock_httpx, mock_db):
+def test_docparse_success(mock_post, mock_db):
     provider = HttpDocParseProvider()
     
     # Mock successful response
-    mock_client = MagicMock()
-    mock_httpx.return_value.__enter__.return_value = mock_client
     mock_resp = MagicMock()
     mock_resp.json.return_value = {
         "parse_bundle_path": "bundles/xyz.json",
@@ -25,7 +23,7 @@ def test_docparse_success(mock_httpx, mock_db):
         "parse_flags": [],
         "pages": [{"page_number": 1}]
     }
-    mock_client.post.return_value = mock_resp
+    mock_post.return_value = mock_resp
     
     result = provider.parse_document(
         blob_path="raw/123.pdf",
@@ -46,13 +44,11 @@ def test_docparse_success(mock_httpx, mock_db):
     outputs = params[3] 
     assert outputs['page_count'] == 1
 
-def test_docparse_failure(mock_httpx, mock_db):
+def test_docparse_failure(mock_post, mock_db):
     provider = HttpDocParseProvider()
     
     # Mock failure
-    mock_client = MagicMock()
-    mock_httpx.return_value.__enter__.return_value = mock_client
-    mock_client.post.side_effect = Exception("Connection failed")
+    mock_post.side_effect = Exception("Connection failed")
     
     with pytest.raises(RuntimeError, match="DocParse failed"):
         provider.parse_document(
@@ -0,0 +1,54 @@
+import asyncio
+import io
+
+import pytest
+from fastapi import HTTPException
+from pypdf import PdfWriter
+
+from tpa_docparse import main, parse_pool
+from tpa_docparse.parse_pool import ParseQueue
+
+
+def _blank_pdf(pages: int) -> bytes:
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=200, height=200)
+    buf = io.BytesIO()
+    writer.write(buf)
+    return buf.getvalue()
+
+
+def test_cpu_parse_runs_in_a_worker_process(monkeypatch):
+    monkeypatch.setenv("TPA_DOCPARSE_PARSE_WORKERS", "1")
+    try:
+        parsed = asyncio.run(parse_pool.run_cpu(main._parse_pdf_cpu, _blank_pdf(3), "doc.pdf"))
+    finally:
+        parse_pool.shutdown_pool()
+    assert [p["page_number"] for p in parsed["fallback_pages"]] == [1, 2, 3]
+    assert parsed["visuals"] == []
+
+
+def test_parse_queue_limits_concurrency_and_rejects_overflow():
+    async def scenario():
+        queue = ParseQueue(limit=1, max_waiting=1)
+        release = asyncio.Event()
+
+        async def hold():
+            async with queue:
+                await release.wait()
+
+        first = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        second = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        assert queue.stats()["in_flight"] == 1 and queue.stats()["queue_depth"] == 1
+        with pytest.raises(HTTPException) as exc:
+            async with queue:
+                pass
+        assert exc.value.status_code == 503
+        release.set()
+        await asyncio.gather(first, second)
+        return queue.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["completed"] == 2 and stats["rejected"] == 1 and stats["queue_depth"] == 0
@@ -0,0 +1,108 @@
+import io
+import os
+from unittest.mock import patch
+
+import pytest
+from PIL import Image
+
+from tpa_docparse.page_render import PageRenderError, plan_render_batches, render_pages
+
+
+def _plan(pages, dpi=300):
+    return [
+        {"page_number": p, "dpi": dpi, "tier": "full", "reason": "full_res_only", "blob_path": f"renders/p{p:04d}.png"}
+        for p in pages
+    ]
+
+
+def _fake_convert(pdf_path, *, dpi, first_page, last_page, fmt, output_folder, paths_only):
+    assert os.path.exists(pdf_path)
+    paths = []
+    for page in range(first_page, last_page + 1):
+        path = os.path.join(output_folder, f"out-{page:03d}.png")
+        Image.new("RGB", (dpi // 10, dpi // 5)).save(path, format="PNG")
+        paths.append(path)
+    return paths
+
+
+def test_plan_render_batches_splits_on_gaps_dpi_and_size():
+    plan = _plan([1, 2, 3, 4, 5, 7, 8]) + _plan([9, 10], dpi=150)
+    batches = plan_render_batches(plan, batch_pages=3)
+    ranges = [(b[0]["page_number"], b[-1]["page_number"], b[0]["dpi"]) for b in batches]
+    assert ranges == [(1, 3, 300), (4, 5, 300), (7, 8, 300), (9, 10, 150)]
+
+
+def test_render_pages_uploads_every_page_once():
+    uploaded = {}
+
+    def upload(blob_path, data):
+        uploaded[blob_path] = data
+
+    with patch("tpa_docparse.page_render.convert_from_path", side_effect=_fake_convert) as convert:
+        results = list(render_pages(pdf_bytes=b"%PDF", plan=_plan(range(1, 11)), upload=upload, workers=3, batch_pages=4))
+
+    assert convert.call_count == 3
+    assert sorted(r["page_number"] for r, _ in results) == list(range(1, 11))
+    assert set(uploaded) == {f"renders/p{p:04d}.png" for p in range(1, 11)}
+    rendered, run = results[0]
+    assert rendered["render_width"] == 30 and rendered["render_height"] == 60
+    assert run["status"] == "success"
+    assert run["duration_seconds"] >= 0
+    with Image.open(io.BytesIO(uploaded[rendered["render_blob_path"]])) as img:
+        assert img.format == "PNG"
+
+
+def test_render_pages_raises_with_error_run():
+    def broken(*args, **kwargs):
+        raise RuntimeError("poppler exploded")
+
+    with patch("tpa_docparse.page_render.convert_from_path", side_effect=broken):
+        with pytest.raises(PageRenderError) as excinfo:
+            list(render_pages(pdf_bytes=b"%PDF", plan=_plan([1, 2]), upload=lambda *_: None, workers=1))
+
+    assert excinfo.value.page_number == 1
+    assert excinfo.value.render_run["status"] == "error"
+
+
+def test_select_render_tier_policy():
+    from tpa_docparse.main import _select_render_tier
+
+    dense = "Policy H1 requires affordable housing. " * 80
+    common = {"docling_used": True, "docling_errors": []}
+    assert _select_render_tier(page_text=dense, visual_count=2, **common) == ("full", "visuals_present")
+    assert _select_render_tier(page_text="Figure 3", visual_count=0, **common) == ("full", "low_text_density")
+    # An ordinary full page of body text stays readable; only small-print pages drop to a thumbnail.
+    assert _select_render_tier(page_text=dense, visual_count=0, **common) == ("standard", "text_page")
+    assert _select_render_tier(page_text=dense * 2, visual_count=0, **common) == ("thumbnail", "text_dense_structured")
+    assert _select_render_tier(page_text=dense[:600], visual_count=0, **common) == ("standard", "text_page")
+    assert _select_render_tier(
+        page_text=dense, visual_count=0, docling_used=False, docling_errors=[]
+    ) == ("standard", "text_page_fallback_parse")
+
+
+def test_select_render_tier_can_be_disabled(monkeypatch):
+    from tpa_docparse.main import _select_render_tier
+
+    monkeypatch.setenv("TPA_DOCPARSE_RENDER_TIERING", "full_only")
+    assert _select_render_tier(
+        page_text="x " * 2000, visual_count=0, docling_used=True, docling_errors=[]
+    ) == ("full", "full_res_only")
+
+
+def test_load_page_image_reports_failed_upgrade_and_uses_stored_render(monkeypatch):
+    from tpa_api.ingestion import docparse_ops
+
+    def failing_upgrade(**kwargs):
+        raise RuntimeError("docparse down")
+
+    monkeypatch.setattr(docparse_ops, "_ensure_page_render_tier", failing_upgrade)
+    monkeypatch.setattr(
+        docparse_ops, "_db_fetch_one", lambda sql, params=None: {"render_blob_path": "docparse/p0003-standard.png"}
+    )
+    monkeypatch.setattr(docparse_ops, "read_blob_bytes", lambda path: (b"png:" + path.encode(), "image/png", None))
+
+    data, content_type, errors = docparse_ops._load_page_image(document_id="doc-1", page_number=3)
+
+    assert data == b"png:docparse/p0003-standard.png"
+    assert content_type == "image/png"
+    assert errors == ["page_render_upgrade_failed:doc-1:p3:docparse down"]
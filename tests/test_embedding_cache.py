@@ -0,0 +1,56 @@
+from unittest.mock import patch
+
+import pytest
+
+from tpa_api import embedding_cache
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache(monkeypatch):
+    monkeypatch.delenv("TPA_REDIS_URL", raising=False)
+    monkeypatch.setattr(embedding_cache, "_local", embedding_cache.OrderedDict())
+    monkeypatch.setattr(embedding_cache, "_stats", {})
+
+
+def _fake_embed(*, texts, model_id=None):
+    return [[float(len(t)), 1.0] for t in texts]
+
+
+def test_key_normalises_whitespace_and_separates_models():
+    a = embedding_cache.embedding_cache_key("m1", "Policy  H1\n requires homes ")
+    b = embedding_cache.embedding_cache_key("m1", "Policy H1 requires homes")
+    c = embedding_cache.embedding_cache_key("m2", "Policy H1 requires homes")
+    assert a == b
+    assert a != c
+
+
+def test_only_misses_are_embedded_and_duplicates_collapse():
+    with patch.object(embedding_cache, "_embed_texts_sync", side_effect=_fake_embed) as embed:
+        counters: dict = {}
+        first = embedding_cache._embed_texts_cached_sync(
+            texts=["alpha", "beta", "alpha "], model_id="m", scope="chunk", counters=counters
+        )
+        second = embedding_cache._embed_texts_cached_sync(texts=["beta", "gamma"], model_id="m", scope="chunk")
+
+    assert first == [[5.0, 1.0], [4.0, 1.0], [5.0, 1.0]]
+    assert second == [[4.0, 1.0], [5.0, 1.0]]
+    assert [c.kwargs["texts"] for c in embed.call_args_list] == [["alpha", "beta"], ["gamma"]]
+    assert counters == {"cache_hits": 1, "cache_misses": 2}
+    stats = embedding_cache.embedding_cache_stats()
+    assert stats["scopes"]["chunk"]["hits"] == 2
+    assert stats["scopes"]["chunk"]["misses"] == 3
+    assert stats["hit_rate"] == 0.4
+
+
+def test_count_mismatch_is_not_cached():
+    with patch.object(embedding_cache, "_embed_texts_sync", return_value=[[1.0]]):
+        assert embedding_cache._embed_texts_cached_sync(texts=["a", "b"], model_id="m") is None
+    assert embedding_cache.embedding_cache_stats()["local_entries"] == 0
+
+
+def test_multimodal_key_includes_image():
+    with patch.object(embedding_cache, "_embed_multimodal_sync", return_value=[0.5]) as embed:
+        embedding_cache._embed_multimodal_cached_sync(image_bytes=b"a", text="plan", model_id="mm")
+        embedding_cache._embed_multimodal_cached_sync(image_bytes=b"a", text="plan", model_id="mm")
+        embedding_cache._embed_multimodal_cached_sync(image_bytes=b"b", text="plan", model_id="mm")
+    assert embed.call_count == 2
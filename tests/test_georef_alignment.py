@@ -0,0 +1,56 @@
+import numpy as np
+
+from tpa_georef_agent.alignment import edge_distance_map, score_points, stack_line_points
+
+
+def test_edge_distance_map_matches_brute_force_city_block():
+    rng = np.random.default_rng(7)
+    mask = rng.random((23, 31)) > 0.97
+    edges = np.argwhere(mask)
+    rows, cols = np.indices(mask.shape)
+    brute = np.min(np.abs(rows[..., None] - edges[:, 0]) + np.abs(cols[..., None] - edges[:, 1]), axis=-1)
+    assert np.array_equal(edge_distance_map(mask), brute)
+    assert (edge_distance_map(np.zeros((4, 5), dtype=bool)) == 9).all()
+
+
+def _legacy_score(lines, mask, project):
+    hits = total = 0
+    for line in lines:
+        for idx, (x, y) in enumerate(line):
+            if idx % 5:
+                continue
+            col, row = project(np.array([x]), np.array([y]))
+            col_i, row_i = int(round(col[0])), int(round(row[0]))
+            if 0 <= col_i < mask.shape[1] and 0 <= row_i < mask.shape[0]:
+                total += 1
+                hits += bool(mask[row_i, col_i])
+    return hits / total, total
+
+
+def test_full_sampling_matches_per_point_scoring_and_early_exit_estimates_it():
+    rng = np.random.default_rng(3)
+    mask = np.zeros((400, 600), dtype=bool)
+    mask[::10, :] = True
+    lines = [[(float(x), float(y)) for x, y in rng.uniform(-20, 620, size=(int(n), 2))] for n in rng.integers(2, 60, 400)]
+
+    def project(xs, ys):
+        return xs * 1.0, ys * (400 / 640.0)
+
+    expected, total = _legacy_score(lines, mask, project)
+    points = stack_line_points(lines, stride=5)
+    score, meta = score_points(points, project=project, edge_mask=mask, mode="full")
+    assert score == expected and meta["samples"] == total and not meta["stopped_early"]
+    assert "mean_edge_distance_px" not in meta
+
+    dist = edge_distance_map(mask)
+    exact, meta = score_points(points, project=project, edge_mask=mask, distance_map=dist, mode="full")
+    assert exact == expected and meta["mean_edge_distance_px"] > 0
+
+    near, _ = score_points(points, project=project, edge_mask=mask, mode="full", tolerance_px=5)
+    assert near == 1.0
+
+    estimate, meta = score_points(
+        points, project=project, edge_mask=mask, mode="early_exit", chunk_size=256, min_samples=400, margin=0.05
+    )
+    assert meta["stopped_early"] and meta["points_visited"] < len(points)
+    assert abs(estimate - expected) < 0.06
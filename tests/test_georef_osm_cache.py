@@ -0,0 +1,117 @@
+import json
+import threading
+
+from tpa_georef_agent import osm_cache
+
+# Two roads in Cambridge: one inside a single z14 tile, one crossing into the neighbouring tile.
+_WAYS = [
+    (101, [(0.1180, 52.2050), (0.1200, 52.2060)]),
+    (102, [(0.1300, 52.2050), (0.1450, 52.2055)]),
+]
+_BBOX = {"south": 52.2040, "west": 0.1170, "north": 52.2070, "east": 0.1460}
+
+
+def _fetcher(calls, result=(_WAYS, None)):
+    def fetch(*, south, west, north, east):
+        calls.append((south, west, north, east))
+        return result
+
+    return fetch
+
+
+def test_tiles_are_fetched_once_then_served_from_disk(tmp_path, monkeypatch):
+    monkeypatch.setenv("TPA_OSM_CACHE_DIR", str(tmp_path))
+    calls = []
+
+    lines, err = osm_cache.cached_highways(**_BBOX, fetch=_fetcher(calls))
+    assert err is None
+    assert sorted(lines) == sorted(coords for _, coords in _WAYS)
+    assert len(calls) == 1
+
+    before = osm_cache.cache_stats()
+    again, err = osm_cache.cached_highways(**_BBOX, fetch=_fetcher(calls))
+    after = osm_cache.cache_stats()
+    assert err is None and len(calls) == 1
+    # Way 102 is stored in both tiles it touches but returned once; 1e-7 degree precision round-trips.
+    assert sorted(again) == sorted(lines)
+    tiles = len(osm_cache.tiles_for_bbox(**_BBOX, zoom=14))
+    assert after["tile_hits"] - before["tile_hits"] == tiles
+    assert after["tile_misses"] == before["tile_misses"]
+
+
+def test_expired_tiles_are_served_when_overpass_fails(tmp_path, monkeypatch):
+    monkeypatch.setenv("TPA_OSM_CACHE_DIR", str(tmp_path))
+    osm_cache.cached_highways(**_BBOX, fetch=_fetcher([]))
+    monkeypatch.setenv("TPA_OSM_CACHE_TTL_SECONDS", "1")
+    monkeypatch.setattr(osm_cache.time, "time", lambda: 4102444800.0)
+
+    calls = []
+    lines, err = osm_cache.cached_highways(**_BBOX, fetch=_fetcher(calls, ([], "osm_query_failed:timeout")))
+    assert len(calls) == 1
+    assert err is None
+    assert len(lines) == 2
+
+    # Nothing cached for this area and the source is down: the error surfaces.
+    lines, err = osm_cache.cached_highways(
+        south=51.50, west=-0.13, north=51.51, east=-0.12, fetch=_fetcher([], ([], "osm_query_failed:timeout"))
+    )
+    assert (lines, err) == ([], "osm_query_failed:timeout")
+
+
+def test_slow_fetch_does_not_block_other_areas(tmp_path, monkeypatch):
+    monkeypatch.setenv("TPA_OSM_CACHE_DIR", str(tmp_path))
+    slow_started = threading.Event()
+    other_done = threading.Event()
+    waited = []
+
+    def slow_fetch(*, south, west, north, east):
+        # Holds its refresh open until the London lookup finishes; under one process-wide lock that
+        # lookup would queue behind this fetch and the wait would time out.
+        slow_started.set()
+        waited.append(other_done.wait(timeout=5))
+        return _WAYS, None
+
+    results = []
+    slow = threading.Thread(target=lambda: results.append(osm_cache.cached_highways(**_BBOX, fetch=slow_fetch)))
+    slow.start()
+    assert slow_started.wait(timeout=5)
+    lines, err = osm_cache.cached_highways(
+        south=51.50, west=-0.13, north=51.51, east=-0.12, fetch=_fetcher([], ([], None))
+    )
+    other_done.set()
+    slow.join()
+    assert (lines, err) == ([], None)
+    assert waited == [True]
+    assert results[0][1] is None and len(results[0][0]) == 2
+    assert osm_cache._fetch_locks == {}
+
+
+def test_offline_preload_from_geojsonseq(tmp_path, monkeypatch):
+    extract = tmp_path / "highways.geojsonl"
+    extract.write_text(
+        "\n".join(
+            json.dumps(
+                {
+                    "type": "Feature",
+                    "properties": {"osm_id": str(way_id), "highway": "residential"},
+                    "geometry": {"type": "LineString", "coordinates": [list(c) for c in coords]},
+                }
+            )
+            for way_id, coords in _WAYS
+        ),
+        encoding="utf-8",
+    )
+    root = tmp_path / "tiles"
+    summary = osm_cache.preload(extract, root=root, zoom=14)
+    assert summary["ways"] == 2 and summary["tiles"] >= 2
+
+    monkeypatch.setenv("TPA_OSM_CACHE_DIR", str(root))
+    monkeypatch.setenv("TPA_OSM_CACHE_OFFLINE", "true")
+    calls = []
+    lines, err = osm_cache.cached_highways(**_BBOX, fetch=_fetcher(calls))
+    assert err is None and calls == []
+    assert len(lines) == 2
+
+    lines, err = osm_cache.cached_highways(south=51.50, west=-0.13, north=51.51, east=-0.12, fetch=_fetcher(calls))
+    assert lines == [] and err.startswith("osm_offline_cache_miss:")
+    assert calls == []
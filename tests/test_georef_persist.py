@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+georef = pytest.importorskip("tpa_api.ingestion.georef")
+
+
+def test_persist_stores_transform_control_points_and_cog_artifact(monkeypatch):
+    executed: list[tuple[str, tuple]] = []
+    monkeypatch.setattr(georef, "_db_execute", lambda sql, params=None: executed.append((sql, params)))
+    monkeypatch.setattr(georef, "_db_fetch_one", lambda sql, params=None: {"id": "world-frame"})
+
+    payload = {
+        "ok": True,
+        "status": "success",
+        "transform": {
+            "method": "affine",
+            "matrix": [[1.0, 0.0, 500000.0], [0.0, -1.0, 180000.0]],
+            "matrix_shape": [2, 3],
+        },
+        "control_points": [
+            {"src": {"x": 0.0, "y": 0.0}, "dst": {"x": 500000.0, "y": 180000.0}},
+            {"src": {"x": 10.0, "y": 10.0}, "dst": {"x": 500010.0, "y": 179990.0}, "residual": 0.4},
+        ],
+        "projection_artifacts": [
+            {
+                "artifact_type": "geotiff",
+                "artifact_path": "georef/va-1/abc.tif",
+                "metadata": {"source": "apply-gcps", "overviews": [2, 4]},
+            }
+        ],
+    }
+    transform_id, transform_count, projection_count, errors = georef._persist_georef_outputs(
+        run_id=None,
+        tool_run_id="tool-run",
+        image_frame_id="image-frame",
+        target_epsg=27700,
+        payload=payload,
+    )
+
+    assert (transform_count, projection_count, errors) == (1, 1, [])
+    tables = [sql.split("INSERT INTO", 1)[1].split()[0] for sql, _ in executed]
+    assert tables == ["transforms", "control_points", "control_points", "projection_artifacts"]
+    transform_params = executed[0][1]
+    assert transform_params[1:3] == ("image-frame", "world-frame")
+    assert len(json.loads(transform_params[7])) == 2
+    artifact_params = executed[-1][1]
+    assert artifact_params[1:4] == (transform_id, "geotiff", "georef/va-1/abc.tif")
+    assert json.loads(artifact_params[6])["content_type"] == "image/tiff"
+
+
+def test_tool_run_goes_through_the_recorder_and_failures_do_not_raise(monkeypatch):
+    recorded: list = []
+    monkeypatch.setattr(georef, "record_tool_run", lambda **kwargs: recorded.append(kwargs) or "tr-1")
+    args = dict(
+        ingest_batch_id="batch",
+        run_id=None,
+        visual_asset_id="va-1",
+        base_url="http://georef",
+        started_at=None,
+        outputs={},
+        status="success",
+        uncertainty_note="",
+    )
+    assert georef._log_georef_tool_run(**args) == "tr-1"
+    assert recorded[0]["tool_name"] == "georef_auto" and recorded[0]["confidence_hint"] == "medium"
+
+    def unavailable(**kwargs):
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(georef, "record_tool_run", unavailable)
+    assert georef._log_georef_tool_run(**{**args, "status": "error"}) is None
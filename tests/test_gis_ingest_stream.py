@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from tpa_api.ingestion import gis_ingest
+
+
+def _feature_collection(n):
+    return {
+        "type": "FeatureCollection",
+        "name": "article_4",
+        "crs": {"type": "name", "properties": {"name": "urn:ogc:def:crs:OGC:1.3:CRS84"}},
+        "features": [
+            {
+                "type": "Feature",
+                "properties": {"ref": f"A4/{i}", "area_ha": 1.25 * i, "note": "quoted \"}]\" text"},
+                "geometry": {"type": "Polygon", "coordinates": [[[0.1 * i, 51.0], [0.1 * i + 0.01, 51.0], [0.1 * i, 51.01], [0.1 * i, 51.0]]]},
+            }
+            for i in range(n)
+        ],
+        "bbox": [0, 51.0, 1.0, 51.01],
+    }
+
+
+def test_iter_geojson_features_matches_json_loads_across_chunk_boundaries(tmp_path):
+    path = tmp_path / "article_4.geojson"
+    data = _feature_collection(40)
+    path.write_text(json.dumps(data, indent=1), encoding="utf-8")
+
+    for read_chars in (1, 7, 64, 1 << 20):
+        assert list(gis_ingest._iter_geojson_features(path, read_chars=read_chars)) == data["features"]
+
+
+
+def test_malformed_feature_fails_at_the_buffer_cap(tmp_path):
+    path = tmp_path / "broken.geojson"
+    good = json.dumps(_feature_collection(2)["features"][0])
+    # An unterminated string swallows the rest of the file unless the buffer is capped.
+    path.write_text('{"type": "FeatureCollection", "features": [' + good + ', {"type": "Feature", "properties": {"ref": "A4/' + "x" * 5000 + ', ' + good * 50 + "]}", encoding="utf-8")
+
+    features = gis_ingest._iter_geojson_features(path, read_chars=64, max_value_chars=1024)
+    assert next(features)["properties"]["ref"] == "A4/0"
+    with pytest.raises(ValueError, match="still incomplete after 1024 characters"):
+        next(features)
+
+def test_ingest_streams_features_in_copy_batches(tmp_path, monkeypatch):
+    root = tmp_path / "bench" / "gis_data"
+    root.mkdir(parents=True)
+    (root / "Article 4.geojson").write_text(json.dumps(_feature_collection(5)), encoding="utf-8")
+    monkeypatch.setenv("TPA_AUTHORITY_PACKS_ROOT", str(tmp_path))
+    monkeypatch.setenv("TPA_GIS_COPY_BATCH_FEATURES", "2")
+    monkeypatch.setenv("TPA_GIS_SIMPLIFY_TOLERANCE", "0.0001")
+
+    batches = []
+
+    def fake_copy(rows, *, target, tolerance):
+        batches.append((len(rows), target["type"], tolerance))
+        props = [json.loads(r[2]) for r in rows]
+        xs = [p["feature_index"] * 0.1 for p in props]
+        return len(rows), {"xmin": min(xs), "ymin": 51.0, "xmax": max(xs) + 0.01, "ymax": 51.01}
+
+    profiles = []
+    monkeypatch.setattr(gis_ingest, "_db_fetch_one", lambda sql, params=None: None)
+    monkeypatch.setattr(gis_ingest, "_db_execute", lambda sql, params=None: profiles.append(params))
+    monkeypatch.setattr(gis_ingest, "_copy_feature_batch", fake_copy)
+
+    result = gis_ingest.ingest_authority_gis_layers(authority_id="bench")
+
+    assert result["inserted_features"] == 5
+    assert result["errors"] == []
+    assert batches == [(2, "article_4", 0.0001), (2, "article_4", 0.0001), (1, "article_4", 0.0001)]
+    profile_geometry = json.loads(profiles[0][7])
+    profile_props = json.loads(profiles[0][8])
+    assert profile_props["feature_count"] == 5
+    assert profile_geometry["coordinates"][0][0] == [0.0, 51.0]
+    assert profile_geometry["coordinates"][0][2] == pytest.approx([0.41, 51.01])
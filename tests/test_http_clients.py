@@ -0,0 +1,156 @@
+import httpx
+import pytest
+
+from tpa_api import http_clients
+
+
+@pytest.fixture(autouse=True)
+def _reset_clients():
+    http_clients.close_model_http_clients()
+    yield
+    http_clients.close_model_http_clients()
+
+
+_RealClient = httpx.Client
+
+
+def _mock_client(handler, **_):
+    return _RealClient(transport=httpx.MockTransport(handler))
+
+
+def test_clients_are_shared_per_role():
+    assert http_clients.model_http_client("embeddings") is http_clients.model_http_client("embeddings")
+    assert http_clients.model_http_client("embeddings") is not http_clients.model_http_client("reranker")
+
+
+def test_role_timeouts_are_bounded(monkeypatch):
+    monkeypatch.setenv("TPA_MODEL_HTTP_READ_TIMEOUT_RERANKER", "7")
+    timeout = http_clients._role_timeout("reranker")
+    assert timeout.read == 7.0
+    assert timeout.connect == 10.0
+    assert http_clients._role_timeout("embeddings").read == 180.0
+
+
+def test_requests_record_pool_metrics(monkeypatch):
+    def handler(request):
+        if request.url.path == "/boom":
+            raise httpx.ReadTimeout("slow", request=request)
+        return httpx.Response(200, json={"ok": True})
+
+    monkeypatch.setattr(http_clients.httpx, "Client", lambda **kw: _mock_client(handler, **kw))
+    assert http_clients._model_post("llm", "http://llm/v1/chat/completions", json={}).json() == {"ok": True}
+    with pytest.raises(httpx.ReadTimeout):
+        http_clients._model_post("llm", "http://llm/boom", json={})
+
+    stats = http_clients.model_http_stats()["roles"]["llm"]
+    assert stats["requests"] == 2
+    assert stats["timeouts"] == 1 and stats["errors"] == 1
+    assert stats["in_flight"] == 0 and stats["peak_in_flight"] == 1
+
+
+def test_embedding_dialect_is_probed_once_and_invalidated(monkeypatch):
+    from tpa_api import model_clients
+
+    monkeypatch.setenv("TPA_EMBEDDINGS_BASE_URL", "http://emb")
+    monkeypatch.delenv("TPA_MODEL_SUPERVISOR_URL", raising=False)
+    monkeypatch.setattr(model_clients, "_endpoint_dialects", {})
+    calls = []
+    state = {"route": "/embed"}
+
+    def fake_post(role, url, **kwargs):
+        calls.append(url)
+        if url.endswith(state["route"]):
+            texts = kwargs["json"].get("inputs") or kwargs["json"].get("input")
+            return httpx.Response(200, json=[[1.0] for _ in texts])
+        return httpx.Response(404, text="nope")
+
+    monkeypatch.setattr(model_clients, "_model_post", fake_post)
+    assert model_clients._embed_texts_sync(texts=["a"]) == [[1.0]]
+    assert model_clients._embed_texts_sync(texts=["b"]) == [[1.0]]
+    assert calls == ["http://emb/v1/embeddings", "http://emb/embeddings", "http://emb/embed", "http://emb/embed"]
+
+    state["route"] = "/v1/embeddings"
+    calls.clear()
+    assert model_clients._embed_texts_sync(texts=["c"]) == [[1.0]]
+    assert calls == ["http://emb/embed", "http://emb/v1/embeddings"]
+    (entry,) = model_clients.model_endpoint_dialects()
+    assert entry["url"] == "http://emb/v1/embeddings"
+    assert entry["invalidations"] == 1
+
+
+def test_supervisor_ensure_is_leased_until_invalidated(monkeypatch):
+    from tpa_api import cache, model_clients, model_leases
+
+    monkeypatch.setenv("TPA_MODEL_SUPERVISOR_URL", "http://supervisor:8091")
+    monkeypatch.delenv("TPA_REDIS_URL", raising=False)
+    monkeypatch.setattr(cache, "_memory_cache", {})
+    ensures = []
+
+    def fake_post(role, url, **kwargs):
+        ensures.append(kwargs["json"]["role"])
+        return httpx.Response(
+            200,
+            json={"base_url": "http://tpa-embeddings:8080", "lease_seconds": 30},
+            request=httpx.Request("POST", url),
+        )
+
+    monkeypatch.setattr(model_clients, "_model_post", fake_post)
+    for _ in range(3):
+        assert model_clients._ensure_model_role_sync(role="embeddings") == "http://tpa-embeddings:8080"
+    assert ensures == ["embeddings"]
+
+    model_leases.invalidate_model_leases(["embeddings"])
+    model_clients._ensure_model_role_sync(role="embeddings")
+    assert ensures == ["embeddings", "embeddings"]
+
+
+def test_connect_error_drops_lease(monkeypatch):
+    from tpa_api import cache, model_leases
+
+    monkeypatch.delenv("TPA_REDIS_URL", raising=False)
+    monkeypatch.setattr(cache, "_memory_cache", {})
+    model_leases.grant_model_lease("llm", "http://tpa-llm:8000/v1", lease_seconds=30)
+
+    def handler(request):
+        raise httpx.ConnectError("refused", request=request)
+
+    monkeypatch.setattr(http_clients.httpx, "Client", lambda **kw: _mock_client(handler, **kw))
+    with pytest.raises(httpx.ConnectError):
+        http_clients._model_post("llm", "http://tpa-llm:8000/v1/chat/completions", json={})
+    assert model_leases.get_model_lease("llm") is None
+
+
+def test_scheduled_lease_is_renewed_during_call_and_released(monkeypatch):
+    import time
+
+    from tpa_api import cache, model_clients, model_leases
+
+    monkeypatch.setenv("TPA_MODEL_SUPERVISOR_URL", "http://supervisor:8091")
+    monkeypatch.delenv("TPA_REDIS_URL", raising=False)
+    monkeypatch.setattr(cache, "_memory_cache", {})
+    calls = []
+
+    def fake_post(role, url, **kwargs):
+        path = url.rsplit("/", 1)[-1]
+        calls.append(path)
+        if path == "ensure":
+            body = {"base_url": "http://tpa-llm:8000", "lease_seconds": 1, "lease_id": "lease-1"}
+        elif path == "completions":
+            # Outlasts the 1s lease: the renewal thread must keep it alive.
+            time.sleep(1.2)
+            body = {"choices": [{"message": {"content": "ok"}}]}
+        else:
+            body = {"lease_id": kwargs["json"]["lease_id"], "renewed": True, "released": True}
+        return httpx.Response(200, json=body, request=httpx.Request("POST", url))
+
+    monkeypatch.setattr(model_clients, "_model_post", fake_post)
+    assert model_clients._generate_completion_sync(prompt="hi") == "ok"
+
+    deadline = time.time() + 2
+    while "release" not in calls and time.time() < deadline:
+        time.sleep(0.05)
+    assert calls[:2] == ["ensure", "completions"]
+    assert "renew" in calls
+    assert calls[-1] == "release"
+    # Scheduled grants are per request and never shared through the client lease cache.
+    assert model_leases.get_model_lease("llm") is None
@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("langgraph")
+
+from tpa_api.ingestion import run_graph  # noqa: E402
+
+
+class _FakeGraph:
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.peak = 0
+
+    async def ainvoke(self, state, config):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.05)
+            if state["filename"] == "bad.pdf":
+                raise RuntimeError("docparse exploded")
+            return {**state}
+        finally:
+            self.in_flight -= 1
+
+
+def test_documents_run_concurrently_with_isolated_failures(monkeypatch):
+    graph = _FakeGraph()
+    progress: list[dict] = []
+    docs = [
+        {"id": f"doc-{i}", "raw_blob_path": f"raw/{name}", "metadata": {}}
+        for i, name in enumerate(["a.pdf", "bad.pdf", "c.pdf", "d.pdf", "e.pdf"])
+    ]
+    monkeypatch.setenv("TPA_INGEST_DOC_CONCURRENCY", "3")
+    monkeypatch.delenv("TPA_INGEST_QUEUE_MODE", raising=False)
+    monkeypatch.setattr(run_graph, "init_db_pool", lambda: None)
+    monkeypatch.setattr(run_graph, "_db_fetch_one", lambda *a, **k: {"ingest_batch_id": "b1", "authority_id": "a1"})
+    monkeypatch.setattr(run_graph, "_db_fetch_all", lambda *a, **k: docs)
+    monkeypatch.setattr(run_graph, "create_ingest_run", lambda **kwargs: "run-1")
+    monkeypatch.setattr(run_graph, "read_blob_bytes", lambda path: (b"%PDF", "application/pdf", None))
+    monkeypatch.setattr(run_graph, "build_ingestion_graph", lambda *a, **k: graph)
+    monkeypatch.setattr(run_graph, "_update_run_step_progress", lambda **kwargs: progress.append(kwargs))
+
+    result = asyncio.run(run_graph.run_graph_for_job("job-1"))
+
+    assert graph.peak == 3
+    assert result["documents_processed"] == 4
+    assert result["status"] == "error"
+    assert len(result["failures"]) == 1 and "docparse exploded" in result["failures"][0]
+    assert progress[-1]["outputs"]["processed"] == 4
+    assert progress[-1]["outputs"]["failed"] == 1
+    assert progress[-1]["status"] == "error"
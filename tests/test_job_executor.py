@@ -0,0 +1,70 @@
+import threading
+import time
+
+from tpa_api.job_executor import CoalescingJobExecutor, JobCancelled
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_requests_for_a_queued_key_coalesce_and_priority_orders_the_queue():
+    gate = threading.Event()
+    ran: list[str] = []
+
+    def run(key, should_cancel):
+        if key == "blocker":
+            gate.wait(5)
+        ran.append(key)
+
+    executor = CoalescingJobExecutor("test", run, max_workers=1)
+    executor.submit("blocker")
+    _wait_for(lambda: executor.stats()["running"] == 1)
+    assert executor.submit("tab-a", priority=2) == "queued"
+    assert executor.submit("tab-b", priority=1) == "queued"
+    assert executor.submit("tab-a", priority=0) == "coalesced"
+    assert executor.stats()["queue_by_priority"] == {"0": 1, "1": 1}
+    gate.set()
+    _wait_for(lambda: executor.stats()["completed"] == 3)
+    assert ran == ["blocker", "tab-a", "tab-b"]
+    executor.shutdown()
+
+
+def test_changed_inputs_cancel_the_running_job_and_queue_one_rerun():
+    started = threading.Event()
+    runs: list[tuple[str, bool]] = []
+
+    def run(key, should_cancel):
+        first = not runs
+        runs.append((key, first))
+        if first:
+            started.set()
+            _wait_for(should_cancel)
+            raise JobCancelled(key)
+
+    executor = CoalescingJobExecutor("test", run, max_workers=2)
+    executor.submit("tab-a", input_key="v1")
+    started.wait(5)
+    assert executor.submit("tab-a", input_key="v1") == "coalesced"
+    assert executor.submit("tab-a", input_key="v2") == "superseded"
+    assert executor.submit("tab-a", input_key="v2") == "coalesced"
+    _wait_for(lambda: executor.stats()["completed"] == 1)
+    stats = executor.stats()
+    assert stats["cancelled"] == 1 and stats["superseded"] == 1
+    # The rerun never overlapped the cancelled run for the same key.
+    assert [key for key, _ in runs] == ["tab-a", "tab-a"]
+    executor.shutdown()
+
+
+def test_full_queue_rejects_new_keys():
+    gate = threading.Event()
+    executor = CoalescingJobExecutor("test", lambda key, should_cancel: gate.wait(5), max_workers=1, max_queue=1)
+    executor.submit("blocker")
+    _wait_for(lambda: executor.stats()["running"] == 1)
+    assert executor.submit("tab-a") == "queued"
+    assert executor.submit("tab-b") == "rejected"
+    gate.set()
+    executor.shutdown()
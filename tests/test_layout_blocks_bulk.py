@@ -0,0 +1,73 @@
+from contextlib import contextmanager
+
+from tpa_api.ingestion import ops
+
+
+class _FakeLayoutBlocks:
+    """Just enough of a psycopg connection to emulate the layout_blocks upsert."""
+
+    def __init__(self, existing=None):
+        self.rows = dict(existing or {})  # block_id -> (id, evidence_ref_id)
+        self._result = []
+
+    def cursor(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params):
+        wanted = params[1]
+        if "SELECT block_id, id " in sql:
+            self._result = [(b, self.rows[b][0]) for b in wanted if b in self.rows]
+        else:
+            self._result = [(b, self.rows[b][1]) for b in wanted if b in self.rows]
+
+    def executemany(self, sql, seq):
+        for params in seq:
+            layout_block_id, block_id, evidence_ref_id = params[0], params[6], params[15]
+            if block_id in self.rows:
+                stored_id, stored_ref = self.rows[block_id]
+                self.rows[block_id] = (stored_id, stored_ref or evidence_ref_id)
+            else:
+                self.rows[block_id] = (layout_block_id, evidence_ref_id)
+
+    def fetchall(self):
+        return self._result
+
+
+def test_duplicate_block_ids_report_the_stored_layout_block_id(monkeypatch):
+    conn = _FakeLayoutBlocks(existing={"b-old": ("00000000-0000-0000-0000-000000000001", "ref-old")})
+
+    @contextmanager
+    def transaction():
+        yield conn
+
+    monkeypatch.setattr(ops, "_db_transaction", transaction)
+    monkeypatch.setattr(
+        ops, "_ensure_evidence_ref_rows", lambda conn, refs, run_id=None: {ref: f"id:{ref}" for ref in refs}
+    )
+    blocks = [
+        {"block_id": "b-1", "text": "Policy H1", "page_number": 1},
+        {"block_id": "b-old", "text": "Policy H2", "page_number": 1},
+        {"block_id": "b-1", "text": "Policy H1 (continued)", "page_number": 2},
+    ]
+
+    rows = ops._persist_layout_blocks(
+        document_id="doc-1",
+        ingest_batch_id="batch-1",
+        run_id=None,
+        source_artifact_id=None,
+        pages=[{"page_number": 1, "text": "Policy H1 Policy H2"}],
+        blocks=blocks,
+    )
+
+    assert [r["block_id"] for r in rows] == ["b-1", "b-old", "b-1"]
+    for row in rows:
+        assert row["layout_block_id"] == conn.rows[row["block_id"]][0]
+    assert rows[0]["layout_block_id"] == rows[2]["layout_block_id"]
+    assert rows[0]["evidence_ref"] == rows[2]["evidence_ref"]
+    assert rows[1]["layout_block_id"] == "00000000-0000-0000-0000-000000000001"
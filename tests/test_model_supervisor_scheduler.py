@@ -0,0 +1,126 @@
+import threading
+import time
+
+import pytest
+
+from tpa_model_supervisor.scheduler import GpuRoleScheduler, SchedulerTimeout, SimulatedBackend
+
+
+EXCLUSIVE = {"llm", "vlm", "embeddings"}
+
+
+def _scheduler(*, window: float = 0.2, lease: float = 5.0, start_seconds: float = 0.0) -> GpuRoleScheduler:
+    backend = SimulatedBackend(start_seconds=start_seconds)
+    return GpuRoleScheduler(backend, exclusive_roles=EXCLUSIVE, window_seconds=window, lease_seconds=lease)
+
+
+def test_same_role_requests_share_one_start():
+    sched = _scheduler()
+    leases = [sched.acquire("llm") for _ in range(5)]
+    assert all(lease.base_url == "http://sim-llm" for lease in leases)
+    assert sched.backend.events == [("start", "llm")]
+    status = sched.status()
+    assert status["active_role"] == "llm"
+    assert status["in_flight_by_role"] == {"llm": 5}
+    assert status["swaps"] == 0
+
+
+def test_active_role_is_not_stopped_while_lease_in_flight():
+    sched = _scheduler(window=0.05)
+    llm = sched.acquire("llm")
+    got: list = []
+    t = threading.Thread(target=lambda: got.append(sched.acquire("vlm", timeout_seconds=5)))
+    t.start()
+    time.sleep(0.3)
+    # Window has closed but the llm lease is still held: vlm must wait in the queue.
+    assert got == []
+    status = sched.status()
+    assert status["queue_depth"] == 1
+    assert status["queue_by_role"] == {"vlm": 1}
+    assert ("stop", "llm") not in sched.backend.events
+
+    assert sched.release(llm.lease_id) is True
+    t.join(timeout=5)
+    assert got and got[0].role == "vlm"
+    assert got[0].stopped_roles == ["llm"]
+    status = sched.status()
+    assert status["active_role"] == "vlm"
+    assert status["swaps"] == 1
+    assert status["queue_depth"] == 0
+
+
+def test_queued_requests_for_one_role_are_batched_into_one_swap():
+    sched = _scheduler(window=0.05, start_seconds=0.05)
+    llm = sched.acquire("llm")
+    results: list = []
+    threads = [threading.Thread(target=lambda: results.append(sched.acquire("vlm", timeout_seconds=5))) for _ in range(4)]
+    for t in threads:
+        t.start()
+    time.sleep(0.2)
+    sched.release(llm.lease_id)
+    for t in threads:
+        t.join(timeout=5)
+    assert len(results) == 4
+    assert sched.backend.events.count(("start", "vlm")) == 1
+    assert sched.status()["swaps"] == 1
+
+
+def test_expired_lease_unblocks_swap():
+    sched = _scheduler(window=0.05, lease=0.2)
+    sched.acquire("llm")
+    lease = sched.acquire("embeddings", timeout_seconds=5)
+    assert lease.stopped_roles == ["llm"]
+
+
+def test_queue_timeout():
+    sched = _scheduler(window=0.05, lease=10.0)
+    sched.acquire("llm")
+    with pytest.raises(SchedulerTimeout):
+        sched.acquire("vlm", timeout_seconds=0.2)
+    assert sched.status()["queue_depth"] == 0
+
+
+def test_non_exclusive_roles_do_not_swap():
+    sched = _scheduler()
+    sched.acquire("llm")
+    sched.acquire("sam2")
+    assert sched.backend.running_roles() == {"llm", "sam2"}
+    assert sched.status()["swaps"] == 0
+
+
+def test_failed_start_does_not_leave_a_stopped_role_active():
+    sched = _scheduler(window=0.0)
+    sched.release(sched.acquire("llm").lease_id)
+
+    def failing_start(role):
+        raise RuntimeError(f"{role} failed to start")
+
+    real_start, sched.backend.start = sched.backend.start, failing_start
+    with pytest.raises(RuntimeError):
+        sched.acquire("vlm", timeout_seconds=1)
+    sched.backend.start = real_start
+    assert sched.backend.running == set()
+    assert sched.status()["active_role"] is None
+
+    lease = sched.acquire("llm", timeout_seconds=1)
+    assert lease.role == "llm"
+    assert sched.backend.running == {"llm"}
+    assert sched.backend.events[-1] == ("start", "llm")
+
+
+def test_renewed_lease_keeps_role_past_ttl():
+    sched = _scheduler(window=0.05, lease=0.3)
+    llm = sched.acquire("llm")
+    got: list = []
+    t = threading.Thread(target=lambda: got.append(sched.acquire("vlm", timeout_seconds=5)))
+    t.start()
+    for _ in range(4):
+        time.sleep(0.15)
+        assert sched.renew(llm.lease_id) is not None
+    assert got == []
+    assert ("stop", "llm") not in sched.backend.events
+
+    sched.release(llm.lease_id)
+    t.join(timeout=5)
+    assert got and got[0].stopped_roles == ["llm"]
+    assert sched.renew(llm.lease_id) is None
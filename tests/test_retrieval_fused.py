@@ -0,0 +1,63 @@
+from tpa_api import retrieval
+
+
+def _sql(**overrides):
+    where_sql, where_params = retrieval._hybrid_scope_where("policy_clause", authority_id="a1", plan_cycle_id="pc-1")
+    kwargs = dict(
+        spec=retrieval._HYBRID_KINDS["policy_clause"],
+        where_sql=where_sql,
+        where_params=where_params,
+        queries=["flood risk", "heritage setting"],
+        query_vecs=[[0.1, 0.2, 0.3], [0.3, 0.2, 0.1]],
+        dim=3,
+        embedding_model_id="m",
+        limit=12,
+        rrf_k=60,
+        keep=20,
+        rerank_n=20,
+        use_fts=True,
+    )
+    kwargs.update(overrides)
+    return retrieval._fused_hybrid_sql(**kwargs)
+
+
+def test_fused_sql_binds_every_placeholder():
+    for overrides in ({}, {"dim": None}, {"use_fts": False}):
+        sql, params = _sql(**overrides)
+        assert sql.count("%s") == len(params)
+
+
+def test_disabled_lanes_become_empty_ctes():
+    sql, _ = _sql(dim=None)
+    assert "unit_embeddings" not in sql
+    sql, _ = _sql(use_fts=False)
+    assert "websearch_to_tsquery" not in sql
+    assert "unit_embeddings" in sql
+
+
+def test_batch_uses_one_round_trip_and_groups_by_query(monkeypatch):
+    calls: list = []
+    tool_runs: list = []
+
+    def fake_fetch(sql, params, *, ef_search=None):
+        calls.append(params)
+        return [
+            {"qid": 1, "unit_id": "c2", "kw_score": 0.5, "vec_distance": None, "rrf_score": 0.016,
+             "fused_rank": 1, "source_type": "document", "source_id": "d1", "fragment_id": "p3",
+             "rerank_text": "text"},
+            {"qid": 0, "unit_id": "c1", "kw_score": None, "vec_distance": 0.2, "rrf_score": 0.016,
+             "fused_rank": 1, "source_type": None, "source_id": None, "fragment_id": None,
+             "rerank_text": "text"},
+        ]
+
+    monkeypatch.setattr(retrieval, "_embed_texts_cached_sync", lambda **kwargs: [[0.1, 0.2], [0.2, 0.1]])
+    monkeypatch.setattr(retrieval, "_fetch_ann_rows", fake_fetch)
+    monkeypatch.setattr(retrieval, "record_tool_run", lambda **kwargs: tool_runs.append(kwargs) or f"tr-{len(tool_runs)}")
+
+    out = retrieval._retrieve_chunks_hybrid_batch_sync(queries=["first", "second"], rerank=False)
+
+    assert len(calls) == 1
+    assert [r["results"][0]["chunk_id"] for r in out] == ["c1", "c2"]
+    assert out[0]["results"][0]["evidence_ref"] == "chunk::c1::page-unknown"
+    assert out[1]["results"][0]["evidence_ref"] == "document::d1::p3"
+    assert len(tool_runs) == 2 and out[0]["tool_run_id"] != out[1]["tool_run_id"]
@@ -0,0 +1,86 @@
+import pytest
+
+scenarios = pytest.importorskip("tpa_api.services.scenarios")
+
+from tpa_api.hash_utils import stable_hash  # noqa: E402
+
+
+_TAB = {
+    "state_vector_jsonb": {"growth": "high"},
+    "plan_project_id": "pp-1",
+    "authority_id": "camden",
+    "plan_cycle_id": "pc-1",
+}
+
+
+def _patch_versions(monkeypatch, versions: dict[tuple[str, str, str], int], calls: list):
+    def fetch_all(sql, params):
+        calls.append(params)
+        return [
+            {"source_table": source, "scope_kind": kind, "scope_id": scope_id, "version": v}
+            for (source, kind, scope_id), v in versions.items()
+        ]
+
+    monkeypatch.setattr(scenarios, "_db_fetch_all", fetch_all)
+    monkeypatch.setattr(
+        scenarios, "_db_fetch_one", lambda *a, **k: pytest.fail("freshness must not scan dependency tables")
+    )
+
+
+def test_snapshot_is_one_lookup_and_tracks_counter_changes(monkeypatch):
+    calls: list = []
+    versions = {
+        ("site_assessments", "plan_project", "pp-1"): 3,
+        ("policy_clauses", "authority", "camden"): 10,
+        ("policy_clauses", "plan_cycle", "pc-1"): 4,
+        ("trace_links", "global", ""): 7,
+        ("site_assessments", "plan_project", "pp-other"): 99,
+    }
+    _patch_versions(monkeypatch, versions, calls)
+
+    first = scenarios._scenario_dependency_snapshot(_TAB)
+    assert len(calls) == 1
+    assert first["site_assessments_version"] == 3
+    assert first["policy_clauses_version"] == 14
+    assert first["trace_links_version"] == 7
+    assert first["visual_assets_version"] == 0
+
+    assert stable_hash(scenarios._scenario_dependency_snapshot(_TAB)) == stable_hash(first)
+    versions[("policy_clauses", "plan_cycle", "pc-1")] = 5
+    assert stable_hash(scenarios._scenario_dependency_snapshot(_TAB)) != stable_hash(first)
+
+
+def test_failed_counter_lookup_keeps_the_stored_snapshot(monkeypatch):
+    calls: list = []
+    _patch_versions(monkeypatch, {("site_assessments", "plan_project", "pp-1"): 3}, calls)
+    stored = scenarios._scenario_dependency_snapshot(_TAB)
+
+    def fetch_all(sql, params):
+        raise RuntimeError("connection reset")
+
+    monkeypatch.setattr(scenarios, "_db_fetch_all", fetch_all)
+    tab = {**_TAB, "dependency_snapshot_jsonb": stored}
+    assert stable_hash(scenarios._scenario_dependency_snapshot(tab)) == stable_hash(stored)
+
+    # A tab that never ran gets the same keys, without versions.
+    never_run = scenarios._scenario_dependency_snapshot(_TAB)
+    assert never_run.keys() == stored.keys()
+    assert never_run["site_assessments_version"] is None
+
+
+def test_unscoped_tab_sums_authority_counters_and_global(monkeypatch):
+    calls: list = []
+    versions = {
+        ("policy_clauses", "authority", "camden"): 10,
+        ("policy_clauses", "authority", "islington"): 6,
+        ("policy_clauses", "global", ""): 2,
+        ("trace_links", "global", ""): 7,
+    }
+    _patch_versions(monkeypatch, versions, calls)
+    tab = {"state_vector_jsonb": {}, "plan_project_id": None, "authority_id": None, "plan_cycle_id": None}
+
+    snapshot = scenarios._scenario_dependency_snapshot(tab)
+    assert calls[0][2] is True
+    assert snapshot["policy_clauses_version"] == 18
+    assert snapshot["trace_links_version"] == 7
+    assert snapshot["site_assessments_version"] == 0
@@ -0,0 +1,76 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from tpa_api.spatial_fingerprint import compute_site_fingerprint_sync, compute_site_fingerprints_batch_sync
+
+
+class _FakeDb:
+    def __init__(self, site_ids, features_per_site):
+        self.site_ids = site_ids
+        self.features_per_site = features_per_site
+        self.statements: list[str] = []
+
+    def fetch_one(self, sql, params=None):
+        raise AssertionError("batch fingerprinting should not issue per-site lookups")
+
+    def fetch_all(self, sql, params=None):
+        self.statements.append(sql)
+        if "FROM sites\n" in sql and "LATERAL" not in sql:
+            return [{"id": sid, "metadata": {}} for sid in self.site_ids]
+        if "LATERAL" in sql:
+            return [
+                {"site_id": sid, "spatial_feature_id": str(uuid4()), "type": ftype, "properties": {}}
+                for sid in self.site_ids
+                for ftype in self.features_per_site
+            ]
+        return []
+
+    def execute(self, sql, params=None):
+        self.statements.append(sql)
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def test_batch_uses_constant_statements_and_logs_runs_before_edges():
+    sites = [str(uuid4()) for _ in range(25)]
+    missing = str(uuid4())
+    db = _FakeDb(sites, ["flood_zone", "conservation_area", "flood_zone"])
+    results = compute_site_fingerprints_batch_sync(
+        db_fetch_one=db.fetch_one,
+        db_fetch_all=db.fetch_all,
+        db_execute=db.execute,
+        utc_now=_now,
+        site_ids=[*sites, missing],
+        authority_id="camden",
+        plan_cycle_id=None,
+    )
+    fingerprint, tool_run_id, errors = results[sites[0]]
+    assert fingerprint["counts_by_type"] == {"flood_zone": 2, "conservation_area": 1}
+    assert errors == []
+    assert results[missing][0] is None and results[missing][2] == ["site_not_found"]
+    assert len({run_id for _, run_id, _ in results.values()}) == 26
+    # sites, spatial join, tool runs, 2x kg_node, kg_edge delete + insert, fingerprint retire + insert.
+    assert len(db.statements) == 9
+    run_insert = next(i for i, sql in enumerate(db.statements) if "INSERT INTO tool_runs" in sql)
+    edge_insert = next(i for i, sql in enumerate(db.statements) if "INSERT INTO kg_edge" in sql)
+    assert run_insert < edge_insert
+
+
+def test_single_site_form_delegates_to_batch():
+    site = str(uuid4())
+    db = _FakeDb([site], ["green_belt"])
+    fingerprint, tool_run_id, errors = compute_site_fingerprint_sync(
+        db_fetch_one=db.fetch_one,
+        db_fetch_all=db.fetch_all,
+        db_execute=db.execute,
+        utc_now=_now,
+        site_id=site,
+        authority_id=None,
+        plan_cycle_id=None,
+        token_budget=400,
+    )
+    assert fingerprint["summary"] == "Intersects: green_belt (1)"
+    assert "capped at 2 features" in fingerprint["limitations_text"]
+    assert tool_run_id and errors == []
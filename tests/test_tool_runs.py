@@ -0,0 +1,164 @@
+from datetime import datetime, timezone
+
+from contextlib import contextmanager
+
+from tpa_api import db, tool_runs, vector_index
+
+
+def _row(tool_run_id: str) -> tuple:
+    now = datetime.now(timezone.utc)
+    return (tool_run_id, "t", "{}", "{}", "success", now, now, None, None, None, None)
+
+
+def _capture(monkeypatch) -> list[list[tuple]]:
+    batches: list[list[tuple]] = []
+    monkeypatch.setattr(tool_runs, "_write_rows", lambda rows: batches.append(list(rows)) or 0)
+    return batches
+
+
+def test_records_are_written_in_batches(monkeypatch):
+    batches = _capture(monkeypatch)
+    recorder = tool_runs.ToolRunRecorder(batch_size=3, flush_interval_seconds=60)
+    for i in range(7):
+        recorder.record(_row(f"id-{i}"))
+    assert recorder.flush() == 7
+    assert [len(b) for b in batches] == [3, 3, 1]
+    assert [r[0] for b in batches for r in b] == [f"id-{i}" for i in range(7)]
+    assert recorder.stats()["pending"] == 0
+    recorder.shutdown()
+
+
+def test_barrier_flushes_before_a_statement_references_a_queued_id(monkeypatch):
+    batches = _capture(monkeypatch)
+    recorder = tool_runs.ToolRunRecorder(flush_interval_seconds=60)
+    recorder.record(_row("tr-1"))
+    recorder.barrier(("other", 1))
+    assert batches == []
+    recorder.barrier(("row-id", "tr-1"))
+    assert [r[0] for r in batches[0]] == ["tr-1"]
+    recorder.shutdown()
+
+
+def test_barrier_flushes_for_ids_inside_list_params(monkeypatch):
+    # services/trace.py reads tool runs back with `WHERE id = ANY(%s::uuid[])`.
+    batches = _capture(monkeypatch)
+    recorder = tool_runs.ToolRunRecorder(flush_interval_seconds=60)
+    recorder.record(_row("tr-1"))
+    recorder.barrier((["tr-0", "tr-9"],))
+    recorder.barrier({"ids": ("tr-0",), "nested": [{"x": 1}]})
+    assert batches == []
+    recorder.barrier((["tr-0", "tr-1"],))
+    assert [r[0] for r in batches[0]] == ["tr-1"]
+    recorder.record(_row("tr-2"))
+    recorder.barrier({"filters": {"ids": ["tr-2"]}})
+    assert [r[0] for r in batches[1]] == ["tr-2"]
+    recorder.shutdown()
+
+
+def test_full_queue_falls_back_to_a_synchronous_write(monkeypatch):
+    batches = _capture(monkeypatch)
+    recorder = tool_runs.ToolRunRecorder(max_queue=1, flush_interval_seconds=60, enqueue_timeout_seconds=0.01)
+    # Hold the writer lock so the background thread cannot drain the queue.
+    with recorder._write_lock:
+        recorder.record(_row("queued"))
+        recorder.record(_row("overflow"))
+    assert [[r[0] for r in b] for b in batches] == [["overflow"]]
+    assert recorder.stats()["sync_fallbacks"] == 1
+    recorder.shutdown()
+    assert batches[-1][0][0] == "queued"
+
+
+def test_rejected_records_are_counted(monkeypatch):
+    monkeypatch.setattr(tool_runs, "_write_rows", lambda rows: 1)
+    recorder = tool_runs.ToolRunRecorder(flush_interval_seconds=60)
+    recorder.record(_row("bad"))
+    recorder.record(_row("good"))
+    assert recorder.flush() == 1
+    assert recorder.stats()["failed"] == 1 and recorder.stats()["written"] == 1
+    recorder.shutdown()
+
+
+def test_vector_search_does_not_flush_queued_tool_runs(monkeypatch):
+    recorder = tool_runs.ToolRunRecorder(flush_interval_seconds=60)
+    flushes: list[int] = []
+    monkeypatch.setattr(recorder, "flush", lambda: flushes.append(1) or 0)
+    recorder.record(_row("tr-queued"))
+    monkeypatch.setattr(tool_runs, "_recorder", recorder)
+
+    class _Cursor:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def execute(self, sql, params=None):
+            pass
+
+        def fetchall(self):
+            return [{"id": "chunk-1"}]
+
+    class _Conn:
+        @contextmanager
+        def transaction(self):
+            yield
+
+        def cursor(self, **kwargs):
+            return _Cursor()
+
+    class _Pool:
+        @contextmanager
+        def connection(self):
+            yield _Conn()
+
+    monkeypatch.setattr(db, "_db_pool_or_503", lambda: _Pool())
+    rows = vector_index._fetch_ann_rows("SELECT 1", ("[0.1,0.2]", "authority-1", 10), ef_search=40)
+    assert rows == [{"id": "chunk-1"}]
+    assert flushes == [] and recorder.stats()["pending"] == 1
+    # A bulk writer still flushes everything first.
+    with db._db_transaction():
+        pass
+    assert flushes == [1]
+    recorder.shutdown()
+
+
+def test_failed_batches_stay_queued(monkeypatch):
+    calls: list[int] = []
+
+    def flaky(rows):
+        calls.append(len(rows))
+        if len(calls) == 1:
+            raise ConnectionError("db down")
+        return 0
+
+    monkeypatch.setattr(tool_runs, "_write_rows", flaky)
+    recorder = tool_runs.ToolRunRecorder(flush_interval_seconds=60)
+    recorder.record(_row("a"))
+    try:
+        recorder.flush()
+    except ConnectionError:
+        pass
+    assert recorder.stats()["queued"] == 1
+    assert recorder.flush() == 1
+    assert recorder.stats()["pending"] == 0
+    recorder.shutdown()
+
+
+def test_sync_mode_writes_inline(monkeypatch):
+    batches = _capture(monkeypatch)
+    monkeypatch.setenv("TPA_TOOL_RUN_RECORDER", "sync")
+    tool_run_id = tool_runs.record_tool_run(
+        tool_name="t", inputs={"q": 1}, outputs={}, status="success", started_at=datetime.now(timezone.utc)
+    )
+    assert batches and batches[0][0][0] == tool_run_id
+
+
+def test_db_helpers_run_registered_barriers():
+    assert tool_runs._tool_run_write_barrier in db._write_barriers
+    seen: list = []
+    db.register_write_barrier(seen.append)
+    try:
+        db._run_write_barriers(("x",))
+    finally:
+        db._write_barriers.remove(seen.append)
+    assert seen == [("x",)]
@@ -0,0 +1,27 @@
+from tpa_api.vector_index import (
+    _index_expression,
+    ann_candidate_limit,
+    ann_order_sql,
+    unit_embedding_index_name,
+)
+
+
+def test_order_expression_matches_index_expression_per_width():
+    for dim, opclass in ((1024, "vector_cosine_ops"), (2560, "halfvec_cosine_ops"), (4096, "bit_hamming_ops")):
+        expression, got_opclass = _index_expression(dim)
+        assert got_opclass == opclass
+        # The query's ORDER BY must apply the same cast to the column as the index expression.
+        assert expression.strip("()") in ann_order_sql("embedding", dim)
+
+
+def test_binary_quantised_widths_over_fetch_for_rerank(monkeypatch):
+    monkeypatch.setenv("TPA_VECTOR_RERANK_FACTOR", "5")
+    assert ann_candidate_limit(12, 1024) == 12
+    assert ann_candidate_limit(12, 4096) == 60
+
+
+def test_index_name_is_stable_and_identifier_safe():
+    name = unit_embedding_index_name(model_id="Qwen/Qwen3-Embedding-8B", unit_type="chunk", dim=4096)
+    assert name == unit_embedding_index_name(model_id="Qwen/Qwen3-Embedding-8B", unit_type="chunk", dim=4096)
+    assert name.startswith("unit_embeddings_hnsw_") and len(name) < 63
+    assert name != unit_embedding_index_name(model_id="Qwen/Qwen3-Embedding-8B", unit_type="policy_clause", dim=4096)
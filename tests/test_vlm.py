@@ -77,25 +77,22 @@ class TestModelSupervisor:
                 "TPA_MODEL_SUPERVISOR_TOKEN": "token",
             },
         ):
-            with patch("tpa_api.model_clients.httpx.Client") as mock_client:
+            with patch("tpa_api.model_clients._model_post") as mock_post:
                 mock_response = MagicMock()
                 mock_response.json.return_value = {"base_url": "http://vlm:8000/v1"}
-                mock_client.return_value.__enter__.return_value.post.return_value = (
-                    mock_response
-                )
+                mock_post.return_value = mock_response
 
                 result = _ensure_model_role_sync(role="vlm", timeout_seconds=30.0)
                 assert result == "http://vlm:8000/v1"
+                assert mock_post.call_args.args[0] == "supervisor"
 
     def test_ensure_model_role_sync_supervisor_error(self):
         """Sync ensure handles supervisor errors gracefully."""
         with patch.dict(
             os.environ, {"TPA_MODEL_SUPERVISOR_URL": "http://supervisor:8091"}
         ):
-            with patch("tpa_api.model_clients.httpx.Client") as mock_client:
-                mock_client.return_value.__enter__.return_value.post.side_effect = (
-                    Exception("Connection refused")
-                )
+            with patch("tpa_api.model_clients._model_post") as mock_post:
+                mock_post.side_effect = Exception("Connection refused")
 
                 result = _ensure_model_role_sync(role="vlm", timeout_seconds=30.0)
                 assert result is None